@@ -0,0 +1,149 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks reading a large vistrail XML file with the DOM-based reader
+and with the incremental iterparse reader, reporting time and peak memory.
+
+Each reader runs in a fresh process so that peak memory can be measured
+independently.
+
+Usage: python load_xml.py [--size MB] [--keep FILE]
+
+"""
+
+from __future__ import division
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import make_vistrail
+
+from vistrails.core.system import get_elementtree_library
+from vistrails.db.domain import DBVistrail
+from vistrails.db.versions import getVersionDAO, currentVersion
+
+ElementTree = get_elementtree_library()
+
+LOADERS = ('dom', 'iterparse')
+
+def write_vistrail(vistrail, filename):
+    """write_vistrail(vistrail: DBVistrail, filename: str) -> None
+    Writes vistrail as XML one action at a time, so that files much larger
+    than what the DOM writer can hold in memory can be generated."""
+    dao = getVersionDAO(currentVersion)['xml']['action']
+    f = open(filename, 'wb')
+    try:
+        f.write('<vistrail id="%d" name="synthetic" version="%s">\n' %
+                (vistrail.db_id or 0, currentVersion))
+        for action in vistrail.db_actions:
+            node = dao.toXML(action, ElementTree.Element('action'))
+            f.write(ElementTree.tostring(node))
+            f.write('\n')
+        f.write('</vistrail>\n')
+    finally:
+        f.close()
+
+def generate(filename, size):
+    """generate(filename: str, size: int) -> int
+    Writes a synthetic vistrail of about size MB, returns its number of
+    actions."""
+    sample = 2000
+    vistrail, _ = make_vistrail(sample)
+    write_vistrail(vistrail, filename)
+    per_action = os.path.getsize(filename) / sample
+    n_actions = max(sample, int(size * 1024 * 1024 / per_action))
+    vistrail, _ = make_vistrail(n_actions)
+    write_vistrail(vistrail, filename)
+    return n_actions
+
+def load(loader, filename):
+    """Runs in the child process: loads filename and prints the elapsed
+    time and the peak resident size."""
+    daoList = getVersionDAO(currentVersion)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    if loader == 'dom':
+        vistrail = daoList.open_from_xml(filename, DBVistrail.vtType)
+    else:
+        vistrail = daoList.iterparse_vistrail(filename)
+    elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print elapsed, before, peak, len(vistrail.db_actions)
+
+def run(size, keep):
+    if keep:
+        filename = keep
+    else:
+        fd, filename = tempfile.mkstemp(prefix='vt_bench_', suffix='.xml')
+        os.close(fd)
+    try:
+        if not keep or not os.path.exists(keep):
+            n_actions = generate(filename, size)
+            print "%d actions" % n_actions
+        print "%.1f MB" % (os.path.getsize(filename) / (1024 * 1024))
+        print "%10s %10s %16s %10s" % ('reader', 'time (s)',
+                                       'peak delta (MB)', 'actions')
+        for loader in LOADERS:
+            output = subprocess.check_output([sys.executable,
+                                              os.path.abspath(__file__),
+                                              '--load', loader, filename])
+            elapsed, before, peak, actions = output.split()
+            # ru_maxrss is in kilobytes on Linux
+            print "%10s %10.2f %16.1f %10s" % (
+                    loader, float(elapsed),
+                    (int(peak) - int(before)) / 1024, actions)
+    finally:
+        if not keep:
+            os.unlink(filename)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100,
+                        help="size of the synthetic vistrail, in MB")
+    parser.add_argument('--keep', metavar='FILE',
+                        help="reuse or keep the synthetic vistrail in FILE")
+    parser.add_argument('--load', choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument('filename', nargs='?', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.load:
+        load(args.load, args.filename)
+    else:
+        run(args.size, args.keep)
@@ -0,0 +1,80 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks workflow materialization time against version tree depth,
+with and without materialization checkpoints.
+
+Usage: python materialize.py [--actions N] [--modules M]
+
+"""
+
+from __future__ import division
+
+import argparse
+
+from synthetic import make_vistrail, timeit
+
+from vistrails.db.services.checkpoint import WorkflowCheckpoints
+from vistrails.db.services.vistrail import materializeWorkflow
+
+def run(n_actions, n_modules):
+    vistrail, versions = make_vistrail(n_actions, n_modules)
+    print "%d actions, %d modules" % (n_actions, n_modules)
+    print "%10s %14s %14s %14s" % ('depth', 'replay (s)', 'cold ckpt (s)',
+                                   'warm ckpt (s)')
+    depth = 100
+    while depth <= n_actions:
+        version = versions[depth - 1]
+        replay = timeit(lambda: materializeWorkflow(vistrail, version, False))
+
+        def cold():
+            vistrail._workflow_checkpoints = WorkflowCheckpoints()
+            materializeWorkflow(vistrail, version)
+        cold_time = timeit(cold)
+
+        # warm: a sibling version was materialized before
+        vistrail._workflow_checkpoints = WorkflowCheckpoints()
+        materializeWorkflow(vistrail, versions[depth - 2])
+        warm = timeit(lambda: materializeWorkflow(vistrail, version))
+        print "%10d %14.4f %14.4f %14.4f" % (depth, replay, cold_time, warm)
+        depth *= 2
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--actions', type=int, default=20000)
+    parser.add_argument('--modules', type=int, default=20)
+    args = parser.parse_args()
+    run(args.actions, args.modules)
@@ -0,0 +1,179 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks the memory used by a large vistrail loaded from XML, with the
+__slots__-based domain classes and with dict-based ones.
+
+The dict-based mode loads the domain classes with their __slots__
+declarations removed, which is what the generator emits for objects not
+listed in SLOTS_OBJECTS. Each mode runs in a fresh process so that peak
+memory can be measured independently.
+
+Usage: python memory.py [--size MB] [--keep FILE]
+
+"""
+
+from __future__ import division
+
+import argparse
+import ctypes
+import gc
+import imp
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+_root_dir = os.path.realpath(os.path.join(os.path.dirname(__file__),
+                                          '..', '..'))
+sys.path.insert(0, _root_dir)
+
+MODES = ('slots', 'dict')
+
+class DictDomainImporter(object):
+    """Import hook loading the domain classes with their __slots__
+    declarations removed. Must be installed before vistrails is imported,
+    as the core classes derive from the domain classes."""
+
+    name = 'vistrails.db.versions.v1_0_4.domain.auto_gen'
+
+    def find_module(self, fullname, path=None):
+        if fullname == self.name:
+            return self
+        return None
+
+    def load_module(self, fullname):
+        filename = os.path.join(_root_dir, *fullname.split('.')) + '.py'
+        with open(filename) as f:
+            source = re.sub(r"\n    __slots__ = \([^)]*\)\n", "\n", f.read())
+        module = imp.new_module(fullname)
+        module.__file__ = filename
+        module.__package__ = fullname.rsplit('.', 1)[0]
+        sys.modules[fullname] = module
+        exec compile(source, filename, 'exec') in module.__dict__
+        return module
+
+def instance_dict(obj):
+    """instance_dict(obj) -> dict or None
+    Returns the instance dictionary of obj if it has been created; reading
+    obj.__dict__ directly would create it."""
+    offset = type(obj).__dictoffset__
+    if offset <= 0:
+        return None
+    if not ctypes.c_void_p.from_address(id(obj) + offset).value:
+        return None
+    return obj.__dict__
+
+def domain_size():
+    """domain_size() -> (int, int)
+    Returns the number of live domain objects and the bytes they use,
+    counting their instance dictionaries but not their fields."""
+    count = 0
+    size = 0
+    for obj in gc.get_objects():
+        if isinstance(getattr(type(obj), 'vtType', None), str):
+            count += 1
+            size += sys.getsizeof(obj)
+            d = instance_dict(obj)
+            if d is not None:
+                size += sys.getsizeof(d)
+    return count, size
+
+def load(mode, filename):
+    """Runs in the child process: loads and converts filename, and prints
+    the elapsed time, the peak resident size and the domain object size."""
+    if mode == 'dict':
+        sys.meta_path.insert(0, DictDomainImporter())
+    from vistrails.core.vistrail.vistrail import Vistrail
+    from vistrails.db.domain import DBVistrail
+    from vistrails.db.versions import getVersionDAO, currentVersion
+
+    daoList = getVersionDAO(currentVersion)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    vistrail = daoList.open_from_xml(filename, DBVistrail.vtType)
+    Vistrail.convert(vistrail)
+    elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    count, size = domain_size()
+    print elapsed, before, peak, count, size
+
+def run(size, keep):
+    from load_xml import generate
+
+    if keep:
+        filename = keep
+    else:
+        fd, filename = tempfile.mkstemp(prefix='vt_bench_', suffix='.xml')
+        os.close(fd)
+    try:
+        if not keep or not os.path.exists(keep):
+            n_actions = generate(filename, size)
+            print "%d actions" % n_actions
+        print "%.1f MB" % (os.path.getsize(filename) / (1024 * 1024))
+        print "%10s %10s %16s %10s %12s" % ('classes', 'time (s)',
+                                            'peak delta (MB)', 'objects',
+                                            'objects (MB)')
+        for mode in MODES:
+            output = subprocess.check_output([sys.executable,
+                                              os.path.abspath(__file__),
+                                              '--load', mode, filename])
+            elapsed, before, peak, count, size = output.split()
+            # ru_maxrss is in kilobytes on Linux
+            print "%10s %10.2f %16.1f %10s %12.1f" % (
+                    mode, float(elapsed),
+                    (int(peak) - int(before)) / 1024, count,
+                    int(size) / (1024 * 1024))
+    finally:
+        if not keep:
+            os.unlink(filename)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=50,
+                        help="size of the synthetic vistrail, in MB")
+    parser.add_argument('--keep', metavar='FILE',
+                        help="reuse or keep the synthetic vistrail in FILE")
+    parser.add_argument('--load', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('filename', nargs='?', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.load:
+        load(args.load, args.filename)
+    else:
+        run(args.size, args.keep)
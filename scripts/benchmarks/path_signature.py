@@ -0,0 +1,111 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks the signature of a Directory constant, comparing the
+modification time signature with the content digest signature.
+
+"cold" digests every file, "warm" reuses the digest cache and "touched"
+is the time after every file was touched without being changed.
+
+Usage: python path_signature.py [--files N] [--size KB]
+
+"""
+
+from __future__ import division
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from synthetic import timeit
+
+from vistrails.core.cache.file_digest import FileDigestCache
+
+def make_tree(root, n_files, size):
+    """make_tree(root: str, n_files: int, size: int) -> None
+    Writes n_files files of size bytes under root, 100 per directory."""
+    old = time.time() - 60
+    for i in xrange(n_files):
+        dirname = os.path.join(root, 'dir%d' % (i // 100))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        filename = os.path.join(dirname, 'file%d' % i)
+        with open(filename, 'wb') as f:
+            f.write(os.urandom(size))
+        os.utime(filename, (old, old))
+
+def mtime_signature(path):
+    # what path_parameter_hasher does for the 'mtime' signature
+    t = int(os.path.getmtime(path))
+    for subpath in os.listdir(path):
+        subpath = os.path.join(path, subpath)
+        if os.path.isdir(subpath):
+            t = max(t, mtime_signature(subpath))
+    return t
+
+def run(n_files, size):
+    tmp_dir = tempfile.mkdtemp(prefix='vt_bench_')
+    try:
+        root = os.path.join(tmp_dir, 'tree')
+        make_tree(root, n_files, size)
+        digest_file = os.path.join(tmp_dir, 'digests')
+        print "%d files of %d KB" % (n_files, size // 1024)
+        print "%10s %12s" % ('mode', 'time (s)')
+        print "%10s %12.4f" % ('mtime', timeit(lambda: mtime_signature(root)))
+        start = time.time()
+        FileDigestCache(digest_file).path_digest(root)
+        print "%10s %12.4f" % ('cold', time.time() - start)
+        warm = timeit(lambda: FileDigestCache(digest_file).path_digest(root))
+        print "%10s %12.4f" % ('warm', warm)
+        touched = time.time() - 30
+        for dirpath, dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                os.utime(os.path.join(dirpath, filename), (touched, touched))
+        start = time.time()
+        FileDigestCache(digest_file).path_digest(root)
+        print "%10s %12.4f" % ('touched', time.time() - start)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=256,
+                        help="size of the files in KB")
+    args = parser.parse_args()
+    run(args.files, args.size * 1024)
@@ -0,0 +1,170 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks port matching on a synthetic pipeline, comparing the
+registry's type index with the lookups it replaced.
+
+The pipeline chains String, ConcatenateString, Integer and Float modules.
+Every port pair is checked the way the builder checks a new connection,
+with conversion allowed, so pairs such as Float -> Integer also search
+the converters. The pipeline is then validated.
+
+Usage: python port_matching.py [--modules N]
+
+"""
+
+from __future__ import division
+
+import argparse
+from itertools import izip
+
+from synthetic import timeit
+
+import vistrails.core.application
+from vistrails.core.modules.module_registry import get_module_registry
+from vistrails.core.modules.vistrails_module import Converter
+from vistrails.core.system import get_vistrails_basic_pkg_id
+from vistrails.core.vistrail.controller import VistrailController
+from vistrails.core.vistrail.pipeline import Pipeline
+from vistrails.db.domain import IdScope
+
+# (source module, output port, destination module, input port)
+PATTERN = [('String', 'value', 'ConcatenateString', 'str1'),
+           ('ConcatenateString', 'value', 'ConcatenateString', 'str2'),
+           ('ConcatenateString', 'value', 'String', 'value'),
+           ('Integer', 'value', 'Float', 'value'),
+           ('Float', 'value', 'Integer', 'value')]
+
+def make_pipeline(n_modules):
+    """make_pipeline(n_modules: int) -> (Pipeline, list of port pairs)
+    Builds a pipeline of about n_modules modules. Pairs that need a
+    converter are returned but not connected."""
+    basic_pkg = get_vistrails_basic_pkg_id()
+    id_scope = IdScope()
+    pipeline = Pipeline()
+    pairs = []
+    i = 0
+    while len(pipeline.modules) < n_modules:
+        src_name, src_port, dst_name, dst_port = PATTERN[i % len(PATTERN)]
+        i += 1
+        src = VistrailController.create_module_static(id_scope, basic_pkg,
+                                                      src_name)
+        dst = VistrailController.create_module_static(id_scope, basic_pkg,
+                                                      dst_name)
+        pipeline.add_module(src)
+        pipeline.add_module(dst)
+        out_spec = src.get_port_spec(src_port, 'output')
+        in_spec = dst.get_port_spec(dst_port, 'input')
+        pairs.append((out_spec, in_spec))
+        if get_module_registry().ports_can_connect(out_spec, in_spec):
+            pipeline.add_connection(
+                    VistrailController.create_connection_static(
+                            id_scope, src, out_spec, dst, in_spec))
+    return pipeline, pairs
+
+def legacy_specs_matched(reg, sub, super):
+    """are_specs_matched() with the lookups used before the type index."""
+    basic_pkg = get_vistrails_basic_pkg_id()
+    variant_desc = reg.get_descriptor_by_name(basic_pkg, 'Variant')
+    list_desc = reg.get_descriptor_by_name(basic_pkg, 'List')
+    sub_descs = sub.descriptors()
+    super_descs = super.descriptors()
+    if sub_descs == [variant_desc] or super_descs == [variant_desc]:
+        return True
+    if [list_desc] in [super_descs, sub_descs]:
+        return True
+    if len(sub_descs) == len(super_descs):
+        matched = True
+        for sub_desc, super_desc in izip(sub_descs, super_descs):
+            if sub_desc == variant_desc or super_desc == variant_desc:
+                continue
+            if not reg.is_descriptor_subclass(sub_desc, super_desc):
+                matched = False
+                break
+        if matched:
+            return True
+    # the converter cache was cleared whenever a package was loaded, so
+    # each distinct pair scanned every converter once
+    key = (tuple(sub_descs), tuple(super_descs))
+    if key not in legacy_conversions:
+        legacy_conversions[key] = [
+                c for c in reg._converters
+                if c.module is not Converter and
+                c.module.can_convert(sub_descs, super_descs)]
+    return bool(legacy_conversions[key])
+
+legacy_conversions = {}
+
+def run(n_modules):
+    reg = get_module_registry()
+    pipeline, pairs = make_pipeline(n_modules)
+    print "%d modules, %d connections, %d port pairs" % (
+            len(pipeline.modules), len(pipeline.connections), len(pairs))
+
+    def legacy():
+        legacy_conversions.clear()
+        for out_spec, in_spec in pairs:
+            legacy_specs_matched(reg, out_spec, in_spec)
+
+    def indexed():
+        reg.reset_type_index()
+        for out_spec, in_spec in pairs:
+            reg.ports_can_connect(out_spec, in_spec, allow_conversion=True)
+
+    def indexed_warm():
+        for out_spec, in_spec in pairs:
+            reg.ports_can_connect(out_spec, in_spec, allow_conversion=True)
+
+    def validate():
+        pipeline.validate()
+
+    print "%-24s %10s" % ('', 'time (s)')
+    print "%-24s %10.4f" % ('match, legacy', timeit(legacy))
+    print "%-24s %10.4f" % ('match, index rebuilt', timeit(indexed))
+    print "%-24s %10.4f" % ('match, index warm', timeit(indexed_warm))
+    print "%-24s %10.4f" % ('validate', timeit(validate))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=int, default=2000,
+                        help="number of modules in the pipeline")
+    args = parser.parse_args()
+    app = vistrails.core.application.init(
+            options_dict={'installBundles': False})
+    try:
+        run(args.modules)
+    finally:
+        app.finishSession()
@@ -0,0 +1,116 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks materializing every version of a vistrail the way the
+query engine does, through VistrailController.get_pipeline(), with and
+without read_only.
+
+The objects column counts the gc-tracked objects kept alive by the
+pipelines of the scan.
+
+Usage: python query_scan.py [DIRECTORY]
+
+"""
+
+from __future__ import division
+
+import argparse
+import gc
+import os
+
+from synthetic import timeit
+
+import vistrails.core.application
+from vistrails.core.db.io import load_vistrail
+from vistrails.core.db.locator import FileLocator
+from vistrails.core.system import vistrails_root_directory
+from vistrails.core.vistrail.controller import VistrailController
+
+def count_objects(func):
+    """count_objects(func: callable) -> int
+    Returns the number of gc-tracked objects that the result of func
+    keeps alive."""
+    gc.collect()
+    gc.disable()
+    try:
+        before = len(gc.get_objects())
+        result = func()
+        after = len(gc.get_objects())
+    finally:
+        gc.enable()
+    del result
+    return after - before
+
+def run(directory):
+    print "%20s %9s %14s %14s %14s %14s" % ('vistrail', 'versions',
+                                            'copy (s)', 'read-only (s)',
+                                            'copy objs', 'read-only objs')
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.vt'):
+            continue
+        try:
+            vistrail = load_vistrail(
+                    FileLocator(os.path.join(directory, filename)))[0]
+        except Exception:
+            continue
+        controller = VistrailController(vistrail, auto_save=False)
+        versions = sorted(vistrail.actionMap)
+
+        def scan(**kwargs):
+            return [controller.get_pipeline(version, **kwargs)
+                    for version in versions]
+        copy_scan = lambda: scan(do_validate=False)
+        read_only_scan = lambda: scan(read_only=True)
+        try:
+            times = (timeit(copy_scan), timeit(read_only_scan))
+        except Exception:
+            continue
+        print "%20s %9d %14.4f %14.4f %14d %14d" % (
+                filename[:20], len(versions), times[0], times[1],
+                count_objects(copy_scan), count_objects(read_only_scan))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory', nargs='?',
+                        default=os.path.join(vistrails_root_directory(),
+                                             '..', 'examples'))
+    args = parser.parse_args()
+    app = vistrails.core.application.init(
+            options_dict={'installBundles': False})
+    try:
+        run(args.directory)
+    finally:
+        app.finishSession()
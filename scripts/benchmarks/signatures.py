@@ -0,0 +1,131 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks pipeline signature computation after editing one parameter,
+comparing a full refresh against incremental recomputation.
+
+Usage: python signatures.py [--modules N]
+
+"""
+
+from __future__ import division
+
+import argparse
+
+from synthetic import timeit
+
+import vistrails.core.application
+from vistrails.core.system import get_vistrails_basic_pkg_id
+from vistrails.core.vistrail.connection import Connection
+from vistrails.core.vistrail.module import Module
+from vistrails.core.vistrail.module_function import ModuleFunction
+from vistrails.core.vistrail.module_param import ModuleParam
+from vistrails.core.vistrail.pipeline import Pipeline
+from vistrails.core.vistrail.port import Port
+from vistrails.db.domain import IdScope
+
+def make_pipeline(n_modules):
+    """make_pipeline(n_modules: int) -> Pipeline
+    Builds a chain of String modules, each with a value parameter."""
+    basic_pkg = get_vistrails_basic_pkg_id()
+    id_scope = IdScope()
+    modules = []
+    connections = []
+    for i in xrange(n_modules):
+        param = ModuleParam(id=id_scope.getNewId(ModuleParam.vtType),
+                            type='String',
+                            val='value %d' % i)
+        function = ModuleFunction(id=id_scope.getNewId(ModuleFunction.vtType),
+                                  name='value',
+                                  parameters=[param])
+        module = Module(id=id_scope.getNewId(Module.vtType),
+                        name='String',
+                        package=basic_pkg,
+                        functions=[function])
+        if modules:
+            ports = [Port(id=id_scope.getNewId(Port.vtType),
+                          type='source',
+                          moduleId=modules[-1].id,
+                          moduleName='String',
+                          name='value_as_string'),
+                     Port(id=id_scope.getNewId(Port.vtType),
+                          type='destination',
+                          moduleId=module.id,
+                          moduleName='String',
+                          name='value')]
+            connections.append(
+                    Connection(id=id_scope.getNewId(Connection.vtType),
+                               ports=ports))
+        modules.append(module)
+    pipeline = Pipeline(id=0, modules=modules, connections=connections)
+    pipeline.build_index()
+    return pipeline
+
+def run(n_modules):
+    pipeline = make_pipeline(n_modules)
+    pipeline.compute_signatures()
+    print "%d modules" % n_modules
+    print "%10s %14s %14s" % ('edited', 'refresh (s)', 'incremental (s)')
+    for position in (0, n_modules // 2, n_modules - 1):
+        param = pipeline.modules[position].functions[0].params[0]
+        values = iter(xrange(1000000))
+
+        def edit():
+            param.strValue = 'edited %d' % values.next()
+            pipeline.invalidate_object_signatures(ModuleParam.vtType,
+                                                  param.real_id)
+
+        def refresh():
+            edit()
+            pipeline.refresh_signatures()
+
+        def incremental():
+            edit()
+            pipeline.compute_signatures()
+
+        print "%10d %14.4f %14.4f" % (position, timeit(refresh),
+                                      timeit(incremental))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=int, default=2000)
+    args = parser.parse_args()
+    app = vistrails.core.application.init(
+            options_dict={'installBundles': False})
+    try:
+        run(args.modules)
+    finally:
+        app.finishSession()
@@ -0,0 +1,200 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Builds synthetic vistrails for the benchmark scripts in this directory.
+
+The generated vistrails only use the db layer domain classes so that they
+can be created and materialized without starting a VisTrails application.
+
+"""
+
+from __future__ import division
+
+import os
+import random
+import sys
+import time
+
+_this_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(_this_dir, '..', '..')))
+
+from vistrails.db.domain import DBVistrail, DBAction, DBChange, DBModule, \
+    DBFunction, DBParameter, DBConnection, DBPort, DBLocation
+from vistrails.db.services.action import create_add_op_chain
+
+BASIC_PKG = 'org.vistrails.vistrails.basic'
+
+def _new_id(vistrail, vtType):
+    return vistrail.idScope.getNewId(vtType)
+
+def _add_action(vistrail, ops, parent):
+    for op in ops:
+        if op.db_id < 0:
+            op.db_id = _new_id(vistrail, 'operation')
+    action = DBAction(id=_new_id(vistrail, DBAction.vtType),
+                      prevId=parent,
+                      operations=ops)
+    for op in ops:
+        if op.db_data is not None:
+            vistrail.db_add_object(op.db_data)
+    vistrail.db_add_action(action)
+    return action.db_id
+
+def _make_module(vistrail, name='String'):
+    param = DBParameter(id=_new_id(vistrail, DBParameter.vtType),
+                        pos=0,
+                        name='<no description>',
+                        type='%s:String' % BASIC_PKG,
+                        val='0',
+                        alias='')
+    function = DBFunction(id=_new_id(vistrail, DBFunction.vtType),
+                          pos=0,
+                          name='value',
+                          parameters=[param])
+    location = DBLocation(id=_new_id(vistrail, DBLocation.vtType),
+                          x=0.0, y=0.0)
+    module = DBModule(id=_new_id(vistrail, DBModule.vtType),
+                      cache=1,
+                      name=name,
+                      namespace='',
+                      package=BASIC_PKG,
+                      version='2.1.1',
+                      location=location,
+                      functions=[function])
+    return module
+
+def _make_connection(vistrail, source, target):
+    ports = [DBPort(id=_new_id(vistrail, DBPort.vtType),
+                    type='source',
+                    moduleId=source.db_id,
+                    moduleName=source.db_name,
+                    name='value_as_string',
+                    signature='(%s:String)' % BASIC_PKG),
+             DBPort(id=_new_id(vistrail, DBPort.vtType),
+                    type='destination',
+                    moduleId=target.db_id,
+                    moduleName=target.db_name,
+                    name='value',
+                    signature='(%s:String)' % BASIC_PKG)]
+    return DBConnection(id=_new_id(vistrail, DBConnection.vtType),
+                        ports=ports)
+
+def make_vistrail(n_actions, n_modules=20, branch_probability=0.0, seed=0):
+    """make_vistrail(n_actions: int, n_modules: int,
+                     branch_probability: float, seed: int) -> DBVistrail
+
+    Creates a vistrail whose first actions add n_modules connected String
+    modules, followed by parameter changes on random modules until
+    n_actions actions exist.  With branch_probability > 0, some actions
+    start a new branch from a random earlier version.
+
+    """
+    rng = random.Random(seed)
+    vistrail = DBVistrail()
+    parent = 0
+    modules = []
+    versions = []
+    # current parameter of each module, per version is not needed since
+    # branches only change parameters that exist in every version
+    params = {}
+    for i in xrange(min(n_modules, n_actions)):
+        module = _make_module(vistrail)
+        ops = create_add_op_chain(module)
+        if modules:
+            conn = _make_connection(vistrail, modules[-1], module)
+            ops.extend(create_add_op_chain(conn))
+        modules.append(module)
+        function = module.db_functions[0]
+        params[module.db_id] = (function.db_id,
+                                function.db_parameters[0].db_id)
+        parent = _add_action(vistrail, ops, parent)
+        versions.append(parent)
+
+    # versions after this point all contain every module
+    base = len(versions)
+    current = {}
+    latest = {}
+    for i in xrange(len(versions), n_actions):
+        if (branch_probability > 0.0 and len(versions) > base and
+                rng.random() < branch_probability):
+            parent = versions[rng.randrange(base, len(versions))]
+        module = modules[rng.randrange(len(modules))]
+        function_id, _ = params[module.db_id]
+        if branch_probability > 0.0:
+            old_id = current.get((parent, module.db_id),
+                                 params[module.db_id][1])
+        else:
+            old_id = latest.get(module.db_id, params[module.db_id][1])
+        param = DBParameter(id=_new_id(vistrail, DBParameter.vtType),
+                            pos=0,
+                            name='<no description>',
+                            type='%s:String' % BASIC_PKG,
+                            val=str(i),
+                            alias='')
+        op = DBChange(id=_new_id(vistrail, 'operation'),
+                      what=DBParameter.vtType,
+                      oldObjId=old_id,
+                      newObjId=param.db_id,
+                      parentObjId=function_id,
+                      parentObjType=DBFunction.vtType,
+                      data=param)
+        new_version = _add_action(vistrail, [op], parent)
+        if branch_probability > 0.0:
+            # record the parameters of the new version
+            for m in modules:
+                key = (parent, m.db_id)
+                if key in current:
+                    current[(new_version, m.db_id)] = current[key]
+            current[(new_version, module.db_id)] = param.db_id
+        else:
+            latest[module.db_id] = param.db_id
+        parent = new_version
+        versions.append(parent)
+    return vistrail, versions
+
+def timeit(func, repeat=3):
+    """timeit(func: callable, repeat: int) -> float
+    Returns the best wall-clock time of repeat calls to func.
+
+    """
+    best = None
+    for i in xrange(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
@@ -0,0 +1,106 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks the tabledata join and group-by, comparing the NumPy
+implementations against the dictionary-based ones.
+
+Usage: python tabledata.py [--max-rows N]
+
+"""
+
+from __future__ import division
+
+import argparse
+
+from synthetic import timeit
+
+from vistrails.packages.tabledata.columnar import ColumnarTable
+from vistrails.packages.tabledata.common import get_numpy
+from vistrails.packages.tabledata.operations import AggregatedTable, \
+    JoinedTables
+
+class DictJoinedTables(JoinedTables):
+    use_numpy = False
+
+class DictAggregatedTable(AggregatedTable):
+    use_numpy = False
+
+def make_table(numpy, n_rows, n_keys, seed):
+    """make_table(numpy: module, n_rows: int, n_keys: int, seed: int)
+         -> ColumnarTable
+    Builds a table of string keys and numeric string values."""
+    random = numpy.random.RandomState(seed)
+    # same widths as what the CSV reader would produce
+    keys = random.randint(0, n_keys, n_rows).astype(
+            'S%d' % len(str(n_keys - 1)))
+    values = random.randint(-1000, 1000, n_rows).astype('S5')
+    return ColumnarTable([keys, values], n_rows, ['key', 'value'])
+
+def run(max_rows):
+    numpy = get_numpy()
+    print "%10s %12s %12s %12s %12s" % ('rows', 'join dict', 'join numpy',
+                                        'group dict', 'group numpy')
+    n_rows = 10000
+    while n_rows <= max_rows:
+        left = make_table(numpy, n_rows, n_rows, 1)
+        right = make_table(numpy, n_rows, n_rows, 2)
+
+        def join(cls):
+            def do_join():
+                table = cls(left, right, 0, 0)
+                table.get_column(1)
+                table.get_column(3)
+            return do_join
+
+        def group(cls):
+            def do_group():
+                table = cls(left, 'sum', 1, 0)
+                table.get_column(1)
+            return do_group
+
+        print "%10d %12.4f %12.4f %12.4f %12.4f" % (
+                n_rows,
+                timeit(join(DictJoinedTables), 1),
+                timeit(join(JoinedTables), 1),
+                timeit(group(DictAggregatedTable), 1),
+                timeit(group(AggregatedTable), 1))
+        n_rows *= 10
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-rows', type=int, default=10000000)
+    args = parser.parse_args()
+    run(args.max_rows)
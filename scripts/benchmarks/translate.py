@@ -0,0 +1,179 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks opening a corpus of vistrails saved by older versions of
+VisTrails, comparing translation through every intermediate schema, fused
+translation and the on-disk translation cache.
+
+Files are grouped by the schema version they were saved with. "parse" is
+the time to read their XML, "chain" and "fused" the time to translate them
+on top of that, and "cache" the time to read the cached translations
+instead of doing both. By default the corpus is the vistrails shipped with
+VisTrails.
+
+Usage: python translate.py [--repeat N] [FILE_OR_DIR ...]
+
+"""
+
+from __future__ import division
+
+import argparse
+import os
+import shutil
+import tempfile
+import zipfile
+
+from synthetic import timeit
+
+from vistrails.core.system import vistrails_root_directory
+from vistrails.db.domain import DBVistrail
+from vistrails.db.services.io import get_version_for_xml_file, \
+    open_from_binary, save_to_binary
+from vistrails.db.versions import getVersionDAO, currentVersion, \
+    translate_object
+
+def find_corpus(paths):
+    """find_corpus(paths: list) -> list
+    Returns the .vt and .xml files in paths, walking directories."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                files.extend(os.path.join(dirpath, f)
+                             for f in sorted(filenames)
+                             if f.endswith('.vt') or f.endswith('.xml'))
+        else:
+            files.append(path)
+    return files
+
+def extract_vistrails(files, tmp_dir):
+    """extract_vistrails(files: list, tmp_dir: str) -> dict
+    Returns {version: [xml filename]} for the vistrails of an older schema
+    found in files, extracting them from .vt archives into tmp_dir."""
+    by_version = {}
+    for i, filename in enumerate(files):
+        if filename.endswith('.vt'):
+            try:
+                z = zipfile.ZipFile(filename)
+                try:
+                    data = z.read('vistrail')
+                finally:
+                    z.close()
+            except (zipfile.BadZipfile, KeyError):
+                continue
+            filename = os.path.join(tmp_dir, '%d.xml' % i)
+            with open(filename, 'wb') as f:
+                f.write(data)
+        try:
+            version = get_version_for_xml_file(filename)
+        except Exception:
+            continue
+        with open(filename, 'rb') as f:
+            if '<vistrail' not in f.read(1024):
+                continue
+        if version != currentVersion:
+            by_version.setdefault(version, []).append(filename)
+    return by_version
+
+def version_key(version):
+    return tuple(int(v) for v in version.split('.'))
+
+def run(paths, repeat):
+    if not paths:
+        root_dir = os.path.dirname(vistrails_root_directory())
+        paths = [os.path.join(root_dir, 'examples'),
+                 os.path.join(root_dir, 'contrib'),
+                 os.path.join(root_dir, 'vistrails', 'tests', 'resources')]
+    tmp_dir = tempfile.mkdtemp(prefix='vt_bench_')
+    try:
+        by_version = extract_vistrails(find_corpus(paths), tmp_dir)
+        print "%8s %6s %10s %10s %10s %10s" % (
+                'version', 'files', 'parse (s)', 'chain (s)', 'fused (s)',
+                'cache (s)')
+        totals = [0, 0, 0, 0, 0]
+        for version in sorted(by_version, key=version_key):
+            filenames = by_version[version]
+            daoList = getVersionDAO(version)
+            objs = {}
+            def parse():
+                for filename in filenames:
+                    objs[filename] = daoList.open_from_xml(filename,
+                                                           DBVistrail.vtType)
+            def translate(fuse):
+                for filename in filenames:
+                    vistrail = daoList.open_from_xml(filename,
+                                                     DBVistrail.vtType)
+                    translate_object(vistrail, 'translateVistrail', version,
+                                     fuse=fuse)
+            parse_time = timeit(parse, repeat)
+            chain_time = timeit(lambda: translate(False), repeat) - parse_time
+            fused_time = timeit(lambda: translate(True), repeat) - parse_time
+
+            cache_files = []
+            for i, (filename, vistrail) in enumerate(objs.iteritems()):
+                cache_file = os.path.join(tmp_dir, '%s-%d.bin' % (version, i))
+                vistrail = translate_object(vistrail, 'translateVistrail',
+                                            version)
+                try:
+                    save_to_binary(vistrail, cache_file)
+                except Exception:
+                    # not all translations can be written back
+                    continue
+                cache_files.append(cache_file)
+            def load_cache():
+                for cache_file in cache_files:
+                    open_from_binary(cache_file, DBVistrail.vtType)
+            cache_time = timeit(load_cache, repeat)
+
+            print "%8s %6d %10.3f %10.3f %10.3f %10.3f" % (
+                    version, len(filenames), parse_time, chain_time,
+                    fused_time, cache_time)
+            for i, value in enumerate((len(filenames), parse_time,
+                                       chain_time, fused_time, cache_time)):
+                totals[i] += value
+        print "%8s %6d %10.3f %10.3f %10.3f %10.3f" % tuple(['total'] +
+                                                            totals)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of runs, the best one is reported")
+    parser.add_argument('paths', nargs='*', metavar='FILE_OR_DIR',
+                        help="vistrails to open (default: the examples)")
+    args = parser.parse_args()
+    run(args.paths, args.repeat)
@@ -0,0 +1,199 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Benchmarks query-by-example over a corpus of vistrails, comparing the
+heuristic DAG matching VisualQuery used before with the SubgraphMatcher.
+
+Queries are connected subgraphs of increasing size, without parameters,
+picked at random from the pipelines of the corpus.
+
+Usage: python visual_query.py [--versions N] [--queries Q] [DIRECTORY]
+
+"""
+
+from __future__ import division
+
+import argparse
+import os
+import random
+
+from synthetic import timeit
+
+import vistrails.core.application
+from vistrails.core.db.io import load_vistrail
+from vistrails.core.db.locator import FileLocator
+from vistrails.core.query.subgraph import PipelineIndex, SubgraphMatcher
+from vistrails.core.query.visual import VisualQuery
+from vistrails.core.system import vistrails_root_directory
+from vistrails.core.utils import append_to_dict_of_lists
+from vistrails.core.vistrail.module import Module
+from vistrails.core.vistrail.pipeline import Pipeline
+
+def load_corpus(directory, n_versions):
+    """load_corpus(directory: str, n_versions: int) -> list of Pipeline
+    Materializes up to n_versions pipelines from each vistrail."""
+    pipelines = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.vt'):
+            continue
+        try:
+            vistrail = load_vistrail(
+                    FileLocator(os.path.join(directory, filename)))[0]
+        except Exception:
+            continue
+        versions = sorted(vistrail.actionMap)[-n_versions:]
+        for version in versions:
+            try:
+                pipeline = vistrail.getPipeline(version)
+            except Exception:
+                continue
+            if pipeline.modules:
+                pipelines.append(pipeline)
+    return pipelines
+
+def make_query(pipeline, size, rng):
+    """make_query(pipeline: Pipeline, size: int, rng: Random) -> Pipeline
+    Picks a connected subgraph of the pipeline, dropping the parameters."""
+    graph = pipeline.graph
+    selected = [rng.choice(pipeline.modules.keys())]
+    while len(selected) < size:
+        frontier = set()
+        for module_id in selected:
+            frontier.update(m for m, _ in graph.edges_from(module_id))
+            frontier.update(m for m, _ in graph.edges_to(module_id))
+        frontier.difference_update(selected)
+        if not frontier:
+            return None
+        selected.append(rng.choice(sorted(frontier)))
+    selected = set(selected)
+    modules = []
+    for module_id in selected:
+        module = pipeline.modules[module_id]
+        modules.append(Module(id=module.id, name=module.name,
+                              package=module.package,
+                              namespace=module.namespace))
+    connections = [c.do_copy() for c in pipeline.connections.itervalues()
+                   if c.source.moduleId in selected and
+                   c.destination.moduleId in selected]
+    return Pipeline(modules=modules, connections=connections)
+
+def heuristic_matches(query, p):
+    """The matching loop VisualQuery.run used before SubgraphMatcher."""
+    matches = set()
+    queryModuleNameIndex = {}
+    for moduleId, module in p.modules.iteritems():
+        append_to_dict_of_lists(queryModuleNameIndex, module.name, moduleId)
+    for querySourceId in query.queryPipeline.graph.sources():
+        querySourceName = query.queryPipeline.modules[querySourceId].name
+        if querySourceName not in queryModuleNameIndex:
+            matches = set()
+            continue
+        candidates = queryModuleNameIndex[querySourceName]
+        atLeastOneMatch = False
+        for candidateSourceId in candidates:
+            querySource = query.queryPipeline.modules[querySourceId]
+            candidateSource = p.modules[candidateSourceId]
+            if not query.matchQueryModule(candidateSource, querySource):
+                continue
+            (match, targetIds) = query.heuristicDAGIsomorphism(
+                    template=query.queryPipeline, target=p,
+                    template_ids=[querySourceId],
+                    target_ids=[candidateSourceId])
+            if match:
+                atLeastOneMatch = True
+                matches.update(targetIds)
+        if not atLeastOneMatch:
+            matches = set()
+            break
+    return matches
+
+def run(directory, n_versions, n_queries):
+    pipelines = load_corpus(directory, n_versions)
+    print "%d pipelines, %d modules" % (
+            len(pipelines), sum(len(p.modules) for p in pipelines))
+    rng = random.Random(4)
+    print "%6s %8s %14s %14s %10s %10s" % ('size', 'queries', 'heuristic (s)',
+                                           'subgraph (s)', 'heuristic',
+                                           'subgraph')
+    for size in (2, 4, 6, 10, 12):
+        queries = []
+        candidates = [p for p in pipelines if len(p.modules) >= size]
+        for i in xrange(n_queries * 10):
+            if len(queries) == n_queries or not candidates:
+                break
+            query = make_query(rng.choice(candidates), size, rng)
+            if query is not None:
+                queries.append(query)
+        if not queries:
+            continue
+        visual_queries = [VisualQuery(q, None) for q in queries]
+        matchers = [SubgraphMatcher(q, vq.matchQueryModule)
+                    for q, vq in zip(queries, visual_queries)]
+        counts = {}
+
+        def heuristic():
+            counts['heuristic'] = sum(len(heuristic_matches(vq, p))
+                                      for vq in visual_queries
+                                      for p in pipelines)
+
+        def subgraph():
+            total = 0
+            for p in pipelines:
+                target = PipelineIndex(p)
+                for matcher in matchers:
+                    total += len(matcher.matched_modules(p, target))
+            counts['subgraph'] = total
+
+        print "%6d %8d %14.4f %14.4f %10d %10d" % (
+                size, len(queries), timeit(heuristic), timeit(subgraph),
+                counts['heuristic'], counts['subgraph'])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--versions', type=int, default=50,
+                        help="number of versions to load from each vistrail")
+    parser.add_argument('--queries', type=int, default=20,
+                        help="number of queries of each size")
+    parser.add_argument('directory', nargs='?',
+                        default=os.path.join(vistrails_root_directory(),
+                                             '..', 'examples'))
+    args = parser.parse_args()
+    app = vistrails.core.application.init(
+            options_dict={'installBundles': False})
+    try:
+        run(args.directory, args.versions, args.queries)
+    finally:
+        app.finishSession()
@@ -471,7 +471,7 @@ class Pipeline(object):
                         conn = create_connection(id_scope,
                                                  constant_mod, 'value',
                                                  module, 'ExternalPipe')
-                        pipeline.db_add_connection(conn)
+                        pipeline.add_connection(conn)
                     else:
                         raise RuntimeError("TODO : create tuple")
 
@@ -0,0 +1,431 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Persistent cache of file content digests.
+
+Digests are checked against the stat signature of the file (device, inode,
+size, modification time), so an unchanged file is never read twice, while
+a touched file with the same contents still gets the same digest.
+
+"""
+
+from __future__ import division
+
+import marshal
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from vistrails.core import debug
+
+import unittest
+
+try:
+    import hashlib
+    sha_hash = hashlib.sha1
+except ImportError:
+    import sha
+    sha_hash = sha.new
+
+
+def sha1_file(path, chunk_size=1<<16):
+    """sha1_file(path: str, chunk_size: int) -> str
+    Returns the SHA-1 digest of the contents of path.
+
+    """
+    hasher = sha_hash()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+class FileDigestCache(object):
+    """Maps (digest name, device, inode) to the digest of a file.
+
+    Each entry also holds the size and mtime_ns of the file when it was
+    hashed, and is replaced when the file changes. At most max_entries are
+    kept, the ones added first are dropped.
+
+    If filename is set, entries are loaded from it and save() writes them
+    back, merged with the entries other processes wrote in the meantime
+    unless clear() was called. Entries are only written when save() is
+    called, so callers hashing many files should save once when done.
+
+    """
+    # files modified this recently (in seconds) are not cached, as they
+    # could be written again without their mtime changing
+    RACY_DELAY = 2
+
+    # version of the file format, files written by other versions are
+    # discarded
+    FORMAT = 2
+
+    def __init__(self, filename=None, max_entries=100000):
+        self.filename = filename
+        self.max_entries = max_entries
+        self.reads = 0
+        # (name, device, inode) -> (size, mtime_ns, digest, time added)
+        self._digests = {}
+        self._dirty = False
+        self._cleared = False
+        # stat of filename when it was last read or written
+        self._file_stat = None
+        self._lock = threading.RLock()
+        if filename is not None:
+            self.load()
+
+    @staticmethod
+    def stat_key(path, st):
+        # os.stat() doesn't give inodes on Windows under Python 2, use the
+        # path instead; it also only gives the mtime as a float
+        inode = st.st_ino or os.path.abspath(path)
+        return (st.st_dev, inode, st.st_size,
+                int(round(st.st_mtime * 1e9)))
+
+    def _stat_file(self):
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime)
+
+    def _read(self):
+        try:
+            with open(self.filename, 'rb') as fp:
+                data = marshal.load(fp)
+        except IOError:
+            return {}
+        except (EOFError, ValueError, TypeError), e:
+            debug.warning("Discarding unreadable digest cache %s" %
+                          self.filename, e)
+            return {}
+        if (isinstance(data, tuple) and len(data) == 2 and
+                data[0] == self.FORMAT and isinstance(data[1], dict)):
+            return data[1]
+        return {}
+
+    def load(self):
+        with self._lock:
+            self._file_stat = self._stat_file()
+            for key, entry in self._read().iteritems():
+                current = self._digests.get(key)
+                if current is None or current[3] < entry[3]:
+                    self._digests[key] = entry
+
+    def _evict(self):
+        extra = len(self._digests) - self.max_entries
+        if extra > 0:
+            oldest = sorted(self._digests.iteritems(),
+                            key=lambda item: item[1][3])[:extra]
+            for key, entry in oldest:
+                del self._digests[key]
+
+    def save(self):
+        """save() -> None
+        Writes the entries to filename if they changed.
+
+        """
+        if self.filename is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            # another process may have saved since we loaded; keep its
+            # entries instead of overwriting them with ours only
+            if not self._cleared and self._stat_file() != self._file_stat:
+                self.load()
+            self._evict()
+            dirname = os.path.dirname(self.filename)
+            try:
+                if dirname and not os.path.isdir(dirname):
+                    os.makedirs(dirname)
+                fd, tmp_name = tempfile.mkstemp(dir=dirname or None,
+                                                suffix='.tmp')
+                with os.fdopen(fd, 'wb') as fp:
+                    marshal.dump((self.FORMAT, self._digests), fp)
+                if os.path.exists(self.filename):
+                    os.remove(self.filename)
+                os.rename(tmp_name, self.filename)
+            except (IOError, OSError), e:
+                debug.warning("Cannot write digest cache %s" %
+                              self.filename, e)
+                return
+            self._file_stat = self._stat_file()
+            self._dirty = self._cleared = False
+
+    def clear(self):
+        """clear() -> None
+        Removes all the entries, including the saved ones on the next
+        save().
+
+        """
+        with self._lock:
+            self._digests = {}
+            self._dirty = self._cleared = True
+
+    def __len__(self):
+        return len(self._digests)
+
+    def file_digest(self, path, name='sha1', digest_func=sha1_file):
+        """file_digest(path: str, name: str, digest_func: callable) -> str
+        Returns digest_func(path), only calling it if the file changed
+        since the digest called name was last computed.
+
+        """
+        st = os.stat(path)
+        device, inode, size, mtime_ns = self.stat_key(path, st)
+        key = (name, device, inode)
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry is not None and entry[:2] == (size, mtime_ns):
+                return entry[2]
+        digest = digest_func(path)
+        with self._lock:
+            self.reads += 1
+            now = time.time()
+            if now - st.st_mtime >= self.RACY_DELAY:
+                self._digests[key] = (size, mtime_ns, digest, now)
+                self._dirty = True
+        return digest
+
+    def directory_digest(self, path):
+        """directory_digest(path: str) -> str
+        Returns a digest of the names and contents of everything under
+        path.
+
+        """
+        hasher = sha_hash()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            relroot = os.path.relpath(root, path)
+            for name in dirs:
+                hasher.update('d %s\0' % os.path.join(relroot, name))
+            for name in sorted(files):
+                filename = os.path.join(root, name)
+                hasher.update('f %s\0' % os.path.join(relroot, name))
+                try:
+                    hasher.update(self.file_digest(filename))
+                except (IOError, OSError):
+                    # dangling link or unreadable file
+                    hasher.update('\0')
+        return hasher.digest()
+
+    def path_digest(self, path):
+        """path_digest(path: str) -> str
+        Returns the digest of a file or directory.
+
+        """
+        if os.path.isdir(path):
+            return self.directory_digest(path)
+        return self.file_digest(path)
+
+
+_file_digest_cache = None
+_file_digest_cache_lock = threading.Lock()
+
+def get_file_digest_cache():
+    """get_file_digest_cache() -> FileDigestCache
+    Returns the shared digest cache, stored in the file set by the
+    fileDigestCache configuration option.
+
+    """
+    global _file_digest_cache
+    from vistrails.core.configuration import get_vistrails_configuration
+    import vistrails.core.system
+    conf = get_vistrails_configuration()
+    filename = None
+    if conf is not None:
+        filename = vistrails.core.system.get_vistrails_directory(
+                'fileDigestCache', conf)
+    with _file_digest_cache_lock:
+        if (_file_digest_cache is None or
+                _file_digest_cache.filename != filename):
+            if _file_digest_cache is not None:
+                _file_digest_cache.save()
+            _file_digest_cache = FileDigestCache(filename)
+        return _file_digest_cache
+
+def save_file_digest_cache():
+    """save_file_digest_cache() -> None
+    Writes the new entries of the shared digest cache, if it was used.
+
+    """
+    cache = _file_digest_cache
+    if cache is not None:
+        cache.save()
+
+
+class TestFileDigestCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='vt_digests_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, contents, mtime=None):
+        path = os.path.join(self.directory, name)
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with open(path, 'wb') as fp:
+            fp.write(contents)
+        if mtime is None:
+            mtime = time.time() - 60
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_unchanged(self):
+        cache = FileDigestCache()
+        path = self.write('a.txt', 'some contents')
+        digest = cache.file_digest(path)
+        self.assertEqual(digest, sha_hash('some contents').digest())
+        self.assertEqual(cache.file_digest(path), digest)
+        self.assertEqual(cache.reads, 1)
+
+        # touched and copied files are read again but give the same digest
+        os.utime(path, (time.time() - 30, time.time() - 30))
+        self.assertEqual(cache.file_digest(path), digest)
+        other = self.write('b.txt', 'some contents')
+        self.assertEqual(cache.file_digest(other), digest)
+        self.assertEqual(cache.reads, 3)
+
+        # recently modified files are not cached
+        recent = self.write('c.txt', 'new contents', time.time())
+        cache.file_digest(recent)
+        cache.file_digest(recent)
+        self.assertEqual(cache.reads, 5)
+
+    def test_persistent(self):
+        filename = os.path.join(self.directory, 'cache', 'digests')
+        path = self.write('a.txt', 'some contents')
+        cache = FileDigestCache(filename)
+        digest = cache.path_digest(path)
+        self.assertFalse(os.path.exists(filename))
+        cache.save()
+        self.assertTrue(os.path.isfile(filename))
+        cache = FileDigestCache(filename)
+        self.assertEqual(cache.path_digest(path), digest)
+        self.assertEqual(cache.reads, 0)
+
+    def test_merge(self):
+        filename = os.path.join(self.directory, 'digests')
+        a = self.write('a.txt', 'a')
+        b = self.write('b.txt', 'b')
+        cache1 = FileDigestCache(filename)
+        cache2 = FileDigestCache(filename)
+        cache1.file_digest(a)
+        cache2.file_digest(b)
+        cache1.save()
+        cache2.save()
+        cache = FileDigestCache(filename)
+        self.assertEqual(len(cache), 2)
+        cache.file_digest(a)
+        cache.file_digest(b)
+        self.assertEqual(cache.reads, 0)
+
+    def test_threads(self):
+        paths = [self.write('%d.txt' % i, str(i)) for i in xrange(20)]
+        cache = FileDigestCache(os.path.join(self.directory, 'digests'))
+        def hash_all():
+            for path in paths:
+                cache.file_digest(path)
+            cache.save()
+        threads = [threading.Thread(target=hash_all) for i in xrange(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(cache), 20)
+        self.assertEqual(len(FileDigestCache(cache.filename)), 20)
+
+    def test_directory(self):
+        cache = FileDigestCache()
+        root = os.path.join(self.directory, 'root')
+        self.write('root/a.txt', 'a')
+        self.write('root/sub/b.txt', 'b')
+        digest = cache.directory_digest(root)
+        self.assertEqual(cache.directory_digest(root), digest)
+        self.assertEqual(cache.reads, 2)
+        self.write('root/sub/b.txt', 'c', time.time() - 30)
+        self.assertNotEqual(cache.directory_digest(root), digest)
+        self.write('root/sub/b.txt', 'b', time.time() - 20)
+        self.assertEqual(cache.directory_digest(root), digest)
+        os.rename(os.path.join(root, 'sub', 'b.txt'),
+                  os.path.join(root, 'sub', 'd.txt'))
+        self.assertNotEqual(cache.directory_digest(root), digest)
+
+    def test_stale_entries(self):
+        cache = FileDigestCache(max_entries=2)
+        path = self.write('a.txt', 'a')
+        cache.file_digest(path)
+        self.write('a.txt', 'b', time.time() - 30)
+        self.assertEqual(cache.file_digest(path), sha_hash('b').digest())
+        self.assertEqual(len(cache), 1)
+        for name in ('b.txt', 'c.txt'):
+            cache.file_digest(self.write(name, name))
+        self.assertEqual(len(cache), 3)
+        cache._evict()
+        self.assertEqual(len(cache), 2)
+        cache.file_digest(path)
+        self.assertEqual(cache.reads, 5)
+
+    def test_save(self):
+        filename = os.path.join(self.directory, 'digests')
+        cache = FileDigestCache(filename)
+        reads = []
+        read = cache._read
+        def counting_read():
+            reads.append(1)
+            return read()
+        cache._read = counting_read
+        cache.file_digest(self.write('a.txt', 'a'))
+        cache.save()
+        cache.file_digest(self.write('b.txt', 'b'))
+        cache.save()
+        # the file only written by this cache is not read again
+        self.assertEqual(reads, [])
+        self.assertEqual(len(FileDigestCache(filename)), 2)
+
+        other = FileDigestCache(filename)
+        other.file_digest(self.write('c.txt', 'c'))
+        other.save()
+        cache.clear()
+        cache.save()
+        self.assertEqual(reads, [])
+        self.assertEqual(len(FileDigestCache(filename)), 0)
@@ -63,7 +63,11 @@ _simple_documentation = """
 autoConnect: Automatically connect dragged in modules
 autoSave: Automatically save backup vistrails every two minutes
 batch: Run in batch mode instead of interactive mode
+binaryCache: Save a binary copy of the vistrail in .vt files to open them faster
 cache: Cache previous results so they may be used in future computations
+cacheMaxModules: Maximum number of modules kept in the execution cache
+cacheMaxSize: Maximum estimated size (MB) of the execution cache
+cachePolicy: Eviction policy for the execution cache (lru or cost)
 customVersionColors: Allow setting custom colors for versions
 dataDir: Default data directory
 db: The name for the database to load the vistrail from
@@ -71,11 +75,17 @@ dbDefault: Save vistrails in a database by default
 debugLevel: How much information should VisTrails log
 defaultFileType: Default file type/extension for vistrails (.vt or .xml)
 detachHistoryView: Show the version tree in a separate window
+diskCache: Store module results on disk so they can be reused across sessions
+diskCacheDir: Directory for the persistent result cache
+diskCacheSize: Maximum size (MB) of the persistent result cache
 dotVistrails: User configuration directory
 enablePackagesSilently: Automatically enable packages when needed
 errorLog: Write errors to a log file
 NoExecute: Do not execute specified workflows
 executionLog: Track execution provenance when running workflows
+executionThreads: Number of threads running thread-safe modules concurrently
+explorationWorkers: Number of processes running parameter exploration cells
+fileDigestCache: File storing the content digests of File and Directory values
 fileDir: Default vistrail directory
 fixedCustomVersionColorSaturation: Don't vary custom color with age
 fixedSpreadsheetCells: Draw spreadsheet cells at a fixed size
@@ -92,6 +102,9 @@ jobList: List running workflows
 jobInfo: List jobs in running workflow
 loadPackages: Whether to load the packages enabled in the configuration file
 logDir: Log files directory
+loopLogging: How loop iterations are logged (full, sampled, aggregated)
+loopLogSample: With sampled loop logging, also log every Nth iteration
+loopWorkers: Number of threads or processes running loop iterations
 maxRecentVistrails: Number of recent vistrails
 maximizeWindows: VisTrails windows should be maximized
 migrateTags: Move tags to upgraded versions
@@ -102,6 +115,7 @@ outputPipelineGraph: Output the workflow graph as an image
 outputVersionTree: Output the version tree as an image
 parameterExploration: Run parameter exploration instead of workflow
 parameters: List of parameters to use when running workflow
+pathSignature: How File and Directory values are signed for caching (mtime or content)
 port: The port for the database to load the vistrail from
 reportUsage: Report anonymous usage statistics to the developers
 enableUsage: Enable sending anonymous usage statistics
@@ -109,7 +123,10 @@ disableUsage: Disable sending anonymous usage statistics
 repositoryHTTPURL: Remote package repository URL
 repositoryLocalPath: Local package repository directory
 rootDirectory: Directory that contains the VisTrails source code
+rpcCachePipelines: Number of pipelines the XML RPC server keeps in memory
+rpcCacheVistrails: Number of vistrails the XML RPC server keeps in memory
 rpcConfig: Config file for server connection options
+rpcDispatchTimeout: Seconds to wait for requests forwarded to other instances
 rpcInstances: Number of other instances that vistrails should start
 rpcLogFile: Log file for XML RPC server
 rpcPort: Port where this xml rpc server will work
@@ -137,6 +154,8 @@ thumbs.cacheDir: Thumbnail cache directory
 thumbs.cacheSize: Thumbnail cache size (MB)
 thumbs.mouseHover: Show thumbnails when mouse is hovering above a version
 thumbs.tagsOnly: Store thumbnails only for tagged versions
+translationCache: Cache translations of files from older VisTrails versions
+translationCacheDir: Directory for the translation cache
 upgradeDelay: Persist upgrade only after other changes
 upgradeModuleFailPrompt: Alert when a subworkflow upgrade fails
 upgrades: Attempt to automatically upgrade old workflows
@@ -162,10 +181,37 @@ batch: Boolean
 
     Run vistrails in batch mode instead of interactive mode.
 
+binaryCache: Boolean
+
+    When saving a .vt file, also store a binary copy of the vistrail
+    next to its XML. When opening a .vt file, read its binary copy,
+    which is much faster than parsing the XML, as long as it is tagged
+    with the XML it was made from. The copy itself is not checked
+    against the XML, so only enable this for files you trust; binary
+    copies are ignored while it is off. VisTrails versions that do not know this format
+    refuse to open such files.
+
 cache: Boolean
 
     Cache previous results so they may be used in future computations.
 
+cacheMaxModules: Integer
+
+    Maximum number of modules kept in the execution cache. Modules are
+    evicted (along with the modules that depend on them) once this number
+    is exceeded. 0 means no limit.
+
+cacheMaxSize: Integer
+
+    Maximum estimated size (in MB) of the outputs kept in the execution
+    cache. 0 means no limit.
+
+cachePolicy: String
+
+    Eviction policy for the execution cache: 'lru' evicts the least recently
+    used modules first, 'cost' also weighs the compute time of a module
+    against the size of its outputs.
+
 customVersionColors: Boolean
 
     Allow setting custom colors for versions, and display these colors in the
@@ -197,6 +243,21 @@ detachHistoryView: Boolean
 
     Show the version tree in a separate window.
 
+diskCache: Boolean
+
+    Store the outputs of cacheable modules on disk, keyed by the signature
+    of their upstream subpipeline, so that later sessions (including batch
+    runs and server restarts) can reuse them instead of recomputing.
+
+diskCacheDir: Path
+
+    The directory used by the persistent result cache.
+
+diskCacheSize: Integer
+
+    The maximum size (in MB) of the persistent result cache. Least recently
+    used results are removed first. 0 means no limit.
+
 dotVistrails: Path
 
     The location to look for VisTrails user configurations and
@@ -219,6 +280,28 @@ executionLog: Boolean
 
     Track execution provenance when running workflows.
 
+executionThreads: Integer
+
+    Number of worker threads used to run modules that declare themselves
+    thread-safe concurrently, as soon as the modules they depend on are
+    done. 0 disables concurrent execution and runs every module on the
+    main thread.
+
+explorationWorkers: Integer
+
+    Number of worker processes used to execute the cells of a parameter
+    exploration when its results are not shown in the spreadsheet. Cells
+    that only differ in the innermost dimension are sent to the same
+    worker, so that their common upstream modules are only computed once.
+    0 executes every cell in the VisTrails process.
+
+fileDigestCache: Path
+
+    The file in which the content digests used by the 'content' path
+    signature are kept, keyed by device, inode, size and modification
+    time so that unchanged files are not read again. It can be removed
+    at any time.
+
 fileDir: Path
 
     The location that VisTrails uses as a default directory for
@@ -290,6 +373,29 @@ logger: ConfigurationObject
 
     *Deprecated*
 
+loopLogging: String
+
+    How the iterations of loops (implicit list loops, While, Map, Fold)
+    are recorded in the execution log. 'full' logs every iteration.
+    'sampled' only logs the first and last iterations, the ones that
+    failed, and every Nth (see loopLogSample). 'aggregated' logs none of
+    them. In both cases, a summary with the number of iterations, their
+    durations and a histogram of the errors is added to the execution of
+    the looping module, as a 'loop_summary' annotation.
+
+loopLogSample: Integer
+
+    With sampled loop logging, also log every Nth iteration. 0 only
+    keeps the first, last and failed iterations.
+
+loopWorkers: Integer
+
+    Number of worker threads or processes used to compute the iterations
+    of a module that receives a list on a port expecting a single value.
+    Modules that declare themselves thread-safe run on threads, modules
+    that declare themselves process-safe run on processes. 0 disables
+    parallel loops and runs every iteration on the main thread.
+
 maximizeWindows: Boolean
 
     Whether the VisTrails windows should take up the entire screen space.
@@ -355,6 +461,14 @@ parameters: String
 
     List of parameters to use when running workflow.
 
+pathSignature: String
+
+    How File and Directory values are signed for the execution cache:
+    'mtime' uses the path and its modification time (in seconds), while
+    'content' uses a digest of the contents only. With 'content',
+    touching a file does not invalidate cached results, and files with
+    the same contents at different paths share them.
+
 port: Integer
 
     The port for the database to load the vistrail from.
@@ -395,10 +509,26 @@ rootDirectory: Path
 
     Directory that contains the VisTrails source code.
 
+rpcCachePipelines: Integer
+
+    Maximum number of materialized pipelines the XML RPC server keeps in
+    memory across all cached vistrails. 0 disables pipeline caching.
+
+rpcCacheVistrails: Integer
+
+    Maximum number of vistrails loaded from databases that the XML RPC
+    server keeps in memory. Cached vistrails are reloaded when their
+    modification time in the database changes. 0 disables the cache.
+
 rpcConfig: String
 
     Config file for server connection options.
 
+rpcDispatchTimeout: Integer
+
+    Number of seconds the XML RPC server waits for a request it forwarded
+    to one of its other instances before giving up. 0 waits forever.
+
 rpcInstances: Integer
 
     Number of other instances that vistrails should start.
@@ -533,6 +663,18 @@ thumbs.tagsOnly: Boolean
     If True, only stores thumbnails for tagged versions. Otherwise,
     stores thumbnails for all versions.
 
+translationCache: Boolean
+
+    Keep a binary copy of vistrails, workflows and logs that were
+    translated from an older schema, keyed by the contents of the
+    original file and by the VisTrails version, so that opening the
+    same file again skips the translation.
+
+translationCacheDir: Path
+
+    The directory used by the translation cache. It can be removed at
+    any time.
+
 upgradeDelay: Boolean
 
     Persist upgrade only after other changes.
@@ -683,6 +825,9 @@ base_config = {
      ConfigField('rpcLogFile', os.path.join(system.vistrails_root_directory(),
                        'rpcserver.log'), ConfigPath, ConfigType.COMMAND_LINE),
      ConfigField('rpcInstances', 0, int, ConfigType.COMMAND_LINE),
+     ConfigField('rpcCacheVistrails', 16, int),
+     ConfigField('rpcCachePipelines', 256, int),
+     ConfigField('rpcDispatchTimeout', 600, int),
      ConfigField('multithread', None, bool, ConfigType.COMMAND_LINE_FLAG),
      ConfigField('rpcConfig', os.path.join(system.vistrails_root_directory(),
                       'server.cfg'), ConfigPath, ConfigType.COMMAND_LINE)],
@@ -690,9 +835,32 @@ base_config = {
     [ConfigField('autoSave', True, bool, ConfigType.ON_OFF),
      ConfigField('dbDefault', False, bool, ConfigType.ON_OFF),
      ConfigField('cache', True, bool, ConfigType.ON_OFF),
+     ConfigField('cacheMaxModules', 0, int),
+     ConfigField('cacheMaxSize', 0, int),
+     ConfigField('cachePolicy', 'lru', str, widget_type="combo",
+                 widget_options={"allowed_values": ["lru", "cost"],
+                                 "label": "Cache eviction policy"}),
+     ConfigField('diskCache', False, bool, ConfigType.ON_OFF),
+     ConfigField('diskCacheDir', "resultcache", ConfigPath),
+     ConfigField('diskCacheSize', 1024, int),
+     ConfigField('executionThreads', 0, int),
+     ConfigField('explorationWorkers', 0, int),
+     ConfigField('loopWorkers', 0, int),
+     ConfigField('loopLogging', 'full', str, widget_type="combo",
+                 widget_options={"allowed_values": ["full", "sampled",
+                                                    "aggregated"],
+                                 "label": "Loop logging"}),
+     ConfigField('loopLogSample', 100, int),
      ConfigField('stopOnError', True, bool, ConfigType.ON_OFF),
      ConfigField('executionLog', True, bool, ConfigType.ON_OFF),
      ConfigField('errorLog', True, bool, ConfigType.ON_OFF),
+     ConfigField('binaryCache', False, bool, ConfigType.ON_OFF),
+     ConfigField('translationCache', False, bool, ConfigType.ON_OFF),
+     ConfigField('translationCacheDir', "translations", ConfigPath),
+     ConfigField('pathSignature', 'mtime', str, widget_type="combo",
+                 widget_options={"allowed_values": ["mtime", "content"],
+                                 "label": "File signatures"}),
+     ConfigField('fileDigestCache', "file_digests", ConfigPath),
      ConfigField('defaultFileType', system.vistrails_default_file_type(), str,
                  widget_type="combo",
                  widget_options={"allowed_values": [".vt", ".xml"],
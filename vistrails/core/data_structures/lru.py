@@ -0,0 +1,143 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Mapping keeping its keys in the order they were last set, to implement
+bounded least-recently-used stores without collections.OrderedDict,
+which Python 2.6 lacks."""
+
+from __future__ import division
+
+import unittest
+
+_marker = object()
+
+class LRUDict(object):
+    """Dictionary that remembers the order in which its keys were last set.
+
+    Setting a key, even an existing one, makes it the most recent; reading
+    does not change the order. Iteration goes from the least to the most
+    recent key, and popitem(last=False) removes the least recent one.
+
+    The order is kept in a list, so updates are linear in the number of
+    keys; this is meant for small bounded caches.
+
+    """
+    def __init__(self):
+        self._values = {}
+        self._order = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key in self._values:
+            self._order.remove(key)
+        self._values[key] = value
+        self._order.append(key)
+
+    def __delitem__(self, key):
+        del self._values[key]
+        self._order.remove(key)
+
+    def pop(self, key, default=_marker):
+        if key not in self._values:
+            if default is _marker:
+                raise KeyError(key)
+            return default
+        self._order.remove(key)
+        return self._values.pop(key)
+
+    def popitem(self, last=True):
+        if not self._order:
+            raise KeyError('popitem(): dictionary is empty')
+        if last:
+            key = self._order.pop()
+        else:
+            key = self._order.pop(0)
+        return key, self._values.pop(key)
+
+    def keys(self):
+        return list(self._order)
+
+    def clear(self):
+        self._values.clear()
+        del self._order[:]
+
+##############################################################################
+
+class TestLRUDict(unittest.TestCase):
+    def test_order(self):
+        d = LRUDict()
+        for i in xrange(4):
+            d[i] = str(i)
+        self.assertEqual(d.keys(), [0, 1, 2, 3])
+        d[1] = 'one'
+        self.assertEqual(d[1], 'one')
+        self.assertEqual(d.get(0), '0')
+        self.assertEqual(list(d), [0, 2, 3, 1])
+        self.assertEqual(d.popitem(last=False), (0, '0'))
+        self.assertEqual(d.popitem(), (1, 'one'))
+        self.assertEqual(len(d), 2)
+
+    def test_remove(self):
+        d = LRUDict()
+        d['a'] = 1
+        d['b'] = 2
+        self.assertEqual(d.pop('a'), 1)
+        self.assertEqual(d.pop('a', None), None)
+        self.assertRaises(KeyError, d.pop, 'a')
+        del d['b']
+        self.assertNotIn('b', d)
+        self.assertRaises(KeyError, d.popitem)
+        d['c'] = 3
+        d.clear()
+        self.assertEqual((len(d), d.keys()), (0, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
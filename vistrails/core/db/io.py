@@ -80,7 +80,7 @@ def load_vistrail(locator, is_abstraction=False):
             vistrail = res.vistrail
             abstraction_files.extend(res.abstractions)
             thumbnail_files.extend(res.thumbnails)
-            mashups.extend(res.mashups)
+            mashups = res.mashups
         else:
             vistrail = res
     vistrail.is_abstraction = is_abstraction
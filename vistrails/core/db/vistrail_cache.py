@@ -0,0 +1,435 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Cache of vistrails and pipelines loaded from databases.
+
+The XML-RPC server answers most requests by loading a vistrail from the
+database and materializing one of its versions. :class:`VistrailCache`
+keeps recently used vistrails and pipelines in memory so repeated
+requests only cost a modification time query. An entry is reloaded when
+the modification time stored in the database changes.
+
+"""
+from __future__ import division
+
+import os
+import threading
+import time
+import unittest
+
+from vistrails.core.data_structures.lru import LRUDict
+
+
+class VistrailCache(object):
+    """Bounded, thread-safe LRU cache of vistrails and their pipelines.
+
+    Vistrails are keyed by (host, port, database, object id) and are
+    checked against ``locator.get_db_modification_time()`` on every
+    access. Pipelines are keyed by vistrail and version and are dropped
+    when the vistrail they were materialized from is reloaded.
+
+    Cached objects are shared between requests and must not be modified.
+    Pipelines are materialized and vistrails serialized while holding the
+    lock of the vistrail's entry, since they read and update state of
+    the vistrail that is not thread-safe.
+
+    """
+    def __init__(self, max_vistrails=16, max_pipelines=256):
+        self.max_vistrails = max_vistrails
+        self.max_pipelines = max_pipelines
+        self._lock = threading.Lock()
+        # key -> _Entry, least recently used first
+        self._entries = LRUDict()
+        # (key, version) -> (vistrail, pipeline), least recently used first
+        self._pipelines = LRUDict()
+        self._stats = dict.fromkeys(['hits', 'misses', 'invalidations',
+                                     'evictions', 'pipeline_hits',
+                                     'pipeline_misses'], 0)
+
+    class _Entry(object):
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.vistrail = None
+            self.timestamp = None
+            self.xml = None
+
+    @staticmethod
+    def key(locator):
+        return (locator.host, locator.port, locator.db,
+                long(locator.obj_id))
+
+    def _load(self, locator):
+        from vistrails.core.db.io import load_vistrail
+        return load_vistrail(locator)[0]
+
+    def get_vistrail(self, locator):
+        """get_vistrail(locator: DBLocator) -> Vistrail
+
+        Returns the vistrail stored at locator, loading it if it is not
+        cached or if it changed in the database since it was loaded.
+
+        """
+        if self.max_vistrails <= 0:
+            return self._load(locator)
+        return self._get_entry(locator).vistrail
+
+    def _get_entry(self, locator):
+        key = self.key(locator)
+        timestamp = locator.get_db_modification_time()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                entry = self._Entry()
+            self._entries[key] = entry
+
+        # Loading holds the entry lock only, so that concurrent requests
+        # for the same vistrail wait for a single load while requests for
+        # other vistrails go through
+        with entry.lock:
+            if entry.vistrail is not None and entry.timestamp == timestamp:
+                with self._lock:
+                    self._stats['hits'] += 1
+                return entry
+            vistrail = self._load(locator)
+            with self._lock:
+                if entry.vistrail is not None:
+                    self._stats['invalidations'] += 1
+                    self._drop_pipelines(key)
+                else:
+                    self._stats['misses'] += 1
+                entry.vistrail = vistrail
+                entry.timestamp = timestamp
+                entry.xml = None
+                self._evict()
+        return entry
+
+    def get_pipeline(self, locator, version):
+        """get_pipeline(locator: DBLocator, version: int) -> Pipeline
+
+        Returns the pipeline for version in the vistrail stored at
+        locator, materializing it if it is not cached. The pipeline is
+        shared with other callers, it must not be modified.
+
+        """
+        version = long(version)
+        if self.max_vistrails <= 0:
+            return self._load(locator).getPipeline(version)
+        entry = self._get_entry(locator)
+        pkey = (self.key(locator), version)
+        with entry.lock:
+            vistrail = entry.vistrail
+            if self.max_pipelines <= 0:
+                return vistrail.getPipeline(version)
+            with self._lock:
+                cached = self._pipelines.pop(pkey, None)
+                if cached is not None and cached[0] is vistrail:
+                    self._pipelines[pkey] = cached
+                    self._stats['pipeline_hits'] += 1
+                    return cached[1]
+                self._stats['pipeline_misses'] += 1
+
+            # Materialized holding the entry lock only: requests for other
+            # vistrails go through, and the vistrail isn't reloaded
+            # meanwhile
+            pipeline = vistrail.getPipeline(version)
+            with self._lock:
+                self._pipelines[pkey] = (vistrail, pipeline)
+                while len(self._pipelines) > self.max_pipelines:
+                    self._pipelines.popitem(last=False)
+        return pipeline
+
+    def get_vistrail_xml(self, locator):
+        """get_vistrail_xml(locator: DBLocator) -> str
+
+        Returns the vistrail stored at locator, serialized to XML.
+
+        """
+        from vistrails.core.db.io import serialize
+        if self.max_vistrails <= 0:
+            return serialize(self._load(locator))
+        entry = self._get_entry(locator)
+        with entry.lock:
+            if entry.xml is None:
+                entry.xml = serialize(entry.vistrail)
+            return entry.xml
+
+    def _drop_pipelines(self, key):
+        for pkey in [k for k in self._pipelines if k[0] == key]:
+            del self._pipelines[pkey]
+
+    def _evict(self):
+        while len(self._entries) > self.max_vistrails:
+            key, _ = self._entries.popitem(last=False)
+            self._drop_pipelines(key)
+            self._stats['evictions'] += 1
+
+    def invalidate(self, locator=None):
+        """invalidate(locator: DBLocator) -> None
+
+        Drops the vistrail stored at locator from the cache, or every
+        cached object if locator is None.
+
+        """
+        with self._lock:
+            if locator is None:
+                self._entries.clear()
+                self._pipelines.clear()
+            else:
+                key = self.key(locator)
+                self._entries.pop(key, None)
+                self._drop_pipelines(key)
+
+    def stats(self):
+        """stats() -> dict
+
+        Returns the hit and miss counters along with the number of cached
+        vistrails and pipelines.
+
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['vistrails'] = len(self._entries)
+            stats['pipelines'] = len(self._pipelines)
+        return stats
+
+
+_vistrail_cache = None
+
+def get_vistrail_cache():
+    """get_vistrail_cache() -> VistrailCache
+
+    Returns the process-wide cache, sized from the rpcCacheVistrails and
+    rpcCachePipelines configuration options.
+
+    """
+    global _vistrail_cache
+    if _vistrail_cache is None:
+        from vistrails.core.configuration import get_vistrails_configuration
+        conf = get_vistrails_configuration()
+        _vistrail_cache = VistrailCache(
+                getattr(conf, 'rpcCacheVistrails', 16),
+                getattr(conf, 'rpcCachePipelines', 256))
+    return _vistrail_cache
+
+##############################################################################
+
+class TestVistrailCache(unittest.TestCase):
+    class FakeLocator(object):
+        def __init__(self, obj_id, timestamp='2016-01-01 00:00:00'):
+            self.host = 'localhost'
+            self.port = 3306
+            self.db = 'vistrails'
+            self.obj_id = obj_id
+            self.timestamp = timestamp
+
+        def get_db_modification_time(self):
+            return self.timestamp
+
+    class FakeVistrail(object):
+        def __init__(self):
+            self.materialized = []
+
+        def getPipeline(self, version):
+            self.materialized.append(version)
+            return ('pipeline', version)
+
+    class CountingCache(VistrailCache):
+        def __init__(self, *args, **kwargs):
+            VistrailCache.__init__(self, *args, **kwargs)
+            self.loads = []
+
+        def _load(self, locator):
+            self.loads.append(locator.obj_id)
+            return TestVistrailCache.FakeVistrail()
+
+    def test_hit(self):
+        cache = self.CountingCache()
+        locator = self.FakeLocator(1)
+        vistrail = cache.get_vistrail(locator)
+        self.assertIs(cache.get_vistrail(self.FakeLocator(1)), vistrail)
+        self.assertEqual(cache.loads, [1])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_modified(self):
+        cache = self.CountingCache()
+        locator = self.FakeLocator(1)
+        first = cache.get_vistrail(locator)
+        cache.get_pipeline(locator, 3)
+        locator.timestamp = '2016-01-02 00:00:00'
+        second = cache.get_vistrail(locator)
+        self.assertIsNot(first, second)
+        self.assertEqual(cache.loads, [1, 1])
+        self.assertEqual(cache.stats()['invalidations'], 1)
+        self.assertEqual(cache.stats()['pipelines'], 0)
+        cache.get_pipeline(locator, 3)
+        self.assertEqual(second.materialized, [3])
+
+    def test_pipelines(self):
+        cache = self.CountingCache(max_pipelines=2)
+        locator = self.FakeLocator(1)
+        self.assertEqual(cache.get_pipeline(locator, 3), ('pipeline', 3))
+        cache.get_pipeline(locator, 3)
+        cache.get_pipeline(locator, 4)
+        cache.get_pipeline(locator, 5)
+        cache.get_pipeline(locator, 3)
+        vistrail = cache.get_vistrail(locator)
+        self.assertEqual(vistrail.materialized, [3, 4, 5, 3])
+        stats = cache.stats()
+        self.assertEqual((stats['pipeline_hits'], stats['pipeline_misses']),
+                         (1, 4))
+
+    def test_eviction(self):
+        cache = self.CountingCache(max_vistrails=2)
+        for obj_id in [1, 2, 1, 3, 1, 2]:
+            cache.get_pipeline(self.FakeLocator(obj_id), 1)
+        self.assertEqual(cache.loads, [1, 2, 3, 2])
+        stats = cache.stats()
+        self.assertEqual((stats['evictions'], stats['vistrails'],
+                          stats['pipelines']), (2, 2, 2))
+
+    def test_invalidate(self):
+        cache = self.CountingCache()
+        cache.get_vistrail(self.FakeLocator(1))
+        cache.get_vistrail(self.FakeLocator(2))
+        cache.invalidate(self.FakeLocator(1))
+        cache.get_vistrail(self.FakeLocator(1))
+        cache.get_vistrail(self.FakeLocator(2))
+        self.assertEqual(cache.loads, [1, 2, 1])
+        cache.invalidate()
+        self.assertEqual(cache.stats()['vistrails'], 0)
+
+    def test_disabled(self):
+        cache = self.CountingCache(max_vistrails=0)
+        cache.get_vistrail(self.FakeLocator(1))
+        cache.get_vistrail(self.FakeLocator(1))
+        self.assertEqual(cache.loads, [1, 1])
+
+    def test_threads(self):
+        cache = self.CountingCache()
+        locator = self.FakeLocator(1)
+        results = []
+        threads = [threading.Thread(
+                           target=lambda: results.append(
+                                   cache.get_vistrail(locator)))
+                   for i in xrange(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cache.loads, [1])
+        self.assertEqual(len(set(id(v) for v in results)), 1)
+
+    def test_materialize_threads(self):
+        """Pipelines of a vistrail are materialized one at a time."""
+        class SlowVistrail(self.FakeVistrail):
+            running = 0
+            max_running = 0
+
+            def getPipeline(self, version):
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+                time.sleep(0.01)
+                self.running -= 1
+                return TestVistrailCache.FakeVistrail.getPipeline(self,
+                                                                  version)
+
+        class Cache(VistrailCache):
+            def _load(self, locator):
+                return SlowVistrail()
+        cache = Cache()
+        locator = self.FakeLocator(1)
+        threads = [threading.Thread(
+                           target=lambda: [cache.get_pipeline(locator, v)
+                                           for v in (1, 2, 3)])
+                   for i in xrange(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        vistrail = cache.get_vistrail(locator)
+        self.assertEqual(vistrail.max_running, 1)
+        self.assertEqual(sorted(vistrail.materialized), [1, 2, 3])
+
+    def test_materialize_threads_vistrail(self):
+        """Concurrent requests get the same pipelines as a single one."""
+        from vistrails.core.db.locator import FileLocator
+        from vistrails.core.system import vistrails_root_directory
+        filename = os.path.join(vistrails_root_directory(),
+                                'tests', 'resources', 'test-streaming.vt')
+        vistrail = FileLocator(filename).load().vistrail
+        versions = sorted(vistrail.actionMap)[1:]
+        expected = dict((version, vistrail.getPipeline(version))
+                        for version in versions)
+
+        class Cache(VistrailCache):
+            def _load(self, locator):
+                return FileLocator(filename).load().vistrail
+        cache = Cache(max_pipelines=4)
+        locator = self.FakeLocator(1)
+        results = []
+        def work(offset):
+            try:
+                for version in versions[offset:] + versions[:offset]:
+                    results.append((version,
+                                    cache.get_pipeline(locator, version)))
+            except Exception, e:
+                results.append((None, e))
+        threads = [threading.Thread(target=work, args=(i,))
+                   for i in xrange(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8 * len(versions))
+        for version, pipeline in results:
+            self.assertEqual(pipeline, expected[version])
+
+    def test_vistrail_xml(self):
+        from vistrails.core.db.io import serialize
+        from vistrails.core.vistrail.vistrail import Vistrail
+
+        class Cache(self.CountingCache):
+            def _load(self, locator):
+                self.loads.append(locator.obj_id)
+                return Vistrail()
+        cache = Cache()
+        locator = self.FakeLocator(1)
+        xml = cache.get_vistrail_xml(locator)
+        self.assertEqual(xml, serialize(cache.get_vistrail(locator)))
+        self.assertIs(cache.get_vistrail_xml(locator), xml)
+        locator.timestamp = '2016-01-02 00:00:00'
+        self.assertIsNot(cache.get_vistrail_xml(locator), xml)
+        self.assertEqual(cache.loads, [1, 1])
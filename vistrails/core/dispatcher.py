@@ -0,0 +1,346 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Dispatch of server requests to other VisTrails instances.
+
+A server started with rpcInstances forwards execution requests to the
+instances it spawned. :class:`InstanceDispatcher` gives each instance a
+request queue served by its own thread. Requests go to the instance that
+last handled the same workflow, if it is not much busier than the others,
+or else to the least loaded one. Identical requests that arrive while one
+is still running share its result.
+
+"""
+from __future__ import division
+
+import Queue
+import threading
+import time
+import unittest
+import xmlrpclib
+
+from vistrails.core.data_structures.lru import LRUDict
+
+
+class DispatchTimeout(Exception):
+    """Raised when a forwarded request does not complete in time."""
+
+
+class _Request(object):
+    def __init__(self, method, args):
+        self.method = method
+        self.args = args
+        self.dedup_key = repr((method, args))
+        self.submitted = time.time()
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+
+    def finish(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout=None):
+        # Event.wait() only returns the flag from Python 2.7 on
+        self._done.wait(timeout)
+        if not self._done.isSet():
+            raise DispatchTimeout("%s did not complete in %s seconds" %
+                                  (self.method, timeout))
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _Instance(object):
+    def __init__(self, uri, make_proxy, on_done):
+        self.uri = uri
+        self.queue = Queue.Queue()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._make_proxy = make_proxy
+        self._on_done = on_done
+        self.thread = threading.Thread(target=self._run,
+                                       name='dispatch %s' % uri)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self):
+        # Proxies are not thread-safe, so each instance thread owns one
+        proxy = self._make_proxy(self.uri)
+        while True:
+            request = self.queue.get()
+            if request is None:
+                break
+            try:
+                result = getattr(proxy, request.method)(*request.args)
+            except Exception, e:
+                self._on_done(self, request, error=e)
+            else:
+                self._on_done(self, request, result=result)
+
+    def stats(self):
+        completed = self.completed + self.failed
+        return {'uri': self.uri,
+                'queued': self.pending,
+                'completed': self.completed,
+                'failed': self.failed,
+                'mean_latency': (self.total_latency / completed
+                                 if completed else 0.0),
+                'max_latency': self.max_latency}
+
+
+class InstanceDispatcher(object):
+    """Routes requests to a set of VisTrails server instances.
+
+    Requests are routed by an affinity key such as (host, db, vt_id,
+    version). The instance that last served the key, or failing that the
+    same vistrail (the key without its last element), is preferred while
+    its queue is at most affinity_slack requests longer than the shortest
+    one. Other requests go to the instance with the shortest queue.
+
+    """
+    def __init__(self, uris, timeout=None, affinity_slack=1,
+                 max_affinity=1024, make_proxy=xmlrpclib.ServerProxy):
+        self.timeout = timeout
+        self.affinity_slack = affinity_slack
+        self.max_affinity = max_affinity
+        self._lock = threading.Lock()
+        self._affinity = LRUDict()
+        self._inflight = {}
+        self.instances = [_Instance(uri, make_proxy, self._finish)
+                          for uri in uris]
+
+    def __len__(self):
+        return len(self.instances)
+
+    @staticmethod
+    def _affinity_keys(key):
+        if key is None:
+            return []
+        if isinstance(key, tuple) and len(key) > 1:
+            return [key, key[:-1]]
+        return [key]
+
+    def _choose(self, key):
+        least = min(self.instances, key=lambda i: i.pending)
+        for k in self._affinity_keys(key):
+            instance = self._affinity.get(k)
+            if (instance is not None and
+                    instance.pending <= least.pending + self.affinity_slack):
+                return instance
+        return least
+
+    def _remember(self, key, instance):
+        for k in self._affinity_keys(key):
+            self._affinity[k] = instance
+        while len(self._affinity) > self.max_affinity:
+            self._affinity.popitem(last=False)
+
+    def _finish(self, instance, request, result=None, error=None):
+        latency = time.time() - request.submitted
+        with self._lock:
+            instance.pending -= 1
+            if error is None:
+                instance.completed += 1
+            else:
+                instance.failed += 1
+            instance.total_latency += latency
+            instance.max_latency = max(instance.max_latency, latency)
+            if self._inflight.get(request.dedup_key) is request:
+                del self._inflight[request.dedup_key]
+        request.finish(result, error)
+
+    def _enqueue(self, instance, method, args):
+        request = _Request(method, args)
+        instance.pending += 1
+        instance.queue.put(request)
+        return request
+
+    def submit(self, method, args, key=None):
+        """submit(method: str, args: tuple, key: hashable) -> request
+
+        Queues a call to method on one of the instances and returns a
+        request whose wait() returns the result. If an identical call is
+        already queued or running, its request is returned instead.
+
+        """
+        args = tuple(args)
+        dedup_key = repr((method, args))
+        with self._lock:
+            request = self._inflight.get(dedup_key)
+            if request is not None:
+                return request
+            instance = self._choose(key)
+            self._remember(key, instance)
+            request = self._enqueue(instance, method, args)
+            self._inflight[request.dedup_key] = request
+        return request
+
+    def call(self, method, args, key=None, timeout=None):
+        """call(method: str, args: tuple, key: hashable,
+                timeout: float) -> result
+
+        Forwards a call and waits for its result, raising DispatchTimeout
+        after timeout seconds (default: the dispatcher's timeout).
+
+        """
+        if timeout is None:
+            timeout = self.timeout
+        return self.submit(method, args, key).wait(timeout)
+
+    def broadcast(self, method, args, timeout=None):
+        """broadcast(method: str, args: tuple, timeout: float) -> list
+
+        Forwards a call to every instance and returns (result, error)
+        pairs in the order of the instances.
+
+        """
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            requests = [self._enqueue(instance, method, tuple(args))
+                        for instance in self.instances]
+        results = []
+        for request in requests:
+            try:
+                results.append((request.wait(timeout), None))
+            except Exception, e:
+                results.append((None, e))
+        return results
+
+    def stats(self):
+        """stats() -> list of dict
+
+        Returns queue depth, completed and failed counts, and latency of
+        each instance. Latencies are in seconds and include queueing.
+
+        """
+        with self._lock:
+            return [instance.stats() for instance in self.instances]
+
+    def close(self):
+        for instance in self.instances:
+            instance.queue.put(None)
+
+##############################################################################
+
+class TestInstanceDispatcher(unittest.TestCase):
+    class FakeProxy(object):
+        def __init__(self, uri, calls, gate):
+            self.uri = uri
+            self.calls = calls
+            self.gate = gate
+
+        def run(self, value):
+            self.gate.wait()
+            self.calls.append((self.uri, value))
+            return (self.uri, value)
+
+        def fail(self):
+            raise ValueError("failed")
+
+    def make_dispatcher(self, n, **kwargs):
+        self.calls = []
+        self.gate = threading.Event()
+        make_proxy = lambda uri: self.FakeProxy(uri, self.calls, self.gate)
+        dispatcher = InstanceDispatcher(['i%d' % i for i in xrange(n)],
+                                        make_proxy=make_proxy, **kwargs)
+        self.addCleanup(dispatcher.close)
+        self.addCleanup(self.gate.set)
+        return dispatcher
+
+    def test_least_loaded(self):
+        dispatcher = self.make_dispatcher(3)
+        requests = [dispatcher.submit('run', (i,)) for i in xrange(3)]
+        self.assertEqual([s['queued'] for s in dispatcher.stats()],
+                         [1, 1, 1])
+        self.gate.set()
+        uris = set(r.wait(5)[0] for r in requests)
+        self.assertEqual(uris, set(['i0', 'i1', 'i2']))
+
+    def test_affinity(self):
+        dispatcher = self.make_dispatcher(3)
+        self.gate.set()
+        first = dispatcher.call('run', (1,), key=('db', 1, 2), timeout=5)
+        second = dispatcher.call('run', (2,), key=('db', 1, 2), timeout=5)
+        # another version of the same vistrail
+        third = dispatcher.call('run', (3,), key=('db', 1, 3), timeout=5)
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(first[0], third[0])
+
+    def test_affinity_slack(self):
+        dispatcher = self.make_dispatcher(2, affinity_slack=1)
+        requests = [dispatcher.submit('run', (i,), key=('db', 1, 2))
+                    for i in xrange(3)]
+        self.assertEqual([s['queued'] for s in dispatcher.stats()],
+                         [2, 1])
+        self.gate.set()
+        for request in requests:
+            request.wait(5)
+
+    def test_dedup(self):
+        dispatcher = self.make_dispatcher(2)
+        first = dispatcher.submit('run', (1,))
+        second = dispatcher.submit('run', (1,))
+        self.assertIs(first, second)
+        self.gate.set()
+        self.assertEqual(first.wait(5), second.wait(5))
+        self.assertEqual(len(self.calls), 1)
+        dispatcher.call('run', (1,), timeout=5)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_timeout(self):
+        dispatcher = self.make_dispatcher(1, timeout=0.01)
+        self.assertRaises(DispatchTimeout, dispatcher.call, 'run', (1,))
+
+    def test_error(self):
+        dispatcher = self.make_dispatcher(1)
+        self.assertRaises(ValueError, dispatcher.call, 'fail', (), None, 5)
+        self.gate.set()
+        dispatcher.call('run', (1,), timeout=5)
+        stats = dispatcher.stats()[0]
+        self.assertEqual((stats['queued'], stats['completed'],
+                          stats['failed']), (0, 1, 1))
+
+    def test_broadcast(self):
+        dispatcher = self.make_dispatcher(3)
+        self.gate.set()
+        results = dispatcher.broadcast('run', (1,), timeout=5)
+        self.assertEqual(results, [(('i%d' % i, 1), None)
+                                   for i in xrange(3)])
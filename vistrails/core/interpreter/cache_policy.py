@@ -0,0 +1,251 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Bounded cache policies for the CachedInterpreter.
+
+A CachePolicy keeps track of when each persistent module was last used, how
+long it took to compute and the estimated size of its outputs, and selects
+which modules to evict once the configured limits are exceeded.
+
+"""
+
+from __future__ import division
+
+import sys
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+import unittest
+
+
+def estimate_size(value, max_depth=3):
+    """estimate_size(value: object, max_depth: int) -> int
+
+    Returns a rough estimate of the memory used by value, in bytes.
+    Containers are followed up to max_depth levels; arrays report their
+    buffer size.
+
+    """
+    seen = set()
+
+    def size(obj, depth):
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        if numpy is not None and isinstance(obj, numpy.ndarray):
+            return obj.nbytes + sys.getsizeof(obj, 0)
+        try:
+            s = sys.getsizeof(obj)
+        except TypeError:
+            s = 0
+        if depth >= max_depth:
+            return s
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            s += sum(size(o, depth + 1) for o in obj)
+        elif isinstance(obj, dict):
+            s += sum(size(k, depth + 1) + size(v, depth + 1)
+                     for k, v in obj.iteritems())
+        return s
+
+    return size(value, 0)
+
+def estimate_module_size(obj):
+    """estimate_module_size(obj: Module) -> int
+
+    Estimates the size of the outputs of a module instance.
+
+    """
+    return sum(estimate_size(value)
+               for port, value in obj.outputPorts.iteritems()
+               if value is not obj)
+
+
+class CacheStats(object):
+    """Hit, miss and eviction counters of an execution cache.
+
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def as_dict(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+    def __repr__(self):
+        return ('<CacheStats hits=%d misses=%d evictions=%d>' %
+                (self.hits, self.misses, self.evictions))
+
+
+class CachePolicy(object):
+    """Tracks persistent modules and selects eviction victims.
+
+    With policy 'lru', the least recently used module is evicted first.
+    With policy 'cost', modules are ranked GreedyDual-Size style: each one
+    gets a priority of clock + compute_time / size when it is used, the
+    lowest priority is evicted first and the clock is advanced to the
+    evicted priority, so that cheap, large results go before expensive,
+    small ones while old entries still age out.
+
+    max_modules and max_size (in bytes) of 0 mean no limit.
+
+    """
+    POLICIES = ('lru', 'cost')
+
+    def __init__(self, max_modules=0, max_size=0, policy='lru'):
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown cache policy %r" % policy)
+        self.max_modules = max_modules
+        self.max_size = max_size
+        self.policy = policy
+        self.stats = CacheStats()
+        self._counter = 0
+        self._clock = 0.0
+        self._priority = {}
+        self._compute_time = {}
+        self._size = {}
+        self._total_size = 0
+
+    def is_bounded(self):
+        return self.max_modules > 0 or self.max_size > 0
+
+    def total_size(self):
+        return self._total_size
+
+    def __len__(self):
+        return len(self._priority)
+
+    def __contains__(self, module_id):
+        return module_id in self._priority
+
+    def _update_priority(self, module_id):
+        if self.policy == 'lru':
+            self._counter += 1
+            self._priority[module_id] = self._counter
+        else:
+            cost = self._compute_time.get(module_id, 0.0)
+            size = max(self._size.get(module_id, 0), 1)
+            self._priority[module_id] = self._clock + cost / size
+
+    def touch(self, module_id):
+        """Marks a module as used."""
+        self._update_priority(module_id)
+
+    def record(self, module_id, compute_time=None, size=None):
+        """Records the compute time and output size of a module."""
+        if compute_time is not None:
+            self._compute_time[module_id] = compute_time
+        if size is not None:
+            self._total_size += size - self._size.get(module_id, 0)
+            self._size[module_id] = size
+        self._update_priority(module_id)
+
+    def forget(self, module_id):
+        """Stops tracking a module that was removed from the cache."""
+        self._priority.pop(module_id, None)
+        self._compute_time.pop(module_id, None)
+        self._total_size -= self._size.pop(module_id, 0)
+
+    def clear(self):
+        self._priority.clear()
+        self._compute_time.clear()
+        self._size.clear()
+        self._total_size = 0
+        self._clock = 0.0
+
+    def over_limit(self):
+        return ((self.max_modules > 0 and
+                 len(self._priority) > self.max_modules) or
+                (self.max_size > 0 and self._total_size > self.max_size))
+
+    def next_victim(self, protected=()):
+        """next_victim(protected: set) -> module id or None
+
+        Returns the module that should be evicted next, ignoring the ones
+        in protected.
+
+        """
+        victim = None
+        victim_priority = None
+        for module_id, priority in self._priority.iteritems():
+            if module_id in protected:
+                continue
+            if victim is None or priority < victim_priority:
+                victim, victim_priority = module_id, priority
+        if victim is not None and self.policy == 'cost':
+            self._clock = victim_priority
+        return victim
+
+
+class TestCachePolicy(unittest.TestCase):
+    def test_lru(self):
+        policy = CachePolicy(max_modules=2)
+        for i in xrange(3):
+            policy.record(i, size=10)
+        policy.touch(0)
+        self.assertTrue(policy.over_limit())
+        self.assertEqual(policy.next_victim(), 1)
+        self.assertEqual(policy.next_victim(protected=set([1])), 2)
+        policy.forget(1)
+        self.assertFalse(policy.over_limit())
+        self.assertEqual(policy.total_size(), 20)
+
+    def test_cost(self):
+        policy = CachePolicy(max_size=100, policy='cost')
+        policy.record(0, compute_time=10.0, size=60)
+        policy.record(1, compute_time=0.1, size=60)
+        self.assertTrue(policy.over_limit())
+        self.assertEqual(policy.next_victim(), 1)
+
+    def test_estimate_size(self):
+        small = estimate_size([1, 2])
+        big = estimate_size(['x' * 1000, [2] * 100])
+        self.assertGreater(big, small)
+        self.assertGreater(big, 1000)
@@ -40,14 +40,20 @@ import base64
 import copy
 import gc
 import cPickle as pickle
+import sys
 
 import time
 
 from vistrails.core.common import InstanceObject, VistrailsInternalError
+from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.core.data_structures.bijectivedict import Bidict
 from vistrails.core import debug
 import vistrails.core.interpreter.base
 from vistrails.core.interpreter.base import AbortExecution
+from vistrails.core.interpreter.cache_policy import CachePolicy, \
+    estimate_module_size
+from vistrails.core.interpreter.disk_cache import DiskCache
+from vistrails.core.interpreter.scheduler import ThreadedScheduler
 import vistrails.core.interpreter.utils
 from vistrails.core.log.controller import DummyLogController
 from vistrails.core.modules.basic_modules import identifier as basic_pkg, \
@@ -92,6 +98,8 @@ class ViewUpdatingLogController(object):
         self.executed = {}
         self.suspended = {}
         self.cached = {}
+        self.compute_times = {}
+        self._compute_start = {}
 
     def signalSuccess(self, obj):
         self.executed[obj.id] = True
@@ -108,6 +116,7 @@ class ViewUpdatingLogController(object):
     def begin_compute(self, obj):
         i = self.remap_id(obj.id)
         self.view.set_module_computing(i)
+        self._compute_start[obj.id] = time.time()
 
         reg = get_module_registry()
         module_name = reg.get_descriptor(obj.__class__).name
@@ -149,6 +158,9 @@ class ViewUpdatingLogController(object):
             # It's ok, because that was already logged by the recursive
             # execute_pipeline() call
             return
+        start = self._compute_start.pop(obj.id, None)
+        if start is not None:
+            self.compute_times[obj.id] = time.time() - start
         if was_suspended:
             self._handle_suspended(obj, error)
             self.suspended[obj.id] = error
@@ -216,6 +228,9 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         self._objects = {}
         self.filePool = self._file_pool
         self._streams = []
+        self._cache_policy = CachePolicy()
+        self.disk_cache = None
+        self.update_cache_limits()
 
     def clear(self):
         self._file_pool.cleanup()
@@ -223,6 +238,71 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for obj in self._objects.itervalues():
             obj.clear()
         self._objects = {}
+        self._cache_policy.clear()
+
+    def update_cache_limits(self):
+        """update_cache_limits() -> None
+
+        Reads the cache bounds from the configuration.
+        """
+        conf = get_vistrails_configuration()
+        if conf is None:
+            return
+        policy = self._cache_policy
+        policy.max_modules = max(getattr(conf, 'cacheMaxModules', 0) or 0, 0)
+        policy.max_size = max(getattr(conf, 'cacheMaxSize', 0) or 0,
+                              0) * 1024 * 1024
+        name = getattr(conf, 'cachePolicy', 'lru') or 'lru'
+        if name not in CachePolicy.POLICIES:
+            debug.warning("Unknown cache policy %r, using 'lru'" % name)
+            name = 'lru'
+        policy.policy = name
+
+        if conf.check('diskCache'):
+            directory = vistrails.core.system.get_vistrails_directory(
+                    'diskCacheDir', conf)
+            max_size = max(getattr(conf, 'diskCacheSize', 0) or 0,
+                           0) * 1024 * 1024
+            if (self.disk_cache is None or
+                    self.disk_cache.directory != directory):
+                self.disk_cache = DiskCache(directory, max_size)
+            else:
+                self.disk_cache.max_size = max_size
+        else:
+            self.disk_cache = None
+
+    def get_cache_stats(self):
+        """get_cache_stats() -> dict
+
+        Returns the hit, miss and eviction counters of the cache along with
+        its current number of modules and estimated size in bytes.
+        """
+        stats = self._cache_policy.stats.as_dict()
+        stats['modules'] = len(self._objects)
+        stats['size'] = self._cache_policy.total_size()
+        if self.disk_cache is not None:
+            disk_stats = self.disk_cache.stats.as_dict()
+            disk_stats['stores'] = self.disk_cache.stores
+            stats['disk'] = disk_stats
+        return stats
+
+    def enforce_cache_limits(self, protected=()):
+        """enforce_cache_limits(protected: set of persistent module ids)
+
+        Evicts modules from the persistent pipeline, along with their
+        dependents, until the cache is within its bounds. Modules in
+        protected are never evicted.
+        """
+        policy = self._cache_policy
+        while policy.over_limit():
+            victim = policy.next_victim(protected)
+            if victim is None:
+                break
+            before = len(self._objects)
+            self.clean_modules([victim])
+            # the victim might not be in the persistent pipeline anymore
+            policy.forget(victim)
+            policy.stats.evictions += before - len(self._objects)
 
     def __del__(self):
         self.clear()
@@ -241,6 +321,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for v in dependencies:
             self._persistent_pipeline.delete_module(v)
             del self._objects[v]
+            self._cache_policy.forget(v)
 
     def clean_non_cacheable_modules(self):
         """clean_non_cacheable_modules() -> None
@@ -363,6 +444,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             persistent_id = tmp_to_persistent_module_map[i]
             module = self._persistent_pipeline.modules[persistent_id]
             obj = self._objects[persistent_id] = module.summon()
+            self._cache_policy.touch(persistent_id)
             obj.interpreter = self
             obj.id = persistent_id
             obj.signature = module._signature
@@ -524,22 +606,24 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         self._streams.append(Generator.generators)
         Generator.generators = []
 
-        # Update new sinks
-        for obj in persistent_sinks:
+        def handle_update_error(exc_info):
+            """Reports an exception raised by Module.update().
+
+            Returns True if the execution must stop.
+            """
             abort = False
             try:
-                obj.update()
-                continue
+                raise exc_info[0], exc_info[1], exc_info[2]
             except ModuleWasSuspended:
-                continue
+                return False
             except ModuleHadError:
                 pass
             except AbortExecution:
-                break
+                return True
             except ModuleSuspended, ms:
                 ms.module.logging.end_update(ms.module, ms,
                                              was_suspended=True)
-                continue
+                return False
             except ModuleErrors, mes:
                 for me in mes.module_errors:
                     me.module.logging.end_update(me.module, me)
@@ -553,8 +637,27 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                 mb.module.logging.end_update(mb.module)
                 logging_obj.signalError(mb.module, mb)
                 abort = True
-            if stop_on_error or abort:
+            return stop_on_error or abort
+
+        # Run independent branches concurrently if enabled; the loop below
+        # then only has to pick up the results
+        stopped = False
+        conf = get_vistrails_configuration()
+        threads = getattr(conf, 'executionThreads', 0) if conf else 0
+        if threads > 0:
+            scheduler = ThreadedScheduler(
+                    threads,
+                    wrap_types=(ViewUpdatingLogController.Loop,))
+            stopped = scheduler.execute(persistent_sinks, handle_update_error)
+
+        # Update new sinks
+        for obj in persistent_sinks:
+            if stopped:
                 break
+            try:
+                obj.update()
+            except Exception:
+                stopped = handle_update_error(sys.exc_info())
 
         if Generator.generators:
             record_usage(generators=len(Generator.generators))
@@ -607,6 +710,18 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         suspends = {}
         caches = {}
 
+        # record compute time and output size for the cache policy
+        policy = self._cache_policy
+        if policy.is_bounded():
+            for obj in tmp_id_to_module_map.itervalues():
+                if obj.id in logging_obj.compute_times:
+                    size = None
+                    if policy.max_size > 0 or policy.policy == 'cost':
+                        size = estimate_module_size(obj)
+                    policy.record(obj.id,
+                                  logging_obj.compute_times[obj.id],
+                                  size)
+
         to_delete = []
         for (tmp_id, obj) in tmp_id_to_module_map.iteritems():
             if clean_pipeline:
@@ -761,6 +876,11 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             for (i, error) in errors.iteritems():
                 view.set_module_error(i, error.msg, error.errorTrace)
         self.finalize_pipeline(pipeline, *(res[:-1]), **new_kwargs)
+        # Only evict at the top level, when no module is running
+        self.update_cache_limits()
+        if self._cache_policy.is_bounded():
+            self.enforce_cache_limits(set(obj.id
+                                          for obj in res[1].itervalues()))
         time_end = time.time()
 
         result = InstanceObject(objects=res[1],
@@ -810,7 +930,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         connection_id_map = Bidict()
         modules_added = set()
         connections_added = set()
-        pipeline.refresh_signatures()
+        pipeline.compute_signatures()
         # we must traverse vertices in topological sort order
         verts = pipeline.graph.vertices_topological_sort()
         for new_module_id in verts:
@@ -825,10 +945,13 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                     base64.b16encode(new_sig).lower()
                 module_id_map[new_module_id] = persistent_id
                 modules_added.add(new_module_id)
+                self._cache_policy.stats.misses += 1
             else:
                 i = self._persistent_pipeline \
                         .subpipeline_id_from_signature(new_sig)
                 module_id_map[new_module_id] = i
+                self._cache_policy.stats.hits += 1
+                self._cache_policy.touch(i)
         for connection in pipeline.connections.itervalues():
             new_sig = pipeline.connection_signature(connection.id)
             if not self._persistent_pipeline.has_connection_signature(new_sig):
@@ -847,8 +970,9 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                 i = self._persistent_pipeline \
                         .connection_id_from_signature(new_sig)
                 connection_id_map[connection.id] = i
-        # update persistent signatures
-        self._persistent_pipeline.compute_signatures()
+        # update persistent signatures; the signatures of modules already
+        # in there must stay those computed when they were added
+        self._persistent_pipeline.compute_signatures(rehash_volatile=False)
         return (module_id_map, connection_id_map,
                 modules_added, connections_added)
         
@@ -859,7 +983,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         object_map = {}
         module_id_map = {}
         connection_id_map = {}
-        pipeline.refresh_signatures()
+        pipeline.compute_signatures()
         # we must traverse vertices in topological sort order
         verts = pipeline.graph.vertices_topological_sort()
         for module_id in verts:
@@ -963,6 +1087,144 @@ class TestCachedInterpreter(unittest.TestCase):
         finally:
             StandardOutput.compute = old_compute
 
+    def make_pipeline(self, value):
+        """Creates a pipeline String(value) -> String."""
+        from vistrails.core.vistrail.connection import Connection
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.module_function import ModuleFunction
+        from vistrails.core.vistrail.module_param import ModuleParam
+        from vistrails.core.vistrail.pipeline import Pipeline
+        from vistrails.core.vistrail.port import Port
+        from vistrails.core.system import get_vistrails_basic_pkg_id
+
+        pkg = get_vistrails_basic_pkg_id()
+        version = get_module_registry().get_package_by_name(pkg).version
+        pipeline = Pipeline()
+        function = ModuleFunction(name='value',
+                                  parameters=[ModuleParam(pos=0,
+                                                          type='String',
+                                                          val=value)])
+        m1 = Module(id=0, name='String', package=pkg, version=version,
+                    functions=[function])
+        m2 = Module(id=1, name='String', package=pkg, version=version)
+        pipeline.add_module(m1)
+        pipeline.add_module(m2)
+        s_sig = m1.get_port_spec('value', 'output').sigstring
+        d_sig = m2.get_port_spec('value', 'input').sigstring
+        pipeline.add_connection(Connection(
+                id=0,
+                ports=[Port(id=0, type='source', moduleId=0,
+                            name='value', signature=s_sig),
+                       Port(id=1, type='destination', moduleId=1,
+                            name='value', signature=d_sig)]))
+        return pipeline
+
+    def test_bounded_cache(self):
+        """Test that the cache evicts modules and their dependents."""
+        conf = get_vistrails_configuration()
+        old_max = conf.cacheMaxModules
+        conf.cacheMaxModules = 4
+        try:
+            interpreter = CachedInterpreter()
+            for i in xrange(4):
+                result = interpreter.execute(self.make_pipeline(str(i)))
+                self.assertFalse(result.errors)
+                self.assertLessEqual(len(interpreter._objects), 4)
+            stats = interpreter.get_cache_stats()
+            self.assertEqual(stats['misses'], 8)
+            self.assertEqual(stats['evictions'], 4)
+            self.assertEqual(stats['modules'], 4)
+
+            # most recent pipeline is still cached
+            result = interpreter.execute(self.make_pipeline('3'))
+            self.assertEqual(len(result.modules_added), 0)
+            self.assertEqual(interpreter.get_cache_stats()['hits'], 2)
+            # every downstream module was evicted with its upstream module
+            g = interpreter._persistent_pipeline.graph
+            for m in interpreter._persistent_pipeline.modules:
+                for source, _ in g.edges_to(m):
+                    self.assertIn(source, interpreter._objects)
+        finally:
+            conf.cacheMaxModules = old_max
+
+    def test_disk_cache(self):
+        """Test that results are reused from disk by a new interpreter."""
+        import shutil
+        import tempfile
+        conf = get_vistrails_configuration()
+        old_values = conf.diskCache, conf.diskCacheDir
+        directory = tempfile.mkdtemp(prefix='vt_diskcache_')
+        conf.diskCache = True
+        conf.diskCacheDir = directory
+        try:
+            interpreter = CachedInterpreter()
+            result = interpreter.execute(self.make_pipeline('disk'))
+            self.assertFalse(result.errors)
+            self.assertEqual(interpreter.get_cache_stats()['disk']['stores'],
+                             2)
+
+            interpreter = CachedInterpreter()
+            result = interpreter.execute(self.make_pipeline('disk'))
+            self.assertFalse(result.errors)
+            self.assertFalse(any(result.executed.itervalues()))
+            self.assertEqual(result.objects[1].get_output('value'), 'disk')
+            self.assertEqual(interpreter.get_cache_stats()['disk']['hits'],
+                             1)
+        finally:
+            conf.diskCache, conf.diskCacheDir = old_values
+            shutil.rmtree(directory)
+
+    def test_disk_cache_connected_ports(self):
+        """Test that disk entries missing a connected port are not used."""
+        import shutil
+        import tempfile
+        from vistrails.core.modules.vistrails_module import Module
+        directory = tempfile.mkdtemp(prefix='vt_diskcache_')
+        try:
+            interpreter = CachedInterpreter()
+            interpreter.disk_cache = DiskCache(directory)
+            module = Module()
+            module.interpreter = interpreter
+            module.signature = 'abcdef'
+            module.moduleInfo['pipeline'] = self.make_pipeline('ports')
+            module.moduleInfo['moduleId'] = 0
+            self.assertEqual(module.connected_output_ports(), ['value'])
+            interpreter.disk_cache.store('abcdef', {'other': 1})
+            self.assertFalse(module.setDiskCache())
+            interpreter.disk_cache.store('abcdef', {'value': 'ports'})
+            self.assertTrue(module.setDiskCache())
+            self.assertEqual(module.get_output('value'), 'ports')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_concurrent_execution(self):
+        """Test that thread-safe modules run on worker threads."""
+        import threading
+        from vistrails.core.modules.basic_modules import String
+        conf = get_vistrails_configuration()
+        old_threads = conf.executionThreads
+        old_compute = String.compute
+        threads = []
+        def compute(self):
+            threads.append(threading.current_thread())
+            old_compute(self)
+        String.compute = compute
+        String.is_thread_safe = lambda self: True
+        conf.executionThreads = 2
+        try:
+            interpreter = CachedInterpreter()
+            result = interpreter.execute(self.make_pipeline('threads'))
+            self.assertFalse(result.errors)
+            self.assertTrue(all(result.executed.itervalues()))
+            self.assertEqual(result.objects[1].get_output('value'),
+                             'threads')
+            self.assertEqual(len(threads), 2)
+            self.assertNotIn(threading.current_thread(), threads)
+        finally:
+            conf.executionThreads = old_threads
+            String.compute = old_compute
+            del String.is_thread_safe
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,224 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Persistent disk tier for the CachedInterpreter.
+
+Module outputs are pickled under the subpipeline signature of the module,
+so that a later process executing the same upstream subpipeline can reuse
+them instead of recomputing.  The least recently used entries are removed
+once the total size of the cache exceeds its limit.
+
+"""
+
+from __future__ import division
+
+import cPickle as pickle
+import os
+import shutil
+import tempfile
+
+from vistrails.core import debug
+from vistrails.core.interpreter.cache_policy import CacheStats
+
+import unittest
+
+
+class DiskCache(object):
+    """Stores dictionaries of module outputs on disk, keyed by signature.
+
+    max_size is in bytes; 0 means no limit.
+
+    """
+    SUFFIX = '.pkl'
+
+    def __init__(self, directory, max_size=0):
+        self.directory = directory
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self.stores = 0
+        self._total_size = None
+
+    def _path(self, signature):
+        return os.path.join(self.directory, signature[:2],
+                            signature + self.SUFFIX)
+
+    def _entries(self):
+        """Returns (mtime, size, path) for every entry of the cache."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(self.SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def total_size(self):
+        if self._total_size is None:
+            self._total_size = sum(e[1] for e in self._entries())
+        return self._total_size
+
+    def __contains__(self, signature):
+        return os.path.isfile(self._path(signature))
+
+    def load(self, signature):
+        """load(signature: str) -> dict or None
+
+        Returns the outputs stored under signature, or None.
+
+        """
+        path = self._path(signature)
+        try:
+            with open(path, 'rb') as fp:
+                outputs = pickle.load(fp)
+        except IOError:
+            self.stats.misses += 1
+            return None
+        except Exception, e:
+            # unreadable entry, e.g. class no longer exists
+            debug.warning("Discarding unreadable cache entry %s" % path, e)
+            self._remove(path)
+            self.stats.misses += 1
+            return None
+        try:
+            # mark as recently used
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.stats.hits += 1
+        return outputs
+
+    def store(self, signature, outputs):
+        """store(signature: str, outputs: dict) -> bool
+
+        Stores outputs under signature. Returns False if the outputs cannot
+        be serialized.
+
+        """
+        try:
+            data = pickle.dumps(outputs, pickle.HIGHEST_PROTOCOL)
+        except Exception, e:
+            debug.log("Outputs for %s cannot be stored in the disk cache: "
+                      "%s" % (signature, debug.format_exception(e)))
+            return False
+        if self.max_size > 0 and len(data) > self.max_size:
+            return False
+        path = self._path(signature)
+        dirname = os.path.dirname(path)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            # write to a temporary file first so that concurrent readers
+            # never see a partial entry
+            fd, tmp_name = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(data)
+            if os.path.exists(path):
+                self._remove(path)
+            os.rename(tmp_name, path)
+        except (IOError, OSError), e:
+            debug.warning("Cannot write disk cache entry %s" % path, e)
+            return False
+        if self._total_size is not None:
+            self._total_size += len(data)
+        self.stores += 1
+        self.enforce_limits()
+        return True
+
+    def _remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        if self._total_size is not None:
+            self._total_size -= size
+
+    def enforce_limits(self):
+        """Removes least recently used entries until under max_size."""
+        if self.max_size <= 0 or self.total_size() <= self.max_size:
+            return
+        entries = sorted(self._entries())
+        self._total_size = sum(e[1] for e in entries)
+        for mtime, size, path in entries:
+            if self._total_size <= self.max_size:
+                break
+            self._remove(path)
+            self.stats.evictions += 1
+
+    def clear(self):
+        for mtime, size, path in self._entries():
+            self._remove(path)
+        self._total_size = 0
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='vt_diskcache_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_roundtrip(self):
+        cache = DiskCache(self.directory)
+        self.assertIsNone(cache.load('abcdef'))
+        self.assertTrue(cache.store('abcdef', {'value': [1, 2, 3]}))
+        self.assertIn('abcdef', cache)
+        self.assertEqual(DiskCache(self.directory).load('abcdef'),
+                         {'value': [1, 2, 3]})
+        self.assertEqual(cache.stats.misses, 1)
+
+    def test_unpicklable(self):
+        cache = DiskCache(self.directory)
+        self.assertFalse(cache.store('abcdef', {'value': lambda: 1}))
+        self.assertNotIn('abcdef', cache)
+
+    def test_eviction(self):
+        cache = DiskCache(self.directory)
+        cache.store('aa01', {'value': 'x' * 1000})
+        os.utime(cache._path('aa01'), (1, 1))
+        cache.store('bb02', {'value': 'y' * 1000})
+        cache.max_size = 1500
+        cache.enforce_limits()
+        self.assertNotIn('aa01', cache)
+        self.assertIn('bb02', cache)
+        self.assertEqual(cache.stats.evictions, 1)
@@ -45,6 +45,12 @@ import atexit
 
 class Interpreter(vistrails.core.interpreter.cached.CachedInterpreter):
 
+    def update_cache_limits(self):
+        vistrails.core.interpreter.cached.CachedInterpreter.\
+            update_cache_limits(self)
+        # results are never reused when caching is disabled
+        self.disk_cache = None
+
     def clean_non_cacheable_modules(self):
         non_cacheable_modules = [i for
                                  (i, mod) in self._objects.iteritems()]
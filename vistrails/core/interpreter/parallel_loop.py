@@ -0,0 +1,420 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Parallel execution of the iterations of implicit loops.
+
+When a module gets a list on a port that expects a single value,
+Module.compute_all() runs a copy of the module for each element. If the
+loopWorkers option is set, the compute() calls of these copies can run
+concurrently: on worker threads for modules that declare themselves
+thread-safe (typically, modules that release the GIL or wait on a
+subprocess), or on worker processes for modules that declare themselves
+process-safe (CPU-bound Python code).
+
+The copies are still updated one after the other on the main thread, so the
+loop logging, the caches and the order of the outputs are unchanged; their
+compute() method is replaced with one waiting for the result computed in the
+background.
+
+"""
+
+from __future__ import division
+
+import cPickle as pickle
+import cStringIO
+import multiprocessing
+import os
+import Queue
+import sys
+import threading
+import traceback
+
+from vistrails.core import debug
+from vistrails.core.configuration import get_vistrails_configuration
+from vistrails.core.data_structures.bijectivedict import Bidict
+from vistrails.core.interpreter.scheduler import ThreadLogging
+from vistrails.core.modules.module_descriptor import ModuleDescriptor
+from vistrails.core.modules.vistrails_module import Module, ModuleError, \
+    ModuleConnector, _dummy_logging
+
+
+def get_loop_executor(module):
+    """get_loop_executor(module: Module) -> executor or None
+
+    Returns an object running the iterations of module concurrently, or
+    None if they should run sequentially.
+
+    """
+    conf = get_vistrails_configuration()
+    workers = getattr(conf, 'loopWorkers', 0) if conf else 0
+    if workers <= 0:
+        return None
+    if module.is_process_safe():
+        return ProcessIterations(workers)
+    elif module.is_thread_safe():
+        return ThreadIterations(workers)
+    return None
+
+
+class ThreadIterations(object):
+    """Runs the compute() method of the iteration modules on threads.
+
+    Logging calls made from the worker threads are performed on the main
+    thread, while it waits for the result of that same iteration.
+
+    """
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.tasks = Queue.Queue()
+        self.pending = []
+        self.cancelled = False
+
+    def start(self, modules):
+        owner = threading.current_thread()
+        for module in modules:
+            events = Queue.Queue()
+            module.logging = ThreadLogging(module.logging, events, owner)
+            self.tasks.put((module.compute, events))
+            self.pending.append(events)
+            module.compute = self.waiter(events)
+        for i in xrange(min(self.max_workers, len(modules))):
+            worker = threading.Thread(target=self.work,
+                                      name='vistrails-loop-worker')
+            worker.daemon = True
+            worker.start()
+
+    def work(self):
+        while True:
+            try:
+                compute, events = self.tasks.get_nowait()
+            except Queue.Empty:
+                return
+            exc_info = None
+            if not self.cancelled:
+                try:
+                    compute()
+                except Exception:
+                    exc_info = sys.exc_info()
+            events.put(('done', exc_info))
+
+    def waiter(self, events):
+        def compute():
+            self.pending.remove(events)
+            self.wait(events)
+        return compute
+
+    @staticmethod
+    def wait(events):
+        while True:
+            kind, payload = events.get()
+            if kind == 'call':
+                ThreadLogging.perform(*payload)
+            elif payload is not None:
+                raise payload[0], payload[1], payload[2]
+            else:
+                return
+
+    def finish(self):
+        """Waits for the iterations whose result was not used.
+
+        This happens if the loop stopped on an error, or if an iteration
+        came from a cache; iterations that didn't start are skipped.
+
+        """
+        self.cancelled = True
+        for events in self.pending:
+            try:
+                self.wait(events)
+            except Exception:
+                pass
+        self.pending = []
+
+
+class ProcessPool(object):
+    """A multiprocessing pool kept between executions.
+
+    The worker processes are forked from the application and only have the
+    packages and module classes it had at that time, so the pool is started
+    again when the module registry changed since (packages were enabled,
+    disabled or reloaded), or when a different number of processes is
+    requested.
+
+    Each worker sends its process id when it starts, so that the workers
+    replacing the ones that exited can be counted.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self._key = None
+        self._started = None
+        self._workers = set()
+
+    @staticmethod
+    def registry_key():
+        from vistrails.core.modules.module_registry import \
+            get_module_registry, module_registry_loaded
+
+        if not module_registry_loaded():
+            return None
+        registry = get_module_registry()
+        return id(registry), registry.generation
+
+    def get(self, processes):
+        """Returns the pool of worker processes, starting it if necessary.
+        """
+        key = processes, self.registry_key()
+        with self._lock:
+            if self._pool is not None and self._key != key:
+                self._terminate()
+            if self._pool is None:
+                self._started = multiprocessing.Queue()
+                self._workers = set()
+                self._pool = multiprocessing.Pool(processes,
+                                                  initializer=init_worker,
+                                                  initargs=(self._started,))
+                self._key = key
+            return self._pool
+
+    def workers_started(self):
+        """Returns the number of worker processes the pool has started.
+
+        The pool replaces the workers that exit, so this is more than the
+        number of processes if some of them exited.
+
+        """
+        with self._lock:
+            if self._started is not None:
+                while True:
+                    try:
+                        self._workers.add(self._started.get_nowait())
+                    except Queue.Empty:
+                        break
+            return len(self._workers)
+
+    def terminate(self):
+        """Stops the worker processes, if they were started.
+        """
+        with self._lock:
+            self._terminate()
+
+    def _terminate(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._started.close()
+            self._pool = self._key = self._started = None
+            self._workers = set()
+
+
+_process_pool = ProcessPool()
+
+
+def get_process_pool(processes):
+    return _process_pool.get(processes)
+
+
+def terminate_process_pool():
+    _process_pool.terminate()
+
+
+def process_pool_workers_started():
+    return _process_pool.workers_started()
+
+
+def init_worker(started=None):
+    """Initializes the VisTrails application in a worker process.
+
+    Forked workers inherit it, with the registry, from the parent. The
+    process id is put on the started queue if it is given.
+
+    """
+    import vistrails.core.application
+
+    if vistrails.core.application.get_vistrails_application() is None:
+        vistrails.core.application.init({'spawned': True}, args=[])
+    if started is not None:
+        started.put(os.getpid())
+
+
+# Module attributes not sent to the worker processes; connectors are sent as
+# values, and iterated_ports holds the lists being iterated on
+_local_attributes = set(['inputPorts', 'outputPorts', 'is_method', 'logging',
+                         'interpreter', 'moduleInfo', 'change_parameter',
+                         'compute', 'iterated_ports', 'streamed_ports'])
+
+
+def persistent_id(obj):
+    """Pickles the registry, its descriptors and module classes as references.
+    """
+    from vistrails.core.modules.module_registry import get_module_registry, \
+        ModuleRegistry
+
+    if isinstance(obj, ModuleRegistry):
+        return 'registry'
+    elif isinstance(obj, ModuleDescriptor):
+        descriptor = obj
+    elif isinstance(obj, type) and issubclass(obj, Module):
+        try:
+            descriptor = get_module_registry().get_descriptor(obj)
+        except Exception:
+            return None
+    else:
+        return None
+    return '%d\x00%s\x00%s\x00%s' % (
+            descriptor is not obj,
+            descriptor.identifier, descriptor.name, descriptor.namespace or '')
+
+
+def persistent_load(pid):
+    from vistrails.core.modules.module_registry import get_module_registry
+
+    if pid == 'registry':
+        return get_module_registry()
+    is_module, identifier, name, namespace = pid.split('\x00')
+    descriptor = get_module_registry().get_descriptor_by_name(
+            identifier, name, namespace or None)
+    if is_module == '1':
+        return descriptor.module
+    return descriptor
+
+
+def dumps(obj):
+    f = cStringIO.StringIO()
+    pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump(obj)
+    return f.getvalue()
+
+
+def loads(data):
+    unpickler = pickle.Unpickler(cStringIO.StringIO(data))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
+def dump_module(module):
+    """Serializes an iteration module with the values of its inputs.
+    """
+    state = dict((k, v) for k, v in module.__dict__.iteritems()
+                 if k not in _local_attributes)
+    module_info = dict((k, v) for k, v in module.moduleInfo.iteritems()
+                       if isinstance(v, (basestring, int, long, float)))
+    inputs = {}
+    for port_name, connectors in module.inputPorts.iteritems():
+        inputs[port_name] = [(conn.get_raw(), conn.obj.list_depth,
+                              conn.spec, conn.typecheck,
+                              module.is_method.get(conn))
+                             for conn in connectors]
+    return dumps((type(module), state, module_info, inputs))
+
+
+def compute_module(data):
+    """Runs compute() for a module serialized by dump_module().
+
+    Returns ('ok', serialized outputs) or ('error', (message, traceback)).
+
+    """
+    from vistrails.core.modules.basic_modules import create_constant
+
+    try:
+        klass, state, module_info, inputs = loads(data)
+        module = klass.__new__(klass)
+        module.__dict__.update(state)
+        module.logging = _dummy_logging
+        module.moduleInfo = module_info
+        module.iterated_ports = []
+        module.streamed_ports = {}
+        module.outputPorts = {}
+        module.inputPorts = {}
+        module.is_method = Bidict()
+        for port_name, connectors in inputs.iteritems():
+            module.inputPorts[port_name] = conns = []
+            for value, list_depth, spec, typecheck, method in connectors:
+                constant = create_constant(value)
+                constant.list_depth = list_depth
+                conn = ModuleConnector(constant, 'value', spec, typecheck)
+                if method is not None:
+                    module.is_method[conn] = method
+                conns.append(conn)
+        module.compute()
+        outputs = dict((k, v) for k, v in module.outputPorts.iteritems()
+                       if k != 'self')
+        return 'ok', dumps(outputs)
+    except ModuleError, e:
+        return 'error', (e.msg, e.errorTrace or traceback.format_exc())
+    except Exception, e:
+        return 'error', ("Uncaught exception: %s" %
+                         debug.format_exception(e).rstrip(),
+                         traceback.format_exc())
+
+
+class ProcessIterations(object):
+    """Runs the compute() method of the iteration modules on processes.
+
+    The module, with the values on its input ports, is pickled and sent to a
+    worker, which sends back the values of the output ports. Modules that
+    cannot be pickled are computed on the main thread, as usual.
+
+    """
+    def __init__(self, processes):
+        self.processes = processes
+
+    def start(self, modules):
+        pool = get_process_pool(self.processes)
+        for module in modules:
+            try:
+                data = dump_module(module)
+            except Exception, e:
+                debug.warning("Can't send loop iteration to a worker "
+                              "process", e)
+                continue
+            module.compute = self.waiter(
+                    module, pool.apply_async(compute_module, (data,)))
+
+    @staticmethod
+    def waiter(module, result):
+        def compute():
+            status, value = result.get()
+            if status == 'error':
+                msg, errorTrace = value
+                raise ModuleError(module, msg, errorTrace=errorTrace)
+            for port_name, output in loads(value).iteritems():
+                module.set_output(port_name, output)
+        return compute
+
+    def finish(self):
+        pass
@@ -0,0 +1,387 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Concurrent execution of independent pipeline branches.
+
+The CachedInterpreter normally updates the sinks of a pipeline one after
+the other, each of them recursively updating its upstream modules on the
+main thread. When concurrent execution is enabled, a ThreadedScheduler
+walks the dependency graph instead: once all the upstream modules of a
+module are done, the module is updated on a worker thread if it declares
+itself thread-safe (see Module.is_thread_safe()), or on the main thread
+otherwise.
+
+Logging calls made by modules running on worker threads are forwarded to
+the main thread, so that the log controller and the view are only ever
+used from there.
+
+"""
+
+from __future__ import division
+
+from collections import deque
+import multiprocessing
+import Queue
+import sys
+import threading
+
+import unittest
+
+
+class ThreadLogging(object):
+    """Proxy for a module's logging object used while the module runs on a
+    worker thread.
+
+    Every call is handed to the thread that owns the scheduler, and the
+    worker blocks until it has been performed there. Returned objects that
+    are instances of wrap_types (e.g. loops) are wrapped the same way.
+
+    """
+
+    def __init__(self, logging, events, owner, wrap_types=()):
+        self._logging = logging
+        self._events = events
+        self._owner = owner
+        self._wrap_types = wrap_types
+
+    def __getattr__(self, name):
+        attr = getattr(self._logging, name)
+        if not callable(attr):
+            return attr
+        def call(*args, **kwargs):
+            if threading.current_thread() is self._owner:
+                return self._wrap(attr(*args, **kwargs))
+            result = [None, None]
+            done = threading.Event()
+            self._events.put(('call', (attr, args, kwargs, result, done)))
+            done.wait()
+            if result[1] is not None:
+                raise result[1][0], result[1][1], result[1][2]
+            return self._wrap(result[0])
+        return call
+
+    def _wrap(self, value):
+        if isinstance(value, self._wrap_types):
+            return ThreadLogging(value, self._events, self._owner,
+                                 self._wrap_types)
+        return value
+
+    @staticmethod
+    def perform(attr, args, kwargs, result, done):
+        try:
+            result[0] = attr(*args, **kwargs)
+        except Exception:
+            result[1] = sys.exc_info()
+        done.set()
+
+
+class ThreadedScheduler(object):
+    """Updates modules in dependency order, running the thread-safe ones
+    on a pool of worker threads.
+
+    """
+
+    def __init__(self, max_workers=None, wrap_types=()):
+        self.wrap_types = wrap_types
+        if not max_workers:
+            try:
+                max_workers = multiprocessing.cpu_count()
+            except NotImplementedError: # pragma: no cover
+                max_workers = 1
+        self.max_workers = max_workers
+
+    @staticmethod
+    def upstream_modules(obj):
+        """upstream_modules(obj: Module) -> list of Module
+
+        Returns the modules connected to the input ports of obj.
+
+        """
+        result = []
+        seen = set()
+        for connector_list in obj.inputPorts.itervalues():
+            for connector in connector_list:
+                if id(connector.obj) not in seen:
+                    seen.add(id(connector.obj))
+                    result.append(connector.obj)
+        return result
+
+    def dependencies(self, sinks):
+        """dependencies(sinks: list of Module) -> (list, dict, dict)
+
+        Returns the modules needed to update sinks, in topological order,
+        and two dicts mapping the id() of each module to the modules
+        upstream and downstream of it.
+
+        """
+        order = []
+        upstream = {}
+        downstream = {}
+        for sink in sinks:
+            if id(sink) in upstream:
+                continue
+            stack = [(sink, False)]
+            while stack:
+                obj, expanded = stack.pop()
+                if expanded:
+                    order.append(obj)
+                    continue
+                if id(obj) in upstream:
+                    continue
+                upstream[id(obj)] = self.upstream_modules(obj)
+                downstream.setdefault(id(obj), [])
+                stack.append((obj, True))
+                for up in upstream[id(obj)]:
+                    downstream.setdefault(id(up), []).append(obj)
+                    if id(up) not in upstream:
+                        stack.append((up, False))
+        return order, upstream, downstream
+
+    @staticmethod
+    def is_thread_safe(obj):
+        # cached modules are cheap to update, keep them on the main thread
+        return not obj.upToDate and obj.is_thread_safe()
+
+    def execute(self, sinks, handle_error):
+        """execute(sinks: list of Module, handle_error: callable) -> bool
+
+        Updates every module needed by sinks. A module is started once
+        all its upstream modules have been updated successfully; modules
+        downstream of a failure are left alone.
+
+        handle_error(exc_info) is called on the current thread for each
+        module whose update() raised, and returns True to stop the
+        execution. Modules already running are waited for.
+
+        Returns True if the execution was stopped.
+
+        """
+        order, upstream, downstream = self.dependencies(sinks)
+        waiting = dict((id(obj), len(upstream[id(obj)])) for obj in order)
+        main_ready = deque()
+        pool_ready = deque()
+        def release(obj):
+            if self.is_thread_safe(obj):
+                pool_ready.append(obj)
+            else:
+                main_ready.append(obj)
+        for obj in order:
+            if not waiting[id(obj)]:
+                release(obj)
+
+        owner = threading.current_thread()
+        events = Queue.Queue()
+        tasks = Queue.Queue()
+        workers = []
+        loggings = {}
+        running = [0]
+        stopped = False
+
+        def work():
+            while True:
+                obj = tasks.get()
+                if obj is None:
+                    return
+                try:
+                    obj.update()
+                    exc_info = None
+                except Exception:
+                    exc_info = sys.exc_info()
+                events.put(('done', (obj, exc_info)))
+
+        def finished(obj, exc_info):
+            if exc_info is not None:
+                return handle_error(exc_info)
+            for down in downstream[id(obj)]:
+                waiting[id(down)] -= 1
+                if not waiting[id(down)]:
+                    release(down)
+            return False
+
+        def process(event):
+            kind, payload = event
+            if kind == 'call':
+                ThreadLogging.perform(*payload)
+                return False
+            obj, exc_info = payload
+            running[0] -= 1
+            obj.logging = loggings.pop(id(obj))
+            return finished(obj, exc_info)
+
+        try:
+            while True:
+                while pool_ready and not stopped:
+                    obj = pool_ready.popleft()
+                    if len(workers) < min(self.max_workers, running[0] + 1):
+                        worker = threading.Thread(target=work,
+                                                  name='vistrails-worker')
+                        worker.daemon = True
+                        worker.start()
+                        workers.append(worker)
+                    loggings[id(obj)] = obj.logging
+                    obj.logging = ThreadLogging(obj.logging, events, owner,
+                                                self.wrap_types)
+                    running[0] += 1
+                    tasks.put(obj)
+                try:
+                    while True:
+                        stopped = process(events.get_nowait()) or stopped
+                except Queue.Empty:
+                    pass
+                if stopped and not running[0]:
+                    break
+                if main_ready and not stopped:
+                    obj = main_ready.popleft()
+                    try:
+                        obj.update()
+                        exc_info = None
+                    except Exception:
+                        exc_info = sys.exc_info()
+                    stopped = finished(obj, exc_info) or stopped
+                elif running[0]:
+                    stopped = process(events.get()) or stopped
+                elif not pool_ready or stopped:
+                    break
+        finally:
+            for worker in workers:
+                tasks.put(None)
+            for obj in order:
+                if id(obj) in loggings:
+                    obj.logging = loggings.pop(id(obj))
+        return stopped
+
+##############################################################################
+
+class _Connector(object):
+    def __init__(self, obj):
+        self.obj = obj
+
+class _Logging(object):
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def begin_update(self, obj):
+        self.threads.add(threading.current_thread())
+        self.calls.append(('begin', obj.name))
+
+class _Module(object):
+    def __init__(self, name, upstream, thread_safe, log, events,
+                 fail=False):
+        self.name = name
+        self.inputPorts = {'in': [_Connector(m) for m in upstream]}
+        self.upToDate = False
+        self.computed = False
+        self.thread_safe = thread_safe
+        self.logging = log
+        self.events = events
+        self.fail = fail
+
+    def is_thread_safe(self):
+        return self.thread_safe
+
+    def update(self):
+        if self.computed:
+            return
+        self.logging.begin_update(self)
+        for connector_list in self.inputPorts.itervalues():
+            for connector in connector_list:
+                assert connector.obj.computed
+        self.events.append((self.name, threading.current_thread()))
+        if self.fail:
+            raise ValueError(self.name)
+        self.computed = True
+
+class TestThreadedScheduler(unittest.TestCase):
+    def make_modules(self, fail=None):
+        """Builds a diamond: a -> (b, c) -> d, plus e -> d."""
+        log = _Logging()
+        events = []
+        def module(name, upstream, thread_safe):
+            return _Module(name, upstream, thread_safe, log, events,
+                           name == fail)
+        a = module('a', [], False)
+        b = module('b', [a], True)
+        c = module('c', [a], True)
+        e = module('e', [], True)
+        d = module('d', [b, c, e], False)
+        return log, events, dict(a=a, b=b, c=c, d=d, e=e)
+
+    def test_order(self):
+        log, events, modules = self.make_modules()
+        errors = []
+        stopped = ThreadedScheduler(2).execute(
+                [modules['d']], lambda exc_info: errors.append(exc_info))
+        self.assertFalse(stopped)
+        self.assertEqual(errors, [])
+        names = [name for name, _ in events]
+        self.assertEqual(sorted(names), ['a', 'b', 'c', 'd', 'e'])
+        self.assertLess(names.index('a'), names.index('b'))
+        self.assertLess(names.index('a'), names.index('c'))
+        self.assertEqual(names[-1], 'd')
+        main = threading.current_thread()
+        for name, thread in events:
+            if name in ('a', 'd'):
+                self.assertIs(thread, main)
+            else:
+                self.assertIsNot(thread, main)
+        # logging only happened on the main thread, and loggers are restored
+        self.assertEqual(log.threads, set([main]))
+        self.assertEqual(len(log.calls), 5)
+        for m in modules.itervalues():
+            self.assertIs(m.logging, log)
+
+    def test_error(self):
+        log, events, modules = self.make_modules(fail='b')
+        errors = []
+        def handle_error(exc_info):
+            errors.append(exc_info[1])
+            return False
+        stopped = ThreadedScheduler(2).execute([modules['d']], handle_error)
+        self.assertFalse(stopped)
+        self.assertEqual([str(e) for e in errors], ['b'])
+        names = [name for name, _ in events]
+        self.assertNotIn('d', names)
+        self.assertIn('c', names)
+
+    def test_stop(self):
+        log, events, modules = self.make_modules(fail='a')
+        stopped = ThreadedScheduler(2).execute([modules['d']],
+                                               lambda exc_info: True)
+        self.assertTrue(stopped)
+        names = [name for name, _ in events]
+        self.assertNotIn('b', names)
+        self.assertNotIn('d', names)
@@ -36,9 +36,13 @@
 
 from __future__ import division
 
+import array
 import copy
+import json
+import math
 
 from vistrails.core import debug
+from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.core.log.workflow_exec import WorkflowExec
 from vistrails.core.log.module_exec import ModuleExec
 from vistrails.core.log.loop_exec import LoopExec, LoopIteration
@@ -49,6 +53,7 @@ from vistrails.core.vistrail.annotation import Annotation
 from vistrails.core.vistrail.pipeline import Pipeline
 from vistrails.core.vistrail.vistrail import Vistrail
 import vistrails.core.system
+from vistrails.db.services.log import LOOP_SUMMARY_KEY
 
 
 @apply
@@ -96,6 +101,7 @@ class LogController(object):
         self.module_execs = {}      # vistrails_module -> *Exec
         self.parent_execs = {}      # vistrails_module -> *Exec
         self.children_execs = {}    # vistrails_module -> [*Exec]
+        self.loop_controllers = {}  # LoopExec -> LogLoopController
         if machine is not None:
             self.machine = machine
         else:
@@ -145,11 +151,85 @@ class LogController(object):
                                          vistrail, pipeline, currentVersion)
 
 
+class LoopSummary(object):
+    """Aggregated statistics on the iterations of a loop.
+
+    This is what is left of the iterations that are not logged individually
+    when the loop logging is 'sampled' or 'aggregated'. It is stored as a
+    JSON annotation on the execution that owns the loop.
+    """
+    max_error_kinds = 20
+    percentiles = (50, 90, 99)
+
+    def __init__(self, loop_exec, granularity):
+        self.loop_exec = loop_exec
+        self.granularity = granularity
+        self.count = 0
+        self.completed = 0
+        self.suspended = 0
+        self.errors = {}
+        self.durations = array.array('d')
+
+    def add(self, duration, completed, error=None):
+        self.count += 1
+        if duration is not None:
+            self.durations.append(duration)
+        if completed == 1:
+            self.completed += 1
+        elif completed == -2:
+            self.suspended += 1
+        else:
+            error = (error or 'Unknown error').strip().split('\n', 1)[0]
+            error = error[:200]
+            if (error not in self.errors and
+                    len(self.errors) >= self.max_error_kinds):
+                error = 'Other errors'
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def to_dict(self):
+        summary = {'loop_exec': self.loop_exec.id,
+                   'granularity': self.granularity,
+                   'iterations': self.count,
+                   'completed': self.completed,
+                   'suspended': self.suspended,
+                   'errors': sum(self.errors.itervalues()),
+                   'error_histogram': self.errors}
+        if self.durations:
+            durations = sorted(self.durations)
+            n = len(durations)
+            summary['duration'] = duration = {
+                    'total': math.fsum(durations),
+                    'min': durations[0],
+                    'max': durations[-1]}
+            for p in self.percentiles:
+                rank = int(math.ceil(p * n / 100.0))
+                duration['p%d' % p] = durations[max(rank, 1) - 1]
+        return summary
+
+
 class LogLoopController(object):
-    def __init__(self, controller, loop_exec, loop_module):
+    """Logs the iterations of a loop.
+
+    With the default 'full' granularity, every iteration is recorded. With
+    'sampled', only the first and last iterations, those that failed and
+    every Nth are kept; with 'aggregated', none is. The other iterations
+    (and what executed in them) are dropped once they are done and only
+    counted in a LoopSummary.
+    """
+    def __init__(self, controller, loop_exec, loop_module,
+                 granularity='full', sample_every=0, owner_exec=None):
         self.controller = controller
         self.loop_exec = loop_exec
         self.loop_module = loop_module
+        self.granularity = granularity
+        self.sample_every = sample_every
+        self.owner_exec = owner_exec
+        if granularity == 'full':
+            self.summary = None
+        else:
+            self.summary = LoopSummary(loop_exec, granularity)
+        self.pending = {}       # looped_module -> unfinished LoopIteration
+        self.last = None        # last finished iteration, if not kept
 
     def _create_loop_iteration(self, iteration):
         l_iteration_id = self.controller.log.id_scope.getNewId(
@@ -168,12 +248,16 @@ class LogLoopController(object):
             execs.discard(self.loop_exec)
         except KeyError:
             pass
+        self.flush()
 
     def start_iteration(self, looped_module, iteration):
         """Signals that we are executing a module as an iteration of the loop.
         """
         loop_iteration = self._create_loop_iteration(iteration)
-        self.loop_exec.add_loop_iteration(loop_iteration)
+        if self.summary is None:
+            self.loop_exec.add_loop_iteration(loop_iteration)
+        else:
+            self.pending[id(looped_module)] = loop_iteration
         self.controller.parent_execs[id(looped_module)] = loop_iteration
 
     def finish_iteration(self, looped_module):
@@ -184,6 +268,66 @@ class LogLoopController(object):
 
         loop_iteration.ts_end = vistrails.core.system.current_time()
         loop_iteration.completed = 1
+        if self.summary is not None:
+            self.pending.pop(id(looped_module), None)
+            self._record(loop_iteration)
+
+    def _record(self, loop_iteration):
+        """Counts a finished iteration, and keeps it if it is sampled.
+        """
+        completed, error = loop_iteration.completed, loop_iteration.error
+        for item_exec in loop_iteration.item_execs:
+            item_completed = getattr(item_exec, 'db_completed', 1)
+            if item_completed == -1:
+                completed, error = -1, item_exec.db_error
+                break
+            elif item_completed == -2:
+                completed = -2
+        duration = loop_iteration.duration
+        if duration is not None:
+            # timedelta.total_seconds() is new in Python 2.7
+            duration = (duration.days * 86400 + duration.seconds +
+                        duration.microseconds / 1e6)
+        first = self.summary.count == 0
+        self.summary.add(duration, completed, error)
+
+        self.last = None
+        if self.granularity != 'sampled':
+            return
+        if (first or completed != 1 or
+                (self.sample_every > 0 and
+                 loop_iteration.iteration % self.sample_every == 0)):
+            self.loop_exec.add_loop_iteration(loop_iteration)
+        else:
+            self.last = loop_iteration
+
+    def flush(self, error=None):
+        """Records the summary of the loop, once it is over.
+
+        Iterations that were started but not finished failed with the loop.
+        """
+        self.controller.loop_controllers.pop(id(self.loop_exec), None)
+        if self.summary is None:
+            return
+        for loop_iteration in sorted(self.pending.itervalues(),
+                                     key=lambda i: i.iteration):
+            loop_iteration.ts_end = vistrails.core.system.current_time()
+            loop_iteration.completed = -1
+            loop_iteration.error = error
+            self._record(loop_iteration)
+        self.pending = {}
+        if self.last is not None:
+            self.loop_exec.add_loop_iteration(self.last)
+            self.last = None
+
+        if self.owner_exec is not None:
+            a_id = self.controller.log.id_scope.getNewId(Annotation.vtType)
+            self.owner_exec.add_annotation(Annotation(
+                    id=a_id,
+                    key=LOOP_SUMMARY_KEY,
+                    value=json.dumps(self.summary.to_dict(),
+                                     sort_keys=True)))
+        self.summary = None
 
 
 class LogWorkflowController(LogController):
@@ -221,8 +365,10 @@ class LogWorkflowController(LogController):
         """
         if id(parent_exec) in self.module_execs:
             parent_exec = self.module_execs[id(parent_exec)]
-        return LogWorkflowController(self.log, self.machine, parent_exec,
-                                     self.workflow_exec)
+        controller = LogWorkflowController(self.log, self.machine,
+                                           parent_exec, self.workflow_exec)
+        controller.loop_controllers = self.loop_controllers
+        return controller
 
     def get_iteration_from_module(self, module):
         """If executing this module as part of a loop, gets the iteration;
@@ -272,9 +418,23 @@ class LogWorkflowController(LogController):
                     parent_exec.add_loop_exec(loop_exec)
                 break
         else:
-            self.workflow_exec.add_item_exec(loop_exec)
+            parent_exec = self.workflow_exec
+            parent_exec.add_item_exec(loop_exec)
         self.children_execs.setdefault(id(loop_module), set()).add(loop_exec)
-        return LogLoopController(self, loop_exec, loop_module)
+
+        conf = get_vistrails_configuration()
+        granularity = getattr(conf, 'loopLogging', 'full') if conf else 'full'
+        if granularity not in ('sampled', 'aggregated'):
+            return LogLoopController(self, loop_exec, loop_module)
+        if not hasattr(parent_exec, 'add_annotation'):
+            parent_exec = self.workflow_exec
+        controller = LogLoopController(
+                self, loop_exec, loop_module,
+                granularity=granularity,
+                sample_every=getattr(conf, 'loopLogSample', 0),
+                owner_exec=parent_exec)
+        self.loop_controllers[id(loop_exec)] = controller
+        return controller
 
     def finish_execution(self, module, error, errorTrace=None, suspended=False):
         """Signals the end of the execution of a module.
@@ -313,6 +473,8 @@ class LogWorkflowController(LogController):
             else:
                 child.completed = -1
                 child.error = error
+            if id(child) in self.loop_controllers:
+                self.loop_controllers[id(child)].flush(error)
 
     def insert_module_annotations(self, module, a_dict):
         """Adds an annotation on the execution object for this module.
@@ -386,6 +548,9 @@ class LogWorkflowExecController(LogWorkflowController):
     def finish_workflow_execution(self, errors, suspended=False):
         """Signals the end of the execution of a pipeline.
         """
+        # loops interrupted by an error in one of their iterations
+        for controller in self.loop_controllers.values():
+            controller.flush('Loop interrupted')
         self.workflow_exec.ts_end = vistrails.core.system.current_time()
         if suspended:
             self.workflow_exec.completed = -2
@@ -393,3 +558,90 @@ class LogWorkflowExecController(LogWorkflowController):
             self.workflow_exec.completed = -1
         else:
             self.workflow_exec.completed = 1
+
+
+import unittest
+
+
+class TestLoopLogging(unittest.TestCase):
+    def run_loop(self, granularity, iterations=10, failing=(), stop=None):
+        """Logs a loop through the controller API.
+
+        Returns the execution of the looping module.
+        """
+        from vistrails.core.log.log import Log
+
+        conf = get_vistrails_configuration()
+        old_values = conf.loopLogging, conf.loopLogSample
+        conf.loopLogging, conf.loopLogSample = granularity, 4
+        try:
+            log = Log()
+            controller = LogController(log).start_workflow_execution(
+                    None, pipeline=Pipeline(id=1))
+            looping = object()
+            controller.start_execution(looping, 1, 'Looping')
+            loop = controller.start_loop_execution(looping, iterations)
+            for i in xrange(iterations):
+                module = object()
+                loop.start_iteration(module, i)
+                controller.start_execution(module, 2, 'Looped')
+                if i in failing or i == stop:
+                    controller.finish_execution(module, 'failed')
+                else:
+                    controller.finish_execution(module, None)
+                if i == stop:
+                    controller.finish_execution(looping, 'interrupted')
+                    break
+                loop.finish_iteration(module)
+            else:
+                loop.finish_loop_execution()
+                controller.finish_execution(looping, None)
+            controller.finish_workflow_execution({})
+        finally:
+            conf.loopLogging, conf.loopLogSample = old_values
+        return log.workflow_execs[0].item_execs[0]
+
+    @staticmethod
+    def iterations(module_exec):
+        loop_exec, = module_exec.loop_execs
+        return [i.iteration for i in loop_exec.loop_iterations]
+
+    @staticmethod
+    def summary(module_exec):
+        from vistrails.db.services.log import get_loop_summaries
+        loop_exec, = module_exec.loop_execs
+        return get_loop_summaries(module_exec).get(loop_exec.id)
+
+    def test_full(self):
+        module_exec = self.run_loop('full')
+        self.assertEqual(self.iterations(module_exec), range(10))
+        self.assertIsNone(self.summary(module_exec))
+
+    def test_sampled(self):
+        module_exec = self.run_loop('sampled', failing=[5])
+        self.assertEqual(self.iterations(module_exec), [0, 4, 5, 8, 9])
+        summary = self.summary(module_exec)
+        self.assertEqual((summary['iterations'], summary['completed'],
+                          summary['errors']),
+                         (10, 9, 1))
+        self.assertEqual(summary['error_histogram'], {'failed': 1})
+
+    def test_aggregated(self):
+        module_exec = self.run_loop('aggregated', iterations=200,
+                                    failing=[3, 7])
+        self.assertEqual(self.iterations(module_exec), [])
+        summary = self.summary(module_exec)
+        self.assertEqual((summary['iterations'], summary['completed'],
+                          summary['errors'], summary['granularity']),
+                         (200, 198, 2, 'aggregated'))
+        duration = summary['duration']
+        self.assertLessEqual(duration['min'], duration['p50'])
+        self.assertLessEqual(duration['p99'], duration['max'])
+
+    def test_interrupted(self):
+        module_exec = self.run_loop('sampled', stop=6)
+        self.assertEqual(self.iterations(module_exec), [0, 4, 6])
+        loop_exec, = module_exec.loop_execs
+        self.assertEqual(loop_exec.loop_iterations[-1].completed, -1)
+        summary = self.summary(module_exec)
+        self.assertEqual((summary['iterations'], summary['errors']), (7, 1))
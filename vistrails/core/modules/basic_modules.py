@@ -38,6 +38,8 @@ pipelines."""
 from __future__ import division
 
 import vistrails.core.cache.hasher
+from vistrails.core.cache.file_digest import get_file_digest_cache
+from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.core.debug import format_exception
 from vistrails.core.modules.module_registry import get_module_registry
 from vistrails.core.modules.vistrails_module import Module, new_module, \
@@ -398,7 +400,27 @@ class Path(Constant):
 
 Path.default_value = PathObject('')
 
+def path_content_hasher(p):
+    """Signs a path by the digest of its contents rather than its name,
+    using the digest cache so unchanged files are not read again.
+
+    """
+    try:
+        digest = get_file_digest_cache().path_digest(p.strValue)
+    except (IOError, OSError):
+        return vistrails.core.cache.hasher.Hasher.parameter_signature(p)
+    hasher = sha_hash()
+    hasher.update(p.type)
+    hasher.update(p.identifier)
+    hasher.update(p.namespace or "")
+    hasher.update(digest)
+    return hasher.digest()
+
 def path_parameter_hasher(p):
+    conf = get_vistrails_configuration()
+    if getattr(conf, 'pathSignature', 'mtime') == 'content':
+        return path_content_hasher(p)
+
     def get_mtime(path):
         t = int(os.path.getmtime(path))
         if os.path.isdir(path):
@@ -1715,7 +1737,62 @@ class TestUnzip(unittest.TestCase):
                  ([], ['file2.txt'])])
 
 
-from vistrails.core.configuration import get_vistrails_configuration
+class TestPathSignature(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp(prefix='vt_pathsig_')
+        conf = get_vistrails_configuration()
+        self.old_values = conf.pathSignature, conf.fileDigestCache
+        conf.fileDigestCache = os.path.join(self.directory, 'digests')
+
+    def tearDown(self):
+        conf = get_vistrails_configuration()
+        conf.pathSignature, conf.fileDigestCache = self.old_values
+        shutil.rmtree(self.directory)
+
+    def make_param(self, name, contents):
+        import time
+        from vistrails.core.vistrail.module_param import ModuleParam
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as fp:
+            fp.write(contents)
+        mtime = time.time() - 60
+        os.utime(path, (mtime, mtime))
+        return ModuleParam(type='File', val=path, identifier=identifier)
+
+    def test_content(self):
+        p1 = self.make_param('a.txt', 'contents')
+        p2 = self.make_param('b.txt', 'contents')
+        p3 = self.make_param('c.txt', 'other contents')
+        conf = get_vistrails_configuration()
+        conf.pathSignature = 'mtime'
+        self.assertNotEqual(path_parameter_hasher(p1),
+                            path_parameter_hasher(p2))
+        conf.pathSignature = 'content'
+        sig = path_parameter_hasher(p1)
+        self.assertEqual(path_parameter_hasher(p2), sig)
+        self.assertNotEqual(path_parameter_hasher(p3), sig)
+        os.utime(p1.strValue, None)
+        self.assertEqual(path_parameter_hasher(p1), sig)
+
+    def test_saved_per_pass(self):
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.module_function import ModuleFunction
+        from vistrails.core.vistrail.pipeline import Pipeline
+        conf = get_vistrails_configuration()
+        conf.pathSignature = 'content'
+        pipeline = Pipeline()
+        for i in xrange(3):
+            param = self.make_param('%d.txt' % i, str(i))
+            function = ModuleFunction(name='value', parameters=[param])
+            pipeline.add_module(Module(id=i, name='File', package=identifier,
+                                       functions=[function]))
+        # the hasher doesn't write the digests, the signature pass does
+        path_parameter_hasher(param)
+        self.assertFalse(os.path.exists(conf.fileDigestCache))
+        pipeline.compute_signatures()
+        self.assertTrue(os.path.isfile(conf.fileDigestCache))
+
 
 class TestTypechecking(unittest.TestCase):
     @classmethod
@@ -35,7 +35,7 @@
 ###############################################################################
 from __future__ import division
 
-from itertools import izip, chain
+from itertools import izip, imap, chain
 from ast import literal_eval
 import collections
 import copy
@@ -530,6 +530,10 @@ class ModuleRegistry(DBRegistry):
 
     def set_defaults(self, other=None):
         self._root_descriptor = None
+        # generation is incremented whenever modules, ports or packages are
+        # added or removed, so that copies of the registry kept elsewhere
+        # (e.g. in worker processes) can be detected as stale
+        self.generation = 0
         self.signals = ModuleRegistrySignals()
         self.setup_indices()
         if other is None:
@@ -551,6 +555,7 @@ class ModuleRegistry(DBRegistry):
                 self.packages[other._default_package.identifier]
 
     def setup_indices(self):
+        self.reset_type_index()
         self.descriptors_by_id = {}
         self.package_versions = self.db_packages_identifier_index
         self.packages = {}
@@ -632,6 +637,8 @@ class ModuleRegistry(DBRegistry):
         # self.descriptors[(desc.package, desc.name, desc.namespace)] = desc
         self.descriptors_by_id[desc.id] = desc
         package.add_descriptor(desc)
+        self._update_type_index(desc)
+        self.generation += 1
     def delete_descriptor(self, desc, package=None):
         if package is None:
             try:
@@ -643,6 +650,8 @@ class ModuleRegistry(DBRegistry):
         # del self.descriptors[(desc.package, desc.name, desc.namespace)]
         del self.descriptors_by_id[desc.id]
         package.delete_descriptor(desc)
+        self._update_type_index(desc, deleted=True)
+        self.generation += 1
     def add_package(self, package):
         DBRegistry.db_add_package(self, package)
         for key in chain(package.old_identifiers, [package.identifier]):
@@ -652,12 +661,14 @@ class ModuleRegistry(DBRegistry):
                     self.packages[key] = package
             else:
                 self.packages[key] = package
+        self.generation += 1
 
     def delete_package(self, package):
         DBRegistry.db_delete_package(self, package)
         # FIXME hard to incremental updates here so we'll just recreate
         # this can be slow
         self.setup_indices()
+        self.generation += 1
 
     def has_abs_upgrade(self, identifier, name, namespace='',
                         package_version='', module_version=''):
@@ -897,6 +908,29 @@ class ModuleRegistry(DBRegistry):
         else:
             return vistrails.core.cache.hasher.Hasher.module_signature(module, chm)
 
+    def has_custom_signature(self, module):
+        """has_custom_signature(module: Module) -> bool
+
+        Returns True if the signature of the module comes from a
+        package-provided hasher, either for the module itself or for
+        one of its parameters. Such signatures may depend on state
+        outside the pipeline (e.g. file modification times) and can't
+        be cached across executions.
+        """
+        descriptor = self.get_descriptor_by_name(module.package,
+                                                 module.name,
+                                                 module.namespace)
+        if descriptor and descriptor.hasher_callable():
+            return True
+        chm = self._constant_hasher_map
+        if not chm:
+            return False
+        for function in module.functions:
+            for p in function.params:
+                if (p.identifier, p.type, p.namespace) in chm:
+                    return True
+        return False
+
     def get_module_color(self, identifier, name, namespace=None):
         return self.get_descriptor_by_name(identifier, name, namespace).module_color()
 
@@ -942,6 +976,7 @@ class ModuleRegistry(DBRegistry):
         if issubclass(module,
                 vistrails.core.modules.vistrails_module.Converter):
             self._conversions = dict()
+            self._converter_signatures = {}
             self._converters.add(descriptor)
 
         if module is not None:
@@ -1502,6 +1537,7 @@ class ModuleRegistry(DBRegistry):
             raise InvalidPortSpec(descriptor, spec.name, spec.type, e)
 
         descriptor.add_port_spec(spec)
+        self.generation += 1
         if spec.type == 'input':
             self.signals.emit_new_input_port(descriptor.identifier,
                                              descriptor.name, spec.name, spec)
@@ -1699,6 +1735,7 @@ class ModuleRegistry(DBRegistry):
                 vistrails.core.modules.vistrails_module.Converter)
         if self.is_descriptor_subclass(descriptor, converter_desc):
             self._conversions = dict()
+            self._converter_signatures = {}
             self._converters.remove(descriptor)
 
         self.signals.emit_deleted_module(descriptor)
@@ -1748,10 +1785,12 @@ class ModuleRegistry(DBRegistry):
     def delete_input_port(self, descriptor, port_name):
         """ Just remove a name input port with all of its specs """
         descriptor.delete_input_port(port_name)
+        self.generation += 1
 
     def delete_output_port(self, descriptor, port_name):
         """ Just remove a name output port with all of its specs """
         descriptor.delete_output_port(port_name)
+        self.generation += 1
 
     def source_ports_from_descriptor(self, descriptor, sorted=True):
         ports = [p[1] for p in self.module_ports('output', descriptor)]
@@ -1877,18 +1916,56 @@ class ModuleRegistry(DBRegistry):
                     vistrails.core.modules.vistrails_module.Converter):
                 continue
 
-            if converter.module.can_convert(sub_descs, super_descs):
+            signature = self._get_converter_signature(converter)
+            if signature is None:
+                if converter.module.can_convert(sub_descs, super_descs):
+                    converters.append(converter)
+            elif (len(sub_descs) == len(signature[0]) and
+                    len(signature[1]) == len(super_descs) and
+                    self.is_descriptor_list_subclass(sub_descs,
+                                                     signature[0]) and
+                    self.is_descriptor_list_subclass(signature[1],
+                                                     super_descs)):
                 converters.append(converter)
 
         # Store in the cache that there was no result
         self._conversions[key] = converters
         return converters
 
+    def _get_converter_signature(self, converter):
+        """_get_converter_signature(converter) -> (in_descs, out_descs)
+        Returns the descriptors of the ports the default
+        Converter.can_convert() compares, or None if the converter
+        overrides can_convert().
+
+        """
+        try:
+            return self._converter_signatures[converter]
+        except KeyError:
+            pass
+        can_convert = converter.module.can_convert.im_func
+        base = vistrails.core.modules.vistrails_module.Converter
+        if can_convert is not base.can_convert.im_func:
+            signature = None
+        else:
+            in_port = self.get_port_spec_from_descriptor(
+                    converter, 'in_value', 'input')
+            out_port = self.get_port_spec_from_descriptor(
+                    converter, 'out_value', 'output')
+            signature = (tuple(in_port.descriptors()),
+                         tuple(out_port.descriptors()))
+        self._converter_signatures[converter] = signature
+        return signature
+
     def is_descriptor_list_subclass(self, sub_descs, super_descs):
-        basic_pkg = get_vistrails_basic_pkg_id()
-        variant_desc = self.get_descriptor_by_name(basic_pkg, 'Variant')
-        module_desc = self.get_descriptor_by_name(basic_pkg, 'Module')
+        key = self._type_index_key(sub_descs, super_descs)
+        try:
+            return self._compatible[key][0]
+        except KeyError:
+            pass
 
+        variant_desc, _, module_desc = self.get_basic_type_descriptors()
+        result = True
         for (sub_desc, super_desc) in izip(sub_descs, super_descs):
             if sub_desc == variant_desc or super_desc == variant_desc:
                 continue
@@ -1900,8 +1977,10 @@ class ModuleRegistry(DBRegistry):
                         category=VistrailsDeprecation)
                 #return False
             if not self.is_descriptor_subclass(sub_desc, super_desc):
-                return False
-        return True
+                result = False
+                break
+        self._compatible[key] = (result, sub_descs, super_descs)
+        return result
 
     def are_specs_matched(self, sub, super, allow_conversion=False,
                           out_converters=None):
@@ -1910,9 +1989,6 @@ class ModuleRegistry(DBRegistry):
         
         """
         # For a connection, this gets called for sub -> super
-        basic_pkg = get_vistrails_basic_pkg_id()
-        variant_desc = self.get_descriptor_by_name(basic_pkg, 'Variant')
-        list_desc = self.get_descriptor_by_name(basic_pkg, 'List')
         # sometimes sub is coming None
         # I don't know if this is expected, so I will put a test here
         sub_descs = []
@@ -1920,13 +1996,35 @@ class ModuleRegistry(DBRegistry):
             sub_descs = sub.descriptors()
         if sub_descs is None:
             return False
-        elif sub_descs == [variant_desc]:
-            return True
         super_descs = []
         if super:
             super_descs = super.descriptors()
         if super_descs is None:
-            return False
+            variant_desc = self.get_basic_type_descriptors()[0]
+            return sub_descs == [variant_desc]
+
+        key = self._type_index_key(sub_descs, super_descs)
+        try:
+            matched = self._matched[key][0]
+        except KeyError:
+            matched = self._are_descriptors_matched(sub_descs, super_descs)
+            self._matched[key] = (matched, sub_descs, super_descs)
+        if matched:
+            return True
+
+        if allow_conversion:
+            converters = self.get_converters(sub_descs, super_descs)
+            if converters:
+                if out_converters is not None:
+                    out_converters.extend(converters)
+                return True
+
+        return False
+
+    def _are_descriptors_matched(self, sub_descs, super_descs):
+        variant_desc, list_desc, _ = self.get_basic_type_descriptors()
+        if sub_descs == [variant_desc]:
+            return True
         elif super_descs == [variant_desc]:
             return True
         elif [list_desc] in [super_descs, sub_descs]:
@@ -1941,18 +2039,8 @@ class ModuleRegistry(DBRegistry):
         #    # List is handled as Variant with depth 1
         #    return True
 
-        if (len(sub_descs) == len(super_descs) and
-                self.is_descriptor_list_subclass(sub_descs, super_descs)):
-            return True
-
-        if allow_conversion:
-            converters = self.get_converters(sub_descs, super_descs)
-            if converters:
-                if out_converters is not None:
-                    out_converters.extend(converters)
-                return True
-
-        return False
+        return (len(sub_descs) == len(super_descs) and
+                self.is_descriptor_list_subclass(sub_descs, super_descs))
 
     def get_module_hierarchy(self, descriptor):
         """get_module_hierarchy(descriptor) -> [klass].
@@ -2096,12 +2184,84 @@ class ModuleRegistry(DBRegistry):
         # otherwise, use descriptors themselves
         if sub == super:
             return True
-        while sub != self.root_descriptor:
-            sub = sub.base_descriptor
-            if sub == super:
-                return True
+        return super in self.get_descriptor_ancestors(sub)
 
-        return False
+    ##########################################################################
+    # Type index
+    #
+    # Port matching is checked for every connection when pipelines are
+    # built, validated and upgraded, so the registry keeps the ancestors
+    # of each descriptor and the result of each descriptor list
+    # comparison. Comparisons are keyed by descriptor identity because
+    # hashing and comparing descriptors by value is comparatively slow;
+    # the entries hold the descriptors so that their ids are not reused.
+    # Adding a descriptor cannot change how existing descriptors relate,
+    # so the index is only pruned when descriptors are deleted.
+
+    def reset_type_index(self):
+        self._ancestors = {}
+        self._compatible = {}
+        self._matched = {}
+        self._basic_type_descriptors = None
+        self._conversions = dict()
+        self._converter_signatures = {}
+
+    @staticmethod
+    def _type_index_key(sub_descs, super_descs):
+        return (tuple(imap(id, sub_descs)), tuple(imap(id, super_descs)))
+
+    def _update_type_index(self, desc, deleted=False):
+        if desc.identifier == get_vistrails_basic_pkg_id():
+            self._basic_type_descriptors = None
+        # descriptors are only deleted once they have no children, so no
+        # other ancestor set refers to desc
+        self._ancestors.pop(desc, None)
+        if not deleted:
+            return
+        for index in (self._compatible, self._matched):
+            for key in [key for key, (_, sub_descs, super_descs)
+                        in index.iteritems()
+                        if desc in sub_descs or desc in super_descs]:
+                del index[key]
+        for key in [key for key in self._conversions
+                    if desc in key[0] or desc in key[1]]:
+            del self._conversions[key]
+
+    def get_basic_type_descriptors(self):
+        """get_basic_type_descriptors() -> (Variant, List, Module)
+        Returns the descriptors that port matching treats specially.
+
+        """
+        if self._basic_type_descriptors is None:
+            basic_pkg = get_vistrails_basic_pkg_id()
+            self._basic_type_descriptors = tuple(
+                    self.get_descriptor_by_name(basic_pkg, name)
+                    for name in ('Variant', 'List', 'Module'))
+        return self._basic_type_descriptors
+
+    def get_descriptor_ancestors(self, descriptor):
+        """get_descriptor_ancestors(descriptor) -> frozenset
+        Returns descriptor and every descriptor it derives from.
+
+        """
+        try:
+            return self._ancestors[descriptor]
+        except KeyError:
+            pass
+        chain = [descriptor]
+        ancestors = None
+        while chain[-1] != self.root_descriptor:
+            base = chain[-1].base_descriptor
+            if base in self._ancestors:
+                ancestors = self._ancestors[base]
+                break
+            chain.append(base)
+        if ancestors is None:
+            ancestors = frozenset()
+        for desc in reversed(chain):
+            ancestors = ancestors | frozenset([desc])
+            self._ancestors[desc] = ancestors
+        return ancestors
 
     def find_descriptor_subclass(self, d1, d2):
         if self.is_descriptor_subclass(d1, d2):
@@ -2149,6 +2309,7 @@ class ModuleRegistry(DBRegistry):
     def hide_module(self, descriptor):
         self.signals.emit_hide_module(descriptor)
     def update_module(self, old_descriptor, new_descriptor):
+        self.generation += 1
         self.signals.emit_module_updated(old_descriptor, new_descriptor)
 
     def expand_port_spec_string(self, p_string, cur_package=None, 
@@ -2190,3 +2351,39 @@ class TestModuleRegistry(unittest.TestCase):
         t1 = PortSpec(signature=[Float, Integer])
         t2 = PortSpec(signature=[Integer, Float])
         self.assertNotEquals(t1, t2)
+
+    def test_type_index(self):
+        from vistrails.core.modules.basic_modules import String
+        reg = get_module_registry()
+        basic_pkg = get_vistrails_basic_pkg_id()
+        string_desc = reg.get_descriptor(String)
+        variant_desc, list_desc, module_desc = \
+            reg.get_basic_type_descriptors()
+        class IndexTestString(String):
+            pass
+        class IndexTestSubString(IndexTestString):
+            pass
+        basic_version = reg.packages[basic_pkg].version
+        desc = reg.add_module(IndexTestString, package=basic_pkg,
+                              package_version=basic_version)
+        sub_desc = reg.add_module(IndexTestSubString, package=basic_pkg,
+                                  package_version=basic_version)
+        try:
+            ancestors = reg.get_descriptor_ancestors(sub_desc)
+            self.assertIn(desc, ancestors)
+            self.assertIn(string_desc, ancestors)
+            self.assertIn(module_desc, ancestors)
+            self.assertNotIn(list_desc, ancestors)
+            self.assertTrue(reg.is_descriptor_list_subclass(
+                    [sub_desc, variant_desc], [string_desc, desc]))
+            self.assertFalse(reg.is_descriptor_list_subclass(
+                    [string_desc], [sub_desc]))
+        finally:
+            reg.delete_module(basic_pkg, 'IndexTestSubString')
+            reg.delete_module(basic_pkg, 'IndexTestString')
+        self.assertNotIn(sub_desc, reg._ancestors)
+        self.assertFalse(any(sub_desc in sub_descs or sub_desc in super_descs
+                             for _, sub_descs, super_descs
+                             in reg._compatible.itervalues()))
+        self.assertTrue(reg.is_descriptor_list_subclass([string_desc],
+                                                        [module_desc]))
@@ -40,6 +40,7 @@ from base64 import b16encode, b16decode
 import copy
 from itertools import izip, product, chain
 import json
+import os
 import time
 import traceback
 import warnings
@@ -381,6 +382,38 @@ class Module(object):
         """
         return True
 
+    def is_disk_cacheable(self):
+        """is_disk_cacheable() -> bool.
+        Whether the outputs of this module can be stored in the persistent
+        disk cache and reused by another process. Modules whose outputs
+        cannot be serialized, or that refer to resources that do not outlive
+        the process (open handles, temporary files, GUI objects), should
+        return False. The default is to allow it for cacheable modules.
+
+        """
+        return self.is_cacheable()
+
+    def is_thread_safe(self):
+        """is_thread_safe() -> bool.
+        Whether compute() can run on a worker thread, concurrently with
+        other modules, when concurrent execution is enabled. Such modules
+        must not touch global state or GUI objects; logging calls are
+        forwarded to the main thread. The default is False.
+
+        """
+        return False
+
+    def is_process_safe(self):
+        """is_process_safe() -> bool.
+        Whether compute() can run in a separate process when iterating
+        over a list and parallel loops are enabled. Such modules must only
+        depend on the values of their input ports, which, like their
+        outputs, must be picklable. This suits CPU-bound Python code, that
+        wouldn't run concurrently on threads. The default is False.
+
+        """
+        return False
+
     def update_upstream_port(self, port_name):
         """Updates upstream of a single port instead of all ports."""
 
@@ -453,6 +486,72 @@ class Module(object):
                 params[spec.name] = module.translate_to_string(self.get_output(spec.name))
                 jm.setCache(self.signature, params, p_module.name)
 
+    def connected_output_ports(self):
+        """connected_output_ports() -> list of str
+        Returns the names of the output ports connected downstream in the
+        pipeline being executed.
+
+        """
+        pipeline = self.moduleInfo.get('pipeline', None)
+        if not pipeline:
+            return []
+        p_module = pipeline.modules.get(self.moduleInfo['moduleId'])
+        if p_module is None:
+            return []
+        return p_module.connected_output_ports.keys()
+
+    def _get_disk_cache(self):
+        interpreter = getattr(self, 'interpreter', None)
+        cache = getattr(interpreter, 'disk_cache', None)
+        if (cache is None or self.signature is None or
+                not self.is_cacheable() or not self.is_disk_cacheable()):
+            return None
+        return cache
+
+    def setDiskCache(self):
+        """ setDiskCache() -> Boolean
+            Restores the outputs from the persistent disk cache if they exist
+        """
+        if self.upToDate:
+            return False
+        cache = self._get_disk_cache()
+        if cache is None:
+            return False
+        outputs = cache.load(self.signature)
+        if outputs is None:
+            return False
+        # the entry must provide every port used downstream
+        for port_name in self.connected_output_ports():
+            if port_name != 'self' and port_name not in outputs:
+                return False
+        for port_name, value in outputs.iteritems():
+            self.set_output(port_name, value)
+        self.upToDate = True
+        return True
+
+    def addDiskCache(self):
+        """ addDiskCache() -> None
+            Stores the outputs in the persistent disk cache
+        """
+        cache = self._get_disk_cache()
+        if cache is None:
+            return
+        outputs = {}
+        file_pool = getattr(self.interpreter, 'filePool', None)
+        pool_dir = file_pool.directory if file_pool is not None else None
+        for port_name, value in self.outputPorts.iteritems():
+            if port_name == 'self':
+                continue
+            if isinstance(value, Module):
+                return
+            # temporary files are removed with the file pool
+            name = getattr(value, 'name', None)
+            if (pool_dir is not None and isinstance(name, basestring) and
+                    os.path.abspath(name).startswith(pool_dir)):
+                return
+            outputs[port_name] = value
+        cache.store(self.signature, outputs)
+
     def update_upstream(self):
         """ update_upstream() -> None
         Go upstream from the current module, then update its upstream
@@ -553,7 +652,7 @@ class Module(object):
         elif self.computed:
             return
         self.logging.begin_update(self)
-        if not self.setJobCache():
+        if not self.setJobCache() and not self.setDiskCache():
             self.update_upstream()
         if self.upToDate:
             if not self.computed:
@@ -571,6 +670,7 @@ class Module(object):
                 self.build_stream()
             elif self.list_depth > 0:
                 self.compute_all()
+                self.addDiskCache()
             elif (self.in_pipeline and
                   not self.is_while and
                   (ModuleControlParam.WHILE_COND_KEY in self.control_params or
@@ -580,6 +680,7 @@ class Module(object):
             else:
                 self.compute()
                 self.addJobCache()
+                self.addDiskCache()
             self.computed = True
         except ModuleSuspended, e:
             self.had_error, self.was_suspended = False, True
@@ -674,47 +775,55 @@ class Module(object):
         elements, port_names = self.do_combine(combine_type, inputs, port_names)
         num_inputs = len(elements)
         loop = self.logging.begin_loop_execution(self, num_inputs)
+
+        # Computes the iterations in the background if enabled; they are
+        # still updated in order below
+        executor = None
+        if self.list_depth == 1 and not self.upToDate:
+            from vistrails.core.interpreter.parallel_loop import \
+                get_loop_executor
+            executor = get_loop_executor(self)
+        if executor is not None:
+            modules = [self.make_iteration(i, port_names, elements, True)
+                       for i in xrange(num_inputs)]
+            executor.start(modules)
+
         ## Update everything for each value inside the list
         outputs = {}
-        for i in xrange(num_inputs):
-            self.logging.update_progress(self, float(i)/num_inputs)
-            module = copy.copy(self)
-            module.list_depth = self.list_depth - 1
-            module.had_error = False
-            module.was_suspended = False
-
-            if not self.upToDate: # pragma: no partial
-                ## Type checking if first iteration and last iteration level
-                if i == 0 and self.list_depth == 1:
-                    self.typeChecking(module, port_names, elements)
+        try:
+            for i in xrange(num_inputs):
+                self.logging.update_progress(self, float(i)/num_inputs)
+                if executor is not None:
+                    module = modules[i]
+                else:
+                    module = self.make_iteration(i, port_names, elements)
 
-                module.upToDate = False
-                module.computed = False
-                self.setInputValues(module, port_names, elements[i], i)
+                loop.begin_iteration(module, i)
 
-            loop.begin_iteration(module, i)
+                try:
+                    module.update()
+                except ModuleSuspended, e:
+                    e.loop_iteration = i
+                    module.logging.end_update(module, e, was_suspended=True)
+                    suspended.append(e)
+                    loop.end_iteration(module)
+                    continue
 
-            try:
-                module.update()
-            except ModuleSuspended, e:
-                e.loop_iteration = i
-                module.logging.end_update(module, e, was_suspended=True)
-                suspended.append(e)
                 loop.end_iteration(module)
-                continue
 
-            loop.end_iteration(module)
-
-            ## Getting the result from the output port
-            for nameOutput in module.outputPorts:
-                if nameOutput == 'self':
-                    continue
-                if nameOutput not in outputs:
-                    outputs[nameOutput] = []
-                output = module.get_output(nameOutput)
-                outputs[nameOutput].append(output)
+                ## Getting the result from the output port
+                for nameOutput in module.outputPorts:
+                    if nameOutput == 'self':
+                        continue
+                    if nameOutput not in outputs:
+                        outputs[nameOutput] = []
+                    output = module.get_output(nameOutput)
+                    outputs[nameOutput].append(output)
 
-            self.logging.update_progress(self, i * 1.0 / num_inputs)
+                self.logging.update_progress(self, i * 1.0 / num_inputs)
+        finally:
+            if executor is not None:
+                executor.finish()
 
         if suspended:
             raise ModuleSuspended(
@@ -727,6 +836,32 @@ class Module(object):
             self.set_output(nameOutput, outputs[nameOutput])
         loop.end_loop_execution()
 
+    def make_iteration(self, i, port_names, elements, own_ports=False):
+        """Makes the copy of this module that computes iteration i.
+
+        If own_ports is True, the copy gets its own port dictionaries
+        instead of sharing them with this module, so that the iterations
+        can run concurrently.
+
+        """
+        module = copy.copy(self)
+        module.list_depth = self.list_depth - 1
+        module.had_error = False
+        module.was_suspended = False
+        if own_ports:
+            module.inputPorts = dict(self.inputPorts)
+            module.outputPorts = dict(self.outputPorts)
+
+        if not self.upToDate: # pragma: no partial
+            ## Type checking if first iteration and last iteration level
+            if i == 0 and self.list_depth == 1:
+                self.typeChecking(module, port_names, elements)
+
+            module.upToDate = False
+            module.computed = False
+            self.setInputValues(module, port_names, elements[i], i)
+        return module
+
     def build_stream(self):
         """Determines and builds correct generator type.
 
@@ -1848,6 +1983,17 @@ def new_module(base_module, name, class_dict={}, docstring=None):
 import unittest
 
 class TestImplicitLooping(unittest.TestCase):
+    def setUp(self):
+        # workers forked earlier don't have the monkeypatches below
+        from vistrails.core.interpreter.parallel_loop import \
+            terminate_process_pool
+        terminate_process_pool()
+
+    def tearDown(self):
+        from vistrails.core.interpreter.parallel_loop import \
+            terminate_process_pool
+        terminate_process_pool()
+
     def run_vt(self, vt_basename):
         from vistrails.core.system import vistrails_root_directory
         from vistrails.core.db.locator import FileLocator
@@ -1880,3 +2026,77 @@ class TestImplicitLooping(unittest.TestCase):
 
     def test_list_custom(self):
         self.run_vt("test-list-custom.vt")
+
+    def run_parallel_loop(self, kind):
+        """Loops ConcatenateString over a list with parallel loops enabled.
+
+        Returns the result and the list of the threads or processes that
+        computed each iteration.
+        """
+        import threading
+        from vistrails.core.modules.basic_modules import ConcatenateString
+        from vistrails.tests.utils import execute
+        conf = get_vistrails_configuration()
+        old_workers = conf.loopWorkers
+        old_compute = ConcatenateString.compute
+        def compute(self):
+            old_compute(self)
+            self.set_output('worker', (os.getpid(),
+                                       threading.current_thread().name))
+        ConcatenateString.compute = compute
+        setattr(ConcatenateString, kind, lambda self: True)
+        conf.loopWorkers = 2
+        try:
+            result = execute([
+                    ('List', 'org.vistrails.vistrails.basic', [
+                        ('value', [('List', "['a', 'b', 'c', 'd', 'e']")]),
+                    ]),
+                    ('ConcatenateString', 'org.vistrails.vistrails.basic', [
+                        ('str2', [('String', '!')]),
+                    ]),
+                ],
+                [
+                    (0, 'value', 1, 'str1'),
+                ],
+                full_results=True)
+            self.assertFalse(result.errors)
+            module = result.objects[1]
+            return module.get_output('value'), module.get_output('worker')
+        finally:
+            conf.loopWorkers = old_workers
+            ConcatenateString.compute = old_compute
+            delattr(ConcatenateString, kind)
+
+    def test_parallel_threads(self):
+        import threading
+        value, workers = self.run_parallel_loop('is_thread_safe')
+        self.assertEqual(value, ['a!', 'b!', 'c!', 'd!', 'e!'])
+        self.assertNotIn(threading.current_thread().name,
+                         [name for pid, name in workers])
+
+    def test_parallel_processes(self):
+        value, workers = self.run_parallel_loop('is_process_safe')
+        self.assertEqual(value, ['a!', 'b!', 'c!', 'd!', 'e!'])
+        self.assertNotIn(os.getpid(), [pid for pid, name in workers])
+
+    def test_process_pool_registry_change(self):
+        """The worker processes are restarted when packages change.
+        """
+        from vistrails.core.interpreter.parallel_loop import get_process_pool
+        from vistrails.core.modules.module_registry import get_module_registry
+        from vistrails.core.system import get_vistrails_basic_pkg_id
+        pool = get_process_pool(2)
+        self.assertIs(get_process_pool(2), pool)
+
+        class PoolTestModule(Module):
+            pass
+        registry = get_module_registry()
+        basic_pkg = get_vistrails_basic_pkg_id()
+        registry.add_module(PoolTestModule, package=basic_pkg,
+                            package_version=registry.packages[basic_pkg].version)
+        try:
+            new_pool = get_process_pool(2)
+            self.assertIsNot(new_pool, pool)
+        finally:
+            registry.delete_module(basic_pkg, 'PoolTestModule')
+        self.assertIsNot(get_process_pool(2), new_pool)
@@ -39,9 +39,13 @@ This module handles Parameter Exploration in VisTrails
 from __future__ import division
 
 from vistrails.core import debug
+from vistrails.core.system import get_vistrails_basic_pkg_id
+from vistrails.core.utils import InstanceObject
 from vistrails.core.vistrail.module_function import ModuleFunction
 from vistrails.core.vistrail.module_param import ModuleParam
+import collections
 import copy
+import multiprocessing
 
 import unittest
 
@@ -173,9 +177,12 @@ class InterpolateDiscreteParam(object):
             convert = {'int':'Integer', 'str':'String',
                        'float':'Float', 'double':'Float'}
             p.type = convert[type(v).__name__]
+            p.identifier = get_vistrails_basic_pkg_id()
             p.strValue = str(v)
             f.params.append(p)
         m.functions.append(f)
+        # the function is added in place, so its signatures are stale
+        pipeline.invalidate_signatures(m.id)
 
 class ActionBasedParameterExploration(object):
     """
@@ -209,22 +216,37 @@ class ActionBasedParameterExploration(object):
         """
         results = []
         resultActions = []
-        
+        for pipeline, performedActions in self.iter_explore(pipeline, actions,
+                                                            pre_actions):
+            results.append(pipeline)
+            resultActions.append(performedActions)
+        return (results, resultActions)
+
+    def iter_explore(self, pipeline, actions, pre_actions=[]):
+        """ iter_explore(pipeline: Pipeline, actions: [action set],
+                         pre_actions: [action set])
+                         -> iterator over (pipeline, actions)
+        Same as explore(), but generates the interpolated pipelines one
+        at a time, in the same order. Only the partially interpolated
+        pipelines of the current cell are kept, one per dimension.
+
+        """
         def exploreDimension(pipeline, performedActions, dim):
             """ exploreDimension(pipeline: Pipeline, performedActions: [actions],
-                                 dim: int) -> None
+                                 dim: int) -> iterator
             Start applying actions to the pipeline at dimension
             dim. 'pipeline' will not be modified in the function
             
             """
             if dim<0:
-                results.append(pipeline)
-                resultActions.append(performedActions)
+                yield (pipeline, performedActions)
                 return
             currentActions = actions[dim]
             if len(currentActions)==0:
                 # Ignore empty dimension
-                exploreDimension(pipeline, performedActions, dim-1)
+                for result in exploreDimension(pipeline, performedActions,
+                                               dim-1):
+                    yield result
                 return
             for actionSet in currentActions:
                 currentPipeline = copy.copy(pipeline)
@@ -232,15 +254,206 @@ class ActionBasedParameterExploration(object):
                 for action in actionSet:
                     currentPipeline.perform_action(action)
                     currentPeformedActions.append(action)
-                exploreDimension(currentPipeline, currentPeformedActions, dim-1)
+                for result in exploreDimension(currentPipeline,
+                                               currentPeformedActions, dim-1):
+                    yield result
         
         # perform pre_actions
         currentPipeline = copy.copy(pipeline)
         for action in pre_actions:
             currentPipeline.perform_action(action)
         
-        exploreDimension(currentPipeline, pre_actions, len(actions)-1)
-        return (results, resultActions)
+        return exploreDimension(currentPipeline, pre_actions, len(actions)-1)
+
+def exploration_size(actions):
+    """ exploration_size(actions: [action set]) -> int
+    Returns the number of pipelines generated for these actions
+
+    """
+    size = 1
+    for dimension in actions:
+        size *= max(1, len(dimension))
+    return size
+
+# How often the results of the worker processes are polled, in seconds; the
+# workers are checked between polls
+_worker_poll_interval = 0.5
+
+def execute_exploration(cells, execute, workers=0, group_size=1,
+                        execute_kwargs={}, cell_kwargs=None, log=None):
+    """ execute_exploration(cells: iterator over (pipeline, actions),
+                            execute: callable, workers: int,
+                            group_size: int, execute_kwargs: dict,
+                            cell_kwargs: callable, log: Log)
+                            -> iterator over (index, result)
+    Executes the cells of a parameter exploration as they are generated,
+    yielding their results as they complete.
+
+    If workers is 0, execute(index, pipeline, actions) is called for each
+    cell in this process and its result is yielded. The CachedInterpreter
+    reuses the results of the upstream modules that consecutive cells
+    have in common.
+
+    Otherwise, the cells are serialized and sent, by groups of group_size
+    consecutive cells, to a pool of workers processes, each group being
+    executed by the same worker so that it reuses its own cache. At most
+    two groups per worker are pending at any time. The workers execute
+    them with execute_kwargs, updated with cell_kwargs(index) if given;
+    both must be picklable (e.g. reason, current_version), and a locator
+    is passed as its URL. The workers have no job monitor, and the
+    actions of the cells are not passed to them. The results are objects
+    with an 'errors' dictionary mapping module ids to error messages; a
+    cell that could not be executed, for instance because its worker
+    exited, has its error under None. The execution logs are added to log
+    if it is given. If the iterator is closed before the end (e.g. the
+    exploration was cancelled), the groups still pending are stopped.
+
+    """
+    if workers <= 0:
+        for index, (pipeline, actions) in enumerate(cells):
+            yield (index, execute(index, pipeline, actions))
+        return
+
+    from vistrails.core.db.io import serialize
+    from vistrails.core.interpreter.parallel_loop import get_process_pool, \
+        process_pool_workers_started, terminate_process_pool
+
+    # (indices, AsyncResult, pool generation) for each group sent
+    pending = collections.deque()
+    # The pool replaces a worker that exits, but the group that worker was
+    # executing is lost and its result never arrives, so the workers started
+    # are counted to restart the pool and report these groups
+    pool = {'generation': 0}
+
+    def start_pool():
+        pool['pool'] = get_process_pool(workers)
+
+    def workers_lost():
+        exited = process_pool_workers_started() - workers
+        if exited <= 0:
+            return False
+        # Waits for the groups that may still be running to complete
+        unfinished = sum(1 for indices, result, generation in pending
+                         if not result.ready())
+        return unfinished <= exited
+
+    def groups():
+        group = []
+        for index, (pipeline, actions) in enumerate(cells):
+            if cell_kwargs is not None:
+                kwargs = cell_kwargs(index)
+            else:
+                kwargs = {}
+            group.append((index, serialize(pipeline), kwargs))
+            if len(group) >= group_size:
+                yield group
+                group = []
+        if group:
+            yield group
+
+    def receive():
+        indices, result, generation = pending[0]
+        while True:
+            if generation != pool['generation'] and not result.ready():
+                cell_results = [(index, {None: "Worker process exited"},
+                                 None)
+                                for index in indices]
+                break
+            try:
+                cell_results = result.get(_worker_poll_interval)
+                break
+            except multiprocessing.TimeoutError:
+                if workers_lost():
+                    terminate_process_pool()
+                    start_pool()
+                    pool['generation'] += 1
+            except Exception, e:
+                # The group or its results couldn't be transferred
+                msg = debug.format_exception(e)
+                cell_results = [(index, {None: msg}, None)
+                                for index in indices]
+                break
+        pending.popleft()
+        for index, errors, xml_log in cell_results:
+            if xml_log is not None and log is not None:
+                _add_workflow_exec(log, xml_log)
+            yield (index, InstanceObject(errors=errors))
+
+    start_pool()
+    try:
+        for group in groups():
+            pending.append(([index for index, xml_pipeline, kwargs in group],
+                            pool['pool'].apply_async(_execute_cells,
+                                                     (execute_kwargs, group)),
+                            pool['generation']))
+            while len(pending) >= 2 * workers:
+                for result in receive():
+                    yield result
+        while pending:
+            for result in receive():
+                yield result
+    except GeneratorExit:
+        if pending:
+            terminate_process_pool()
+        raise
+
+def _add_workflow_exec(log, xml_log):
+    """Adds a workflow execution received from a worker to log.
+    """
+    from vistrails.core.db.io import unserialize
+    from vistrails.core.log.workflow_exec import WorkflowExec
+
+    workflow_exec = unserialize(xml_log, WorkflowExec)
+    log.add_workflow_exec(workflow_exec.do_copy(new_ids=True,
+                                                id_scope=log.id_scope,
+                                                id_remap={}))
+
+def _execute_cells(execute_kwargs, cells):
+    """Executes serialized pipelines in a worker process.
+
+    Returns a list of (index, errors, serialized workflow execution).
+    """
+    from vistrails.core.db.io import serialize, unserialize
+    from vistrails.core.db.locator import BaseLocator
+    from vistrails.core.interpreter.default import get_default_interpreter
+    from vistrails.core.log.controller import LogController
+    from vistrails.core.log.log import Log
+    from vistrails.core.vistrail.pipeline import Pipeline
+
+    interpreter = get_default_interpreter()
+    results = []
+    for index, xml_pipeline, kwargs in cells:
+        try:
+            kwargs = dict(execute_kwargs, **kwargs)
+            if kwargs.get('locator') is not None:
+                kwargs['locator'] = BaseLocator.from_url(kwargs['locator'])
+            pipeline = unserialize(xml_pipeline, Pipeline)
+            log = Log()
+            result = interpreter.execute(pipeline,
+                                         logger=LogController(log),
+                                         **kwargs)
+            errors = dict((module_id, str(error))
+                          for module_id, error in result.errors.iteritems())
+            if log.workflow_execs:
+                xml_log = serialize(log.workflow_execs[0])
+            else:
+                xml_log = None
+        except Exception, e:
+            errors = {None: debug.format_exception(e)}
+            xml_log = None
+        results.append((index, errors, xml_log))
+    return results
+
+def _pipelinePosition(pId, sheetCount, rowCount, colCount):
+    """ _pipelinePosition(pId: int, sheetCount: int, rowCount: int,
+                          colCount: int) -> (row, col, sheet)
+    Returns the position of the pId-th pipeline of a parameter exploration
+
+    """
+    col = pId % colCount
+    row = (pId // colCount) % rowCount
+    sheet = (pId // (colCount*rowCount)) % sheetCount
+    return (row, col, sheet)
 
 def _pipelinePositions(sheetCount, rowCount, colCount,
                        pipelines):
@@ -256,10 +469,8 @@ def _pipelinePositions(sheetCount, rowCount, colCount,
 
     pipelinePositions = []
     for pId in xrange(len(pipelines)):
-        col = pId % colCount
-        row = (pId // colCount) % rowCount
-        sheet = (pId // (colCount*rowCount)) % sheetCount
-        pipelinePositions.append((row, col, sheet))
+        pipelinePositions.append(_pipelinePosition(pId, sheetCount,
+                                                   rowCount, colCount))
     return pipelinePositions
 
 
@@ -272,6 +483,17 @@ class TestParameterExploration(unittest.TestCase):
     simple test to test more of the interpolated values
     
     """
+    def setUp(self):
+        # workers forked earlier don't have the monkeypatches below
+        from vistrails.core.interpreter.parallel_loop import \
+            terminate_process_pool
+        terminate_process_pool()
+
+    def tearDown(self):
+        from vistrails.core.interpreter.parallel_loop import \
+            terminate_process_pool
+        terminate_process_pool()
+
     def testInterpolator(self):
         interpolator = InterpolateDiscreteParam(0, 'testing',
                                                 [(0,10),
@@ -283,5 +505,139 @@ class TestParameterExploration(unittest.TestCase):
                           (5, 5.0, 'two'),
                           (10, 10.0, 'three')])
 
+    def test_interpolator_signatures(self):
+        pipeline, actions = self.make_exploration()
+        pipeline.compute_signatures()
+        signature = pipeline.subpipeline_signature(0)
+        interpolator = InterpolateDiscreteParam(pipeline.modules[0],
+                                                'value', [(1, 5)], 2)
+        interpolator.perform(pipeline, 1)
+        pipeline.compute_signatures()
+        self.assertNotEqual(pipeline.subpipeline_signature(0), signature)
+
+    def make_exploration(self):
+        """Returns an Integer pipeline and 3x2 actions changing its values.
+        """
+        from vistrails.core.db.action import create_action
+        from vistrails.core.modules.basic_modules import identifier, version
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.pipeline import Pipeline
+
+        modules = []
+        for i in xrange(2):
+            param = ModuleParam(id=i + 1, pos=0, type='Integer', val='0')
+            function = ModuleFunction(id=i + 1, pos=0, name='value',
+                                      parameters=[param])
+            modules.append(Module(id=i, name='Integer', package=identifier,
+                                  version=version, functions=[function]))
+        pipeline = Pipeline(modules=modules)
+        new_id = [10]
+        def change(module, value):
+            function = modules[module].functions[0]
+            new_id[0] += 1
+            new_param = ModuleParam(id=new_id[0], pos=0, type='Integer',
+                                    val=value)
+            return (create_action([('change', function.params[0], new_param,
+                                    'function', function.real_id)]),)
+        actions = [[change(0, v) for v in ('1', 'oops', '3')],
+                   [change(1, v) for v in ('10', '20')]]
+        return pipeline, actions
+
+    @staticmethod
+    def values(pipeline):
+        return tuple(pipeline.modules[i].functions[0].params[0].strValue
+                     for i in xrange(2))
+
+    def test_iter_explore(self):
+        pipeline, actions = self.make_exploration()
+        explorer = ActionBasedParameterExploration()
+        pipelines, performedActions = explorer.explore(pipeline, actions)
+        cells = explorer.iter_explore(pipeline, actions)
+        self.assertFalse(isinstance(cells, list))
+        cells = list(cells)
+        self.assertEqual([self.values(p) for p, a in cells],
+                         [self.values(p) for p in pipelines])
+        self.assertEqual([a for p, a in cells], performedActions)
+        self.assertEqual(self.values(cells[4][0]), ('oops', '20'))
+        self.assertEqual(exploration_size(actions), 6)
+        self.assertEqual(self.values(pipeline), ('0', '0'))
+
+    def test_execute(self):
+        pipeline, actions = self.make_exploration()
+        cells = ActionBasedParameterExploration().iter_explore(pipeline,
+                                                               actions)
+        executed = []
+        def execute(index, pipeline, actions):
+            executed.append(index)
+            return self.values(pipeline)
+        results = execute_exploration(cells, execute)
+        self.assertEqual(executed, [])
+        self.assertEqual(results.next(), (0, ('1', '10')))
+        self.assertEqual(executed, [0])
+        self.assertEqual(len(list(results)), 5)
+
+    def test_execute_workers(self):
+        from vistrails.core.log.log import Log
+
+        pipeline, actions = self.make_exploration()
+        cells = ActionBasedParameterExploration().iter_explore(pipeline,
+                                                               actions)
+        log = Log()
+        results = dict(execute_exploration(
+                cells, None, workers=2, group_size=3,
+                cell_kwargs=lambda index: {'reason': 'test %d' % index},
+                log=log))
+        self.assertEqual(sorted(results), range(6))
+        self.assertEqual(sorted(i for i, r in results.iteritems()
+                                if r.errors),
+                         [1, 4])
+        self.assertEqual(len(log.workflow_execs), 6)
+        self.assertEqual(sorted(annotation.value
+                                for workflow_exec in log.workflow_execs
+                                for annotation in workflow_exec.annotations
+                                if annotation.key == '__reason__'),
+                         ['test %d' % i for i in xrange(6)])
+
+    def test_execute_workers_exit(self):
+        """Cells are reported as failed if their worker process exits.
+        """
+        import os
+        from vistrails.core.modules.basic_modules import Constant, Integer
+
+        def compute(module):
+            if module.get_input('value') == 20:
+                os._exit(1)
+            Constant.compute(module)
+        pipeline, actions = self.make_exploration()
+        cells = ActionBasedParameterExploration().iter_explore(pipeline,
+                                                               actions)
+        Integer.compute = compute
+        try:
+            results = dict(execute_exploration(cells, None, workers=2,
+                                               group_size=3))
+        finally:
+            del Integer.compute
+        self.assertEqual(sorted(results), range(6))
+        self.assertEqual([i for i in xrange(6) if results[i].errors],
+                         [1, 3, 4, 5])
+        self.assertEqual([results[i].errors.keys() for i in xrange(3, 6)],
+                         [[None]] * 3)
+
+    def test_execute_workers_close(self):
+        """Closing the results stops the pending cells.
+        """
+        from vistrails.core.interpreter.parallel_loop import \
+            get_process_pool, process_pool_workers_started
+
+        pipeline, actions = self.make_exploration()
+        cells = ActionBasedParameterExploration().iter_explore(pipeline,
+                                                               actions)
+        results = execute_exploration(cells, None, workers=2)
+        pool = get_process_pool(2)
+        results.next()
+        results.close()
+        self.assertEqual(process_pool_workers_started(), 0)
+        self.assertIsNot(get_process_pool(2), pool)
+
 if __name__ == '__main__':
     unittest.main()
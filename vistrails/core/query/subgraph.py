@@ -0,0 +1,349 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Subgraph matching for query-by-example.
+
+A query pipeline matches a pipeline if its modules can be mapped to
+distinct modules of the pipeline, with the same names and accepted by the
+module matching function, so that every connection of the query maps to a
+connection between the same ports in the pipeline.
+
+Candidates for each query module are first filtered on name and on the
+signature of their connections (the ports and the names of the modules at
+the other end), then pruned until every query connection is supported by
+the remaining candidates at both ends. The embeddings are then searched
+depth-first, VF2-style, extending partial mappings along the connections of
+the query.
+"""
+from __future__ import division
+
+from collections import defaultdict
+import unittest
+
+
+class PipelineIndex(object):
+    """Module and connection indexes of a pipeline, used for matching.
+    """
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.modules = pipeline.modules
+        self.by_name = {}
+        # module id -> [(port, other module id, other port)]
+        self.out_edges = {}
+        self.in_edges = {}
+        # (source id, source port, destination id, destination port)
+        self.edges = set()
+        for module_id, module in self.modules.iteritems():
+            self.by_name.setdefault(module.name, []).append(module_id)
+            self.out_edges[module_id] = []
+            self.in_edges[module_id] = []
+        for connection in pipeline.connections.itervalues():
+            source = connection.source
+            destination = connection.destination
+            self.out_edges[source.moduleId].append(
+                    (source.name, destination.moduleId, destination.name))
+            self.in_edges[destination.moduleId].append(
+                    (destination.name, source.moduleId, source.name))
+            self.edges.add((source.moduleId, source.name,
+                            destination.moduleId, destination.name))
+        self.signatures = {}
+        for module_id in self.modules:
+            signature = defaultdict(int)
+            for port, other, other_port in self.out_edges[module_id]:
+                signature['out', port, self.modules[other].name,
+                          other_port] += 1
+            for port, other, other_port in self.in_edges[module_id]:
+                signature['in', port, self.modules[other].name,
+                          other_port] += 1
+            self.signatures[module_id] = signature
+
+    def has_signature(self, module_id, signature):
+        """Tells whether a module has at least the given connections.
+        """
+        own = self.signatures[module_id]
+        for key, count in signature.iteritems():
+            if own.get(key, 0) < count:
+                return False
+        return True
+
+
+class SubgraphMatcher(object):
+    """Finds the occurrences of a query pipeline in pipelines.
+
+    match_module(module, query_module) can further restrict which modules
+    a query module can be mapped to, for example on their parameters.
+    """
+    def __init__(self, query, match_module=None):
+        self.query = PipelineIndex(query)
+        self.match_module = match_module
+
+    def domains(self, target):
+        """Computes the candidate modules for each query module.
+
+        Returns None if one of the query modules has no candidate.
+        """
+        query = self.query
+        domains = {}
+        for q_id, q_module in query.modules.iteritems():
+            signature = query.signatures[q_id]
+            candidates = set()
+            for t_id in target.by_name.get(q_module.name, ()):
+                if not target.has_signature(t_id, signature):
+                    continue
+                if (self.match_module is not None and
+                        not self.match_module(target.modules[t_id],
+                                              q_module)):
+                    continue
+                candidates.add(t_id)
+            if not candidates:
+                return None
+            domains[q_id] = candidates
+
+        # Removes the candidates that can't support one of the connections
+        changed = True
+        while changed:
+            changed = False
+            for q_source, s_port, q_dest, d_port in query.edges:
+                sources = domains[q_source]
+                dests = domains[q_dest]
+                supported = set(
+                        t for t in sources
+                        if any(p == s_port and dp == d_port and u in dests
+                               for p, u, dp in target.out_edges[t]))
+                if len(supported) != len(sources):
+                    if not supported:
+                        return None
+                    domains[q_source] = sources = supported
+                    changed = True
+                supported = set(
+                        t for t in dests
+                        if any(p == d_port and sp == s_port and u in sources
+                               for p, u, sp in target.in_edges[t]))
+                if len(supported) != len(dests):
+                    if not supported:
+                        return None
+                    domains[q_dest] = supported
+                    changed = True
+        return domains
+
+    def _order(self, domains, first=None):
+        """Orders the query modules for the search.
+
+        Each module is connected to one placed before it if possible,
+        picking the most constrained one first.
+        """
+        query = self.query
+        remaining = set(query.modules)
+        order = []
+        frontier = set()
+        while remaining:
+            pool = frontier & remaining or remaining
+            if first is not None:
+                q_id, first = first, None
+            else:
+                q_id = min(pool, key=lambda q: (len(domains[q]), q))
+            order.append(q_id)
+            remaining.discard(q_id)
+            frontier.update(other for _, other, _ in query.out_edges[q_id])
+            frontier.update(other for _, other, _ in query.in_edges[q_id])
+        return order
+
+    def _consistent(self, target, q_id, t_id, mapping):
+        query = self.query
+        for port, other, other_port in query.out_edges[q_id]:
+            if (other in mapping and
+                    (t_id, port, mapping[other], other_port) not in
+                    target.edges):
+                return False
+        for port, other, other_port in query.in_edges[q_id]:
+            if (other in mapping and
+                    (mapping[other], other_port, t_id, port) not in
+                    target.edges):
+                return False
+        return True
+
+    def _search(self, target, domains, order, mapping, used):
+        if len(mapping) == len(order):
+            return dict(mapping)
+        q_id = order[len(mapping)]
+        for t_id in domains[q_id]:
+            if t_id in used or not self._consistent(target, q_id, t_id,
+                                                    mapping):
+                continue
+            mapping[q_id] = t_id
+            used.add(t_id)
+            result = self._search(target, domains, order, mapping, used)
+            del mapping[q_id]
+            used.discard(t_id)
+            if result is not None:
+                return result
+        return None
+
+    def find(self, pipeline, target=None):
+        """Returns one mapping {query module id: module id}, or None.
+        """
+        if target is None:
+            target = PipelineIndex(pipeline)
+        if not self.query.modules:
+            return None
+        domains = self.domains(target)
+        if domains is None:
+            return None
+        return self._search(target, domains, self._order(domains), {}, set())
+
+    def matched_modules(self, pipeline, target=None):
+        """Returns the ids of the modules that are part of an occurrence.
+        """
+        if target is None:
+            target = PipelineIndex(pipeline)
+        if not self.query.modules:
+            return set()
+        domains = self.domains(target)
+        if domains is None:
+            return set()
+        confirmed = dict((q_id, set()) for q_id in domains)
+        for q_id in self._order(domains):
+            for t_id in domains[q_id] - confirmed[q_id]:
+                pinned = dict(domains)
+                pinned[q_id] = set([t_id])
+                mapping = self._search(target, pinned,
+                                       self._order(pinned, q_id),
+                                       {}, set())
+                if mapping is None:
+                    continue
+                for q, t in mapping.iteritems():
+                    confirmed[q].add(t)
+        result = set()
+        for t_ids in confirmed.itervalues():
+            result.update(t_ids)
+        return result
+
+
+class TestSubgraphMatcher(unittest.TestCase):
+    @staticmethod
+    def make_pipeline(names, connections):
+        """Builds a pipeline from module names and (source, destination)
+        index pairs, connecting 'value' to 'value'.
+        """
+        from vistrails.core.vistrail.connection import Connection
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.pipeline import Pipeline
+        from vistrails.core.vistrail.port import Port
+        from vistrails.db.domain import IdScope
+
+        id_scope = IdScope()
+        modules = [Module(id=i, name=name, package='test')
+                   for i, name in enumerate(names)]
+        conns = []
+        for source, destination in connections:
+            if isinstance(source, tuple):
+                source, source_port = source
+            else:
+                source_port = 'value'
+            ports = [Port(id=id_scope.getNewId(Port.vtType),
+                          type='source', moduleId=source,
+                          moduleName=names[source], name=source_port),
+                     Port(id=id_scope.getNewId(Port.vtType),
+                          type='destination', moduleId=destination,
+                          moduleName=names[destination], name='value')]
+            conns.append(Connection(id=id_scope.getNewId(Connection.vtType),
+                                    ports=ports))
+        return Pipeline(modules=modules, connections=conns)
+
+    def test_chain(self):
+        target = self.make_pipeline(['A', 'B', 'A', 'B', 'C'],
+                                    [(0, 1), (2, 3), (3, 4)])
+        query = self.make_pipeline(['A', 'B'], [(0, 1)])
+        matcher = SubgraphMatcher(query)
+        self.assertEqual(matcher.matched_modules(target), set([0, 1, 2, 3]))
+        query = self.make_pipeline(['A', 'B', 'C'], [(0, 1), (1, 2)])
+        matcher = SubgraphMatcher(query)
+        self.assertEqual(matcher.find(target), {0: 2, 1: 3, 2: 4})
+        self.assertEqual(matcher.matched_modules(target), set([2, 3, 4]))
+
+    def test_ports(self):
+        target = self.make_pipeline(['A', 'B'], [((0, 'other'), 1)])
+        query = self.make_pipeline(['A', 'B'], [(0, 1)])
+        self.assertEqual(SubgraphMatcher(query).matched_modules(target),
+                         set())
+
+    def test_injective(self):
+        # Two query modules can't be mapped to the same module
+        target = self.make_pipeline(['A', 'B'], [(0, 1)])
+        query = self.make_pipeline(['A', 'B', 'B'], [(0, 1), (0, 2)])
+        self.assertIsNone(SubgraphMatcher(query).find(target))
+        target = self.make_pipeline(['A', 'B', 'B'], [(0, 1), (0, 2)])
+        self.assertEqual(SubgraphMatcher(query).matched_modules(target),
+                         set([0, 1, 2]))
+
+    def test_structure(self):
+        # Diamond in the query, but not in the pipeline
+        query = self.make_pipeline(['A', 'B', 'C', 'D'],
+                                   [(0, 1), (0, 2), (1, 3), (2, 3)])
+        target = self.make_pipeline(['A', 'B', 'C', 'D', 'D'],
+                                    [(0, 1), (0, 2), (1, 3), (2, 4)])
+        self.assertIsNone(SubgraphMatcher(query).find(target))
+        target = self.make_pipeline(['A', 'B', 'C', 'D', 'D'],
+                                    [(0, 1), (0, 2), (1, 3), (2, 4), (2, 3)])
+        self.assertEqual(SubgraphMatcher(query).matched_modules(target),
+                         set([0, 1, 2, 3]))
+
+    def test_large_query(self):
+        # A tree of 15 modules with repeated names, matched in a pipeline
+        # that contains it twice next to decoys
+        names = ['M%d' % (i % 3) for i in xrange(15)]
+        edges = [((i - 1) // 2, i) for i in xrange(1, 15)]
+        query = self.make_pipeline(names, edges)
+        target_names = names + names + ['M0', 'M1', 'M2']
+        target_edges = (edges +
+                        [(s + 15, d + 15) for s, d in edges] +
+                        [(30, 31), (31, 32), (0, 30)])
+        target = self.make_pipeline(target_names, target_edges)
+        matcher = SubgraphMatcher(query)
+        mapping = matcher.find(target)
+        self.assertIsNotNone(mapping)
+        self.assertEqual(len(set(mapping.itervalues())), 15)
+        self.assertEqual(matcher.matched_modules(target), set(xrange(30)))
+        # Removing a connection of the second copy doesn't remove the
+        # first one
+        target = self.make_pipeline(target_names, target_edges[:-5])
+        self.assertEqual(matcher.matched_modules(target), set(xrange(15)))
+
+    def test_match_module(self):
+        target = self.make_pipeline(['A', 'B', 'A', 'B'], [(0, 1), (2, 3)])
+        query = self.make_pipeline(['A', 'B'], [(0, 1)])
+        matcher = SubgraphMatcher(query, lambda m, q: m.id != 2)
+        self.assertEqual(matcher.matched_modules(target), set([0, 1]))
@@ -44,6 +44,7 @@ import unittest
 
 from vistrails.core.query import extract_text
 from vistrails.core.system import time_strptime
+from vistrails.core.vistrail.version_index import VersionIndex
 
 ################################################################################
 
@@ -57,7 +58,7 @@ def validModuleStmt(stmt):
     name is not given
     """
     return type(stmt) in [AndSearchStmt, OrSearchStmt, NotSearchStmt,
-                          ModuleSearchStmt, TrueSearch]
+                          ModuleSearchStmt, ParameterSearchStmt, TrueSearch]
 
 class SearchStmt(object):
     def match(self, controller, action):
@@ -449,22 +450,81 @@ class NameSearchStmt(RegexEnabledSearchStmt):
             m = self._content_matches(controller.vistrail.get_description(action.timestep))
         return bool(m)
 
-class ModuleSearchStmt(RegexEnabledSearchStmt):
+class IndexedSearchStmt(RegexEnabledSearchStmt):
+    """Base class for searches on the content of the pipelines.
+
+    The version index of the vistrail is used to discard the versions that
+    can't contain a matching value before materializing their pipeline.
+    """
+    index_kind = None
+
+    def __init__(self, content, use_regex):
+        RegexEnabledSearchStmt.__init__(self, content, use_regex)
+        self._index_state = None
+
+    def _get_index_state(self, controller):
+        from vistrails.core.modules.module_registry import \
+            get_module_registry
+        index = controller.vistrail.get_version_index()
+        if (self._index_state is None or
+                self._index_state[0] is not index or
+                self._index_state[1] != len(index)):
+            introducing = index.introducing(
+                    self.index_kind,
+                    lambda value: bool(self._content_matches(value)))
+            upgrades = index.upgrade_candidates(get_module_registry())
+            self._index_state = (index, len(index), introducing, {},
+                                 upgrades, {})
+        return self._index_state
+
+    def may_match(self, controller, version):
+        index, _, introducing, memo, _, _ = self._get_index_state(controller)
+        return index.has_ancestor_in(version, introducing, memo)
+
+    def may_need_upgrade(self, controller, version):
+        index, _, _, _, upgrades, memo = self._get_index_state(controller)
+        return index.has_ancestor_in(version, upgrades, memo)
+
     def match(self, controller, action):
         version = action.timestep
         from vistrails.core.configuration import get_vistrails_configuration
         hide_upgrades = getattr(get_vistrails_configuration(),
                                 'hideUpgrades', True)
+        if not self.may_match(controller, version):
+            if not hide_upgrades:
+                return False
+            upgrade = controller.vistrail.get_upgrade(version)
+            if upgrade is None:
+                # create_upgrade() might still upgrade it, renaming modules
+                # or changing parameters
+                if not self.may_need_upgrade(controller, version):
+                    return False
+            elif not self.may_match(controller, upgrade):
+                return False
         if hide_upgrades:
             version = controller.create_upgrade(version, delay_update=True)
-        p = controller.get_pipeline(version, do_validate=False)
+        p = controller.get_pipeline(version, read_only=True)
         for module in p.modules.itervalues():
-            if self._content_matches(module.name):
+            if self.matchModule(version, module):
                 return True
         return False
+
+class ModuleSearchStmt(IndexedSearchStmt):
+    index_kind = VersionIndex.MODULE
+
     def matchModule(self, v, m):
         return self._content_matches(m.name)
 
+class ParameterSearchStmt(IndexedSearchStmt):
+    index_kind = VersionIndex.PARAMETER
+
+    def matchModule(self, v, m):
+        for function in m.functions:
+            for param in function.params:
+                if self._content_matches(param.strValue):
+                    return True
+        return False
+
 class AndSearchStmt(SearchStmt):
     def __init__(self, lst):
         self.matchList = lst
@@ -581,6 +641,17 @@ class SearchCompiler(object):
             lst.append(ModuleSearchStmt(tok, use_regex))
             tokStream = tokStream[1:]
         return (AndSearchStmt(lst), [])
+    def parseParameter(self, tokStream, use_regex):
+        if len(tokStream) == 0:
+            raise SearchParseError('Expected token, got end of search')
+        lst = []
+        while len(tokStream):
+            tok = tokStream[0]
+            if ':' in tok:
+                return (AndSearchStmt(lst), tokStream)
+            lst.append(ParameterSearchStmt(tok, use_regex))
+            tokStream = tokStream[1:]
+        return (AndSearchStmt(lst), [])
     def parseBefore(self, tokStream, use_regex):
         old_tokstream = tokStream
         try:
@@ -638,6 +709,7 @@ class SearchCompiler(object):
                 'after': parseAfter,
                 'name': parseName,
                 'module': parseModule,
+                'parameter': parseParameter,
                 'any': parseAny}
                 
             
@@ -736,6 +808,48 @@ class TestSearch(unittest.TestCase):
         # Test compiling these searches
         SearchCompiler('before')
         SearchCompiler('after')
+    def test_indexed_search(self):
+        from vistrails.core.vistrail.controller import VistrailController
+        from vistrails.core.vistrail.version_index import TestVersionIndex
+        vistrail, versions = TestVersionIndex('test_build_and_update') \
+                                 .make_vistrail()
+        controller = VistrailController(vistrail, auto_save=False)
+        materialized = set()
+        get_pipeline = controller.get_pipeline
+        def counting_get_pipeline(version, *args, **kwargs):
+            materialized.add(version)
+            return get_pipeline(version, *args, **kwargs)
+        controller.get_pipeline = counting_get_pipeline
+        v1, v2, v3, v4 = versions
+        for search, expected in [('module:Float', [v3, v4]),
+                                 ('parameter:world', [v4]),
+                                 ('module:Integer parameter:hello', [v2])]:
+            materialized.clear()
+            stmt = SearchCompiler(search).searchStmt
+            self.assertEqual([v for v in versions
+                              if stmt.match(controller,
+                                            vistrail.actionMap[v])],
+                             expected)
+            self.assertEqual(materialized, set(expected))
+
+    def test_indexed_search_pending_upgrade(self):
+        from vistrails.core.db.action import create_action
+        from vistrails.core.modules.basic_modules import identifier
+        from vistrails.core.vistrail.controller import VistrailController
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.version_index import TestVersionIndex
+        vistrail, (v1, v2, v3, v4) = \
+            TestVersionIndex('test_build_and_update').make_vistrail()
+        module = Module(id=vistrail.idScope.getNewId(Module.vtType),
+                        name='String', package=identifier, version='0.0.1')
+        action = create_action([('add', module)])
+        vistrail.add_action(action, v3)
+        controller = VistrailController(vistrail, auto_save=False)
+        stmt = ModuleSearchStmt('Integer', False)
+        # the upgrade of the new version could introduce the module
+        self.assertFalse(stmt.may_match(controller, action.id))
+        self.assertTrue(stmt.may_need_upgrade(controller, action.id))
+        self.assertFalse(stmt.may_need_upgrade(controller, v4))
 
 if __name__ == '__main__':
     unittest.main()
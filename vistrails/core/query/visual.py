@@ -37,8 +37,10 @@ from __future__ import division
 
 from vistrails.core import query
 from vistrails.core.modules.module_registry import get_module_registry
+from vistrails.core.query.subgraph import SubgraphMatcher
 from vistrails.core import reportusage
 from vistrails.core.utils import append_to_dict_of_lists
+from vistrails.core.vistrail.version_index import VersionIndex
 import copy
 import re
 
@@ -88,51 +90,52 @@ class VisualQuery(query.Query):
             target_ids = nextTargetIds
             template_ids = nextTemplateIds
 
+    def candidate_versions(self, controller, hide_upgrades):
+        """Returns the versions that contain every module of the query.
+
+        This only uses the version index of the vistrail, so it does not
+        materialize any pipeline; the result is a superset of the versions
+        that match. With hide_upgrades, the versions that are not upgraded
+        yet but might be are kept.
+        """
+        vistrail = controller.vistrail
+        index = vistrail.get_version_index()
+        versions = self.versions_to_check
+        names = set(m.name for m in self.queryPipeline.modules.itervalues())
+        if hide_upgrades:
+            upgrades = index.upgrade_candidates(get_module_registry())
+            upgrades_memo = {}
+        for name in names:
+            introducing = index.introducing(VersionIndex.MODULE, name)
+            memo = {}
+            def contains(version):
+                if index.has_ancestor_in(version, introducing, memo):
+                    return True
+                if hide_upgrades:
+                    upgrade = vistrail.get_upgrade(version)
+                    if upgrade is None:
+                        # run() might still upgrade it, renaming modules
+                        return index.has_ancestor_in(version, upgrades,
+                                                     upgrades_memo)
+                    return index.has_ancestor_in(upgrade, introducing, memo)
+                return False
+            versions = [v for v in versions if contains(v)]
+        return versions
+
     def run(self, controller, name):
         reportusage.record_feature('visualquery', controller)
         result = []
         self.tupleLength = 2
-        for version in self.versions_to_check:
-            from vistrails.core.configuration import get_vistrails_configuration
-            hide_upgrades = getattr(get_vistrails_configuration(),
-                                    'hideUpgrades', True)
+        from vistrails.core.configuration import get_vistrails_configuration
+        hide_upgrades = getattr(get_vistrails_configuration(),
+                                'hideUpgrades', True)
+        matcher = SubgraphMatcher(self.queryPipeline, self.matchQueryModule)
+        for version in self.candidate_versions(controller, hide_upgrades):
             if hide_upgrades:
                 version = controller.create_upgrade(version, delay_update=True)
-            p = controller.get_pipeline(version, do_validate=False)
-
-            matches = set()
-            queryModuleNameIndex = {}
-            for moduleId, module in p.modules.iteritems():
-                append_to_dict_of_lists(queryModuleNameIndex, module.name, moduleId)
-            for querySourceId in self.queryPipeline.graph.sources():
-                querySourceName = self.queryPipeline.modules[querySourceId].name
-                if not queryModuleNameIndex.has_key(querySourceName):
-                    # need to reset matches here!
-                    matches = set()
-                    continue
-                candidates = queryModuleNameIndex[querySourceName]
-                atLeastOneMatch = False
-                for candidateSourceId in candidates:
-                    querySource = self.queryPipeline.modules[querySourceId]
-                    candidateSource = p.modules[candidateSourceId]
-                    if not self.matchQueryModule(candidateSource,
-                                                 querySource):
-                        continue
-                    (match, targetIds) = self.heuristicDAGIsomorphism \
-                                             (template = self.queryPipeline, 
-                                              target = p,
-                                              template_ids = [querySourceId],
-                                              target_ids = [candidateSourceId])
-                    if match:
-                        atLeastOneMatch = True
-                        matches.update(targetIds)
-                        
-                # We always perform AND operation
-                if not atLeastOneMatch:
-                    matches = set()
-                    break
-                
-            for m in matches:
+            p = controller.get_pipeline(version, read_only=True)
+
+            for m in sorted(matcher.matched_modules(p)):
                 result.append((version, m))
 
         self.queryResult = result
@@ -3957,9 +3957,9 @@ class VistrailController(object):
                 # check for db log
                 log = Log()
                 if isinstance(self.locator, vistrails.core.db.locator.DBLocator):
-                    connection = self.locator.get_connection()
-                    db_log = open_vt_log_from_db(connection, 
-                                                 self.vistrail.db_id)
+                    with self.locator.connection() as connection:
+                        db_log = open_vt_log_from_db(connection,
+                                                     self.vistrail.db_id)
                     Log.convert(db_log)
                     for workflow_exec in db_log.workflow_execs:
                         workflow_exec.db_id = \
@@ -4270,11 +4270,22 @@ class VistrailController(object):
         return self.move_modules_ops(moves)
 
     def get_pipeline(self, version, allow_fail=False, use_current=False,
-                     do_validate=True, from_root=False):
+                     do_validate=True, from_root=False, read_only=False):
         """ Tries to construct the pipeline for a version in the fastest way
             possible using cached pipelines and version distances, and
             optionally current_pipeline.
+
+            A read_only pipeline must not be modified: it is not validated,
+            and a cached pipeline is returned as is instead of being copied.
+            Others are materialized from the root, which is cheaper than
+            copying the closest cached one and replaying actions on it.
         """
+        if read_only:
+            if version == -1:
+                return None
+            if version in self._pipelines:
+                return self._pipelines[version]
+            return self.vistrail.getPipeline(version)
         if use_current and self.current_version != -1 and not self.current_pipeline:
             debug.warning("current_version is not -1 and "
                           "current_pipeline is None")
@@ -4561,3 +4572,22 @@ class TestTerseGraph(unittest.TestCase):
             13L: [(14L, (False, False)), (17L, (False, False))],
             4L: [], 6L: [], 10L: [], 14L: [], 17L: [],
         })
+
+
+class TestGetPipeline(unittest.TestCase):
+    def test_read_only(self):
+        """Read-only pipelines are the same, cached ones are not copied"""
+        from vistrails.core.db.locator import FileLocator
+        from vistrails.core.system import vistrails_root_directory
+        locator = FileLocator(vistrails_root_directory() +
+                              '/tests/resources/test-streaming.vt')
+        controller = VistrailController(locator.load().vistrail, locator)
+        for version in (10L, 175L):
+            self.assertEqual(controller.get_pipeline(version, read_only=True),
+                             controller.get_pipeline(version,
+                                                     do_validate=False))
+        controller._pipelines[10L] = pipeline = \
+            controller.get_pipeline(10L, do_validate=False)
+        self.assertIs(controller.get_pipeline(10L, read_only=True), pipeline)
+        self.assertIsNot(controller.get_pipeline(10L, do_validate=False),
+                         pipeline)
@@ -423,3 +423,12 @@ class TestOperation(unittest.TestCase):
             op2 = vistrails.core.db.io.unserialize(xml_str, op1.__class__)
             self.assertEquals(op1, op2)
             self.assertEquals(op1.id, op2.id)
+
+    def test_pickle(self):
+        import cPickle
+        for op1 in self.create_ops():
+            for protocol in (0, cPickle.HIGHEST_PROTOCOL):
+                op2 = cPickle.loads(cPickle.dumps(op1, protocol))
+                self.assertIs(op2.__class__, op1.__class__)
+                self.assertEquals(op1, op2)
+                self.assertEquals(op1.id, op2.id)
@@ -37,6 +37,7 @@
 """ This module defines the class Pipeline """
 from __future__ import division
 
+from vistrails.core.cache.file_digest import save_file_digest_cache
 from vistrails.core.cache.hasher import Hasher
 from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.core.data_structures.bijectivedict import Bidict
@@ -134,6 +135,8 @@ class Pipeline(DBWorkflow):
             self._subpipeline_signatures = Bidict()
             self._module_signatures = Bidict()
             self._connection_signatures = Bidict()
+            self._volatile_signatures = set()
+            self._signature_owners = None
         else:
             self.is_valid = other.is_valid
             self.aliases = Bidict([(k,copy.copy(v))
@@ -147,6 +150,11 @@ class Pipeline(DBWorkflow):
             self._module_signatures = \
                 Bidict([(k,copy.copy(v))
                         for (k,v) in other._module_signatures.iteritems()])
+            self._volatile_signatures = set(other._volatile_signatures)
+            if other._signature_owners is not None:
+                self._signature_owners = dict(other._signature_owners)
+            else:
+                self._signature_owners = None
 
         self.graph = Graph()
         for module in self.module_list:
@@ -262,6 +270,8 @@ class Pipeline(DBWorkflow):
         self._subpipeline_signatures = Bidict()
         self._module_signatures = Bidict()
         self._connection_signatures = Bidict()
+        self._volatile_signatures = set()
+        self._signature_owners = None
 
     def get_tmp_id(self, type):
         """get_tmp_id(type: str) -> long
@@ -348,12 +358,17 @@ class Pipeline(DBWorkflow):
                     (op.vtType, op.what)
                 raise VistrailsInternalError(msg)
 
+        self._invalidate_for_operation(op, what)
         if op.vtType == 'add':
             f(op.data, op.parentObjType, op.parentObjId)
         elif op.vtType == 'delete':
             f(op.objectId, op.what, op.parentObjType, op.parentObjId)
         elif op.vtType == 'change':
             f(op.oldObjId, op.data, op.parentObjType, op.parentObjId)
+        if what in (ModuleFunction.vtType, ModuleParam.vtType):
+            self._update_signature_owners(op, what)
+        elif op.parentObjType == Connection.vtType:
+            self._invalidate_for_operation(op, what)
 
     def add_module(self, m, *args):
         """add_module(m: Module) -> None 
@@ -367,10 +382,14 @@ class Pipeline(DBWorkflow):
 #             m.abstraction = self.abstraction_map[m.abstraction_id]
         self.db_add_object(m)
         self.graph.add_vertex(m.id)
+        if self._signature_owners is not None:
+            self._index_signature_owner(self.modules[m.id].functions, m.id)
 
     def change_module(self, old_id, m, *args):
         if not self.has_module_with_id(old_id):
             raise VistrailsInternalError("module %s doesn't exist" % old_id)
+        self.invalidate_signatures(old_id)
+        self._signature_owners = None
         self.db_change_object(old_id, m)
         self.graph.delete_vertex(old_id)
         self.graph.add_vertex(m.id)
@@ -383,6 +402,9 @@ class Pipeline(DBWorkflow):
         if not self.has_module_with_id(id):
             raise VistrailsInternalError("id missing in modules")
 
+        self.invalidate_signatures(id)
+        if self._signature_owners is not None:
+            self._unindex_signature_owner(self.modules[id].functions)
         # we're hiding the necessary operations by doing this!
         for (_, conn_id) in self.graph.adjacency_list[id][:]:
             self.delete_connection(conn_id)
@@ -392,10 +414,6 @@ class Pipeline(DBWorkflow):
         # self.modules.pop(id)
         self.db_delete_object(id, Module.vtType)
         self.graph.delete_vertex(id)
-        if id in self._module_signatures:
-            del self._module_signatures[id]
-        if id in self._subpipeline_signatures:
-            del self._subpipeline_signatures[id]
 
     def add_connection(self, c, *args):
         """add_connection(c: Connection) -> None 
@@ -410,6 +428,7 @@ class Pipeline(DBWorkflow):
             assert(c.sourceId != c.destinationId)        
             self.graph.add_edge(c.sourceId, c.destinationId, c.id)
             self.ensure_connection_specs([c.id])
+            self._invalidate_downstream(c.destinationId)
 
             source_name = c.source.name
             output_ports = self.modules[c.sourceId].connected_output_ports
@@ -433,6 +452,7 @@ class Pipeline(DBWorkflow):
 
         old_conn = self.connections[old_id]
         if old_conn.source is not None and old_conn.destination is not None:
+            self._invalidate_downstream(old_conn.destinationId)
             self.graph.delete_edge(old_conn.sourceId, old_conn.destinationId,
                                    old_conn.id)
             if self.graph.out_degree(old_conn.sourceId) < 1:
@@ -450,6 +470,7 @@ class Pipeline(DBWorkflow):
             assert(c.sourceId != c.destinationId)
             self.graph.add_edge(c.sourceId, c.destinationId, c.id)
             self.ensure_connection_specs([c.id])
+            self._invalidate_downstream(c.destinationId)
             self.modules[c.sourceId].connected_output_ports.add(c.source.name)
             self.modules[c.destinationId].connected_input_ports.add(
                 c.destination.name)
@@ -468,6 +489,7 @@ class Pipeline(DBWorkflow):
         if conn.source is not None and conn.destination is not None and \
                 (conn.destinationId, conn.id) in \
                 self.graph.edges_from(conn.sourceId):
+            self._invalidate_downstream(conn.destinationId)
             self.graph.delete_edge(conn.sourceId, conn.destinationId, conn.id)
 
             c = conn
@@ -679,6 +701,7 @@ class Pipeline(DBWorkflow):
                 # FIXME: check if a change parameter action needs to be generated
                 parameter = self.db_get_object(what, oId)
                 parameter.strValue = str(value)
+                self.invalidate_object_signatures(what, oId)
             else:
                 raise VistrailsInternalError("only parameters are supported")
         
@@ -758,6 +781,8 @@ class Pipeline(DBWorkflow):
             m = self.modules[module_id]
             sig = registry.module_signature(self, m)
             self._module_signatures[module_id] = sig
+            if registry.has_custom_signature(m):
+                self._volatile_signatures.add(module_id)
             return sig
     
     def module_id_from_signature(self, signature):
@@ -825,19 +850,172 @@ class Pipeline(DBWorkflow):
     def has_connection_signature(self, signature):
         return signature in self._connection_signatures.inverse
 
+    # Invalidation
+
+    def invalidate_signatures(self, module_id):
+        """invalidate_signatures(module_id: int) -> None
+        Discards the signature of the given module along with the
+        subpipeline and connection signatures downstream of it. Operations
+        performed through perform_operation do this automatically; call it
+        after modifying a module of the pipeline in place."""
+        if module_id in self._module_signatures:
+            del self._module_signatures[module_id]
+        self._volatile_signatures.discard(module_id)
+        self._invalidate_downstream(module_id)
+
+    def _invalidate_downstream(self, module_id):
+        """_invalidate_downstream(module_id: int) -> None
+        Discards the subpipeline signatures of module_id and of every
+        module downstream of it, and the signatures of the connections
+        incident to them. Module signatures are kept."""
+        adjacency_list = self.graph.adjacency_list
+        inverse_adjacency_list = self.graph.inverse_adjacency_list
+        subpipeline_signatures = self._subpipeline_signatures
+        connection_signatures = self._connection_signatures
+        visited = set()
+        stack = [module_id]
+        while stack:
+            m_id = stack.pop()
+            if m_id in visited:
+                continue
+            visited.add(m_id)
+            if m_id in subpipeline_signatures:
+                del subpipeline_signatures[m_id]
+            if m_id not in adjacency_list:
+                continue
+            for (_, conn_id) in inverse_adjacency_list[m_id]:
+                if conn_id in connection_signatures:
+                    del connection_signatures[conn_id]
+            for (dest_id, conn_id) in adjacency_list[m_id]:
+                if conn_id in connection_signatures:
+                    del connection_signatures[conn_id]
+                stack.append(dest_id)
+
+    def _invalidate_for_operation(self, op, what):
+        """_invalidate_for_operation(op: Operation, what: str) -> None
+        Discards the signatures affected by an operation on an object
+        nested in a module or a connection. Operations on modules and
+        connections themselves are handled by their methods."""
+        if what in self._signature_neutral_types:
+            return
+        parent_type = op.parentObjType
+        if parent_type == Connection.vtType:
+            if op.parentObjId in self.connections:
+                c = self.connections[op.parentObjId]
+                if c.destination is not None and \
+                        c.destinationId in self.modules:
+                    self._invalidate_downstream(c.destinationId)
+            return
+        if parent_type == self.vtType:
+            return
+        self.invalidate_object_signatures(parent_type, op.parentObjId)
+
+    _signature_neutral_types = set([Module.vtType, Connection.vtType,
+                                    Location.vtType, 'annotation'])
+
+    def invalidate_object_signatures(self, obj_type, obj_id):
+        """invalidate_object_signatures(obj_type: str, obj_id: int) -> None
+        Discards the signatures that depend on the given function or
+        parameter of the pipeline, see invalidate_signatures.
+        """
+        module_id = self._signature_owner(obj_type, obj_id)
+        if module_id is not None:
+            self.invalidate_signatures(module_id)
+        else:
+            self.reset_signatures()
+
+    def _signature_owner(self, obj_type, obj_id):
+        """_signature_owner(obj_type: str, obj_id: int) -> int
+        Returns the id of the module whose signature depends on the given
+        object, or None if it can't be determined."""
+        if obj_type in (Module.vtType, Group.vtType, Abstraction.vtType):
+            return obj_id
+        elif obj_type in (ModuleFunction.vtType, ModuleParam.vtType):
+            key = (obj_type, obj_id)
+            if self._signature_owners is None or \
+                    key not in self._signature_owners:
+                self._build_signature_owners()
+            return self._signature_owners.get(key)
+        return None
+
+    def _build_signature_owners(self):
+        self._signature_owners = {}
+        for module in self.module_list:
+            self._index_signature_owner(module.functions, module.id)
+
+    def _index_signature_owner(self, functions, module_id):
+        owners = self._signature_owners
+        for function in functions:
+            owners[(ModuleFunction.vtType, function.real_id)] = module_id
+            for param in function.params:
+                owners[(ModuleParam.vtType, param.real_id)] = module_id
+
+    def _unindex_signature_owner(self, functions):
+        owners = self._signature_owners
+        for function in functions:
+            owners.pop((ModuleFunction.vtType, function.real_id), None)
+            for param in function.params:
+                owners.pop((ModuleParam.vtType, param.real_id), None)
+
+    def _update_signature_owners(self, op, what):
+        """_update_signature_owners(op: Operation, what: str) -> None
+        Keeps the function and parameter index in sync with an operation
+        that was just performed."""
+        if self._signature_owners is None:
+            return
+        if op.vtType == 'delete':
+            self._signature_owners.pop((what, op.objectId), None)
+            return
+        if op.vtType == 'change':
+            self._signature_owners.pop((what, op.oldObjId), None)
+        module_id = self._signature_owner(op.parentObjType, op.parentObjId)
+        if module_id is None:
+            return
+        if what == ModuleFunction.vtType:
+            self._index_signature_owner([op.data], module_id)
+        else:
+            self._signature_owners[(what, op.data.real_id)] = module_id
+
+    def reset_signatures(self):
+        """reset_signatures() -> None
+        Discards every cached signature of this pipeline."""
+        self._connection_signatures = Bidict()
+        self._subpipeline_signatures = Bidict()
+        self._module_signatures = Bidict()
+        self._volatile_signatures = set()
+
     def refresh_signatures(self):
-        self._connection_signatures = {}
-        self._subpipeline_signatures = {}
-        self._module_signatures = {}
+        """refresh_signatures() -> None
+        Recomputes every signature of this pipeline from scratch."""
+        self.reset_signatures()
         self.compute_signatures()
 
-    def compute_signatures(self):
-        """compute_signatures(): compute all module and subpipeline signatures
-        for this pipeline."""
+    def compute_signatures(self, rehash_volatile=True):
+        """compute_signatures(rehash_volatile: bool): compute all module and
+        subpipeline signatures for this pipeline.
+
+        Only the signatures that were invalidated since the last call are
+        recomputed. Signatures of modules using a custom hasher are
+        rehashed as well unless rehash_volatile is False."""
+        if not rehash_volatile:
+            volatile = []
+        else:
+            volatile = list(self._volatile_signatures)
+        for module_id in volatile:
+            if module_id not in self.modules:
+                self._volatile_signatures.discard(module_id)
+                continue
+            old_sig = self._module_signatures.get(module_id)
+            if old_sig is not None:
+                del self._module_signatures[module_id]
+            if self.module_signature(module_id) != old_sig:
+                self._invalidate_downstream(module_id)
         for i in self.modules.iterkeys():
             self.subpipeline_signature(i)
         for c in self.connections.iterkeys():
             self.connection_signature(c)
+        # content hashers only fill the digest cache; write it once per pass
+        save_file_digest_cache()
 
     ##########################################################################
     # Registry-related
@@ -1457,6 +1635,103 @@ class TestPipeline(unittest.TestCase):
         self.assertNotEquals(c_sig_size_before, c_sig_size_after)
         self.assertNotEquals(p_sig_size_before, p_sig_size_after)
 
+    def test_incremental_signatures(self):
+        """Makes sure edits only invalidate downstream signatures, and
+        that recomputing them matches a full refresh."""
+        import vistrails.core.db.action
+
+        def signatures(p):
+            return (dict(p._module_signatures),
+                    dict(p._subpipeline_signatures),
+                    dict(p._connection_signatures))
+
+        pycalc_pkg = 'org.vistrails.vistrails.pythoncalc'
+        id_scope = IdScope()
+        def module(op):
+            param = ModuleParam(id=id_scope.getNewId(ModuleParam.vtType),
+                                type='String',
+                                val=op)
+            function = ModuleFunction(
+                    id=id_scope.getNewId(ModuleFunction.vtType),
+                    name='op',
+                    parameters=[param])
+            return Module(id=id_scope.getNewId(Module.vtType),
+                          name='PythonCalc',
+                          package=pycalc_pkg,
+                          functions=[function])
+        def connection(source, dest, dest_port):
+            ports = [Port(id=id_scope.getNewId(Port.vtType),
+                          type='source',
+                          moduleId=source.id,
+                          moduleName='PythonCalc',
+                          name='value'),
+                     Port(id=id_scope.getNewId(Port.vtType),
+                          type='destination',
+                          moduleId=dest.id,
+                          moduleName='PythonCalc',
+                          name=dest_port)]
+            return Connection(id=id_scope.getNewId(Connection.vtType),
+                              ports=ports)
+        m0, m1, m2 = module('+'), module('+'), module('*')
+        p = Pipeline(id=id_scope.getNewId(Pipeline.vtType),
+                     modules=[m0, m1, m2],
+                     connections=[connection(m0, m2, 'value1'),
+                                  connection(m1, m2, 'value2')])
+        p.build_index()
+        p.compute_signatures()
+        old_sink_sig = p.subpipeline_signature(2)
+        old_m1_sig = p.subpipeline_signature(1)
+
+        # change a parameter of module 0 through an action
+        func = p.modules[0].functions[0]
+        old_param = func.params[0]
+        new_param = ModuleParam(id=-1,
+                                pos=old_param.pos,
+                                name=old_param.name,
+                                val='-',
+                                type=old_param.type)
+        action = vistrails.core.db.action.create_action(
+            [('change', old_param, new_param, func.vtType, func.real_id)])
+        p.perform_action(action)
+        self.assertNotIn(0, p._module_signatures)
+        self.assertNotIn(2, p._subpipeline_signatures)
+        self.assertEqual(p._subpipeline_signatures[1], old_m1_sig)
+        p.compute_signatures()
+        incremental = signatures(p)
+        p.refresh_signatures()
+        self.assertEqual(incremental, signatures(p))
+        self.assertNotEqual(p.subpipeline_signature(2), old_sink_sig)
+
+        # change a parameter in place, then through the index
+        param = p.modules[1].functions[0].params[0]
+        param.strValue = '*'
+        p.invalidate_object_signatures(ModuleParam.vtType, param.real_id)
+        self.assertNotIn(1, p._module_signatures)
+        p.compute_signatures()
+        incremental = signatures(p)
+        p.refresh_signatures()
+        self.assertEqual(incremental, signatures(p))
+
+        # setting an aliased parameter invalidates its module
+        p.add_alias('op', ModuleParam.vtType, param.real_id,
+                    ModuleFunction.vtType, p.modules[1].functions[0].real_id,
+                    1)
+        p.set_alias_str_value('op', '+')
+        self.assertNotIn(1, p._module_signatures)
+        p.compute_signatures()
+        incremental = signatures(p)
+        p.refresh_signatures()
+        self.assertEqual(incremental, signatures(p))
+
+        # removing a connection changes the sink's subpipeline
+        sink_sig = p.subpipeline_signature(2)
+        p.delete_connection(0)
+        p.compute_signatures()
+        self.assertNotEqual(p.subpipeline_signature(2), sink_sig)
+        incremental = signatures(p)
+        p.refresh_signatures()
+        self.assertEqual(incremental, signatures(p))
+
     def test_delete_connections(self):
         p = self.create_default_pipeline()
         p.delete_connection(0)
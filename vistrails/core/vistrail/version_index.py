@@ -0,0 +1,244 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Inverted index over the actions of a vistrail.
+
+Searches used to materialize the pipeline of every version they looked at.
+The VersionIndex records, for each module name, package identifier and
+parameter value, which actions introduced it; a version can only contain
+one of them if the action that introduced it is on the path from the root
+to that version. Deletions are not tracked, so the candidates it returns
+still have to be checked against the actual pipeline, but versions that
+can't match are discarded without building anything.
+
+It also records the module descriptors used by each action, so that the
+versions that might need an upgrade (see upgrade_candidates()) are known
+without validating their pipeline.
+"""
+from __future__ import division
+
+import unittest
+
+
+class VersionIndex(object):
+    """Maps module names, packages and parameter values to versions.
+
+    It is built in a single pass over the actions and updated with
+    add_action() as new versions are created.
+    """
+    MODULE = 'module'
+    PACKAGE = 'package'
+    PARAMETER = 'parameter'
+    DESCRIPTOR = 'descriptor'
+
+    MODULE_TYPES = frozenset(['module', 'abstraction', 'group'])
+
+    def __init__(self, actions=()):
+        self.parents = {}
+        self.terms = {self.MODULE: {},
+                      self.PACKAGE: {},
+                      self.PARAMETER: {},
+                      self.DESCRIPTOR: {}}
+        for action in sorted(actions, key=lambda a: a.db_id):
+            self.add_action(action)
+
+    def __len__(self):
+        return len(self.parents)
+
+    def _add_term(self, kind, value, version):
+        if value is not None:
+            self.terms[kind].setdefault(value, set()).add(version)
+
+    def add_action(self, action):
+        """Indexes the objects added or changed by an action.
+        """
+        version = action.db_id
+        self.parents[version] = action.db_prevId
+        for op in action.db_operations:
+            if op.vtType not in ('add', 'change'):
+                continue
+            obj = op.db_data
+            if obj is None:
+                continue
+            if op.db_what in self.MODULE_TYPES:
+                self._add_term(self.MODULE, obj.db_name, version)
+                self._add_term(self.PACKAGE, obj.db_package, version)
+                self._add_descriptors(obj, version)
+            elif op.db_what == 'parameter':
+                self._add_term(self.PARAMETER, obj.db_val, version)
+
+    def _add_descriptors(self, obj, version):
+        self._add_term(self.DESCRIPTOR,
+                       (obj.db_package, obj.db_name, obj.db_namespace or '',
+                        obj.db_version or '',
+                        str(getattr(obj, 'db_internal_version', '') or '')),
+                       version)
+        # the modules inside a group are upgraded with it
+        workflow = getattr(obj, 'db_workflow', None)
+        if workflow is not None:
+            for module in workflow.db_modules:
+                self._add_descriptors(module, version)
+
+    def introducing(self, kind, match):
+        """Returns the versions that introduced a value of the given kind.
+
+        match is either the value itself or a predicate on the values.
+        """
+        terms = self.terms[kind]
+        if not callable(match):
+            return terms.get(match, set())
+        result = set()
+        for value, versions in terms.iteritems():
+            if match(value):
+                result.update(versions)
+        return result
+
+    def upgrade_candidates(self, registry):
+        """Returns the versions that introduced a module missing from registry.
+
+        Only the versions that have one of these as ancestor can fail to
+        validate and get upgraded, which may rename modules or change
+        parameters.
+        """
+        return self.introducing(
+                self.DESCRIPTOR,
+                lambda d: not registry.has_descriptor_with_name(*d))
+
+    def has_ancestor_in(self, version, versions, memo):
+        """Tells whether version or one of its ancestors is in versions.
+
+        memo is a dictionary filled with the results for the versions
+        walked through; pass the same one for every lookup made with the
+        same set of versions.
+        """
+        path = []
+        while True:
+            if version in memo:
+                result = memo[version]
+                break
+            path.append(version)
+            if version in versions:
+                result = True
+                break
+            version = self.parents.get(version)
+            if version is None:
+                result = False
+                break
+        for v in path:
+            memo[v] = result
+        return result
+
+    def candidates(self, versions, kind, match):
+        """Filters versions, keeping those that might contain the value.
+        """
+        introducing = self.introducing(kind, match)
+        if not introducing:
+            return set()
+        memo = {}
+        return set(v for v in versions
+                   if self.has_ancestor_in(v, introducing, memo))
+
+
+class TestVersionIndex(unittest.TestCase):
+    def make_vistrail(self):
+        from vistrails.core.db.action import create_action
+        from vistrails.core.modules.basic_modules import identifier, version
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.module_function import ModuleFunction
+        from vistrails.core.vistrail.module_param import ModuleParam
+        from vistrails.core.vistrail.vistrail import Vistrail
+
+        vistrail = Vistrail()
+        id_scope = vistrail.idScope
+
+        def add(parent, name, value=None):
+            functions = []
+            if value is not None:
+                param = ModuleParam(id=id_scope.getNewId(ModuleParam.vtType),
+                                    type='String', val=value)
+                functions.append(ModuleFunction(
+                        id=id_scope.getNewId(ModuleFunction.vtType),
+                        name='value', parameters=[param]))
+            module = Module(id=id_scope.getNewId(Module.vtType),
+                            name=name, package=identifier,
+                            version=version,
+                            functions=functions)
+            action = create_action([('add', module)])
+            vistrail.add_action(action, parent)
+            return action.id
+
+        v1 = add(0, 'String', 'hello')
+        v2 = add(v1, 'Integer')
+        v3 = add(v1, 'Float')
+        v4 = add(v3, 'String', 'world')
+        return vistrail, (v1, v2, v3, v4)
+
+    def test_build_and_update(self):
+        vistrail, (v1, v2, v3, v4) = self.make_vistrail()
+        built = VersionIndex(vistrail.actions)
+        updated = vistrail.get_version_index()
+        for index in (built, updated):
+            self.assertEqual(index.candidates([v1, v2, v3, v4],
+                                              VersionIndex.MODULE, 'Float'),
+                             set([v3, v4]))
+            self.assertEqual(index.candidates([v1, v2, v3, v4],
+                                              VersionIndex.PARAMETER,
+                                              'world'),
+                             set([v4]))
+            self.assertEqual(index.candidates([v1, v2, v3, v4],
+                                              VersionIndex.MODULE,
+                                              lambda n: n.endswith('er')),
+                             set([v2]))
+            self.assertEqual(index.candidates([v1, v2, v3, v4],
+                                              VersionIndex.MODULE, 'List'),
+                             set())
+        self.assertEqual(len(updated), 4)
+
+    def test_upgrade_candidates(self):
+        from vistrails.core.db.action import create_action
+        from vistrails.core.modules.basic_modules import identifier
+        from vistrails.core.modules.module_registry import get_module_registry
+        from vistrails.core.vistrail.module import Module
+
+        vistrail, (v1, v2, v3, v4) = self.make_vistrail()
+        registry = get_module_registry()
+        index = vistrail.get_version_index()
+        self.assertEqual(index.upgrade_candidates(registry), set())
+        module = Module(id=vistrail.idScope.getNewId(Module.vtType),
+                        name='String', package=identifier, version='0.0.1')
+        action = create_action([('add', module)])
+        vistrail.add_action(action, v3)
+        self.assertEqual(index.upgrade_candidates(registry), set([action.id]))
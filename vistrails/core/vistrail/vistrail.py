@@ -60,6 +60,7 @@ from vistrails.core.vistrail.module_function import ModuleFunction
 from vistrails.core.vistrail.module_param import ModuleParam
 from vistrails.core.vistrail.operation import AddOp, ChangeOp, DeleteOp
 from vistrails.core.vistrail.plugin_data import PluginData
+from vistrails.core.vistrail.version_index import VersionIndex
 
 import unittest
 import copy
@@ -127,6 +128,8 @@ class Vistrail(DBVistrail):
         # add all versions to the trees
         for action in sorted(self.actions, key=lambda a: a.id):
             self.tree.addVersion(action.id, action.prevId)
+        # inverted index for searches, built on first use
+        self._version_index = None
 
     @staticmethod
     def convert(_vistrail):
@@ -548,6 +551,18 @@ class Vistrail(DBVistrail):
 
         # signal to update explicit tree
         self.tree.addVersion(action.id, action.prevId)
+        if self._version_index is not None:
+            self._version_index.add_action(action)
+
+    def get_version_index(self):
+        """get_version_index() -> VersionIndex
+        Returns the index of module names, packages and parameter values,
+        building it if needed
+
+        """
+        if self._version_index is None:
+            self._version_index = VersionIndex(self.actions)
+        return self._version_index
 
     def hasTag(self, tag):
         """ hasTag(tag) -> boolean 
@@ -1038,8 +1053,8 @@ class Vistrail(DBVistrail):
             if self.db_log_filename is not None:
                 log = open_log_from_xml(self.db_log_filename, True)
         if isinstance(self.locator, vistrails.core.db.locator.DBLocator):
-            connection = self.locator.get_connection()
-            log = open_vt_log_from_db(connection, self.db_id)
+            with self.locator.connection() as connection:
+                log = open_vt_log_from_db(connection, self.db_id)
         Log.convert(log)
         return log
     
@@ -348,6 +348,13 @@ class Object(object):
     def getChildren(self):
         return 'db_children'
 
+    def useSlots(self):
+        try:
+            return self.params['slots'] == 'true'
+        except KeyError:
+            pass
+        return False
+
     def getKey(self):
         for property in self.properties:
             if property.isPrimaryKey():
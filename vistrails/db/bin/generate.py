@@ -37,9 +37,7 @@
 ###############################################################################
 """auto-generates code given specs"""
 
-# requires mako python package (easy_install Mako) and 
-# uses emacs via subprocess call for python indentation
-# the emacs call is slow because it checks all of the indentation
+# requires mako python package (easy_install Mako)
 
 from __future__ import division
 
@@ -48,7 +46,6 @@ from mako.template import Template
 import os
 import re
 import shutil
-import subprocess
 import sys
 import tempfile
 import getopt
@@ -58,6 +55,15 @@ import sql_gen_objects
 
 BASE_DIR = os.path.dirname(os.getcwd())
 
+# objects whose domain classes are generated with __slots__; these are
+# the ones a large vistrail holds many instances of.  Classes used with
+# multiple inheritance in core (module, group, abstraction, config*)
+# must not be listed, their layouts would conflict.
+SLOTS_OBJECTS = ['action', 'actionAnnotation', 'add', 'annotation', 'change',
+                 'connection', 'controlParameter', 'delete', 'function',
+                 'location', 'parameter', 'port', 'portSpec', 'portSpecItem',
+                 'tag']
+
 DOMAIN_INIT = """from auto_gen import *"""
 PERSISTENCE_INIT = \
 """from xml.auto_gen import XMLDAOListBase
@@ -146,10 +152,70 @@ def preprocess_template(in_fname, out_fname=None):
         out_file.close()
     in_file.close()
 
+def indent_python_lines(lines):
+    """indent_python_lines(lines: list of str) -> list of str
+    Aligns the lines continuing an open bracket the way emacs'
+    python-mode does: with the first argument if there is one after the
+    bracket, 4 columns past the line with the bracket otherwise. Other
+    lines are kept as the templates indent them.
+
+    """
+    out = []
+    # (column to align to, indentation of the line with the bracket)
+    brackets = []
+    in_string = None
+    for line in lines:
+        stripped = line.lstrip(' ')
+        if brackets and in_string is None and stripped.strip():
+            col, base = brackets[-1]
+            if col is None:
+                col = base + 4
+            line = ' ' * col + stripped
+        out.append(line)
+
+        text = line.rstrip('\n')
+        indent = len(text) - len(text.lstrip(' '))
+        i = 0
+        while i < len(text):
+            c = text[i]
+            if in_string is not None:
+                if text.startswith(in_string, i):
+                    i += len(in_string)
+                    in_string = None
+                elif c == '\\':
+                    i += 2
+                else:
+                    i += 1
+            elif c == '#':
+                break
+            elif text.startswith('"""', i) or text.startswith("'''", i):
+                in_string = text[i:i+3]
+                i += 3
+            elif c in '"\'':
+                i += 1
+                while i < len(text) and text[i] != c:
+                    if text[i] == '\\':
+                        i += 1
+                    i += 1
+                i += 1
+            else:
+                if c in '([{':
+                    if text[i+1:].split('#')[0].strip():
+                        brackets.append((i + 1, indent))
+                    else:
+                        brackets.append((None, indent))
+                elif c in ')]}' and brackets:
+                    brackets.pop()
+                i += 1
+    return out
+
 def indent_python(fname):
-    subprocess.Popen(["emacs", "-batch", fname, "-f", "mark-whole-buffer",
-                      "-f", "indent-region", "-f", "save-buffer", "-kill"],
-                     stdout=subprocess.PIPE).communicate()
+    f = open(fname)
+    lines = f.readlines()
+    f.close()
+    f = open(fname, 'w')
+    f.writelines(indent_python_lines(lines))
+    f.close()
 
 def run_template(template_fname, objects, version, version_string, output_file,
                  indent=False):
@@ -170,6 +236,14 @@ def run_template(template_fname, objects, version, version_string, output_file,
     finally:
         os.remove(p_fname)
 
+def set_slots(objects, names):
+    names = set(names)
+    for obj in objects:
+        if 'all' in names or obj.getRegularName() in names:
+            obj.params['slots'] = 'true'
+        else:
+            obj.params.pop('slots', None)
+
 def usage(usageDict):
     usageStr = ''
     unrequired = ''
@@ -199,6 +273,7 @@ def dirStructure(baseDir):
     dirs['schemas'] = os.path.join(dirs['base'], 'schemas')
     dirs['xmlPersistence'] = os.path.join(dirs['persistence'], 'xml')
     dirs['sqlPersistence'] = os.path.join(dirs['persistence'], 'sql')
+    dirs['binaryPersistence'] = os.path.join(dirs['persistence'], 'binary')
     dirs['xmlSchema'] = os.path.join(dirs['schemas'], 'xml')
     dirs['sqlSchema'] = os.path.join(dirs['schemas'], 'sql')
     return dirs
@@ -226,14 +301,18 @@ def main(argv=None):
     options = {}
     objects = None
 
-    optionsUsage = {'a': ('generate all database information (-p -s -x)', 
+    optionsUsage = {'a': ('generate all database information (-p -s -x -c)', 
                           False),
                     'b:': ('base directory', False, 'dir'),
                     'd:': ('versions directory', False, 'dir'),
                     'p': ('generate python domain classes', False),
                     's': ('generate sql schema and persistence classes', False),
                     'x': ('generate xml schema and persistence classes', False),
+                    'c': ('generate compact binary persistence classes', False),
                     'v:': ('vistrail version tag', True, 'version'),
+                    'l:': ('objects generated with __slots__ ' \
+                               '(comma-separated, all, none)', False,
+                           'objects'),
                     'm': ('make all directories', False),
                     'n': ('do not change current version', False)}
 
@@ -307,6 +386,10 @@ def main(argv=None):
         if objects is None:
             parser = AutoGenParser()
             objects = parser.parse(versionDirs['specs'])
+        if options['l']:
+            set_slots(objects, options['l'].split(','))
+        else:
+            set_slots(objects, SLOTS_OBJECTS)
         run_template('templates/domain.py.mako', objects, version, versionName,
                      os.path.join(versionDirs['domain'], 'auto_gen.py'),
                      True)
@@ -376,6 +459,20 @@ def main(argv=None):
                      os.path.join(versionDirs['sqlPersistence'], 'auto_gen.py'),
                      True)
 
+    if options['c'] or options['a']:
+        # generate binary dao objects, they follow the xml fields
+        print "generating binary dao objects..."
+        if objects is None:
+            parser = AutoGenParser()
+            objects = parser.parse(versionDirs['specs'])
+        xml_objects = xml_gen_objects.convert(objects)
+
+        run_template('templates/binary.py.mako', xml_objects,
+                     version, versionName,
+                     os.path.join(versionDirs['binaryPersistence'],
+                                  'auto_gen.py'),
+                     True)
+
     if not options['n']:
         domainFile = os.path.join(baseDirs['persistence'], '__init__.py')
         f = open(domainFile, 'w')
@@ -384,5 +481,45 @@ def main(argv=None):
                     versionName)
         f.close()
             
+import unittest
+
+class TestGeneratedCode(unittest.TestCase):
+    def test_current_version(self):
+        """Checks that the domain, xml and binary code of the current
+        version is what the templates generate from its specs."""
+        from vistrails.core.system import vistrails_root_directory
+        from vistrails.db.versions import currentVersion, get_version_name
+
+        versionName = get_version_name(currentVersion)
+        versionDir = os.path.join(vistrails_root_directory(), 'db',
+                                  'versions', versionName)
+        templatesDir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    'templates')
+        def domain_objects():
+            objects = AutoGenParser().parse(os.path.join(versionDir, 'specs'))
+            set_slots(objects, SLOTS_OBJECTS)
+            return objects
+        def xml_objects():
+            # convert() changes the objects it is given
+            return xml_gen_objects.convert(domain_objects())
+        outDir = tempfile.mkdtemp(prefix='vt_generate_')
+        try:
+            for (template, get_objects, path) in \
+                    [('domain.py.mako', domain_objects, 'domain'),
+                     ('xml.py.mako', xml_objects, 'persistence/xml'),
+                     ('binary.py.mako', xml_objects, 'persistence/binary')]:
+                output_file = os.path.join(outDir, template[:-5])
+                run_template(os.path.join(templatesDir, template),
+                             get_objects(), currentVersion, versionName,
+                             output_file, True)
+                with open(output_file) as f:
+                    generated = f.read()
+                with open(os.path.join(versionDir, path, 'auto_gen.py')) as f:
+                    self.assertEqual(generated, f.read(),
+                                     "%s/auto_gen.py is not the output of "
+                                     "%s" % (path, template))
+        finally:
+            shutil.rmtree(outDir)
+
 if __name__ == '__main__':
     main()
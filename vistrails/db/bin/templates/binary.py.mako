@@ -0,0 +1,177 @@
+<%text>###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+</%text>
+"""generated automatically by auto_dao.py"""
+
+from __future__ import division
+
+from binary_dao import BinaryDAO
+from vistrails.db.versions.${version_string}.domain import *
+
+<%
+def getBinaryFields(obj):
+    return [f for f in obj.getPythonFields() if f.hasSpec()]
+
+def needsConversion(field):
+    return field.isReference() or \
+        field.getPythonType() in ('date', 'datetime')
+
+def isPositional(obj):
+    return getBinaryFields(obj) == obj.getPythonFields()
+
+def needsUnpacking(obj):
+    return not isPositional(obj) or \
+        any(needsConversion(f) for f in getBinaryFields(obj))
+%> \\
+% for obj in objs:
+class ${obj.getClassName()}BinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    ## define fromBinary function
+    def fromBinary(self, record):
+        % if not needsUnpacking(obj):
+        obj = ${obj.getClassName()}(*record)
+        % else:
+        <%
+        names = [f.getRegularName() for f in getBinaryFields(obj)]
+        %> \\
+        (${', '.join(names)}${',' if len(names) == 1 else ''}) = record
+        % for field in getBinaryFields(obj):
+        % if field.isChoice():
+        % if field.isPlural():
+        daos = self.daoList
+        ${field.getRegularName()} = [daos[t].fromBinary(r) \
+                                     for (t, r) in ${field.getRegularName()}]
+        % else:
+        if ${field.getRegularName()} is not None:
+            ${field.getRegularName()} = self.getDao( \!
+                ${field.getRegularName()}[0]).fromBinary( \!
+                ${field.getRegularName()}[1])
+        % endif
+        % elif field.isReference():
+        % if field.isPlural():
+        ${field.getRegularName()} = \
+            map(self.getDao('${field.getReference()}').fromBinary, \
+                ${field.getRegularName()})
+        % else:
+        if ${field.getRegularName()} is not None:
+            ${field.getRegularName()} = \
+                self.getDao('${field.getReference()}').fromBinary( \!
+                ${field.getRegularName()})
+        % endif
+        % elif needsConversion(field):
+        ${field.getRegularName()} = \
+            self.convertFromBinary(${field.getRegularName()}, \
+                                   '${field.getPythonType()}')
+        % endif
+        % endfor
+        % if isPositional(obj):
+        obj = ${obj.getClassName()}( \!
+            ${',\n'.join([f.getRegularName() for f in getBinaryFields(obj)])})
+        % else:
+        obj = ${obj.getClassName()}( \!
+            ${',\n'.join(['%s=%s' % (f.getRegularName(), f.getRegularName()) \
+                          for f in getBinaryFields(obj)])})
+        % endif
+        % endif
+        obj.is_dirty = False
+        return obj
+
+    ## define toBinary function
+    def toBinary(self, ${obj.getRegularName()}):
+        % for field in getBinaryFields(obj):
+        % if needsConversion(field):
+        ${field.getRegularName()} = \
+            ${obj.getRegularName()}.${field.getFieldName()}
+        % if field.isChoice():
+        % if field.isPlural():
+        daos = self.daoList
+        ${field.getRegularName()} = [(v.vtType, daos[v.vtType].toBinary(v)) \
+                                     for v in ${field.getRegularIterator()}]
+        % else:
+        if ${field.getRegularName()} is not None:
+            ${field.getRegularName()} = (${field.getRegularName()}.vtType,
+                self.getDao(${field.getRegularName()}.vtType).toBinary( \!
+                    ${field.getRegularName()}))
+        % endif
+        % elif field.isReference():
+        % if field.isPlural():
+        ${field.getRegularName()} = \
+            map(self.getDao('${field.getReference()}').toBinary, \
+                ${field.getRegularIterator()})
+        % else:
+        if ${field.getRegularName()} is not None:
+            ${field.getRegularName()} = \
+                self.getDao('${field.getReference()}').toBinary( \!
+                ${field.getRegularName()})
+        % endif
+        % else:
+        ${field.getRegularName()} = \
+            self.convertToBinary(${field.getRegularName()}, \
+                                 '${field.getPythonType()}')
+        % endif
+        % endif
+        % endfor
+        <%
+        values = []
+        for f in getBinaryFields(obj):
+            if needsConversion(f):
+                values.append(f.getRegularName())
+            else:
+                values.append('%s.%s' % (obj.getRegularName(),
+                                         f.getFieldName()))
+        %> \\
+        return (${',\n'.join(values)}${',' if len(values) == 1 else ''})
+
+% endfor
+"""generated automatically by auto_dao.py"""
+
+class BinaryDAOListBase(dict):
+
+    def __init__(self, daos=None):
+        if daos is not None:
+            dict.update(self, daos)
+
+        % for obj in objs:
+        if '${obj.getRegularName()}' not in self:
+            self['${obj.getRegularName()}'] = \
+                ${obj.getClassName()}BinaryDAOBase(self)
+        % endfor
@@ -25,6 +25,21 @@ def shouldIgnoreIndexDelete(index):
     if type(index) == type([]):
         return index[0][0] == '!'
     return index[0] == '!'
+
+def getSlotNames(obj):
+    slots = []
+    for field in obj.getPythonFields():
+        if field.isReference() and not field.isInverse():
+            slots.append('db_deleted_' + field.getRegularName())
+        if field.isPlural():
+            for index in field.getAllIndices():
+                slots.append('db_%s_%s_index' % (field.getRegularName(),
+                                                  getIndexName(index)))
+        slots.append(field.getPrivateName())
+    # keep __dict__ and __weakref__ so that core subclasses can add their
+    # own attributes and objects can still be converted via __class__
+    slots.extend(['is_dirty', 'is_new', '__dict__', '__weakref__'])
+    return slots
 %> \\
 <%text>###############################################################################
 ##
@@ -64,6 +79,8 @@ def shouldIgnoreIndexDelete(index):
 </%text>
 """generated automatically by auto_dao.py"""
 
+from __future__ import division
+
 import copy
 
 % for obj in objs:
@@ -71,6 +88,22 @@ class ${obj.getClassName()}(object):
 
     vtType = '${obj.getRegularName()}'
 
+    % if obj.useSlots():
+    __slots__ = (${(',\n' + ' ' * 17).join(["'%s'" % n \
+                                            for n in getSlotNames(obj)])})
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in ${obj.getClassName()}.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
+    % endif
     def __init__(self, ${', '.join(['%s=None' % n \
                                     for n in obj.getConstructorNames()])}):
         % for field in obj.getPythonFields():
@@ -36,6 +36,8 @@
 </%text>
 """generated automatically by auto_dao.py"""
 
+from __future__ import division
+
 from sql_dao import SQLDAO
 from vistrails.db.versions.${version_string}.domain import *
 
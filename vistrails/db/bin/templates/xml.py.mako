@@ -36,6 +36,8 @@
 </%text>
 """generated automatically by auto_dao.py"""
 
+from __future__ import division
+
 from vistrails.core.system import get_elementtree_library
 ElementTree = get_elementtree_library()
 
@@ -45,6 +47,30 @@ from vistrails.db.versions.${version_string}.domain import *
 % for obj in objs:
 class ${obj.getClassName()}XMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        % for prop in obj.getXMLAttributes():
+        '${prop.getName()}': ('${prop.getRegularName()}', '${prop.getPythonType()}'),
+        % endfor
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        % for field in obj.getXMLElements() + obj.getXMLChoices():
+        % if field.isPlural() and field.getPythonType() != 'hash':
+        % if field.isChoice():
+        % for prop in field.getXMLProperties():
+        % if prop.isReference():
+        '${prop.getXMLPropertyName()}': ('${prop.getReference()}', '${field.getRegularName()}'),
+        % endif
+        % endfor
+        % elif field.isReference():
+        '${field.getXMLPropertyName()}': ('${field.getReference()}', '${field.getRegularName()}'),
+        % endif
+        % endif
+        % endfor
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
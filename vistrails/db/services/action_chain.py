@@ -92,31 +92,32 @@ def getCurrentOperationDict(actions, currentOperations=None):
     for action in actions:
         for operation in action.db_operations:
             operationvtType = operation.vtType
-            d = operation.__dict__
+            # read the private fields directly: this works for both
+            # dict-based and __slots__-based domain classes
             if operationvtType == 'add':
-                currentOperations[(d['_db_what'], 
-                                   d['_db_objectId'])] = \
+                currentOperations[(operation._db_what,
+                                   operation._db_objectId)] = \
                                    operation
             elif operationvtType == 'delete':
-                what = d['_db_what']
-                objectId = d['_db_objectId']
+                what = operation._db_what
+                objectId = operation._db_objectId
                 t = (what, objectId)
                 try:
                     del currentOperations[t]
                 except KeyError:
-                    msg = "Illegal delete operation: %d" % d['_db_id']
+                    msg = "Illegal delete operation: %d" % operation._db_id
                     raise RuntimeError(msg)
             elif operationvtType == 'change':
-                what = d['_db_what']
-                objectId = d['_db_oldObjId']
+                what = operation._db_what
+                objectId = operation._db_oldObjId
                 t = (what, objectId)
                 try:
                     del currentOperations[t]
                 except KeyError:
-                    msg = "Illegal change operation: %d" % d['_db_id']
+                    msg = "Illegal change operation: %d" % operation._db_id
                     raise RuntimeError(msg)
                 currentOperations[(what,
-                                   d['_db_newObjId'])] = operation
+                                   operation._db_newObjId)] = operation
             else:
                 msg = "Unrecognized operation '%s'" % operation.vtType
                 raise TypeError(msg)
@@ -0,0 +1,245 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Checkpoints for workflow materialization.
+
+Materializing a version replays every action from the root of the version
+tree.  A checkpoint stores the current-operation dictionary (as computed by
+getCurrentOperationDict) at a given version, so that materialization can
+start from the nearest checkpointed ancestor and only apply the remaining
+actions.  The dictionaries only reference the (immutable) operations already
+stored in the vistrail, so a checkpoint costs one dict entry per object of
+the pipeline at that version.
+
+"""
+
+from __future__ import division
+
+import threading
+
+from vistrails.core.data_structures.lru import LRUDict
+from vistrails.db.services.action_chain import getCurrentOperationDict
+
+
+class WorkflowCheckpoints(object):
+    """Bounded LRU store of operation dictionaries for a single vistrail.
+
+    A checkpoint is created every `interval` actions of tree depth while
+    replaying a chain, and at the requested version itself when more than
+    `interval` actions had to be replayed to reach it.  At most
+    `max_checkpoints` checkpoints are kept; the least recently used one is
+    dropped first.  The store may be used from several threads.
+
+    """
+    def __init__(self, max_checkpoints=64, interval=50):
+        self.max_checkpoints = max_checkpoints
+        self.interval = interval
+        # version -> (action, depth, operation dict)
+        self._checkpoints = LRUDict()
+        # guards _checkpoints and the counters
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._checkpoints)
+
+    def __contains__(self, version):
+        return version in self._checkpoints
+
+    def clear(self):
+        with self._lock:
+            self._checkpoints.clear()
+
+    def _lookup(self, vistrail, version):
+        with self._lock:
+            # popping also removes the entry from its LRU position
+            entry = self._checkpoints.pop(version, None)
+            if entry is None:
+                return None
+            action, depth, op_dict = entry
+            # the checkpoint is only valid if the action it was computed
+            # from is still the one stored in the vistrail
+            if (not vistrail.db_has_action_with_id(version) or
+                    vistrail.db_get_action_by_id(version) is not action):
+                return None
+            self._checkpoints[version] = entry
+            return depth, op_dict
+
+    def _store(self, version, action, depth, op_dict):
+        if self.max_checkpoints <= 0:
+            return
+        op_dict = dict(op_dict)
+        with self._lock:
+            self._checkpoints[version] = (action, depth, op_dict)
+            while len(self._checkpoints) > self.max_checkpoints:
+                self._checkpoints.popitem(last=False)
+
+    def get_operation_dict(self, vistrail, version):
+        """get_operation_dict(vistrail, version) -> dict
+
+        Returns the current-operation dictionary for version, equal to
+        getCurrentOperationDict(getActionChain(vistrail, version)).  The
+        returned dictionary is a fresh copy that the caller may modify.
+
+        """
+        chain = []
+        start_depth = 0
+        op_dict = {}
+        current_id = version
+        while current_id > 0:
+            found = self._lookup(vistrail, current_id)
+            if found is not None:
+                start_depth, checkpoint_dict = found
+                op_dict = dict(checkpoint_dict)
+                break
+            action = vistrail.db_get_action_by_id(current_id)
+            chain.append(action)
+            current_id = action.db_prevId
+        else:
+            found = None
+        chain.reverse()
+
+        with self._lock:
+            if found is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if self.interval <= 0:
+            return getCurrentOperationDict(chain, op_dict)
+
+        # replay the chain segment by segment, storing a checkpoint at
+        # every depth that is a multiple of interval
+        depth = start_depth
+        idx = 0
+        while idx < len(chain):
+            step = self.interval - depth % self.interval
+            segment = chain[idx:idx + step]
+            getCurrentOperationDict(segment, op_dict)
+            idx += len(segment)
+            depth += len(segment)
+            if depth % self.interval == 0 or \
+                    (idx == len(chain) and len(chain) > self.interval):
+                action = segment[-1]
+                self._store(action.db_id, action, depth, op_dict)
+        return op_dict
+
+_checkpoints_lock = threading.Lock()
+
+def get_checkpoints(vistrail, create=True):
+    """get_checkpoints(vistrail, create) -> WorkflowCheckpoints
+
+    Returns the checkpoint store attached to vistrail, creating it if
+    necessary.
+
+    """
+    checkpoints = getattr(vistrail, '_workflow_checkpoints', None)
+    if checkpoints is None and create:
+        with _checkpoints_lock:
+            checkpoints = getattr(vistrail, '_workflow_checkpoints', None)
+            if checkpoints is None:
+                checkpoints = WorkflowCheckpoints()
+                vistrail._workflow_checkpoints = checkpoints
+    return checkpoints
+
+def clear_checkpoints(vistrail):
+    checkpoints = get_checkpoints(vistrail, False)
+    if checkpoints is not None:
+        checkpoints.clear()
+
+import unittest
+
+class TestWorkflowCheckpoints(unittest.TestCase):
+    def test_same_pipelines(self):
+        from vistrails.core.db.locator import FileLocator
+        from vistrails.core.system import vistrails_root_directory
+        from vistrails.core.vistrail.pipeline import Pipeline
+        from vistrails.db.services.vistrail import materializeWorkflow
+        vistrail = FileLocator(vistrails_root_directory() +
+                               '/tests/resources/terminator.vt').load().vistrail
+        checkpoints = get_checkpoints(vistrail)
+        checkpoints.interval = 3
+        versions = sorted(vistrail.actionMap.iterkeys())
+        for version in versions + list(reversed(versions)):
+            p1 = materializeWorkflow(vistrail, version, False)
+            p2 = materializeWorkflow(vistrail, version)
+            Pipeline.convert(p1)
+            Pipeline.convert(p2)
+            self.assertEqual(p1, p2)
+        self.assertGreater(len(checkpoints), 0)
+        self.assertGreater(checkpoints.hits, 0)
+
+    def test_bounded(self):
+        from vistrails.core.db.locator import XMLFileLocator
+        from vistrails.core.system import vistrails_root_directory
+        vistrail = XMLFileLocator(vistrails_root_directory() +
+                                  '/tests/resources/dummy.xml').load()
+        checkpoints = WorkflowCheckpoints(max_checkpoints=2, interval=1)
+        for version in vistrail.actionMap.iterkeys():
+            checkpoints.get_operation_dict(vistrail, version)
+            self.assertLessEqual(len(checkpoints), 2)
+
+    def test_threads(self):
+        import threading
+        from vistrails.core.db.locator import FileLocator
+        from vistrails.core.system import vistrails_root_directory
+        from vistrails.db.services.action_chain import getActionChain
+        vistrail = FileLocator(vistrails_root_directory() +
+                               '/tests/resources/terminator.vt').load().vistrail
+        versions = sorted(vistrail.actionMap.iterkeys())[::4]
+        expected = dict((v, getCurrentOperationDict(
+                                getActionChain(vistrail, v)))
+                        for v in versions)
+        checkpoints = WorkflowCheckpoints(max_checkpoints=4, interval=2)
+        errors = []
+        def work(offset):
+            try:
+                for i in xrange(2):
+                    for version in versions[offset:] + versions[:offset]:
+                        op_dict = checkpoints.get_operation_dict(vistrail,
+                                                                 version)
+                        if op_dict != expected[version]:
+                            errors.append(version)
+            except Exception, e:
+                errors.append(e)
+        threads = [threading.Thread(target=work, args=(i * 3,))
+                   for i in xrange(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
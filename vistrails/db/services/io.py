@@ -45,10 +45,15 @@ from vistrails.core.modules.sub_module import get_cur_abs_namespace,\
 
 import vistrails.core.requirements
 
+import binascii
+from contextlib import contextmanager
 from datetime import datetime
+import hashlib
 import os.path
 import shutil
 import tempfile
+import threading
+import time
 import copy
 import warnings
 import zipfile
@@ -73,6 +78,9 @@ import vistrails.core.system
 ElementTree = get_elementtree_library()
 
 CONNECT_TIMEOUT = 15
+# binary copy of the vistrail stored next to its xml in .vt files
+BINARY_VISTRAIL_NAME = 'vistrail.bin'
+MAX_POOL_CONNECTIONS = 8
 
 _db_lib = None
 def get_db_lib():
@@ -208,16 +216,17 @@ def close_db_connection(db_connection):
 def test_db_connection(config):
     """testDBConnection(config: dict) -> None
     Tests a connection raising an exception in case of error.
-    
+
+    The connection is taken from the pool for config, so a successful test
+    leaves an open connection for the next request to use.
+
     """
     #print "Testing config", config
-    if 'connect_timeout' not in config:
-        config['connect_timeout'] = CONNECT_TIMEOUT
     try:
-        db_connection = get_db_lib().connect(**config)
-        close_db_connection(db_connection)
-    except get_db_lib().Error, e:
-        msg = "connection test failed (%d: %s)" % (e.args[0], e.args[1])
+        with pooled_db_connection(config):
+            pass
+    except VistrailsDBException, e:
+        msg = "connection test failed (%s)" % str(e)
         raise VistrailsDBException(msg)
     except TypeError, e:
         msg = "connection test failed (%s)" %str(e)
@@ -234,6 +243,142 @@ def ping_db_connection(db_connection):
     except get_db_lib().OperationalError:
         return False
     return True
+
+class ConnectionPool(object):
+    """Bounded pool of database connections opened with the same config.
+
+    Idle connections are checked with ping_db_connection before being
+    handed out again, and connections that went away are replaced. When
+    max_connections are in use, acquire() waits for one to be released.
+    The pool is safe to use from several threads, but each connection
+    must only be used by the thread that acquired it.
+
+    """
+    def __init__(self, config, max_connections=MAX_POOL_CONNECTIONS,
+                 timeout=CONNECT_TIMEOUT):
+        self.config = dict(config)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle = []
+        self._count = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """acquire() -> connection
+        Returns a live connection, opening one if none is idle.
+
+        """
+        deadline = time.time() + self.timeout
+        with self._condition:
+            while True:
+                while self._idle:
+                    connection = self._idle.pop()
+                    if ping_db_connection(connection):
+                        return connection
+                    self._count -= 1
+                    try:
+                        close_db_connection(connection)
+                    except get_db_lib().Error:
+                        pass
+                if self._count < self.max_connections:
+                    self._count += 1
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    msg = "timed out waiting for a database connection"
+                    raise VistrailsDBException(msg)
+                self._condition.wait(remaining)
+        # Opening happens outside of the lock so that a slow server does
+        # not block threads that could reuse an idle connection
+        try:
+            return open_db_connection(dict(self.config))
+        except Exception:
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection):
+        """release(connection) -> None
+        Returns connection to the pool. Any transaction left open is rolled
+        back so the next user does not see a stale snapshot.
+
+        """
+        try:
+            connection.rollback()
+        except get_db_lib().Error:
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            return
+        with self._condition:
+            if not self._closed:
+                self._idle.append(connection)
+                self._condition.notify()
+                return
+            self._count -= 1
+        close_db_connection(connection)
+
+    def close(self):
+        """close() -> None
+        Closes the idle connections. Connections in use are closed when
+        they are released.
+
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for connection in idle:
+            try:
+                close_db_connection(connection)
+            except get_db_lib().Error:
+                pass
+
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+def _pool_key(config):
+    return tuple(sorted((k, v) for k, v in config.iteritems()
+                        if k != 'connect_timeout'))
+
+def get_connection_pool(config):
+    """get_connection_pool(config: dict) -> ConnectionPool
+    Returns the pool shared by every user of the same connection config.
+
+    """
+    key = _pool_key(config)
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None:
+            pool = _connection_pools[key] = ConnectionPool(config)
+        return pool
+
+def close_connection_pools():
+    """close_connection_pools() -> None
+    Closes the idle connections of every pool and forgets the pools.
+
+    """
+    with _connection_pools_lock:
+        pools = _connection_pools.values()
+        _connection_pools.clear()
+    for pool in pools:
+        pool.close()
+
+@contextmanager
+def pooled_db_connection(config):
+    """pooled_db_connection(config: dict) -> context manager
+    Acquires a connection from the pool for config and releases it when
+    the block exits.
+
+    """
+    pool = get_connection_pool(config)
+    connection = pool.acquire()
+    try:
+        yield connection
+    finally:
+        pool.release(connection)
     
 def translate_to_tbl_name(obj_type):
     map = {DBVistrail.vtType: 'vistrail',
@@ -252,7 +397,6 @@ def date_to_str(date):
 def get_db_object_list(config, obj_type):
     
     result = []    
-    db = open_db_connection(config)
 
     #FIXME Create a DBGetVistrailListSQLDAOBase for this
     # and maybe there's another way to build this query
@@ -282,12 +426,12 @@ def get_db_object_list(config, obj_type):
 #     """ % obj_type
 
     try:
-        c = db.cursor()
-        c.execute(command % translate_to_tbl_name(obj_type))
-        rows = c.fetchall()
-        result = rows
-        c.close()
-        close_db_connection(db)
+        with pooled_db_connection(config) as db:
+            c = db.cursor()
+            c.execute(command % translate_to_tbl_name(obj_type))
+            rows = c.fetchall()
+            result = rows
+            c.close()
         
     except get_db_lib().Error, e:
         msg = "Couldn't get list of vistrails objects from db (%d : %s)" % \
@@ -574,6 +718,134 @@ def save_to_xml(obj, filename, version=None):
         raise VistrailsDBException("cannot save object of type "
                                    "'%s' to xml" % type)
 
+def open_from_binary(filename, type, tags=None):
+    """open_from_binary(filename: str, type: str, tags: dict) -> object
+    Reads a vistrail, workflow or log written by save_to_binary().  The
+    binary format is a fast path for the current schema only: files of
+    other versions are refused and the XML should be read instead.  If
+    tags is given, the file must have been saved with the same tags.
+
+    """
+    if type not in (DBVistrail.vtType, DBWorkflow.vtType, DBLog.vtType):
+        raise VistrailsDBException("cannot open object of type "
+                                   "'%s' from binary" % type)
+    daoList = getVersionDAO(currentVersion)
+    try:
+        obj = daoList.open_from_binary(filename, type, tags)
+        if type == DBVistrail.vtType:
+            vistrails.db.services.vistrail.update_id_scope(obj)
+        elif type == DBWorkflow.vtType:
+            vistrails.db.services.workflow.update_id_scope(obj)
+        else:
+            vistrails.db.services.log.update_id_scope(obj)
+    except (VistrailsDBException, IOError):
+        raise
+    except Exception, e:
+        # malformed records fail in arbitrary ways while being decoded
+        raise VistrailsDBException("Corrupt VisTrails binary file %s: %s" %
+                                   (filename, e))
+    return obj
+
+def save_to_binary(obj, filename, tags=None):
+    """save_to_binary(obj: object, filename: str, tags: dict) -> None
+    Writes a vistrail, workflow or log in the binary format of the
+    current schema.  tags are stored in the header of the file.
+
+    """
+    if obj.vtType not in (DBVistrail.vtType, DBWorkflow.vtType,
+                          DBLog.vtType):
+        raise VistrailsDBException("cannot save object of type "
+                                   "'%s' to binary" % obj.vtType)
+    if not obj.db_version:
+        obj.db_version = currentVersion
+    daoList = getVersionDAO(currentVersion)
+    daoList.save_to_binary(obj, filename, tags)
+
+def file_crc32(filename):
+    """file_crc32(filename: str) -> int
+    Returns the CRC-32 of a file, as stored in zip archives.
+
+    """
+    crc = 0
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), ''):
+            crc = binascii.crc32(chunk, crc)
+    return crc & 0xffffffff
+
+def file_sha1(filename):
+    """file_sha1(filename: str) -> str
+    Returns the hex SHA-1 digest of the contents of a file.
+
+    """
+    sha1 = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), ''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+def get_translation_cache_file(filename, type):
+    """get_translation_cache_file(filename: str, type: str) -> str
+    Returns where the translation of filename, an XML file of an older
+    schema, is cached, keyed by the SHA-1 of its contents and by the
+    VisTrails and schema versions, since translators change between
+    releases.  Returns None if the translation cache is disabled.
+
+    """
+    from vistrails.core.configuration import get_vistrails_configuration
+    conf = get_vistrails_configuration()
+    if not getattr(conf, 'translationCache', False):
+        return None
+    directory = vistrails.core.system.get_vistrails_directory(
+            'translationCacheDir', conf)
+    if directory is None:
+        return None
+    return os.path.join(directory, '%s-%s-%s-%s.bin' % (
+            type, vistrails.core.system.vistrails_version(), currentVersion,
+            file_sha1(filename)))
+
+def open_from_translation_cache(cache_file, type):
+    """open_from_translation_cache(cache_file: str, type: str) -> object
+    Returns the translated object stored in cache_file, or None if there
+    is no usable one (e.g. it was written for an older schema).
+
+    """
+    if cache_file is None or not os.path.isfile(cache_file):
+        return None
+    try:
+        return open_from_binary(cache_file, type)
+    except (VistrailsDBException, IOError), e:
+        debug.log("Ignoring translation cache file %s: %s" % (cache_file, e))
+        return None
+
+def save_to_translation_cache(obj, cache_file):
+    """save_to_translation_cache(obj: object, cache_file: str) -> None
+    Stores a translated object in cache_file.  Failures are not fatal:
+    the file will just be translated again next time.
+
+    """
+    if cache_file is None:
+        return
+    directory = os.path.dirname(cache_file)
+    tmp_fname = None
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # write to a temporary file first so that other processes never
+        # see a partial file
+        fd, tmp_fname = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        save_to_binary(obj, tmp_fname)
+        if os.path.exists(cache_file):
+            os.unlink(cache_file)
+        os.rename(tmp_fname, cache_file)
+    except Exception, e:
+        # some translations produce objects that cannot be written back
+        # (e.g. string dates); they are simply not cached
+        debug.warning("Could not write translation cache file %s" %
+                      cache_file, e)
+        if tmp_fname is not None and os.path.exists(tmp_fname):
+            os.unlink(tmp_fname)
+
 def open_bundle_from_zip_xml(bundle_type, filename):
     if bundle_type == DBVistrail.vtType:
         return open_vistrail_bundle_from_zip_xml(filename)
@@ -655,6 +927,7 @@ def close_zip_xml(temp_dir):
     """
     if temp_dir is None:
         return
+    forget_zip_members(temp_dir)
     if not os.path.isdir(temp_dir):
         if os.path.isfile(temp_dir):
             os.remove(temp_dir)
@@ -684,11 +957,21 @@ def unserialize(str, obj_type):
 
 def open_vistrail_from_xml(filename):
     """open_vistrail_from_xml(filename) -> Vistrail"""
-    tree = ElementTree.parse(filename)
-    version = get_version_for_xml(tree.getroot())
+    extract_zip_member(filename)
+    version = get_version_for_xml_file(filename)
+    cache_file = None
+    if version != currentVersion:
+        cache_file = get_translation_cache_file(filename, DBVistrail.vtType)
+        vistrail = open_from_translation_cache(cache_file, DBVistrail.vtType)
+        if vistrail is not None:
+            return vistrail
     try:
         daoList = getVersionDAO(version)
-        vistrail = daoList.open_from_xml(filename, DBVistrail.vtType, tree)
+        if version == currentVersion:
+            # current schema: build objects while parsing
+            vistrail = daoList.iterparse_vistrail(filename)
+        else:
+            vistrail = daoList.open_from_xml(filename, DBVistrail.vtType)
         if vistrail is None:
             raise VistrailsDBException("Couldn't read vistrail from XML")
         vistrail = translate_vistrail(vistrail, version)
@@ -700,83 +983,239 @@ def open_vistrail_from_xml(filename):
                 "and cannot be opened.")
         raise e
 
+    save_to_translation_cache(vistrail, cache_file)
     return vistrail
 
-def open_vistrail_bundle_from_zip_xml(filename):
-    """open_vistrail_bundle_from_zip_xml(filename) -> SaveBundle
+class LazyList(list):
+    """LazyList is a list whose contents are produced by a loader
+    callable the first time they are accessed.  It is used for bundle
+    members (e.g. mashups) that are expensive to parse and that many
+    sessions never look at.
+
+    """
+
+    def __init__(self, loader):
+        list.__init__(self)
+        self._loader = loader
+
+    def _load(self):
+        if self._loader is not None:
+            loader = self._loader
+            self._loader = None
+            list.extend(self, loader())
+
+    def _loading(name):
+        method = getattr(list, name)
+        def wrapper(self, *args, **kwargs):
+            self._load()
+            return method(self, *args, **kwargs)
+        wrapper.__name__ = name
+        return wrapper
+
+    for _name in ['__iter__', '__reversed__', '__len__', '__contains__',
+                  '__getitem__', '__setitem__', '__delitem__',
+                  '__getslice__', '__setslice__', '__delslice__',
+                  '__eq__', '__ne__', '__repr__', 'append', 'extend',
+                  'insert', 'remove', 'pop', 'index', 'count', 'sort',
+                  'reverse']:
+        locals()[_name] = _loading(_name)
+    del _loading, _name
+
+    def is_loaded(self):
+        return self._loader is None
+
+# maps the path a zip member will be extracted to onto the
+# (zip filename, member name, extraction dir) it still has to come from;
+# the lock is held while extracting so a file is never read half-written
+_pending_zip_members = {}
+_pending_zip_members_lock = threading.Lock()
+
+def extract_zip_member(filename):
+    """extract_zip_member(filename: str) -> None
+    Extracts filename from the .vt archive it was listed in if it has not
+    been written to disk yet.  Paths that do not belong to a lazily opened
+    bundle are left alone.
+
+    """
+    if filename is None:
+        return
+    key = os.path.abspath(filename)
+    with _pending_zip_members_lock:
+        if key not in _pending_zip_members:
+            return
+        zip_fname, member, vt_save_dir = _pending_zip_members[key]
+        z = zipfile.ZipFile(zip_fname)
+        try:
+            z.extract(member, vt_save_dir)
+        finally:
+            z.close()
+        del _pending_zip_members[key]
+
+def extract_zip_members(vt_save_dir):
+    """extract_zip_members(vt_save_dir: str) -> None
+    Extracts every member of a lazily opened bundle that has not been
+    written to vt_save_dir yet.  This needs to happen before the directory
+    is zipped again, as the original archive may be overwritten.
+
+    """
+    if vt_save_dir is None:
+        return
+    prefix = os.path.join(os.path.abspath(vt_save_dir), '')
+    with _pending_zip_members_lock:
+        by_zip = {}
+        for key, (zip_fname, member, save_dir) in \
+                _pending_zip_members.items():
+            if key.startswith(prefix):
+                by_zip.setdefault(zip_fname, []).append((key, member,
+                                                         save_dir))
+        for zip_fname, members in by_zip.iteritems():
+            z = zipfile.ZipFile(zip_fname)
+            try:
+                for key, member, save_dir in members:
+                    z.extract(member, save_dir)
+                    del _pending_zip_members[key]
+            finally:
+                z.close()
+
+def forget_zip_members(vt_save_dir):
+    """forget_zip_members(vt_save_dir: str) -> None
+    Drops the pending members of a bundle whose directory is going away.
+
+    """
+    prefix = os.path.join(os.path.abspath(vt_save_dir), '')
+    with _pending_zip_members_lock:
+        for key in _pending_zip_members.keys():
+            if key.startswith(prefix):
+                del _pending_zip_members[key]
+
+def open_vistrail_bundle_from_zip_xml(filename, binary_cache=None):
+    """open_vistrail_bundle_from_zip_xml(filename, binary_cache: bool)
+         -> SaveBundle
     Open a vistrail from a zip compressed format.
     It expects that the vistrail file inside archive has name 'vistrail',
     the log inside archive has name 'log',
     abstractions inside archive have prefix 'abstraction_',
     and thumbnails inside archive are '.png' files in 'thumbs' dir
 
+    Only the archive index is read up front: the vistrail, thumbnails and
+    the files handled by packages are extracted, while the log and the
+    abstractions are extracted the first time they are opened and the
+    mashups are parsed the first time the list is accessed.
+
+    If binary_cache is set (it defaults to the binaryCache option) and
+    the archive also contains a binary copy of the vistrail that matches
+    its XML, the vistrail is read from that copy instead and the XML is
+    only extracted when needed. Only enable it for trusted files: the
+    copy is not checked against the XML itself.
+
     """
     vt_save_dir = tempfile.mkdtemp(prefix='vt_save')
+    zip_fname = os.path.abspath(filename)
 
-    z = zipfile.ZipFile(filename)
-    try:
-        z.extractall(vt_save_dir)
-    finally:
-        z.close()
-
-    vistrail = None
-    log = None
     log_fname = None
     abstraction_files = []
     unknown_files = []
     thumbnail_files = []
-    mashups = []
+    mashup_files = []
+    vistrail_member = None
+    binary_member = None
+    extract = []
+    deferred = []
+    if binary_cache is None:
+        from vistrails.core.configuration import get_vistrails_configuration
+        binary_cache = getattr(get_vistrails_configuration(), 'binaryCache',
+                               False)
+    from vistrails.core.packagemanager import get_package_manager
+    pm = get_package_manager()
+    z = zipfile.ZipFile(filename)
     try:
-        for root, dirs, files in os.walk(vt_save_dir):
-            for fname in files:
-                if fname == 'vistrail' and root == vt_save_dir:
-                    vistrail = open_vistrail_from_xml(os.path.join(root, fname))
-                elif fname == 'log' and root == vt_save_dir:
-                    # FIXME read log to get execution info
-                    # right now, just ignore the file
-                    log = None 
-                    log_fname = os.path.join(root, fname)
-                    # log = open_log_from_xml(os.path.join(root, fname))
-                    # objs.append(DBLog.vtType, log)
-                elif fname.startswith('abstraction_'):
-                    abstraction_file = os.path.join(root, fname)
-                    abstraction_files.append(abstraction_file)
-                elif (fname.endswith('.png') and
-                      root == os.path.join(vt_save_dir,'thumbs')):
-                    thumbnail_file = os.path.join(root, fname)
-                    thumbnail_files.append(thumbnail_file)
-                elif root == os.path.join(vt_save_dir,'mashups'):
-                    mashup_file = os.path.join(root, fname)
-                    mashup = open_mashuptrail_from_xml(mashup_file)
-                    mashups.append(mashup)
+        for member in z.namelist():
+            if member.endswith('/'):
+                continue
+            path = os.path.join(vt_save_dir, os.path.normpath(member))
+            root, fname = os.path.split(path)
+            if fname == 'vistrail' and root == vt_save_dir:
+                vistrail_member = member
+            elif fname == BINARY_VISTRAIL_NAME and root == vt_save_dir:
+                # it is rewritten or dropped on save, never needed otherwise
+                if binary_cache:
+                    binary_member = member
+                    extract.append(member)
+            elif fname == 'log' and root == vt_save_dir:
+                # FIXME read log to get execution info
+                # right now, just ignore the file
+                log_fname = path
+                deferred.append((path, member))
+            elif fname.startswith('abstraction_'):
+                abstraction_files.append(path)
+                deferred.append((path, member))
+            elif (fname.endswith('.png') and
+                  root == os.path.join(vt_save_dir,'thumbs')):
+                thumbnail_files.append(path)
+                extract.append(member)
+            elif root == os.path.join(vt_save_dir,'mashups'):
+                mashup_files.append(path)
+                deferred.append((path, member))
+            else:
+                handled = False
+                for package in pm.enabled_package_list():
+                    if package.can_handle_vt_file(fname):
+                        handled = True
+                        continue
+                if handled:
+                    extract.append(member)
                 else:
-                    handled = False
-                    from vistrails.core.packagemanager import get_package_manager
-                    pm = get_package_manager()
-                    for package in pm.enabled_package_list():
-                        if package.can_handle_vt_file(fname):
-                            handled = True
-                            continue
-                    if not handled:
-                        unknown_files.append(os.path.join(root, fname))
-    except OSError, e:
+                    unknown_files.append(path)
+        if len(unknown_files) > 0:
+            raise VistrailsDBException("Unknown files in vt file: %s" % \
+                                           unknown_files)
+        if vistrail_member is None:
+            raise VistrailsDBException("vt file does not contain vistrail")
+        vistrail_fname = os.path.join(vt_save_dir, 'vistrail')
+        if binary_member is not None:
+            # the xml is only needed if the binary copy is out of date
+            xml_crc = z.getinfo(vistrail_member).CRC & 0xffffffff
+            deferred.append((vistrail_fname, vistrail_member))
+        else:
+            extract.append(vistrail_member)
+        for member in extract:
+            z.extract(member, vt_save_dir)
+    except (OSError, IOError, zipfile.BadZipfile), e:
         raise VistrailsDBException("Error when reading vt file")
-    if len(unknown_files) > 0:
-        raise VistrailsDBException("Unknown files in vt file: %s" % \
-                                       unknown_files)
+    finally:
+        z.close()
+    with _pending_zip_members_lock:
+        for path, member in deferred:
+            _pending_zip_members[os.path.abspath(path)] = \
+                (zip_fname, member, vt_save_dir)
+
+    vistrail = None
+    if binary_member is not None:
+        try:
+            vistrail = open_from_binary(
+                os.path.join(vt_save_dir, BINARY_VISTRAIL_NAME),
+                DBVistrail.vtType, {'xml_crc32': xml_crc})
+        except (VistrailsDBException, IOError), e:
+            debug.log("Reading the vistrail from XML: %s" % e)
     if vistrail is None:
-        raise VistrailsDBException("vt file does not contain vistrail")
+        vistrail = open_vistrail_from_xml(vistrail_fname)
     vistrail.db_log_filename = log_fname
 
+    def load_mashups():
+        mashups = []
+        for mashup_file in mashup_files:
+            extract_zip_member(mashup_file)
+            mashups.append(open_mashuptrail_from_xml(mashup_file))
+        return mashups
+
     # call package hooks
-    from vistrails.core.packagemanager import get_package_manager
-    pm = get_package_manager()
     for package in pm.enabled_package_list():
         package.loadVistrailFileHook(vistrail, vt_save_dir)
 
-    save_bundle = SaveBundle(DBVistrail.vtType, vistrail, log, 
+    save_bundle = SaveBundle(DBVistrail.vtType, vistrail, None,
                              abstractions=abstraction_files, 
-                             thumbnails=thumbnail_files, mashups=mashups)
+                             thumbnails=thumbnail_files,
+                             mashups=LazyList(load_mashups))
     return (save_bundle, vt_save_dir)
 
 def open_vistrail_bundle_from_db(db_connection, vistrail_id, tmp_dir=None):
@@ -859,7 +1298,8 @@ def save_vistrail_to_xml(vistrail, filename, version=None):
     vistrail.db_currentVersion = current_action
     return vistrail
 
-def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, version=None):
+def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, version=None,
+                                    binary_cache=None):
     """save_vistrail_bundle_to_zip_xml(save_bundle: SaveBundle, filename: str,
                                 vt_save_dir: str, version: str)
          -> (save_bundle: SaveBundle, vt_save_dir: str)
@@ -878,6 +1318,10 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
                                    'bundle does not contain a vistrail')
     if not vt_save_dir:
         vt_save_dir = tempfile.mkdtemp(prefix='vt_save')
+    else:
+        # the archive being written may be the one still backing the
+        # members that were not needed so far
+        extract_zip_members(vt_save_dir)
     # abstractions are saved in the root of the zip file
     # abstraction_dir = os.path.join(vt_save_dir, 'abstractions')
     #thumbnails and mashups have their own folder
@@ -888,10 +1332,28 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
     xml_fname = os.path.join(vt_save_dir, 'vistrail')
     save_vistrail_to_xml(save_bundle.vistrail, xml_fname, version)
 
+    # Save binary copy of the vistrail, tagged with the xml it matches
+    bin_fname = os.path.join(vt_save_dir, BINARY_VISTRAIL_NAME)
+    if binary_cache is None:
+        from vistrails.core.configuration import get_vistrails_configuration
+        binary_cache = getattr(get_vistrails_configuration(), 'binaryCache',
+                               False)
+    if os.path.exists(bin_fname):
+        os.unlink(bin_fname)
+    if binary_cache and version in (None, currentVersion):
+        try:
+            save_to_binary(save_bundle.vistrail, bin_fname,
+                           {'xml_crc32': file_crc32(xml_fname)})
+        except VistrailsDBException, e:
+            debug.warning("Could not save binary copy of vistrail", e)
+            if os.path.exists(bin_fname):
+                os.unlink(bin_fname)
+
     # Save Log
     if save_bundle.vistrail.db_log_filename is not None:
         xml_fname = os.path.join(vt_save_dir, 'log')
         if save_bundle.vistrail.db_log_filename != xml_fname:
+            extract_zip_member(save_bundle.vistrail.db_log_filename)
             shutil.copyfile(save_bundle.vistrail.db_log_filename, xml_fname)
             save_bundle.vistrail.db_log_filename = xml_fname
 
@@ -920,6 +1382,7 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
             if obj != xml_fname:
                 # print 'copying %s -> %s' % (obj, xml_fname)
                 try:
+                    extract_zip_member(obj)
                     shutil.copyfile(obj, xml_fname)
                 except Exception, e:
                     saved_abstractions.pop()
@@ -1104,14 +1567,21 @@ def save_vistrail_to_db(vistrail, db_connection, do_copy=False, version=None):
 
 def open_workflow_from_xml(filename):
     """open_workflow_from_xml(filename) -> DBWorkflow"""
+    version = get_version_for_xml_file(filename)
+    cache_file = None
+    if version != currentVersion:
+        cache_file = get_translation_cache_file(filename, DBWorkflow.vtType)
+        workflow = open_from_translation_cache(cache_file, DBWorkflow.vtType)
+        if workflow is not None:
+            return workflow
     tree = ElementTree.parse(filename)
-    version = get_version_for_xml(tree.getroot())
     daoList = getVersionDAO(version)
     workflow = daoList.open_from_xml(filename, DBWorkflow.vtType, tree)
     if workflow is None:
         raise VistrailsDBException("Couldn't read workflow from XML")
     workflow = translate_workflow(workflow, version)
     vistrails.db.services.workflow.update_id_scope(workflow)
+    save_to_translation_cache(workflow, cache_file)
     return workflow
 
 def open_workflow_from_db(db_connection, id, lock=False, version=None):
@@ -1197,6 +1667,7 @@ def get_saved_workflows(vistrail, db_connection):
 
 def open_log_from_xml(filename, was_appended=False):
     """open_log_from_xml(filename) -> DBLog"""
+    extract_zip_member(filename)
     if was_appended:
         parser = ElementTree.XMLTreeBuilder()
         parser.feed("<log>\n")
@@ -1222,12 +1693,19 @@ def open_log_from_xml(filename, was_appended=False):
         log = DBLog(workflow_execs=workflow_execs)
         vistrails.db.services.log.update_ids(log)
     else:
+        version = get_version_for_xml_file(filename)
+        cache_file = None
+        if version != currentVersion:
+            cache_file = get_translation_cache_file(filename, DBLog.vtType)
+            log = open_from_translation_cache(cache_file, DBLog.vtType)
+            if log is not None:
+                return log
         tree = ElementTree.parse(filename)
-        version = get_version_for_xml(tree.getroot())
         daoList = getVersionDAO(version)
         log = daoList.open_from_xml(filename, DBLog.vtType, tree)
         log = translate_log(log, version)
         vistrails.db.services.log.update_id_scope(log)
+        save_to_translation_cache(log, cache_file)
     return log
 
 def open_log_from_db(db_connection, id, lock=False, version=None):
@@ -1786,6 +2264,21 @@ def get_version_for_xml(root):
     msg = "Cannot find version information"
     raise VistrailsDBException(msg)
 
+def get_version_for_xml_file(filename):
+    """get_version_for_xml_file(filename: str) -> str
+    Reads the version of an XML file from its root element, without
+    parsing the rest of the document.
+
+    """
+    f = open(filename, 'rb')
+    try:
+        for _, root in ElementTree.iterparse(f, ('start',)):
+            return get_version_for_xml(root)
+    finally:
+        f.close()
+    msg = "Cannot find version information"
+    raise VistrailsDBException(msg)
+
 def get_type_for_xml(root):
     return root.tag
 
@@ -1851,6 +2344,271 @@ class TestDBIO(unittest.TestCase):
                          'tests/resources/dummy_new.xml'))
         assert vistrail is not None
 
+    def test_iterparse(self):
+        """test that the incremental reader matches the DOM reader"""
+        vistrail = open_vistrail_from_xml(
+            os.path.join(vistrails.core.system.vistrails_root_directory(),
+                         'tests/resources/dummy.xml'))
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        try:
+            filename = os.path.join(testdir, 'dummy.xml')
+            save_vistrail_to_xml(vistrail, filename)
+            daoList = getVersionDAO(currentVersion)
+            dom = daoList.open_from_xml(filename, DBVistrail.vtType)
+            incremental = daoList.iterparse_vistrail(filename)
+            self.assertEqual(len(incremental.db_actions),
+                             len(vistrail.db_actions))
+            self.assertFalse(incremental.is_dirty)
+            self.assertEqual(
+                ElementTree.tostring(daoList.write_xml_object(dom)),
+                ElementTree.tostring(daoList.write_xml_object(incremental)))
+        finally:
+            shutil.rmtree(testdir)
+
+    def assertSameXML(self, obj1, obj2):
+        daoList = getVersionDAO(currentVersion)
+        self.assertEqual(
+            ElementTree.tostring(daoList.write_xml_object(obj1)),
+            ElementTree.tostring(daoList.write_xml_object(obj2)))
+
+    def test_binary(self):
+        """test that vistrails, workflows and logs round-trip through
+        the binary format"""
+        root_dir = vistrails.core.system.vistrails_root_directory()
+        vistrail = open_vistrail_from_xml(
+            os.path.join(root_dir, 'tests/resources/dummy.xml'))
+        workflow = vistrails.db.services.vistrail.materializeWorkflow(
+            vistrail, max(a.db_id for a in vistrail.db_actions))
+        (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(
+            os.path.join(root_dir, 'tests/resources/paramexp-1.0.3.vt'))
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        try:
+            log = open_log_from_xml(save_bundle.vistrail.db_log_filename,
+                                    True)
+            self.assertTrue(len(log.db_workflow_execs) > 0)
+            for obj in [vistrail, workflow, log, save_bundle.vistrail]:
+                filename = os.path.join(testdir, obj.vtType)
+                save_to_binary(obj, filename, {'test': 1})
+                obj2 = open_from_binary(filename, obj.vtType, {'test': 1})
+                self.assertIsNot(obj2, obj)
+                self.assertFalse(obj2.is_dirty)
+                self.assertSameXML(obj, obj2)
+                with self.assertRaises(VistrailsDBException):
+                    open_from_binary(filename, obj.vtType, {'test': 2})
+            with self.assertRaises(VistrailsDBException):
+                open_from_binary(os.path.join(testdir, DBLog.vtType),
+                                 DBVistrail.vtType)
+            with self.assertRaises(VistrailsDBException):
+                open_from_binary(os.path.join(root_dir,
+                                              'tests/resources/dummy.xml'),
+                                 DBVistrail.vtType)
+        finally:
+            close_zip_xml(vt_save_dir)
+            shutil.rmtree(testdir)
+
+    def test_binary_bundle(self):
+        """test the binary copy of the vistrail in vt files"""
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/dummy_new.vt')
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        filename = os.path.join(testdir, 'dummy_new.vt')
+        try:
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(vt_fname)
+            xml_vistrail = save_bundle.vistrail
+            save_vistrail_bundle_to_zip_xml(save_bundle, filename,
+                                            vt_save_dir, binary_cache=True)
+            close_zip_xml(vt_save_dir)
+            z = zipfile.ZipFile(filename)
+            try:
+                self.assertIn(BINARY_VISTRAIL_NAME, z.namelist())
+            finally:
+                z.close()
+
+            # the binary copy is ignored unless enabled
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(filename,
+                                                  binary_cache=False)
+            try:
+                self.assertFalse(os.path.exists(
+                        os.path.join(vt_save_dir, BINARY_VISTRAIL_NAME)))
+                self.assertTrue(os.path.exists(
+                        os.path.join(vt_save_dir, 'vistrail')))
+            finally:
+                close_zip_xml(vt_save_dir)
+
+            # the binary copy is read, the xml is left in the archive
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(filename,
+                                                  binary_cache=True)
+            try:
+                self.assertFalse(os.path.exists(
+                        os.path.join(vt_save_dir, 'vistrail')))
+                self.assertSameXML(xml_vistrail, save_bundle.vistrail)
+                # saving without the option drops the binary copy
+                save_vistrail_bundle_to_zip_xml(save_bundle, filename,
+                                                vt_save_dir,
+                                                binary_cache=False)
+            finally:
+                close_zip_xml(vt_save_dir)
+            z = zipfile.ZipFile(filename)
+            try:
+                self.assertNotIn(BINARY_VISTRAIL_NAME, z.namelist())
+            finally:
+                z.close()
+        finally:
+            shutil.rmtree(testdir)
+
+    def test_binary_bundle_out_of_date(self):
+        """test that a binary copy not matching the xml is ignored"""
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/dummy_new.vt')
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        filename = os.path.join(testdir, 'dummy_new.vt')
+        try:
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(vt_fname)
+            try:
+                xml_vistrail = save_bundle.vistrail
+                bin_fname = os.path.join(testdir, BINARY_VISTRAIL_NAME)
+                save_to_binary(xml_vistrail, bin_fname, {'xml_crc32': 0})
+                shutil.copyfile(vt_fname, filename)
+                z = zipfile.ZipFile(filename, 'a')
+                try:
+                    z.write(bin_fname, BINARY_VISTRAIL_NAME)
+                finally:
+                    z.close()
+            finally:
+                close_zip_xml(vt_save_dir)
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(filename,
+                                                  binary_cache=True)
+            try:
+                self.assertTrue(os.path.exists(
+                        os.path.join(vt_save_dir, 'vistrail')))
+                self.assertSameXML(xml_vistrail, save_bundle.vistrail)
+            finally:
+                close_zip_xml(vt_save_dir)
+        finally:
+            shutil.rmtree(testdir)
+
+    def test_binary_bundle_malformed(self):
+        """test that a malformed binary copy falls back to the xml"""
+        import marshal
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/dummy_new.vt')
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        filename = os.path.join(testdir, 'dummy_new.vt')
+        try:
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(vt_fname)
+            try:
+                xml_vistrail = save_bundle.vistrail
+                bin_fname = os.path.join(testdir, BINARY_VISTRAIL_NAME)
+                z = zipfile.ZipFile(vt_fname)
+                try:
+                    xml_crc = z.getinfo('vistrail').CRC & 0xffffffff
+                finally:
+                    z.close()
+                # a header matching the xml followed by a bogus record
+                save_to_binary(xml_vistrail, bin_fname,
+                               {'xml_crc32': xml_crc})
+                with open(bin_fname, 'rb') as f:
+                    getVersionDAO(currentVersion).read_binary_header(f)
+                    header_size = f.tell()
+                    f.seek(0)
+                    header = f.read(header_size)
+                with open(bin_fname, 'wb') as f:
+                    f.write(header)
+                    f.write(marshal.dumps((1, 2)))
+                shutil.copyfile(vt_fname, filename)
+                z = zipfile.ZipFile(filename, 'a')
+                try:
+                    z.write(bin_fname, BINARY_VISTRAIL_NAME)
+                finally:
+                    z.close()
+            finally:
+                close_zip_xml(vt_save_dir)
+            self.assertRaises(VistrailsDBException, open_from_binary,
+                              bin_fname, DBVistrail.vtType)
+            (save_bundle, vt_save_dir) = \
+                open_vistrail_bundle_from_zip_xml(filename,
+                                                  binary_cache=True)
+            try:
+                self.assertSameXML(xml_vistrail, save_bundle.vistrail)
+            finally:
+                close_zip_xml(vt_save_dir)
+        finally:
+            shutil.rmtree(testdir)
+
+    def test_fused_translation(self):
+        """test that fusing copy-only translations gives the same objects
+        as translating through every schema"""
+        from vistrails.db.versions import translate_object
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/dummy_new.vt')
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        try:
+            zipfile.ZipFile(vt_fname).extract('vistrail', testdir)
+            filename = os.path.join(testdir, 'vistrail')
+            version = get_version_for_xml_file(filename)
+            translated = []
+            for fuse in (False, True):
+                vistrail = getVersionDAO(version).open_from_xml(
+                    filename, DBVistrail.vtType)
+                translated.append(translate_object(
+                        vistrail, 'translateVistrail', version, fuse=fuse))
+            self.assertEqual(translated[1].db_version, currentVersion)
+            self.assertSameXML(*translated)
+        finally:
+            shutil.rmtree(testdir)
+
+    def test_translation_cache(self):
+        """test that translated vistrails are read back from the cache"""
+        from vistrails.core.configuration import get_vistrails_configuration
+        conf = get_vistrails_configuration()
+        old_values = conf.translationCache, conf.translationCacheDir
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/dummy_new.vt')
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        try:
+            zipfile.ZipFile(vt_fname).extract('vistrail', testdir)
+            filename = os.path.join(testdir, 'vistrail')
+            conf.translationCache = True
+            conf.translationCacheDir = os.path.join(testdir, 'translations')
+            cache_file = get_translation_cache_file(filename,
+                                                    DBVistrail.vtType)
+            self.assertFalse(os.path.exists(cache_file))
+            vistrail = open_vistrail_from_xml(filename)
+            self.assertTrue(os.path.exists(cache_file))
+            self.assertSameXML(vistrail, open_vistrail_from_xml(filename))
+
+            vistrail.db_name = 'from cache'
+            save_to_translation_cache(vistrail, cache_file)
+            self.assertEqual(open_vistrail_from_xml(filename).db_name,
+                             'from cache')
+
+            # files of the current schema are not cached
+            save_vistrail_to_xml(vistrail, filename)
+            open_vistrail_from_xml(filename)
+            self.assertEqual(os.listdir(conf.translationCacheDir),
+                             [os.path.basename(cache_file)])
+
+            # translations made by another release are not used
+            cache_file = get_translation_cache_file(filename,
+                                                    DBVistrail.vtType)
+            old_version = vistrails.core.system.VERSION
+            vistrails.core.system.VERSION = '0.0.1'
+            try:
+                self.assertNotEqual(get_translation_cache_file(
+                                            filename, DBVistrail.vtType),
+                                    cache_file)
+            finally:
+                vistrails.core.system.VERSION = old_version
+        finally:
+            conf.translationCache, conf.translationCacheDir = old_values
+            shutil.rmtree(testdir)
+
     def test3(self):
         """test importing a vt file"""
 
@@ -1861,6 +2619,80 @@ class TestDBIO(unittest.TestCase):
                          'tests/resources/dummy_new.vt'))
         assert save_bundle.vistrail is not None
 
+    def test_lazy_bundle(self):
+        """test that bundle members are only read when needed"""
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/paramexp-1.0.3.vt')
+        (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(vt_fname)
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        try:
+            log_fname = save_bundle.vistrail.db_log_filename
+            self.assertFalse(os.path.exists(log_fname))
+            self.assertFalse(save_bundle.mashups.is_loaded())
+            self.assertEqual(len(save_bundle.mashups), 2)
+            self.assertTrue(save_bundle.mashups.is_loaded())
+            self.assertTrue(os.path.isdir(os.path.join(vt_save_dir, 'thumbs')))
+
+            # saving has to write out everything the archive contained
+            filename = os.path.join(testdir, 'paramexp.vt')
+            shutil.copyfile(vt_fname, filename)
+            (save_bundle, vt_save_dir2) = open_vistrail_bundle_from_zip_xml(
+                filename)
+            save_vistrail_bundle_to_zip_xml(save_bundle, filename,
+                                            vt_save_dir2)
+            close_zip_xml(vt_save_dir2)
+            z = zipfile.ZipFile(filename)
+            try:
+                names = set(os.path.normpath(n) for n in z.namelist())
+            finally:
+                z.close()
+            self.assertIn('log', names)
+            self.assertEqual(len([n for n in names
+                                  if n.startswith('mashups' + os.sep)]), 2)
+            log = open_log_from_xml(log_fname, True)
+            self.assertTrue(os.path.exists(log_fname))
+            self.assertTrue(len(log.db_workflow_execs) > 0)
+        finally:
+            close_zip_xml(vt_save_dir)
+            shutil.rmtree(testdir)
+
+    def test_lazy_bundle_threads(self):
+        """test that threads reading a lazy member all see the whole file"""
+        vt_fname = os.path.join(vistrails.core.system.vistrails_root_directory(),
+                                'tests/resources/paramexp-1.0.3.vt')
+        (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(vt_fname)
+        try:
+            log_fname = save_bundle.vistrail.db_log_filename
+            z = zipfile.ZipFile(vt_fname)
+            try:
+                size = z.getinfo('log').file_size
+            finally:
+                z.close()
+            sizes = []
+            extracted = []
+            extract = zipfile.ZipFile.extract
+            def slow_extract(self, member, path=None, pwd=None):
+                extracted.append(member)
+                time.sleep(0.05)
+                return extract(self, member, path, pwd)
+            def read_log():
+                extract_zip_member(log_fname)
+                sizes.append(os.path.getsize(log_fname))
+            zipfile.ZipFile.extract = slow_extract
+            try:
+                threads = [threading.Thread(target=read_log)
+                           for i in xrange(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                zipfile.ZipFile.extract = extract
+            self.assertEqual(extracted, ['log'])
+            self.assertEqual(sizes, [size] * 8)
+        finally:
+            close_zip_xml(vt_save_dir)
+
     def test4(self):
         """ test saving a vt file """
 
@@ -1881,3 +2713,100 @@ class TestDBIO(unittest.TestCase):
                 self.fail(str(e))
         finally:
             os.rmdir(testdir)
+
+class TestConnectionPool(unittest.TestCase):
+    class FakeDBLib(object):
+        class Error(Exception):
+            pass
+
+        class OperationalError(Error):
+            pass
+
+        def __init__(self):
+            self.opened = []
+
+        def connect(self, **config):
+            connection = TestConnectionPool.FakeConnection(self)
+            self.opened.append(connection)
+            return connection
+
+    class FakeConnection(object):
+        def __init__(self, lib):
+            self.lib = lib
+            self.alive = True
+            self.closed = False
+            self.rollbacks = 0
+
+        def ping(self):
+            if not self.alive:
+                raise self.lib.OperationalError(2006, "gone away")
+
+        def rollback(self):
+            self.rollbacks += 1
+
+        def close(self):
+            self.closed = True
+
+    config = {'host': 'localhost', 'port': 3306, 'db': 'vistrails',
+              'user': 'vistrails', 'passwd': ''}
+
+    def setUp(self):
+        self.old_lib = _db_lib
+        self.lib = self.FakeDBLib()
+        set_db_lib(self.lib)
+
+    def tearDown(self):
+        close_connection_pools()
+        set_db_lib(self.old_lib)
+
+    def test_reuse(self):
+        with pooled_db_connection(dict(self.config)) as first:
+            pass
+        test_db_connection(dict(self.config))
+        with pooled_db_connection(dict(self.config)) as second:
+            self.assertIs(first, second)
+        self.assertEqual(len(self.lib.opened), 1)
+        self.assertEqual(first.rollbacks, 3)
+
+    def test_separate_configs(self):
+        other = dict(self.config, user='other')
+        with pooled_db_connection(dict(self.config)) as first:
+            with pooled_db_connection(other) as second:
+                self.assertIsNot(first, second)
+        self.assertIsNot(get_connection_pool(self.config),
+                         get_connection_pool(other))
+
+    def test_dead_connection(self):
+        with pooled_db_connection(self.config) as first:
+            pass
+        first.alive = False
+        with pooled_db_connection(self.config) as second:
+            self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+
+    def test_bounded(self):
+        pool = ConnectionPool(self.config, max_connections=2, timeout=0.05)
+        connections = [pool.acquire(), pool.acquire()]
+        with self.assertRaises(VistrailsDBException):
+            pool.acquire()
+        result = []
+        waiter = threading.Thread(
+                target=lambda: result.append(pool.acquire()))
+        pool.timeout = 5
+        waiter.start()
+        pool.release(connections[0])
+        waiter.join()
+        self.assertEqual(result, connections[:1])
+        self.assertEqual(len(self.lib.opened), 2)
+
+    def test_close(self):
+        pool = get_connection_pool(self.config)
+        connection = pool.acquire()
+        idle = pool.acquire()
+        pool.release(idle)
+        close_connection_pools()
+        self.assertTrue(idle.closed)
+        self.assertFalse(connection.closed)
+        pool.release(connection)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(get_connection_pool(self.config), pool)
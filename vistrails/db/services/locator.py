@@ -702,8 +702,6 @@ class ZIPFileLocator(XMLFileLocator):
 class DBLocator(BaseLocator):
     cache = {}
     cache_timestamps = {}
-    connections = {}
-    cache_connections = {}
         
     def __init__(self, host, port, database, user, passwd, name=None,
                  **kwargs):
@@ -774,44 +772,35 @@ class DBLocator(BaseLocator):
         return hashlib.sha224(xml_string).hexdigest()
     
     def is_valid(self):
-        if self._conn_id is not None \
-                and self._conn_id in DBLocator.connections:
-            return True
         try:
-            self.get_connection()
+            with self.connection():
+                pass
         except Exception:
             return False
         return True
-        
+
+    def get_config(self):
+        return {'host': self._host,
+                'port': self._port,
+                'db': self._db,
+                'user': self._user,
+                'passwd': self._passwd}
+
+    def connection(self):
+        """connection() -> context manager
+        Acquires a connection from the pool shared by every locator
+        pointing at the same database, and releases it on exit.
+
+        """
+        return io.pooled_db_connection(self.get_config())
+
     def get_connection(self):
-        if self._conn_id is not None \
-                and DBLocator.connections.has_key(self._conn_id):
-            connection = DBLocator.connections[self._conn_id]
-            if io.ping_db_connection(connection):
-                return connection
-        else:
-            if self._conn_id is None:
-                if DBLocator.cache_connections.has_key(self._hash):
-                    connection = DBLocator.cache_connections[self._hash]
-                    if io.ping_db_connection(connection):
-                        debug.log("Reusing cached connection")
-                        return connection
-
-                if len(DBLocator.connections.keys()) == 0:
-                    self._conn_id = 1
-                else:
-                    self._conn_id = max(DBLocator.connections.keys()) + 1
-        config = {'host': self._host,
-                  'port': self._port,
-                  'db': self._db,
-                  'user': self._user,
-                  'passwd': self._passwd}
-        #print "config:", config
-        connection = io.open_db_connection(config)
-            
-        DBLocator.connections[self._conn_id] = connection
-        DBLocator.cache_connections[self._hash] = connection
-        return connection
+        """get_connection() -> connection
+        Opens a connection owned by the caller, who must close it. Prefer
+        connection(), which reuses pooled connections.
+
+        """
+        return io.open_db_connection(self.get_config())
 
     def load(self, type, tmp_dir=None):
         self._hash = self.hash()
@@ -829,14 +818,15 @@ class DBLocator(BaseLocator):
                 if tmp_dir is not None:
                     for absfname in save_bundle.thumbnails:
                         if not os.path.isfile(absfname):
-                            save_bundle.thumbnails = io.open_thumbnails_from_db(self.get_connection(), type, self.obj_id, tmp_dir)
+                            with self.connection() as connection:
+                                save_bundle.thumbnails = io.open_thumbnails_from_db(connection, type, self.obj_id, tmp_dir)
                             break
                 return save_bundle
         #debug.log("loading vistrail from db")
-        connection = self.get_connection()
-        if type == DBWorkflow.vtType:
-            return io.open_from_db(connection, type, self.obj_id)
-        save_bundle = io.open_bundle_from_db(type, connection, self.obj_id, tmp_dir)
+        with self.connection() as connection:
+            if type == DBWorkflow.vtType:
+                return io.open_from_db(connection, type, self.obj_id)
+            save_bundle = io.open_bundle_from_db(type, connection, self.obj_id, tmp_dir)
         primary_obj = save_bundle.get_primary_obj()
         self._name = primary_obj.db_name
         #print "locator db name:", self._name
@@ -849,10 +839,11 @@ class DBLocator(BaseLocator):
         return save_bundle
 
     def save(self, save_bundle, do_copy=False, version=None):
-        connection = self.get_connection()
         for obj in save_bundle.get_db_objs():
             obj.db_name = self._name
-        save_bundle = io.save_bundle_to_db(save_bundle, connection, do_copy, version)
+        with self.connection() as connection:
+            save_bundle = io.save_bundle_to_db(save_bundle, connection,
+                                               do_copy, version)
         primary_obj = save_bundle.get_primary_obj()
         self._obj_id = primary_obj.db_id
         self._obj_type = primary_obj.vtType
@@ -871,9 +862,10 @@ class DBLocator(BaseLocator):
             else:
                 obj_type = self.obj_type
 
-        ts = io.get_db_object_modification_time(self.get_connection(),
-                                                self.obj_id,
-                                                obj_type)
+        with self.connection() as connection:
+            ts = io.get_db_object_modification_time(connection,
+                                                    self.obj_id,
+                                                    obj_type)
         ts = datetime(*time_strptime(str(ts).strip(), '%Y-%m-%d %H:%M:%S')[0:6])
         return ts
         
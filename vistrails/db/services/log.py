@@ -35,8 +35,14 @@
 ###############################################################################
 from __future__ import division
 
+import json
+
 from vistrails.db.domain import DBWorkflowExec
 
+# Key of the annotations summarizing the iterations of a loop that were not
+# logged individually; they are set on the execution that owns the loop
+LOOP_SUMMARY_KEY = 'loop_summary'
+
 def update_id_scope(log):
     if hasattr(log, 'update_id_scope'):
         log.update_id_scope()
@@ -46,3 +52,20 @@ def update_id_scope(log):
 def update_ids(log):
     for workflow_exec in log.db_workflow_execs:
         workflow_exec.db_id = log.id_scope.getNewId(DBWorkflowExec.vtType)
+
+def get_loop_summaries(exec_):
+    """Returns the loop summaries annotated on an execution.
+
+    This is a dict mapping the id of each summarized loop_exec to the
+    summary, a dict with the number of iterations, completed, suspended
+    and errors, an error_histogram and duration statistics.
+    """
+    summaries = {}
+    for annotation in exec_.db_annotations:
+        if annotation.db_key == LOOP_SUMMARY_KEY:
+            try:
+                summary = json.loads(annotation.db_value)
+            except ValueError:
+                continue
+            summaries[summary['loop_exec']] = summary
+    return summaries
@@ -44,6 +44,7 @@ from vistrails.db.domain import DBProvDocument, DBProvEntity, DBProvActivity, \
     DBVtConnection, DBRefProvEntity, DBRefProvPlan, DBRefProvActivity, \
     DBRefProvAgent, DBIsPartOf, IdScope, DBGroupExec, DBLoopExec, DBLoopIteration, \
     DBModuleExec, DBWorkflowExec, DBFunction, DBParameter, DBGroup, DBAbstraction
+from vistrails.db.services.log import get_loop_summaries
 from vistrails.db.services.vistrail import materializeWorkflow
 
 def create_prov_document(entities, activities, agents, connections, usages,
@@ -272,6 +273,28 @@ def create_prov_activity_from_exec(id_scope, module_exec, machine_id, is_part_of
                           vt_error=module_exec._db_error,
                           is_part_of=is_part_of)
     
+def create_prov_activity_from_loop_summary(id_scope, loop_exec, summary,
+                                           is_part_of):
+    """Creates a single activity for the iterations of a loop that were only
+    logged as a summary.
+    """
+    error = None
+    if summary['errors']:
+        error = '%d of %d iterations failed: %s' % (
+                summary['errors'], summary['iterations'],
+                '; '.join('%s (%d)' % item
+                          for item in sorted(summary['error_histogram'].items())))
+    return DBProvActivity(id='a' + str(id_scope.getNewId(DBProvActivity.vtType)),
+                          vt_id=loop_exec._db_id,
+                          startTime=loop_exec._db_ts_start,
+                          endTime=loop_exec._db_ts_end,
+                          vt_type='vt:loop_summary',
+                          vt_cached=None,
+                          vt_completed=-1 if error else 1,
+                          vt_machine_id=None,
+                          vt_error=error,
+                          is_part_of=is_part_of)
+
 def create_prov_usage(prov_activity, prov_entity):
     ref_prov_activity = DBRefProvActivity(prov_ref=prov_activity._db_id)
     ref_prov_entity = DBRefProvEntity(prov_ref=prov_entity._db_id)
@@ -301,6 +324,9 @@ def create_prov(workflow, version, log):
     # mapping between VT ids and PROV objects
     entities_map = {}
     agents_map = {}
+
+    # mapping between loop_exec ids and the summary of their iterations
+    loop_summaries = {}
     
     # mapping between module ids and their functions
     module_functions = {}
@@ -415,6 +441,7 @@ def create_prov(workflow, version, log):
             activities.append(prov_activity)
 
             if exec_.vtType != DBLoopIteration.vtType:
+                loop_summaries.update(get_loop_summaries(exec_))
                 try:
                     functions = module_functions[exec_._db_module_id]
                 except Exception:
@@ -471,6 +498,11 @@ def create_prov(workflow, version, log):
             # Parameter?
             for iter_exec in exec_.loop_iterations:
                 get_execs(iter_exec, parent_exec, prov_agent)
+            if exec_._db_id in loop_summaries:
+                # iterations that were not logged individually
+                activities.append(create_prov_activity_from_loop_summary(
+                        id_scope, exec_, loop_summaries[exec_._db_id],
+                        create_is_part_of(parent_exec)))
 
         else:
             # something is wrong...
@@ -514,7 +546,8 @@ def create_prov(workflow, version, log):
         
         # creating association with PROV entity
         prov_association = create_prov_association(prov_activity, prov_agent, prov_workflow)
-        
+
+        loop_summaries.update(get_loop_summaries(exec_))
         for item in exec_._db_item_execs:
             get_execs(item, prov_activity, prov_agent)
     
@@ -39,6 +39,7 @@ from vistrails.db.domain import DBWorkflow, DBAdd, DBDelete, DBAction, DBAbstrac
     DBModule, DBConnection, DBPort, DBFunction, DBParameter, DBGroup
 from vistrails.db.services.action_chain import getActionChain, getCurrentOperationDict, \
     getCurrentOperations, simplify_ops
+from vistrails.db.services.checkpoint import get_checkpoints
 from vistrails.db import VistrailsDBException
 
 import copy
@@ -70,14 +71,22 @@ def update_id_scope(vistrail):
             for annotation in action.db_annotations:
                 vistrail.idScope.updateBeginId('annotation', annotation.db_id+1)
 
-def materializeWorkflow(vistrail, version):
+def materializeWorkflow(vistrail, version, use_checkpoints=True):
     # construct path up through tree and perform each action
     if vistrail.db_has_action_with_id(version):
         workflow = DBWorkflow()
         #for action in getActionChain(vistrail, version):
         #    oldPerformAction(action, workflow)
-        performActions(getActionChain(vistrail, version), 
-                            workflow)
+        if use_checkpoints:
+            # start from the nearest checkpointed ancestor
+            op_dict = get_checkpoints(vistrail).get_operation_dict(vistrail,
+                                                                   version)
+            operations = op_dict.values()
+            operations.sort(key=lambda x: x.db_id)
+            performAdds(operations, workflow)
+        else:
+            performActions(getActionChain(vistrail, version), 
+                           workflow)
         workflow.db_id = version
         workflow.db_vistrailId = vistrail.db_id
         return workflow
@@ -61,7 +61,20 @@ def getVersionDAO(version=None):
         raise VistrailsDBException(debug.format_exc())
     return persistence.DAOList()
 
-def translate_object(obj, method_name, version=None, target_version=None):
+def translate_object(obj, method_name, version=None, target_version=None,
+                     fuse=True):
+    """translate_object(obj, method_name: str, version: str,
+                        target_version: str, fuse: bool) -> object
+    Translates obj from schema version to target_version by calling
+    method_name from the translate module of each intermediate version.
+
+    Translate modules list, in a module-level copy_translations list, the
+    names of their methods that only copy objects into their schema,
+    without changing anything.  When fuse is True, a run of such hops is
+    done in a single pass by the last translator of the run, instead of
+    building the object graph of every intermediate schema.
+
+    """
     if version is None:
         version = obj.version
     if target_version is None:
@@ -116,8 +129,13 @@ def translate_object(obj, method_name, version=None, target_version=None):
             map = rev_version_map
             break
 
+    def is_copy(translate_module):
+        return method_name in getattr(translate_module, 'copy_translations',
+                                      ())
+
     # don't get stuck in an infinite loop
     count = 0
+    translate_modules = []
     while version != target_version:
         if count > len(map):
             break
@@ -133,7 +151,7 @@ def translate_object(obj, method_name, version=None, target_version=None):
             raise VistrailsDBException("Cannot translate version: "
                                        "version %s missing method '%s'" % \
                                            (version, method_name))
-        obj = getattr(translate_module, method_name)(obj)
+        translate_modules.append(translate_module)
         version = next_version
         count += 1
 
@@ -142,6 +160,20 @@ def translate_object(obj, method_name, version=None, target_version=None):
         msg += "only able to translate to version '%s'" % version
         raise VistrailsDBException(msg)
 
+    i = 0
+    while i < len(translate_modules):
+        translate_module = translate_modules[i]
+        if fuse:
+            # copying straight into the last schema of the run gives the
+            # same objects as copying through each schema in turn
+            while (is_copy(translate_module) and
+                   i + 1 < len(translate_modules) and
+                   is_copy(translate_modules[i + 1])):
+                i += 1
+                translate_module = translate_modules[i]
+        obj = getattr(translate_module, method_name)(obj)
+        i += 1
+
     return obj
 
 def translate_vistrail(vistrail, version=None, target_version=None):
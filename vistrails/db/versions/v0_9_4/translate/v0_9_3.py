@@ -41,6 +41,8 @@ from vistrails.db.versions.v0_9_4.domain import DBVistrail, DBAction, DBTag, DBM
     DBChange, DBDelete, DBAnnotation, DBPort, DBGroup, \
     DBWorkflow, DBLog, DBAbstraction
 
+copy_translations = ['translateLog']
+
 def update_workflow(old_obj, translate_dict):
     return DBWorkflow.update_version(old_obj.db_workflow, 
                                      translate_dict, DBWorkflow())
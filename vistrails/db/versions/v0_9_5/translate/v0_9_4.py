@@ -39,6 +39,8 @@ import copy
 from vistrails.db.versions.v0_9_5.domain import DBVistrail, DBWorkflow, DBLog, \
     DBRegistry, DBModuleExec
 
+copy_translations = ['translateRegistry']
+
 def translateVistrail(_vistrail):
     def update_signature(old_obj, translate_dict):
         return old_obj.db_spec
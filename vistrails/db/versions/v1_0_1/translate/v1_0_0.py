@@ -39,6 +39,8 @@ import copy
 from vistrails.db.versions.v1_0_1.domain import DBVistrail, DBWorkflow, DBLog, \
     DBRegistry, DBModuleDescriptor, DBGroup
 
+copy_translations = ['translateVistrail', 'translateWorkflow', 'translateLog']
+
 def translateVistrail(_vistrail):
     def update_workflow(old_obj, translate_dict):
         return DBWorkflow.update_version(old_obj.db_workflow, translate_dict)
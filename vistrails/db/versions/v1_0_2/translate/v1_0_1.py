@@ -39,6 +39,8 @@ import copy
 from vistrails.db.versions.v1_0_2.domain import DBVistrail, DBWorkflow, DBLog, \
     DBRegistry, DBGroup, DBActionAnnotation, DBAnnotation, DBAction, IdScope
 
+copy_translations = ['translateWorkflow', 'translateLog', 'translateRegistry']
+
 def translateVistrail(_vistrail):
     tag_annotations = []
     notes_annotations = []
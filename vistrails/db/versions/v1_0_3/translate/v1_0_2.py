@@ -53,6 +53,8 @@ from ast import literal_eval
 import unittest
 from xml.dom.minidom import parseString
 
+copy_translations = ['translateLog']
+
 id_scope = None
 
 def update_portSpec(old_obj, translate_dict):
@@ -1396,6 +1396,29 @@ class DBAdd(object):
 
     vtType = 'add'
 
+    __slots__ = ('db_deleted_data',
+                 '_db_data',
+                 '_db_id',
+                 '_db_what',
+                 '_db_objectId',
+                 '_db_parentObjId',
+                 '_db_parentObjType',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBAdd.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, data=None, id=None, what=None, objectId=None, parentObjId=None, parentObjType=None):
         self.db_deleted_data = []
         self._db_data = data
@@ -2993,6 +3016,28 @@ class DBParameter(object):
 
     vtType = 'parameter'
 
+    __slots__ = ('_db_id',
+                 '_db_pos',
+                 '_db_name',
+                 '_db_type',
+                 '_db_val',
+                 '_db_alias',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBParameter.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, pos=None, name=None, type=None, val=None, alias=None):
         self._db_id = id
         self._db_pos = pos
@@ -4832,6 +4877,28 @@ class DBPort(object):
 
     vtType = 'port'
 
+    __slots__ = ('_db_id',
+                 '_db_type',
+                 '_db_moduleId',
+                 '_db_moduleName',
+                 '_db_name',
+                 '_db_signature',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBPort.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, type=None, moduleId=None, moduleName=None, name=None, signature=None):
         self._db_id = id
         self._db_type = type
@@ -6362,6 +6429,30 @@ class DBChange(object):
 
     vtType = 'change'
 
+    __slots__ = ('db_deleted_data',
+                 '_db_data',
+                 '_db_id',
+                 '_db_what',
+                 '_db_oldObjId',
+                 '_db_newObjId',
+                 '_db_parentObjId',
+                 '_db_parentObjType',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBChange.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, data=None, id=None, what=None, oldObjId=None, newObjId=None, parentObjId=None, parentObjType=None):
         self.db_deleted_data = []
         self._db_data = data
@@ -7115,6 +7206,27 @@ class DBConnection(object):
 
     vtType = 'connection'
 
+    __slots__ = ('_db_id',
+                 'db_deleted_ports',
+                 'db_ports_id_index',
+                 'db_ports_type_index',
+                 '_db_ports',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBConnection.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, ports=None):
         self._db_id = id
         self.db_deleted_ports = []
@@ -7347,6 +7459,34 @@ class DBAction(object):
 
     vtType = 'action'
 
+    __slots__ = ('db_deleted_operations',
+                 'db_operations_id_index',
+                 '_db_operations',
+                 '_db_id',
+                 '_db_prevId',
+                 '_db_date',
+                 '_db_session',
+                 '_db_user',
+                 'db_deleted_annotations',
+                 'db_annotations_id_index',
+                 'db_annotations_key_index',
+                 '_db_annotations',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBAction.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, operations=None, id=None, prevId=None, date=None, session=None, user=None, annotations=None):
         self.db_deleted_operations = []
         self.db_operations_id_index = {}
@@ -8261,6 +8401,33 @@ class DBPortSpec(object):
 
     vtType = 'portSpec'
 
+    __slots__ = ('_db_id',
+                 '_db_name',
+                 '_db_type',
+                 '_db_optional',
+                 '_db_depth',
+                 '_db_sort_key',
+                 'db_deleted_portSpecItems',
+                 'db_portSpecItems_id_index',
+                 '_db_portSpecItems',
+                 '_db_min_conns',
+                 '_db_max_conns',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBPortSpec.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, name=None, type=None, optional=None, depth=None, sort_key=None, portSpecItems=None, min_conns=None, max_conns=None):
         self._db_id = id
         self._db_name = name
@@ -10241,6 +10408,25 @@ class DBLocation(object):
 
     vtType = 'location'
 
+    __slots__ = ('_db_id',
+                 '_db_x',
+                 '_db_y',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBLocation.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, x=None, y=None):
         self._db_id = id
         self._db_x = x
@@ -10352,6 +10538,28 @@ class DBFunction(object):
 
     vtType = 'function'
 
+    __slots__ = ('_db_id',
+                 '_db_pos',
+                 '_db_name',
+                 'db_deleted_parameters',
+                 'db_parameters_id_index',
+                 '_db_parameters',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBFunction.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, pos=None, name=None, parameters=None):
         self._db_id = id
         self._db_pos = pos
@@ -10544,6 +10752,28 @@ class DBActionAnnotation(object):
 
     vtType = 'actionAnnotation'
 
+    __slots__ = ('_db_id',
+                 '_db_key',
+                 '_db_value',
+                 '_db_action_id',
+                 '_db_date',
+                 '_db_user',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBActionAnnotation.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, key=None, value=None, action_id=None, date=None, user=None):
         self._db_id = id
         self._db_key = key
@@ -11785,6 +12015,25 @@ class DBControlParameter(object):
 
     vtType = 'controlParameter'
 
+    __slots__ = ('_db_id',
+                 '_db_name',
+                 '_db_value',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBControlParameter.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, name=None, value=None):
         self._db_id = id
         self._db_name = name
@@ -11987,6 +12236,27 @@ class DBDelete(object):
 
     vtType = 'delete'
 
+    __slots__ = ('_db_id',
+                 '_db_what',
+                 '_db_objectId',
+                 '_db_parentObjId',
+                 '_db_parentObjType',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBDelete.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, what=None, objectId=None, parentObjId=None, parentObjType=None):
         self._db_id = id
         self._db_what = what
@@ -12972,6 +13242,24 @@ class DBTag(object):
 
     vtType = 'tag'
 
+    __slots__ = ('_db_id',
+                 '_db_name',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBTag.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, name=None):
         self._db_id = id
         self._db_name = name
@@ -13861,6 +14149,31 @@ class DBPortSpecItem(object):
 
     vtType = 'portSpecItem'
 
+    __slots__ = ('_db_id',
+                 '_db_pos',
+                 '_db_module',
+                 '_db_package',
+                 '_db_namespace',
+                 '_db_label',
+                 '_db_default',
+                 '_db_values',
+                 '_db_entry_type',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBPortSpecItem.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, pos=None, module=None, package=None, namespace=None, label=None, default=None, values=None, entry_type=None):
         self._db_id = id
         self._db_pos = pos
@@ -17061,6 +17374,25 @@ class DBAnnotation(object):
 
     vtType = 'annotation'
 
+    __slots__ = ('_db_id',
+                 '_db_key',
+                 '_db_value',
+                 'is_dirty',
+                 'is_new',
+                 '__dict__',
+                 '__weakref__')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in DBAnnotation.__slots__:
+            if name not in ('__dict__', '__weakref__'):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for (name, value) in state.iteritems():
+            setattr(self, name, value)
+
     def __init__(self, id=None, key=None, value=None):
         self._db_id = id
         self._db_key = key
@@ -37,8 +37,12 @@ from __future__ import division
 
 from xml.auto_gen import XMLDAOListBase
 from sql.auto_gen import SQLDAOListBase
+from binary.auto_gen import BinaryDAOListBase
 from vistrails.core.system import get_elementtree_library
 
+import gc
+import marshal
+
 from vistrails.db import VistrailsDBException
 from vistrails.db.versions.v1_0_4 import version as my_version
 from vistrails.db.versions.v1_0_4.domain import DBGroup, DBWorkflow, DBVistrail, DBLog, \
@@ -49,11 +53,14 @@ root_set = set([DBVistrail.vtType, DBWorkflow.vtType,
 
 ElementTree = get_elementtree_library()
 
+# first bytes of the files written by save_to_binary()
+BINARY_MAGIC = 'VTBIN\x01\n'
 
 class DAOList(dict):
     def __init__(self):
         self['xml'] = XMLDAOListBase()
         self['sql'] = SQLDAOListBase()
+        self['binary'] = BinaryDAOListBase()
 
     def parse_xml_file(self, filename):
         return ElementTree.parse(filename)
@@ -90,6 +97,61 @@ class DAOList(dict):
         vistrail = self.read_xml_object(vtType, tree.getroot())
         return vistrail
 
+    def iterparse_vistrail(self, filename):
+        """iterparse_vistrail(filename) -> DBVistrail
+
+        Reads a vistrail incrementally: each top-level element (action,
+        tag, annotation, ...) is turned into a domain object as soon as it
+        has been parsed and is then discarded, so the whole document tree
+        is never held in memory. Produces the same objects as
+        open_from_xml().
+        """
+        def strip_ns(tag):
+            if tag[0] == "{":
+                return tag.split("}")[1]
+            return tag
+
+        xml_daos = self['xml']
+        vistrail_dao = xml_daos[DBVistrail.vtType]
+        # the tables come from the schema, as the generated fromXML() does
+        vistrail_children = vistrail_dao.xml_children
+        kwargs = dict((arg, [])
+                      for (_, arg) in vistrail_children.itervalues())
+        root = None
+        depth = 0
+        f = open(filename, 'rb')
+        try:
+            for event, elem in ElementTree.iterparse(f, ('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        if strip_ns(elem.tag) != 'vistrail':
+                            return None
+                        root = elem
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue
+                tag = strip_ns(elem.tag)
+                if tag in vistrail_children:
+                    dao, arg = vistrail_children[tag]
+                    kwargs[arg].append(xml_daos[dao].fromXML(elem))
+                elif elem.text is not None and elem.text.strip() != '':
+                    print '*** ERROR *** tag = %s' % elem.tag
+                # drop the subtree that was just read
+                del root[:]
+        finally:
+            f.close()
+        if root is None:
+            return None
+
+        for (name, (arg, type)) in vistrail_dao.xml_attributes.iteritems():
+            kwargs[arg] = vistrail_dao.convertFromStr(root.get(name, None),
+                                                      type)
+        vistrail = DBVistrail(**kwargs)
+        vistrail.is_dirty = False
+        return vistrail
+
     def save_to_xml(self, obj, filename, tags, version=None):
         """save_to_xml(obj : object, filename: str, tags: dict,
                        version: str) -> None
@@ -104,6 +166,95 @@ class DAOList(dict):
         tree = ElementTree.ElementTree(root)
         self.write_xml_file(filename, tree)
 
+    def read_binary_object(self, vtType, record):
+        return self['binary'][vtType].fromBinary(record)
+
+    def write_binary_object(self, obj):
+        return self['binary'][obj.vtType].toBinary(obj)
+
+    def read_binary_header(self, f):
+        """read_binary_header(f: file) -> (str, str, dict)
+
+        Reads the header of a file written by save_to_binary() and
+        returns the schema version, the vtType of the object and the
+        tags stored with it. f is left at the start of the object.
+        """
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise VistrailsDBException("Not a VisTrails binary file")
+        try:
+            version, vtType, tags = marshal.load(f)
+        except (EOFError, ValueError, TypeError):
+            raise VistrailsDBException("Corrupt VisTrails binary file")
+        return version, vtType, tags
+
+    def open_from_binary(self, filename, vtType, tags=None):
+        """open_from_binary(filename: str, vtType: str, tags: dict)
+               -> object
+
+        Reads an object written by save_to_binary(). Only files of this
+        schema version can be read. If tags is given, the file must have
+        been saved with the same values for them, e.g. the checksum of
+        the XML file a binary copy was made from.
+        """
+        f = open(filename, 'rb')
+        try:
+            version, file_vtType, file_tags = self.read_binary_header(f)
+            if version != my_version:
+                raise VistrailsDBException("Cannot read binary file of "
+                                           "version '%s'" % version)
+            if file_vtType != vtType:
+                raise VistrailsDBException("Binary file contains a '%s', "
+                                           "not a '%s'" % (file_vtType,
+                                                           vtType))
+            if tags is not None:
+                for k, v in tags.iteritems():
+                    if file_tags.get(k) != v:
+                        raise VistrailsDBException("Binary file is out of "
+                                                   "date")
+            data = f.read()
+        finally:
+            f.close()
+        # every object created here is kept, so letting the collector
+        # walk the growing heap while they are built only costs time
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            try:
+                record = marshal.loads(data)
+            except (EOFError, ValueError, TypeError):
+                raise VistrailsDBException("Corrupt VisTrails binary file")
+            return self.read_binary_object(vtType, record)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def save_to_binary(self, obj, filename, tags=None, version=None):
+        """save_to_binary(obj: object, filename: str, tags: dict,
+                          version: str) -> None
+
+        """
+        if version is None:
+            version = my_version
+        if tags is None:
+            tags = {}
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            data = marshal.dumps(self.write_binary_object(obj))
+        except ValueError, e:
+            raise VistrailsDBException("Cannot save '%s' to binary: %s" %
+                                       (obj.vtType, e))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        f = open(filename, 'wb')
+        try:
+            f.write(BINARY_MAGIC)
+            marshal.dump((version, obj.vtType, tags), f)
+            f.write(data)
+        finally:
+            f.close()
+
     def open_from_db(self, db_connection, vtType, id=None, lock=False, 
                      global_props=None):
         all_objects = {}
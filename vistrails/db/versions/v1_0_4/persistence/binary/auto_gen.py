@@ -0,0 +1,2860 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""generated automatically by auto_dao.py"""
+
+from __future__ import division
+
+from binary_dao import BinaryDAO
+from vistrails.db.versions.v1_0_4.domain import *
+
+class DBOpmWasGeneratedByBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (effect, role, cause, accounts, opm_times) = record
+        if effect is not None:
+            effect = self.getDao('opm_artifact_id_effect').fromBinary(effect)
+        if role is not None:
+            role = self.getDao('opm_role').fromBinary(role)
+        if cause is not None:
+            cause = self.getDao('opm_process_id_cause').fromBinary(cause)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        opm_times = map(self.getDao('opm_time').fromBinary, opm_times)
+        obj = DBOpmWasGeneratedBy(effect,
+                                  role,
+                                  cause,
+                                  accounts,
+                                  opm_times)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_was_generated_by):
+        effect = opm_was_generated_by.db_effect
+        if effect is not None:
+            effect = self.getDao('opm_artifact_id_effect').toBinary(effect)
+        role = opm_was_generated_by.db_role
+        if role is not None:
+            role = self.getDao('opm_role').toBinary(role)
+        cause = opm_was_generated_by.db_cause
+        if cause is not None:
+            cause = self.getDao('opm_process_id_cause').toBinary(cause)
+        accounts = opm_was_generated_by.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        opm_times = opm_was_generated_by.db_opm_times
+        opm_times = map(self.getDao('opm_time').toBinary, opm_times)
+        return (effect,
+                role,
+                cause,
+                accounts,
+                opm_times)
+
+class DBConfigKeyBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (value, name) = record
+        if value is not None:
+            value = self.getDao(value[0]).fromBinary(value[1])
+        obj = DBConfigKey(value,
+                          name)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, config_key):
+        value = config_key.db_value
+        if value is not None:
+            value = (value.vtType,
+                     self.getDao(value.vtType).toBinary(value))
+        return (value,
+                config_key.db_name)
+
+class DBMashupAliasBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, name, component) = record
+        if component is not None:
+            component = self.getDao('mashup_component').fromBinary(component)
+        obj = DBMashupAlias(id,
+                            name,
+                            component)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, mashup_alias):
+        component = mashup_alias.db_component
+        if component is not None:
+            component = self.getDao('mashup_component').toBinary(component)
+        return (mashup_alias.db_id,
+                mashup_alias.db_name,
+                component)
+
+class DBGroupBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, workflow, cache, name, namespace, package, version, location, functions, annotations, controlParameters) = record
+        if workflow is not None:
+            workflow = self.getDao('workflow').fromBinary(workflow)
+        if location is not None:
+            location = self.getDao('location').fromBinary(location)
+        functions = map(self.getDao('function').fromBinary, functions)
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        controlParameters = map(self.getDao('controlParameter').fromBinary, controlParameters)
+        obj = DBGroup(id,
+                      workflow,
+                      cache,
+                      name,
+                      namespace,
+                      package,
+                      version,
+                      location,
+                      functions,
+                      annotations,
+                      controlParameters)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, group):
+        workflow = group.db_workflow
+        if workflow is not None:
+            workflow = self.getDao('workflow').toBinary(workflow)
+        location = group.db_location
+        if location is not None:
+            location = self.getDao('location').toBinary(location)
+        functions = group.db_functions
+        functions = map(self.getDao('function').toBinary, functions)
+        annotations = group.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        controlParameters = group.db_controlParameters
+        controlParameters = map(self.getDao('controlParameter').toBinary, controlParameters)
+        return (group.db_id,
+                workflow,
+                group.db_cache,
+                group.db_name,
+                group.db_namespace,
+                group.db_package,
+                group.db_version,
+                location,
+                functions,
+                annotations,
+                controlParameters)
+
+class DBOpmWasControlledByBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (effect, role, cause, accounts, starts, ends) = record
+        if effect is not None:
+            effect = self.getDao('opm_process_id_effect').fromBinary(effect)
+        if role is not None:
+            role = self.getDao('opm_role').fromBinary(role)
+        if cause is not None:
+            cause = self.getDao('opm_agent_id').fromBinary(cause)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        starts = map(self.getDao('opm_time').fromBinary, starts)
+        ends = map(self.getDao('opm_time').fromBinary, ends)
+        obj = DBOpmWasControlledBy(effect,
+                                   role,
+                                   cause,
+                                   accounts,
+                                   starts,
+                                   ends)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_was_controlled_by):
+        effect = opm_was_controlled_by.db_effect
+        if effect is not None:
+            effect = self.getDao('opm_process_id_effect').toBinary(effect)
+        role = opm_was_controlled_by.db_role
+        if role is not None:
+            role = self.getDao('opm_role').toBinary(role)
+        cause = opm_was_controlled_by.db_cause
+        if cause is not None:
+            cause = self.getDao('opm_agent_id').toBinary(cause)
+        accounts = opm_was_controlled_by.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        starts = opm_was_controlled_by.db_starts
+        starts = map(self.getDao('opm_time').toBinary, starts)
+        ends = opm_was_controlled_by.db_ends
+        ends = map(self.getDao('opm_time').toBinary, ends)
+        return (effect,
+                role,
+                cause,
+                accounts,
+                starts,
+                ends)
+
+class DBAddBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (data, id, what, objectId, parentObjId, parentObjType) = record
+        if data is not None:
+            data = self.getDao(data[0]).fromBinary(data[1])
+        obj = DBAdd(data,
+                    id,
+                    what,
+                    objectId,
+                    parentObjId,
+                    parentObjType)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, add):
+        data = add.db_data
+        if data is not None:
+            data = (data.vtType,
+                    self.getDao(data.vtType).toBinary(data))
+        return (data,
+                add.db_id,
+                add.db_what,
+                add.db_objectId,
+                add.db_parentObjId,
+                add.db_parentObjType)
+
+class DBProvGenerationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (prov_entity, prov_activity, prov_role) = record
+        if prov_entity is not None:
+            prov_entity = self.getDao('ref_prov_entity').fromBinary(prov_entity)
+        if prov_activity is not None:
+            prov_activity = self.getDao('ref_prov_activity').fromBinary(prov_activity)
+        obj = DBProvGeneration(prov_entity,
+                               prov_activity,
+                               prov_role)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_generation):
+        prov_entity = prov_generation.db_prov_entity
+        if prov_entity is not None:
+            prov_entity = self.getDao('ref_prov_entity').toBinary(prov_entity)
+        prov_activity = prov_generation.db_prov_activity
+        if prov_activity is not None:
+            prov_activity = self.getDao('ref_prov_activity').toBinary(prov_activity)
+        return (prov_entity,
+                prov_activity,
+                prov_generation.db_prov_role)
+
+class DBOpmUsedBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (effect, role, cause, accounts, opm_times) = record
+        if effect is not None:
+            effect = self.getDao('opm_process_id_effect').fromBinary(effect)
+        if role is not None:
+            role = self.getDao('opm_role').fromBinary(role)
+        if cause is not None:
+            cause = self.getDao('opm_artifact_id_cause').fromBinary(cause)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        opm_times = map(self.getDao('opm_time').fromBinary, opm_times)
+        obj = DBOpmUsed(effect,
+                        role,
+                        cause,
+                        accounts,
+                        opm_times)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_used):
+        effect = opm_used.db_effect
+        if effect is not None:
+            effect = self.getDao('opm_process_id_effect').toBinary(effect)
+        role = opm_used.db_role
+        if role is not None:
+            role = self.getDao('opm_role').toBinary(role)
+        cause = opm_used.db_cause
+        if cause is not None:
+            cause = self.getDao('opm_artifact_id_cause').toBinary(cause)
+        accounts = opm_used.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        opm_times = opm_used.db_opm_times
+        opm_times = map(self.getDao('opm_time').toBinary, opm_times)
+        return (effect,
+                role,
+                cause,
+                accounts,
+                opm_times)
+
+class DBOpmArtifactIdCauseBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmArtifactIdCause(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_artifact_id_cause):
+        return (opm_artifact_id_cause.db_id,)
+
+class DBRefProvEntityBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBRefProvEntity(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, ref_prov_entity):
+        return (ref_prov_entity.db_prov_ref,)
+
+class DBVtConnectionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBVtConnection(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, vt_connection):
+        return (vt_connection.db_id,
+                vt_connection.db_vt_source,
+                vt_connection.db_vt_dest,
+                vt_connection.db_vt_source_port,
+                vt_connection.db_vt_dest_port,
+                vt_connection.db_vt_source_signature,
+                vt_connection.db_vt_dest_signature)
+
+class DBOpmAccountBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmAccount(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_account):
+        return (opm_account.db_id,
+                opm_account.db_value)
+
+class DBGroupExecBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (item_execs, id, ts_start, ts_end, cached, module_id, group_name, group_type, completed, error, machine_id, annotations) = record
+        daos = self.daoList
+        item_execs = [daos[t].fromBinary(r) for (t, r) in item_execs]
+        ts_start = self.convertFromBinary(ts_start, 'datetime')
+        ts_end = self.convertFromBinary(ts_end, 'datetime')
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        obj = DBGroupExec(item_execs,
+                          id,
+                          ts_start,
+                          ts_end,
+                          cached,
+                          module_id,
+                          group_name,
+                          group_type,
+                          completed,
+                          error,
+                          machine_id,
+                          annotations)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, group_exec):
+        item_execs = group_exec.db_item_execs
+        daos = self.daoList
+        item_execs = [(v.vtType, daos[v.vtType].toBinary(v)) for v in item_execs]
+        ts_start = group_exec.db_ts_start
+        ts_start = self.convertToBinary(ts_start, 'datetime')
+        ts_end = group_exec.db_ts_end
+        ts_end = self.convertToBinary(ts_end, 'datetime')
+        annotations = group_exec.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        return (item_execs,
+                group_exec.db_id,
+                ts_start,
+                ts_end,
+                group_exec.db_cached,
+                group_exec.db_module_id,
+                group_exec.db_group_name,
+                group_exec.db_group_type,
+                group_exec.db_completed,
+                group_exec.db_error,
+                group_exec.db_machine_id,
+                annotations)
+
+class DBOpmAgentIdBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmAgentId(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_agent_id):
+        return (opm_agent_id.db_id,)
+
+class DBParameterBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBParameter(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, parameter):
+        return (parameter.db_id,
+                parameter.db_pos,
+                parameter.db_name,
+                parameter.db_type,
+                parameter.db_val,
+                parameter.db_alias)
+
+class DBVistrailBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, version, name, actions, tags, annotations, controlParameters, vistrailVariables, parameter_explorations, actionAnnotations) = record
+        actions = map(self.getDao('action').fromBinary, actions)
+        tags = map(self.getDao('tag').fromBinary, tags)
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        controlParameters = map(self.getDao('controlParameter').fromBinary, controlParameters)
+        vistrailVariables = map(self.getDao('vistrailVariable').fromBinary, vistrailVariables)
+        parameter_explorations = map(self.getDao('parameter_exploration').fromBinary, parameter_explorations)
+        actionAnnotations = map(self.getDao('actionAnnotation').fromBinary, actionAnnotations)
+        obj = DBVistrail(id=id,
+                         version=version,
+                         name=name,
+                         actions=actions,
+                         tags=tags,
+                         annotations=annotations,
+                         controlParameters=controlParameters,
+                         vistrailVariables=vistrailVariables,
+                         parameter_explorations=parameter_explorations,
+                         actionAnnotations=actionAnnotations)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, vistrail):
+        actions = vistrail.db_actions
+        actions = map(self.getDao('action').toBinary, actions)
+        tags = vistrail.db_tags
+        tags = map(self.getDao('tag').toBinary, tags)
+        annotations = vistrail.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        controlParameters = vistrail.db_controlParameters
+        controlParameters = map(self.getDao('controlParameter').toBinary, controlParameters)
+        vistrailVariables = vistrail.db_vistrailVariables
+        vistrailVariables = map(self.getDao('vistrailVariable').toBinary, vistrailVariables)
+        parameter_explorations = vistrail.db_parameter_explorations
+        parameter_explorations = map(self.getDao('parameter_exploration').toBinary, parameter_explorations)
+        actionAnnotations = vistrail.db_actionAnnotations
+        actionAnnotations = map(self.getDao('actionAnnotation').toBinary, actionAnnotations)
+        return (vistrail.db_id,
+                vistrail.db_version,
+                vistrail.db_name,
+                actions,
+                tags,
+                annotations,
+                controlParameters,
+                vistrailVariables,
+                parameter_explorations,
+                actionAnnotations)
+
+class DBOpmArtifactValueBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (value,) = record
+        if value is not None:
+            value = self.getDao(value[0]).fromBinary(value[1])
+        obj = DBOpmArtifactValue(value)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_artifact_value):
+        value = opm_artifact_value.db_value
+        if value is not None:
+            value = (value.vtType,
+                     self.getDao(value.vtType).toBinary(value))
+        return (value,)
+
+class DBConfigStrBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBConfigStr(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, config_str):
+        return (config_str.db_value,)
+
+class DBStartupBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (version, configuration, enabled_packages, disabled_packages) = record
+        if configuration is not None:
+            configuration = self.getDao('configuration').fromBinary(configuration)
+        if enabled_packages is not None:
+            enabled_packages = self.getDao('enabled_packages').fromBinary(enabled_packages)
+        if disabled_packages is not None:
+            disabled_packages = self.getDao('disabled_packages').fromBinary(disabled_packages)
+        obj = DBStartup(version,
+                        configuration,
+                        enabled_packages,
+                        disabled_packages)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, startup):
+        configuration = startup.db_configuration
+        if configuration is not None:
+            configuration = self.getDao('configuration').toBinary(configuration)
+        enabled_packages = startup.db_enabled_packages
+        if enabled_packages is not None:
+            enabled_packages = self.getDao('enabled_packages').toBinary(enabled_packages)
+        disabled_packages = startup.db_disabled_packages
+        if disabled_packages is not None:
+            disabled_packages = self.getDao('disabled_packages').toBinary(disabled_packages)
+        return (startup.db_version,
+                configuration,
+                enabled_packages,
+                disabled_packages)
+
+class DBModuleBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, cache, name, namespace, package, version, location, functions, annotations, controlParameters, portSpecs) = record
+        if location is not None:
+            location = self.getDao('location').fromBinary(location)
+        functions = map(self.getDao('function').fromBinary, functions)
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        controlParameters = map(self.getDao('controlParameter').fromBinary, controlParameters)
+        portSpecs = map(self.getDao('portSpec').fromBinary, portSpecs)
+        obj = DBModule(id,
+                       cache,
+                       name,
+                       namespace,
+                       package,
+                       version,
+                       location,
+                       functions,
+                       annotations,
+                       controlParameters,
+                       portSpecs)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, module):
+        location = module.db_location
+        if location is not None:
+            location = self.getDao('location').toBinary(location)
+        functions = module.db_functions
+        functions = map(self.getDao('function').toBinary, functions)
+        annotations = module.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        controlParameters = module.db_controlParameters
+        controlParameters = map(self.getDao('controlParameter').toBinary, controlParameters)
+        portSpecs = module.db_portSpecs
+        portSpecs = map(self.getDao('portSpec').toBinary, portSpecs)
+        return (module.db_id,
+                module.db_cache,
+                module.db_name,
+                module.db_namespace,
+                module.db_package,
+                module.db_version,
+                location,
+                functions,
+                annotations,
+                controlParameters,
+                portSpecs)
+
+class DBPortBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBPort(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, port):
+        return (port.db_id,
+                port.db_type,
+                port.db_moduleId,
+                port.db_moduleName,
+                port.db_name,
+                port.db_signature)
+
+class DBOpmAgentsBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (agents,) = record
+        agents = map(self.getDao('opm_agent').fromBinary, agents)
+        obj = DBOpmAgents(agents)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_agents):
+        agents = opm_agents.db_agents
+        agents = map(self.getDao('opm_agent').toBinary, agents)
+        return (agents,)
+
+class DBOpmDependenciesBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (dependencys,) = record
+        daos = self.daoList
+        dependencys = [daos[t].fromBinary(r) for (t, r) in dependencys]
+        obj = DBOpmDependencies(dependencys)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_dependencies):
+        dependencys = opm_dependencies.db_dependencys
+        daos = self.daoList
+        dependencys = [(v.vtType, daos[v.vtType].toBinary(v)) for v in dependencys]
+        return (dependencys,)
+
+class DBPEFunctionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, module_id, port_name, is_alias, parameters) = record
+        parameters = map(self.getDao('pe_parameter').fromBinary, parameters)
+        obj = DBPEFunction(id,
+                           module_id,
+                           port_name,
+                           is_alias,
+                           parameters)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, pe_function):
+        parameters = pe_function.db_parameters
+        parameters = map(self.getDao('pe_parameter').toBinary, parameters)
+        return (pe_function.db_id,
+                pe_function.db_module_id,
+                pe_function.db_port_name,
+                pe_function.db_is_alias,
+                parameters)
+
+class DBWorkflowBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (modules, id, name, version, connections, annotations, plugin_datas, others, vistrail_id) = record
+        daos = self.daoList
+        modules = [daos[t].fromBinary(r) for (t, r) in modules]
+        connections = map(self.getDao('connection').fromBinary, connections)
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        plugin_datas = map(self.getDao('plugin_data').fromBinary, plugin_datas)
+        others = map(self.getDao('other').fromBinary, others)
+        obj = DBWorkflow(modules=modules,
+                         id=id,
+                         name=name,
+                         version=version,
+                         connections=connections,
+                         annotations=annotations,
+                         plugin_datas=plugin_datas,
+                         others=others,
+                         vistrail_id=vistrail_id)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, workflow):
+        modules = workflow.db_modules
+        daos = self.daoList
+        modules = [(v.vtType, daos[v.vtType].toBinary(v)) for v in modules]
+        connections = workflow.db_connections
+        connections = map(self.getDao('connection').toBinary, connections)
+        annotations = workflow.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        plugin_datas = workflow.db_plugin_datas
+        plugin_datas = map(self.getDao('plugin_data').toBinary, plugin_datas)
+        others = workflow.db_others
+        others = map(self.getDao('other').toBinary, others)
+        return (modules,
+                workflow.db_id,
+                workflow.db_name,
+                workflow.db_version,
+                connections,
+                annotations,
+                plugin_datas,
+                others,
+                workflow.db_vistrail_id)
+
+class DBMashupActionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, prevId, date, user, mashup) = record
+        date = self.convertFromBinary(date, 'datetime')
+        if mashup is not None:
+            mashup = self.getDao('mashup').fromBinary(mashup)
+        obj = DBMashupAction(id,
+                             prevId,
+                             date,
+                             user,
+                             mashup)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, mashup_action):
+        date = mashup_action.db_date
+        date = self.convertToBinary(date, 'datetime')
+        mashup = mashup_action.db_mashup
+        if mashup is not None:
+            mashup = self.getDao('mashup').toBinary(mashup)
+        return (mashup_action.db_id,
+                mashup_action.db_prevId,
+                date,
+                mashup_action.db_user,
+                mashup)
+
+class DBConfigurationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (config_keys,) = record
+        config_keys = map(self.getDao('config_key').fromBinary, config_keys)
+        obj = DBConfiguration(config_keys)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, configuration):
+        config_keys = configuration.db_config_keys
+        config_keys = map(self.getDao('config_key').toBinary, config_keys)
+        return (config_keys,)
+
+class DBChangeBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (data, id, what, oldObjId, newObjId, parentObjId, parentObjType) = record
+        if data is not None:
+            data = self.getDao(data[0]).fromBinary(data[1])
+        obj = DBChange(data,
+                       id,
+                       what,
+                       oldObjId,
+                       newObjId,
+                       parentObjId,
+                       parentObjType)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, change):
+        data = change.db_data
+        if data is not None:
+            data = (data.vtType,
+                    self.getDao(data.vtType).toBinary(data))
+        return (data,
+                change.db_id,
+                change.db_what,
+                change.db_oldObjId,
+                change.db_newObjId,
+                change.db_parentObjId,
+                change.db_parentObjType)
+
+class DBPackageBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, name, identifier, codepath, load_configuration, version, description, module_descriptors) = record
+        module_descriptors = map(self.getDao('module_descriptor').fromBinary, module_descriptors)
+        obj = DBPackage(id,
+                        name,
+                        identifier,
+                        codepath,
+                        load_configuration,
+                        version,
+                        description,
+                        module_descriptors)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, package):
+        module_descriptors = package.db_module_descriptors
+        module_descriptors = map(self.getDao('module_descriptor').toBinary, module_descriptors)
+        return (package.db_id,
+                package.db_name,
+                package.db_identifier,
+                package.db_codepath,
+                package.db_load_configuration,
+                package.db_version,
+                package.db_description,
+                module_descriptors)
+
+class DBLoopExecBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, ts_start, ts_end, loop_iterations) = record
+        ts_start = self.convertFromBinary(ts_start, 'datetime')
+        ts_end = self.convertFromBinary(ts_end, 'datetime')
+        loop_iterations = map(self.getDao('loop_iteration').fromBinary, loop_iterations)
+        obj = DBLoopExec(id,
+                         ts_start,
+                         ts_end,
+                         loop_iterations)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, loop_exec):
+        ts_start = loop_exec.db_ts_start
+        ts_start = self.convertToBinary(ts_start, 'datetime')
+        ts_end = loop_exec.db_ts_end
+        ts_end = self.convertToBinary(ts_end, 'datetime')
+        loop_iterations = loop_exec.db_loop_iterations
+        loop_iterations = map(self.getDao('loop_iteration').toBinary, loop_iterations)
+        return (loop_exec.db_id,
+                ts_start,
+                ts_end,
+                loop_iterations)
+
+class DBConnectionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, ports) = record
+        ports = map(self.getDao('port').fromBinary, ports)
+        obj = DBConnection(id,
+                           ports)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, connection):
+        ports = connection.db_ports
+        ports = map(self.getDao('port').toBinary, ports)
+        return (connection.db_id,
+                ports)
+
+class DBConfigBoolBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBConfigBool(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, config_bool):
+        return (config_bool.db_value,)
+
+class DBActionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (operations, id, prevId, date, session, user, annotations) = record
+        daos = self.daoList
+        operations = [daos[t].fromBinary(r) for (t, r) in operations]
+        date = self.convertFromBinary(date, 'datetime')
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        obj = DBAction(operations,
+                       id,
+                       prevId,
+                       date,
+                       session,
+                       user,
+                       annotations)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, action):
+        operations = action.db_operations
+        daos = self.daoList
+        operations = [(v.vtType, daos[v.vtType].toBinary(v)) for v in operations]
+        date = action.db_date
+        date = self.convertToBinary(date, 'datetime')
+        annotations = action.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        return (operations,
+                action.db_id,
+                action.db_prevId,
+                date,
+                action.db_session,
+                action.db_user,
+                annotations)
+
+class DBStartupPackageBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (name, configuration) = record
+        if configuration is not None:
+            configuration = self.getDao('configuration').fromBinary(configuration)
+        obj = DBStartupPackage(name,
+                               configuration)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, startup_package):
+        configuration = startup_package.db_configuration
+        if configuration is not None:
+            configuration = self.getDao('configuration').toBinary(configuration)
+        return (startup_package.db_name,
+                configuration)
+
+class DBConfigIntBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBConfigInt(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, config_int):
+        return (config_int.db_value,)
+
+class DBOpmProcessIdEffectBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmProcessIdEffect(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_process_id_effect):
+        return (opm_process_id_effect.db_id,)
+
+class DBRefProvPlanBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBRefProvPlan(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, ref_prov_plan):
+        return (ref_prov_plan.db_prov_ref,)
+
+class DBOpmAccountsBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (accounts, opm_overlapss) = record
+        accounts = map(self.getDao('opm_account').fromBinary, accounts)
+        opm_overlapss = map(self.getDao('opm_overlaps').fromBinary, opm_overlapss)
+        obj = DBOpmAccounts(accounts,
+                            opm_overlapss)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_accounts):
+        accounts = opm_accounts.db_accounts
+        accounts = map(self.getDao('opm_account').toBinary, accounts)
+        opm_overlapss = opm_accounts.db_opm_overlapss
+        opm_overlapss = map(self.getDao('opm_overlaps').toBinary, opm_overlapss)
+        return (accounts,
+                opm_overlapss)
+
+class DBRefProvAgentBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBRefProvAgent(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, ref_prov_agent):
+        return (ref_prov_agent.db_prov_ref,)
+
+class DBPortSpecBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, name, type, optional, depth, sort_key, portSpecItems, min_conns, max_conns) = record
+        portSpecItems = map(self.getDao('portSpecItem').fromBinary, portSpecItems)
+        obj = DBPortSpec(id,
+                         name,
+                         type,
+                         optional,
+                         depth,
+                         sort_key,
+                         portSpecItems,
+                         min_conns,
+                         max_conns)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, portSpec):
+        portSpecItems = portSpec.db_portSpecItems
+        portSpecItems = map(self.getDao('portSpecItem').toBinary, portSpecItems)
+        return (portSpec.db_id,
+                portSpec.db_name,
+                portSpec.db_type,
+                portSpec.db_optional,
+                portSpec.db_depth,
+                portSpec.db_sort_key,
+                portSpecItems,
+                portSpec.db_min_conns,
+                portSpec.db_max_conns)
+
+class DBEnabledPackagesBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (packages,) = record
+        packages = map(self.getDao('startup_package').fromBinary, packages)
+        obj = DBEnabledPackages(packages)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, enabled_packages):
+        packages = enabled_packages.db_packages
+        packages = map(self.getDao('startup_package').toBinary, packages)
+        return (packages,)
+
+class DBOpmArtifactBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, value, accounts) = record
+        if value is not None:
+            value = self.getDao('opm_artifact_value').fromBinary(value)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        obj = DBOpmArtifact(id,
+                            value,
+                            accounts)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_artifact):
+        value = opm_artifact.db_value
+        if value is not None:
+            value = self.getDao('opm_artifact_value').toBinary(value)
+        accounts = opm_artifact.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        return (opm_artifact.db_id,
+                value,
+                accounts)
+
+class DBLogBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, version, name, workflow_execs, vistrail_id) = record
+        workflow_execs = map(self.getDao('workflow_exec').fromBinary, workflow_execs)
+        obj = DBLog(id=id,
+                    version=version,
+                    name=name,
+                    workflow_execs=workflow_execs,
+                    vistrail_id=vistrail_id)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, log):
+        workflow_execs = log.db_workflow_execs
+        workflow_execs = map(self.getDao('workflow_exec').toBinary, workflow_execs)
+        return (log.db_id,
+                log.db_version,
+                log.db_name,
+                workflow_execs,
+                log.db_vistrail_id)
+
+class DBLoopIterationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (item_execs, id, ts_start, ts_end, iteration, completed, error) = record
+        daos = self.daoList
+        item_execs = [daos[t].fromBinary(r) for (t, r) in item_execs]
+        ts_start = self.convertFromBinary(ts_start, 'datetime')
+        ts_end = self.convertFromBinary(ts_end, 'datetime')
+        obj = DBLoopIteration(item_execs,
+                              id,
+                              ts_start,
+                              ts_end,
+                              iteration,
+                              completed,
+                              error)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, loop_iteration):
+        item_execs = loop_iteration.db_item_execs
+        daos = self.daoList
+        item_execs = [(v.vtType, daos[v.vtType].toBinary(v)) for v in item_execs]
+        ts_start = loop_iteration.db_ts_start
+        ts_start = self.convertToBinary(ts_start, 'datetime')
+        ts_end = loop_iteration.db_ts_end
+        ts_end = self.convertToBinary(ts_end, 'datetime')
+        return (item_execs,
+                loop_iteration.db_id,
+                ts_start,
+                ts_end,
+                loop_iteration.db_iteration,
+                loop_iteration.db_completed,
+                loop_iteration.db_error)
+
+class DBOpmProcessIdCauseBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmProcessIdCause(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_process_id_cause):
+        return (opm_process_id_cause.db_id,)
+
+class DBOpmArtifactsBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (artifacts,) = record
+        artifacts = map(self.getDao('opm_artifact').fromBinary, artifacts)
+        obj = DBOpmArtifacts(artifacts)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_artifacts):
+        artifacts = opm_artifacts.db_artifacts
+        artifacts = map(self.getDao('opm_artifact').toBinary, artifacts)
+        return (artifacts,)
+
+class DBPEParameterBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBPEParameter(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, pe_parameter):
+        return (pe_parameter.db_id,
+                pe_parameter.db_pos,
+                pe_parameter.db_interpolator,
+                pe_parameter.db_value,
+                pe_parameter.db_dimension)
+
+class DBWorkflowExecBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (item_execs, id, user, ip, session, vt_version, ts_start, ts_end, parent_id, parent_type, parent_version, completed, name, annotations, machines) = record
+        daos = self.daoList
+        item_execs = [daos[t].fromBinary(r) for (t, r) in item_execs]
+        ts_start = self.convertFromBinary(ts_start, 'datetime')
+        ts_end = self.convertFromBinary(ts_end, 'datetime')
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        machines = map(self.getDao('machine').fromBinary, machines)
+        obj = DBWorkflowExec(item_execs,
+                             id,
+                             user,
+                             ip,
+                             session,
+                             vt_version,
+                             ts_start,
+                             ts_end,
+                             parent_id,
+                             parent_type,
+                             parent_version,
+                             completed,
+                             name,
+                             annotations,
+                             machines)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, workflow_exec):
+        item_execs = workflow_exec.db_item_execs
+        daos = self.daoList
+        item_execs = [(v.vtType, daos[v.vtType].toBinary(v)) for v in item_execs]
+        ts_start = workflow_exec.db_ts_start
+        ts_start = self.convertToBinary(ts_start, 'datetime')
+        ts_end = workflow_exec.db_ts_end
+        ts_end = self.convertToBinary(ts_end, 'datetime')
+        annotations = workflow_exec.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        machines = workflow_exec.db_machines
+        machines = map(self.getDao('machine').toBinary, machines)
+        return (item_execs,
+                workflow_exec.db_id,
+                workflow_exec.db_user,
+                workflow_exec.db_ip,
+                workflow_exec.db_session,
+                workflow_exec.db_vt_version,
+                ts_start,
+                ts_end,
+                workflow_exec.db_parent_id,
+                workflow_exec.db_parent_type,
+                workflow_exec.db_parent_version,
+                workflow_exec.db_completed,
+                workflow_exec.db_name,
+                annotations,
+                machines)
+
+class DBLocationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBLocation(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, location):
+        return (location.db_id,
+                location.db_x,
+                location.db_y)
+
+class DBFunctionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, pos, name, parameters) = record
+        parameters = map(self.getDao('parameter').fromBinary, parameters)
+        obj = DBFunction(id,
+                         pos,
+                         name,
+                         parameters)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, function):
+        parameters = function.db_parameters
+        parameters = map(self.getDao('parameter').toBinary, parameters)
+        return (function.db_id,
+                function.db_pos,
+                function.db_name,
+                parameters)
+
+class DBActionAnnotationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, key, value, action_id, date, user) = record
+        date = self.convertFromBinary(date, 'datetime')
+        obj = DBActionAnnotation(id,
+                                 key,
+                                 value,
+                                 action_id,
+                                 date,
+                                 user)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, actionAnnotation):
+        date = actionAnnotation.db_date
+        date = self.convertToBinary(date, 'datetime')
+        return (actionAnnotation.db_id,
+                actionAnnotation.db_key,
+                actionAnnotation.db_value,
+                actionAnnotation.db_action_id,
+                date,
+                actionAnnotation.db_user)
+
+class DBProvActivityBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, startTime, endTime, vt_id, vt_type, vt_cached, vt_completed, vt_machine_id, vt_error, is_part_of) = record
+        if is_part_of is not None:
+            is_part_of = self.getDao('is_part_of').fromBinary(is_part_of)
+        obj = DBProvActivity(id,
+                             startTime,
+                             endTime,
+                             vt_id,
+                             vt_type,
+                             vt_cached,
+                             vt_completed,
+                             vt_machine_id,
+                             vt_error,
+                             is_part_of)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_activity):
+        is_part_of = prov_activity.db_is_part_of
+        if is_part_of is not None:
+            is_part_of = self.getDao('is_part_of').toBinary(is_part_of)
+        return (prov_activity.db_id,
+                prov_activity.db_startTime,
+                prov_activity.db_endTime,
+                prov_activity.db_vt_id,
+                prov_activity.db_vt_type,
+                prov_activity.db_vt_cached,
+                prov_activity.db_vt_completed,
+                prov_activity.db_vt_machine_id,
+                prov_activity.db_vt_error,
+                is_part_of)
+
+class DBProvUsageBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (prov_activity, prov_entity, prov_role) = record
+        if prov_activity is not None:
+            prov_activity = self.getDao('ref_prov_activity').fromBinary(prov_activity)
+        if prov_entity is not None:
+            prov_entity = self.getDao('ref_prov_entity').fromBinary(prov_entity)
+        obj = DBProvUsage(prov_activity,
+                          prov_entity,
+                          prov_role)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_usage):
+        prov_activity = prov_usage.db_prov_activity
+        if prov_activity is not None:
+            prov_activity = self.getDao('ref_prov_activity').toBinary(prov_activity)
+        prov_entity = prov_usage.db_prov_entity
+        if prov_entity is not None:
+            prov_entity = self.getDao('ref_prov_entity').toBinary(prov_entity)
+        return (prov_activity,
+                prov_entity,
+                prov_usage.db_prov_role)
+
+class DBOpmArtifactIdEffectBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmArtifactIdEffect(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_artifact_id_effect):
+        return (opm_artifact_id_effect.db_id,)
+
+class DBOpmGraphBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (accounts, processes, artifacts, agents, dependencies) = record
+        if accounts is not None:
+            accounts = self.getDao('opm_accounts').fromBinary(accounts)
+        if processes is not None:
+            processes = self.getDao('opm_processes').fromBinary(processes)
+        if artifacts is not None:
+            artifacts = self.getDao('opm_artifacts').fromBinary(artifacts)
+        if agents is not None:
+            agents = self.getDao('opm_agents').fromBinary(agents)
+        if dependencies is not None:
+            dependencies = self.getDao('opm_dependencies').fromBinary(dependencies)
+        obj = DBOpmGraph(accounts,
+                         processes,
+                         artifacts,
+                         agents,
+                         dependencies)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_graph):
+        accounts = opm_graph.db_accounts
+        if accounts is not None:
+            accounts = self.getDao('opm_accounts').toBinary(accounts)
+        processes = opm_graph.db_processes
+        if processes is not None:
+            processes = self.getDao('opm_processes').toBinary(processes)
+        artifacts = opm_graph.db_artifacts
+        if artifacts is not None:
+            artifacts = self.getDao('opm_artifacts').toBinary(artifacts)
+        agents = opm_graph.db_agents
+        if agents is not None:
+            agents = self.getDao('opm_agents').toBinary(agents)
+        dependencies = opm_graph.db_dependencies
+        if dependencies is not None:
+            dependencies = self.getDao('opm_dependencies').toBinary(dependencies)
+        return (accounts,
+                processes,
+                artifacts,
+                agents,
+                dependencies)
+
+class DBIsPartOfBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBIsPartOf(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, is_part_of):
+        return (is_part_of.db_prov_ref,)
+
+class DBOpmWasDerivedFromBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (effect, role, cause, accounts, opm_times) = record
+        if effect is not None:
+            effect = self.getDao('opm_artifact_id_effect').fromBinary(effect)
+        if role is not None:
+            role = self.getDao('opm_role').fromBinary(role)
+        if cause is not None:
+            cause = self.getDao('opm_artifact_id_cause').fromBinary(cause)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        opm_times = map(self.getDao('opm_time').fromBinary, opm_times)
+        obj = DBOpmWasDerivedFrom(effect,
+                                  role,
+                                  cause,
+                                  accounts,
+                                  opm_times)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_was_derived_from):
+        effect = opm_was_derived_from.db_effect
+        if effect is not None:
+            effect = self.getDao('opm_artifact_id_effect').toBinary(effect)
+        role = opm_was_derived_from.db_role
+        if role is not None:
+            role = self.getDao('opm_role').toBinary(role)
+        cause = opm_was_derived_from.db_cause
+        if cause is not None:
+            cause = self.getDao('opm_artifact_id_cause').toBinary(cause)
+        accounts = opm_was_derived_from.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        opm_times = opm_was_derived_from.db_opm_times
+        opm_times = map(self.getDao('opm_time').toBinary, opm_times)
+        return (effect,
+                role,
+                cause,
+                accounts,
+                opm_times)
+
+class DBControlParameterBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBControlParameter(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, controlParameter):
+        return (controlParameter.db_id,
+                controlParameter.db_name,
+                controlParameter.db_value)
+
+class DBPluginDataBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBPluginData(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, plugin_data):
+        return (plugin_data.db_id,
+                plugin_data.db_data)
+
+class DBDeleteBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBDelete(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, delete):
+        return (delete.db_id,
+                delete.db_what,
+                delete.db_objectId,
+                delete.db_parentObjId,
+                delete.db_parentObjType)
+
+class DBVistrailVariableBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBVistrailVariable(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, vistrailVariable):
+        return (vistrailVariable.db_name,
+                vistrailVariable.db_uuid,
+                vistrailVariable.db_package,
+                vistrailVariable.db_module,
+                vistrailVariable.db_namespace,
+                vistrailVariable.db_value)
+
+class DBOpmOverlapsBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (opm_account_ids,) = record
+        opm_account_ids = map(self.getDao('opm_account_id').fromBinary, opm_account_ids)
+        obj = DBOpmOverlaps(opm_account_ids)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_overlaps):
+        opm_account_ids = opm_overlaps.db_opm_account_ids
+        opm_account_ids = map(self.getDao('opm_account_id').toBinary, opm_account_ids)
+        return (opm_account_ids,)
+
+class DBOpmWasTriggeredByBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (effect, role, cause, accounts, opm_times) = record
+        if effect is not None:
+            effect = self.getDao('opm_process_id_effect').fromBinary(effect)
+        if role is not None:
+            role = self.getDao('opm_role').fromBinary(role)
+        if cause is not None:
+            cause = self.getDao('opm_process_id_cause').fromBinary(cause)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        opm_times = map(self.getDao('opm_time').fromBinary, opm_times)
+        obj = DBOpmWasTriggeredBy(effect,
+                                  role,
+                                  cause,
+                                  accounts,
+                                  opm_times)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_was_triggered_by):
+        effect = opm_was_triggered_by.db_effect
+        if effect is not None:
+            effect = self.getDao('opm_process_id_effect').toBinary(effect)
+        role = opm_was_triggered_by.db_role
+        if role is not None:
+            role = self.getDao('opm_role').toBinary(role)
+        cause = opm_was_triggered_by.db_cause
+        if cause is not None:
+            cause = self.getDao('opm_process_id_cause').toBinary(cause)
+        accounts = opm_was_triggered_by.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        opm_times = opm_was_triggered_by.db_opm_times
+        opm_times = map(self.getDao('opm_time').toBinary, opm_times)
+        return (effect,
+                role,
+                cause,
+                accounts,
+                opm_times)
+
+class DBModuleDescriptorBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, name, package, namespace, package_version, version, base_descriptor_id, portSpecs) = record
+        portSpecs = map(self.getDao('portSpec').fromBinary, portSpecs)
+        obj = DBModuleDescriptor(id,
+                                 name,
+                                 package,
+                                 namespace,
+                                 package_version,
+                                 version,
+                                 base_descriptor_id,
+                                 portSpecs)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, module_descriptor):
+        portSpecs = module_descriptor.db_portSpecs
+        portSpecs = map(self.getDao('portSpec').toBinary, portSpecs)
+        return (module_descriptor.db_id,
+                module_descriptor.db_name,
+                module_descriptor.db_package,
+                module_descriptor.db_namespace,
+                module_descriptor.db_package_version,
+                module_descriptor.db_version,
+                module_descriptor.db_base_descriptor_id,
+                portSpecs)
+
+class DBTagBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBTag(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, tag):
+        return (tag.db_id,
+                tag.db_name)
+
+class DBOpmRoleBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmRole(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_role):
+        return (opm_role.db_value,)
+
+class DBProvDocumentBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (prov_entitys, prov_activitys, prov_agents, vt_connections, prov_usages, prov_generations, prov_associations) = record
+        prov_entitys = map(self.getDao('prov_entity').fromBinary, prov_entitys)
+        prov_activitys = map(self.getDao('prov_activity').fromBinary, prov_activitys)
+        prov_agents = map(self.getDao('prov_agent').fromBinary, prov_agents)
+        vt_connections = map(self.getDao('vt_connection').fromBinary, vt_connections)
+        prov_usages = map(self.getDao('prov_usage').fromBinary, prov_usages)
+        prov_generations = map(self.getDao('prov_generation').fromBinary, prov_generations)
+        prov_associations = map(self.getDao('prov_association').fromBinary, prov_associations)
+        obj = DBProvDocument(prov_entitys,
+                             prov_activitys,
+                             prov_agents,
+                             vt_connections,
+                             prov_usages,
+                             prov_generations,
+                             prov_associations)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_document):
+        prov_entitys = prov_document.db_prov_entitys
+        prov_entitys = map(self.getDao('prov_entity').toBinary, prov_entitys)
+        prov_activitys = prov_document.db_prov_activitys
+        prov_activitys = map(self.getDao('prov_activity').toBinary, prov_activitys)
+        prov_agents = prov_document.db_prov_agents
+        prov_agents = map(self.getDao('prov_agent').toBinary, prov_agents)
+        vt_connections = prov_document.db_vt_connections
+        vt_connections = map(self.getDao('vt_connection').toBinary, vt_connections)
+        prov_usages = prov_document.db_prov_usages
+        prov_usages = map(self.getDao('prov_usage').toBinary, prov_usages)
+        prov_generations = prov_document.db_prov_generations
+        prov_generations = map(self.getDao('prov_generation').toBinary, prov_generations)
+        prov_associations = prov_document.db_prov_associations
+        prov_associations = map(self.getDao('prov_association').toBinary, prov_associations)
+        return (prov_entitys,
+                prov_activitys,
+                prov_agents,
+                vt_connections,
+                prov_usages,
+                prov_generations,
+                prov_associations)
+
+class DBOpmProcessesBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (processs,) = record
+        processs = map(self.getDao('opm_process').fromBinary, processs)
+        obj = DBOpmProcesses(processs)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_processes):
+        processs = opm_processes.db_processs
+        processs = map(self.getDao('opm_process').toBinary, processs)
+        return (processs,)
+
+class DBOpmAccountIdBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOpmAccountId(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_account_id):
+        return (opm_account_id.db_id,)
+
+class DBPortSpecItemBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBPortSpecItem(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, portSpecItem):
+        return (portSpecItem.db_id,
+                portSpecItem.db_pos,
+                portSpecItem.db_module,
+                portSpecItem.db_package,
+                portSpecItem.db_namespace,
+                portSpecItem.db_label,
+                portSpecItem.db_default,
+                portSpecItem.db_values,
+                portSpecItem.db_entry_type)
+
+class DBMashupComponentBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBMashupComponent(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, mashup_component):
+        return (mashup_component.db_id,
+                mashup_component.db_vtid,
+                mashup_component.db_vttype,
+                mashup_component.db_vtparent_type,
+                mashup_component.db_vtparent_id,
+                mashup_component.db_vtpos,
+                mashup_component.db_vtmid,
+                mashup_component.db_pos,
+                mashup_component.db_type,
+                mashup_component.db_val,
+                mashup_component.db_minVal,
+                mashup_component.db_maxVal,
+                mashup_component.db_stepSize,
+                mashup_component.db_strvaluelist,
+                mashup_component.db_widget,
+                mashup_component.db_seq,
+                mashup_component.db_parent)
+
+class DBMashupBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, name, version, aliases, type, vtid, layout, geometry, has_seq) = record
+        aliases = map(self.getDao('mashup_alias').fromBinary, aliases)
+        obj = DBMashup(id,
+                       name,
+                       version,
+                       aliases,
+                       type,
+                       vtid,
+                       layout,
+                       geometry,
+                       has_seq)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, mashup):
+        aliases = mashup.db_aliases
+        aliases = map(self.getDao('mashup_alias').toBinary, aliases)
+        return (mashup.db_id,
+                mashup.db_name,
+                mashup.db_version,
+                aliases,
+                mashup.db_type,
+                mashup.db_vtid,
+                mashup.db_layout,
+                mashup.db_geometry,
+                mashup.db_has_seq)
+
+class DBMachineBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBMachine(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, machine):
+        return (machine.db_id,
+                machine.db_name,
+                machine.db_os,
+                machine.db_architecture,
+                machine.db_processor,
+                machine.db_ram)
+
+class DBConfigFloatBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBConfigFloat(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, config_float):
+        return (config_float.db_value,)
+
+class DBOtherBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBOther(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, other):
+        return (other.db_id,
+                other.db_key,
+                other.db_value)
+
+class DBRefProvActivityBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBRefProvActivity(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, ref_prov_activity):
+        return (ref_prov_activity.db_prov_ref,)
+
+class DBAbstractionBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, cache, name, namespace, package, version, internal_version, location, functions, annotations, controlParameters) = record
+        if location is not None:
+            location = self.getDao('location').fromBinary(location)
+        functions = map(self.getDao('function').fromBinary, functions)
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        controlParameters = map(self.getDao('controlParameter').fromBinary, controlParameters)
+        obj = DBAbstraction(id,
+                            cache,
+                            name,
+                            namespace,
+                            package,
+                            version,
+                            internal_version,
+                            location,
+                            functions,
+                            annotations,
+                            controlParameters)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, abstraction):
+        location = abstraction.db_location
+        if location is not None:
+            location = self.getDao('location').toBinary(location)
+        functions = abstraction.db_functions
+        functions = map(self.getDao('function').toBinary, functions)
+        annotations = abstraction.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        controlParameters = abstraction.db_controlParameters
+        controlParameters = map(self.getDao('controlParameter').toBinary, controlParameters)
+        return (abstraction.db_id,
+                abstraction.db_cache,
+                abstraction.db_name,
+                abstraction.db_namespace,
+                abstraction.db_package,
+                abstraction.db_version,
+                abstraction.db_internal_version,
+                location,
+                functions,
+                annotations,
+                controlParameters)
+
+class DBProvAgentBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBProvAgent(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_agent):
+        return (prov_agent.db_id,
+                prov_agent.db_vt_id,
+                prov_agent.db_prov_type,
+                prov_agent.db_prov_label,
+                prov_agent.db_vt_machine_os,
+                prov_agent.db_vt_machine_architecture,
+                prov_agent.db_vt_machine_processor,
+                prov_agent.db_vt_machine_ram)
+
+class DBMashuptrailBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (name, version, vtVersion, actions, annotations, actionAnnotations) = record
+        actions = map(self.getDao('mashup_action').fromBinary, actions)
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        actionAnnotations = map(self.getDao('mashup_actionAnnotation').fromBinary, actionAnnotations)
+        obj = DBMashuptrail(name=name,
+                            version=version,
+                            vtVersion=vtVersion,
+                            actions=actions,
+                            annotations=annotations,
+                            actionAnnotations=actionAnnotations)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, mashuptrail):
+        actions = mashuptrail.db_actions
+        actions = map(self.getDao('mashup_action').toBinary, actions)
+        annotations = mashuptrail.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        actionAnnotations = mashuptrail.db_actionAnnotations
+        actionAnnotations = map(self.getDao('mashup_actionAnnotation').toBinary, actionAnnotations)
+        return (mashuptrail.db_name,
+                mashuptrail.db_version,
+                mashuptrail.db_vtVersion,
+                actions,
+                annotations,
+                actionAnnotations)
+
+class DBRegistryBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, version, root_descriptor_id, packages) = record
+        packages = map(self.getDao('package').fromBinary, packages)
+        obj = DBRegistry(id=id,
+                         version=version,
+                         root_descriptor_id=root_descriptor_id,
+                         packages=packages)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, registry):
+        packages = registry.db_packages
+        packages = map(self.getDao('package').toBinary, packages)
+        return (registry.db_id,
+                registry.db_version,
+                registry.db_root_descriptor_id,
+                packages)
+
+class DBOpmAgentBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, value, accounts) = record
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        obj = DBOpmAgent(id,
+                         value,
+                         accounts)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_agent):
+        accounts = opm_agent.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        return (opm_agent.db_id,
+                opm_agent.db_value,
+                accounts)
+
+class DBProvEntityBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, prov_type, prov_label, prov_value, vt_id, vt_type, vt_desc, vt_package, vt_version, vt_cache, vt_location_x, vt_location_y, is_part_of) = record
+        if is_part_of is not None:
+            is_part_of = self.getDao('is_part_of').fromBinary(is_part_of)
+        obj = DBProvEntity(id,
+                           prov_type,
+                           prov_label,
+                           prov_value,
+                           vt_id,
+                           vt_type,
+                           vt_desc,
+                           vt_package,
+                           vt_version,
+                           vt_cache,
+                           vt_location_x,
+                           vt_location_y,
+                           is_part_of)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_entity):
+        is_part_of = prov_entity.db_is_part_of
+        if is_part_of is not None:
+            is_part_of = self.getDao('is_part_of').toBinary(is_part_of)
+        return (prov_entity.db_id,
+                prov_entity.db_prov_type,
+                prov_entity.db_prov_label,
+                prov_entity.db_prov_value,
+                prov_entity.db_vt_id,
+                prov_entity.db_vt_type,
+                prov_entity.db_vt_desc,
+                prov_entity.db_vt_package,
+                prov_entity.db_vt_version,
+                prov_entity.db_vt_cache,
+                prov_entity.db_vt_location_x,
+                prov_entity.db_vt_location_y,
+                is_part_of)
+
+class DBAnnotationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        obj = DBAnnotation(*record)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, annotation):
+        return (annotation.db_id,
+                annotation.db_key,
+                annotation.db_value)
+
+class DBOpmTimeBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (no_later_than, no_earlier_than, clock_id) = record
+        no_later_than = self.convertFromBinary(no_later_than, 'datetime')
+        no_earlier_than = self.convertFromBinary(no_earlier_than, 'datetime')
+        obj = DBOpmTime(no_later_than,
+                        no_earlier_than,
+                        clock_id)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_time):
+        no_later_than = opm_time.db_no_later_than
+        no_later_than = self.convertToBinary(no_later_than, 'datetime')
+        no_earlier_than = opm_time.db_no_earlier_than
+        no_earlier_than = self.convertToBinary(no_earlier_than, 'datetime')
+        return (no_later_than,
+                no_earlier_than,
+                opm_time.db_clock_id)
+
+class DBParameterExplorationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, action_id, name, date, user, dims, layout, functions) = record
+        date = self.convertFromBinary(date, 'datetime')
+        functions = map(self.getDao('pe_function').fromBinary, functions)
+        obj = DBParameterExploration(id,
+                                     action_id,
+                                     name,
+                                     date,
+                                     user,
+                                     dims,
+                                     layout,
+                                     functions)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, parameter_exploration):
+        date = parameter_exploration.db_date
+        date = self.convertToBinary(date, 'datetime')
+        functions = parameter_exploration.db_functions
+        functions = map(self.getDao('pe_function').toBinary, functions)
+        return (parameter_exploration.db_id,
+                parameter_exploration.db_action_id,
+                parameter_exploration.db_name,
+                date,
+                parameter_exploration.db_user,
+                parameter_exploration.db_dims,
+                parameter_exploration.db_layout,
+                functions)
+
+class DBMashupActionAnnotationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, key, value, action_id, date, user) = record
+        date = self.convertFromBinary(date, 'datetime')
+        obj = DBMashupActionAnnotation(id,
+                                       key,
+                                       value,
+                                       action_id,
+                                       date,
+                                       user)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, mashup_actionAnnotation):
+        date = mashup_actionAnnotation.db_date
+        date = self.convertToBinary(date, 'datetime')
+        return (mashup_actionAnnotation.db_id,
+                mashup_actionAnnotation.db_key,
+                mashup_actionAnnotation.db_value,
+                mashup_actionAnnotation.db_action_id,
+                date,
+                mashup_actionAnnotation.db_user)
+
+class DBOpmProcessBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, value, accounts) = record
+        if value is not None:
+            value = self.getDao('opm_process_value').fromBinary(value)
+        accounts = map(self.getDao('opm_account_id').fromBinary, accounts)
+        obj = DBOpmProcess(id,
+                           value,
+                           accounts)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_process):
+        value = opm_process.db_value
+        if value is not None:
+            value = self.getDao('opm_process_value').toBinary(value)
+        accounts = opm_process.db_accounts
+        accounts = map(self.getDao('opm_account_id').toBinary, accounts)
+        return (opm_process.db_id,
+                value,
+                accounts)
+
+class DBDisabledPackagesBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (packages,) = record
+        packages = map(self.getDao('startup_package').fromBinary, packages)
+        obj = DBDisabledPackages(packages)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, disabled_packages):
+        packages = disabled_packages.db_packages
+        packages = map(self.getDao('startup_package').toBinary, packages)
+        return (packages,)
+
+class DBModuleExecBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (id, ts_start, ts_end, cached, module_id, module_name, completed, error, machine_id, annotations, loop_execs) = record
+        ts_start = self.convertFromBinary(ts_start, 'datetime')
+        ts_end = self.convertFromBinary(ts_end, 'datetime')
+        annotations = map(self.getDao('annotation').fromBinary, annotations)
+        loop_execs = map(self.getDao('loop_exec').fromBinary, loop_execs)
+        obj = DBModuleExec(id,
+                           ts_start,
+                           ts_end,
+                           cached,
+                           module_id,
+                           module_name,
+                           completed,
+                           error,
+                           machine_id,
+                           annotations,
+                           loop_execs)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, module_exec):
+        ts_start = module_exec.db_ts_start
+        ts_start = self.convertToBinary(ts_start, 'datetime')
+        ts_end = module_exec.db_ts_end
+        ts_end = self.convertToBinary(ts_end, 'datetime')
+        annotations = module_exec.db_annotations
+        annotations = map(self.getDao('annotation').toBinary, annotations)
+        loop_execs = module_exec.db_loop_execs
+        loop_execs = map(self.getDao('loop_exec').toBinary, loop_execs)
+        return (module_exec.db_id,
+                ts_start,
+                ts_end,
+                module_exec.db_cached,
+                module_exec.db_module_id,
+                module_exec.db_module_name,
+                module_exec.db_completed,
+                module_exec.db_error,
+                module_exec.db_machine_id,
+                annotations,
+                loop_execs)
+
+class DBProvAssociationBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (prov_activity, prov_agent, prov_plan, prov_role) = record
+        if prov_activity is not None:
+            prov_activity = self.getDao('ref_prov_activity').fromBinary(prov_activity)
+        if prov_agent is not None:
+            prov_agent = self.getDao('ref_prov_agent').fromBinary(prov_agent)
+        if prov_plan is not None:
+            prov_plan = self.getDao('ref_prov_plan').fromBinary(prov_plan)
+        obj = DBProvAssociation(prov_activity,
+                                prov_agent,
+                                prov_plan,
+                                prov_role)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, prov_association):
+        prov_activity = prov_association.db_prov_activity
+        if prov_activity is not None:
+            prov_activity = self.getDao('ref_prov_activity').toBinary(prov_activity)
+        prov_agent = prov_association.db_prov_agent
+        if prov_agent is not None:
+            prov_agent = self.getDao('ref_prov_agent').toBinary(prov_agent)
+        prov_plan = prov_association.db_prov_plan
+        if prov_plan is not None:
+            prov_plan = self.getDao('ref_prov_plan').toBinary(prov_plan)
+        return (prov_activity,
+                prov_agent,
+                prov_plan,
+                prov_association.db_prov_role)
+
+class DBOpmProcessValueBinaryDAOBase(BinaryDAO):
+
+    def __init__(self, daoList):
+        self.daoList = daoList
+
+    def getDao(self, dao):
+        return self.daoList[dao]
+
+    def fromBinary(self, record):
+        (value,) = record
+        if value is not None:
+            value = self.getDao(value[0]).fromBinary(value[1])
+        obj = DBOpmProcessValue(value)
+        obj.is_dirty = False
+        return obj
+
+    def toBinary(self, opm_process_value):
+        value = opm_process_value.db_value
+        if value is not None:
+            value = (value.vtType,
+                     self.getDao(value.vtType).toBinary(value))
+        return (value,)
+
+"""generated automatically by auto_dao.py"""
+
+class BinaryDAOListBase(dict):
+
+    def __init__(self, daos=None):
+        if daos is not None:
+            dict.update(self, daos)
+
+        if 'opm_was_generated_by' not in self:
+            self['opm_was_generated_by'] = DBOpmWasGeneratedByBinaryDAOBase(self)
+        if 'config_key' not in self:
+            self['config_key'] = DBConfigKeyBinaryDAOBase(self)
+        if 'mashup_alias' not in self:
+            self['mashup_alias'] = DBMashupAliasBinaryDAOBase(self)
+        if 'group' not in self:
+            self['group'] = DBGroupBinaryDAOBase(self)
+        if 'opm_was_controlled_by' not in self:
+            self['opm_was_controlled_by'] = DBOpmWasControlledByBinaryDAOBase(self)
+        if 'add' not in self:
+            self['add'] = DBAddBinaryDAOBase(self)
+        if 'prov_generation' not in self:
+            self['prov_generation'] = DBProvGenerationBinaryDAOBase(self)
+        if 'opm_used' not in self:
+            self['opm_used'] = DBOpmUsedBinaryDAOBase(self)
+        if 'opm_artifact_id_cause' not in self:
+            self['opm_artifact_id_cause'] = DBOpmArtifactIdCauseBinaryDAOBase(self)
+        if 'ref_prov_entity' not in self:
+            self['ref_prov_entity'] = DBRefProvEntityBinaryDAOBase(self)
+        if 'vt_connection' not in self:
+            self['vt_connection'] = DBVtConnectionBinaryDAOBase(self)
+        if 'opm_account' not in self:
+            self['opm_account'] = DBOpmAccountBinaryDAOBase(self)
+        if 'group_exec' not in self:
+            self['group_exec'] = DBGroupExecBinaryDAOBase(self)
+        if 'opm_agent_id' not in self:
+            self['opm_agent_id'] = DBOpmAgentIdBinaryDAOBase(self)
+        if 'parameter' not in self:
+            self['parameter'] = DBParameterBinaryDAOBase(self)
+        if 'vistrail' not in self:
+            self['vistrail'] = DBVistrailBinaryDAOBase(self)
+        if 'opm_artifact_value' not in self:
+            self['opm_artifact_value'] = DBOpmArtifactValueBinaryDAOBase(self)
+        if 'config_str' not in self:
+            self['config_str'] = DBConfigStrBinaryDAOBase(self)
+        if 'startup' not in self:
+            self['startup'] = DBStartupBinaryDAOBase(self)
+        if 'module' not in self:
+            self['module'] = DBModuleBinaryDAOBase(self)
+        if 'port' not in self:
+            self['port'] = DBPortBinaryDAOBase(self)
+        if 'opm_agents' not in self:
+            self['opm_agents'] = DBOpmAgentsBinaryDAOBase(self)
+        if 'opm_dependencies' not in self:
+            self['opm_dependencies'] = DBOpmDependenciesBinaryDAOBase(self)
+        if 'pe_function' not in self:
+            self['pe_function'] = DBPEFunctionBinaryDAOBase(self)
+        if 'workflow' not in self:
+            self['workflow'] = DBWorkflowBinaryDAOBase(self)
+        if 'mashup_action' not in self:
+            self['mashup_action'] = DBMashupActionBinaryDAOBase(self)
+        if 'configuration' not in self:
+            self['configuration'] = DBConfigurationBinaryDAOBase(self)
+        if 'change' not in self:
+            self['change'] = DBChangeBinaryDAOBase(self)
+        if 'package' not in self:
+            self['package'] = DBPackageBinaryDAOBase(self)
+        if 'loop_exec' not in self:
+            self['loop_exec'] = DBLoopExecBinaryDAOBase(self)
+        if 'connection' not in self:
+            self['connection'] = DBConnectionBinaryDAOBase(self)
+        if 'config_bool' not in self:
+            self['config_bool'] = DBConfigBoolBinaryDAOBase(self)
+        if 'action' not in self:
+            self['action'] = DBActionBinaryDAOBase(self)
+        if 'startup_package' not in self:
+            self['startup_package'] = DBStartupPackageBinaryDAOBase(self)
+        if 'config_int' not in self:
+            self['config_int'] = DBConfigIntBinaryDAOBase(self)
+        if 'opm_process_id_effect' not in self:
+            self['opm_process_id_effect'] = DBOpmProcessIdEffectBinaryDAOBase(self)
+        if 'ref_prov_plan' not in self:
+            self['ref_prov_plan'] = DBRefProvPlanBinaryDAOBase(self)
+        if 'opm_accounts' not in self:
+            self['opm_accounts'] = DBOpmAccountsBinaryDAOBase(self)
+        if 'ref_prov_agent' not in self:
+            self['ref_prov_agent'] = DBRefProvAgentBinaryDAOBase(self)
+        if 'portSpec' not in self:
+            self['portSpec'] = DBPortSpecBinaryDAOBase(self)
+        if 'enabled_packages' not in self:
+            self['enabled_packages'] = DBEnabledPackagesBinaryDAOBase(self)
+        if 'opm_artifact' not in self:
+            self['opm_artifact'] = DBOpmArtifactBinaryDAOBase(self)
+        if 'log' not in self:
+            self['log'] = DBLogBinaryDAOBase(self)
+        if 'loop_iteration' not in self:
+            self['loop_iteration'] = DBLoopIterationBinaryDAOBase(self)
+        if 'opm_process_id_cause' not in self:
+            self['opm_process_id_cause'] = DBOpmProcessIdCauseBinaryDAOBase(self)
+        if 'opm_artifacts' not in self:
+            self['opm_artifacts'] = DBOpmArtifactsBinaryDAOBase(self)
+        if 'pe_parameter' not in self:
+            self['pe_parameter'] = DBPEParameterBinaryDAOBase(self)
+        if 'workflow_exec' not in self:
+            self['workflow_exec'] = DBWorkflowExecBinaryDAOBase(self)
+        if 'location' not in self:
+            self['location'] = DBLocationBinaryDAOBase(self)
+        if 'function' not in self:
+            self['function'] = DBFunctionBinaryDAOBase(self)
+        if 'actionAnnotation' not in self:
+            self['actionAnnotation'] = DBActionAnnotationBinaryDAOBase(self)
+        if 'prov_activity' not in self:
+            self['prov_activity'] = DBProvActivityBinaryDAOBase(self)
+        if 'prov_usage' not in self:
+            self['prov_usage'] = DBProvUsageBinaryDAOBase(self)
+        if 'opm_artifact_id_effect' not in self:
+            self['opm_artifact_id_effect'] = DBOpmArtifactIdEffectBinaryDAOBase(self)
+        if 'opm_graph' not in self:
+            self['opm_graph'] = DBOpmGraphBinaryDAOBase(self)
+        if 'is_part_of' not in self:
+            self['is_part_of'] = DBIsPartOfBinaryDAOBase(self)
+        if 'opm_was_derived_from' not in self:
+            self['opm_was_derived_from'] = DBOpmWasDerivedFromBinaryDAOBase(self)
+        if 'controlParameter' not in self:
+            self['controlParameter'] = DBControlParameterBinaryDAOBase(self)
+        if 'plugin_data' not in self:
+            self['plugin_data'] = DBPluginDataBinaryDAOBase(self)
+        if 'delete' not in self:
+            self['delete'] = DBDeleteBinaryDAOBase(self)
+        if 'vistrailVariable' not in self:
+            self['vistrailVariable'] = DBVistrailVariableBinaryDAOBase(self)
+        if 'opm_overlaps' not in self:
+            self['opm_overlaps'] = DBOpmOverlapsBinaryDAOBase(self)
+        if 'opm_was_triggered_by' not in self:
+            self['opm_was_triggered_by'] = DBOpmWasTriggeredByBinaryDAOBase(self)
+        if 'module_descriptor' not in self:
+            self['module_descriptor'] = DBModuleDescriptorBinaryDAOBase(self)
+        if 'tag' not in self:
+            self['tag'] = DBTagBinaryDAOBase(self)
+        if 'opm_role' not in self:
+            self['opm_role'] = DBOpmRoleBinaryDAOBase(self)
+        if 'prov_document' not in self:
+            self['prov_document'] = DBProvDocumentBinaryDAOBase(self)
+        if 'opm_processes' not in self:
+            self['opm_processes'] = DBOpmProcessesBinaryDAOBase(self)
+        if 'opm_account_id' not in self:
+            self['opm_account_id'] = DBOpmAccountIdBinaryDAOBase(self)
+        if 'portSpecItem' not in self:
+            self['portSpecItem'] = DBPortSpecItemBinaryDAOBase(self)
+        if 'mashup_component' not in self:
+            self['mashup_component'] = DBMashupComponentBinaryDAOBase(self)
+        if 'mashup' not in self:
+            self['mashup'] = DBMashupBinaryDAOBase(self)
+        if 'machine' not in self:
+            self['machine'] = DBMachineBinaryDAOBase(self)
+        if 'config_float' not in self:
+            self['config_float'] = DBConfigFloatBinaryDAOBase(self)
+        if 'other' not in self:
+            self['other'] = DBOtherBinaryDAOBase(self)
+        if 'ref_prov_activity' not in self:
+            self['ref_prov_activity'] = DBRefProvActivityBinaryDAOBase(self)
+        if 'abstraction' not in self:
+            self['abstraction'] = DBAbstractionBinaryDAOBase(self)
+        if 'prov_agent' not in self:
+            self['prov_agent'] = DBProvAgentBinaryDAOBase(self)
+        if 'mashuptrail' not in self:
+            self['mashuptrail'] = DBMashuptrailBinaryDAOBase(self)
+        if 'registry' not in self:
+            self['registry'] = DBRegistryBinaryDAOBase(self)
+        if 'opm_agent' not in self:
+            self['opm_agent'] = DBOpmAgentBinaryDAOBase(self)
+        if 'prov_entity' not in self:
+            self['prov_entity'] = DBProvEntityBinaryDAOBase(self)
+        if 'annotation' not in self:
+            self['annotation'] = DBAnnotationBinaryDAOBase(self)
+        if 'opm_time' not in self:
+            self['opm_time'] = DBOpmTimeBinaryDAOBase(self)
+        if 'parameter_exploration' not in self:
+            self['parameter_exploration'] = DBParameterExplorationBinaryDAOBase(self)
+        if 'mashup_actionAnnotation' not in self:
+            self['mashup_actionAnnotation'] = DBMashupActionAnnotationBinaryDAOBase(self)
+        if 'opm_process' not in self:
+            self['opm_process'] = DBOpmProcessBinaryDAOBase(self)
+        if 'disabled_packages' not in self:
+            self['disabled_packages'] = DBDisabledPackagesBinaryDAOBase(self)
+        if 'module_exec' not in self:
+            self['module_exec'] = DBModuleExecBinaryDAOBase(self)
+        if 'prov_association' not in self:
+            self['prov_association'] = DBProvAssociationBinaryDAOBase(self)
+        if 'opm_process_value' not in self:
+            self['opm_process_value'] = DBOpmProcessValueBinaryDAOBase(self)
@@ -46,6 +46,16 @@ from vistrails.db.versions.v1_0_4.domain import *
 
 class DBOpmWasGeneratedByXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        'time': ('opm_time', 'opm_times'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -135,6 +145,15 @@ class DBOpmWasGeneratedByXMLDAOBase(XMLDAO):
 
 class DBConfigKeyXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -216,6 +235,16 @@ class DBConfigKeyXMLDAOBase(XMLDAO):
 
 class DBMashupAliasXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -277,6 +306,23 @@ class DBMashupAliasXMLDAOBase(XMLDAO):
 
 class DBGroupXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'cache': ('cache', 'int'),
+        'name': ('name', 'str'),
+        'namespace': ('namespace', 'str'),
+        'package': ('package', 'str'),
+        'version': ('version', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'function': ('function', 'functions'),
+        'annotation': ('annotation', 'annotations'),
+        'controlParameter': ('controlParameter', 'controlParameters'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -394,6 +440,17 @@ class DBGroupXMLDAOBase(XMLDAO):
 
 class DBOpmWasControlledByXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        'time': ('opm_time', 'starts'),
+        'time': ('opm_time', 'ends'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -493,6 +550,19 @@ class DBOpmWasControlledByXMLDAOBase(XMLDAO):
 
 class DBAddXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'what': ('what', 'str'),
+        'objectId': ('objectId', 'long'),
+        'parentObjId': ('parentObjId', 'long'),
+        'parentObjType': ('parentObjType', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -638,6 +708,14 @@ class DBAddXMLDAOBase(XMLDAO):
 
 class DBProvGenerationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -706,6 +784,16 @@ class DBProvGenerationXMLDAOBase(XMLDAO):
 
 class DBOpmUsedXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        'time': ('opm_time', 'opm_times'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -795,6 +883,15 @@ class DBOpmUsedXMLDAOBase(XMLDAO):
 
 class DBOpmArtifactIdCauseXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -828,6 +925,15 @@ class DBOpmArtifactIdCauseXMLDAOBase(XMLDAO):
 
 class DBRefProvEntityXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:ref': ('prov_ref', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -861,6 +967,15 @@ class DBRefProvEntityXMLDAOBase(XMLDAO):
 
 class DBVtConnectionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -962,6 +1077,15 @@ class DBVtConnectionXMLDAOBase(XMLDAO):
 
 class DBOpmAccountXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1018,6 +1142,28 @@ class DBOpmAccountXMLDAOBase(XMLDAO):
 
 class DBGroupExecXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'tsStart': ('ts_start', 'datetime'),
+        'tsEnd': ('ts_end', 'datetime'),
+        'cached': ('cached', 'int'),
+        'moduleId': ('module_id', 'long'),
+        'groupName': ('group_name', 'str'),
+        'groupType': ('group_type', 'str'),
+        'completed': ('completed', 'int'),
+        'error': ('error', 'str'),
+        'machine_id': ('machine_id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'annotation': ('annotation', 'annotations'),
+        'moduleExec': ('module_exec', 'item_execs'),
+        'groupExec': ('group_exec', 'item_execs'),
+        'loopExec': ('loop_exec', 'item_execs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1133,6 +1279,15 @@ class DBGroupExecXMLDAOBase(XMLDAO):
 
 class DBOpmAgentIdXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1166,6 +1321,20 @@ class DBOpmAgentIdXMLDAOBase(XMLDAO):
 
 class DBParameterXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'pos': ('pos', 'long'),
+        'name': ('name', 'str'),
+        'type': ('type', 'str'),
+        'val': ('val', 'str'),
+        'alias': ('alias', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1219,6 +1388,24 @@ class DBParameterXMLDAOBase(XMLDAO):
 
 class DBVistrailXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'version': ('version', 'str'),
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'action': ('action', 'actions'),
+        'tag': ('tag', 'tags'),
+        'annotation': ('annotation', 'annotations'),
+        'controlParameter': ('controlParameter', 'controlParameters'),
+        'vistrailVariable': ('vistrailVariable', 'vistrailVariables'),
+        'parameterExploration': ('parameter_exploration', 'parameter_explorations'),
+        'actionAnnotation': ('actionAnnotation', 'actionAnnotations'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1344,6 +1531,14 @@ class DBVistrailXMLDAOBase(XMLDAO):
 
 class DBOpmArtifactValueXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1399,6 +1594,15 @@ class DBOpmArtifactValueXMLDAOBase(XMLDAO):
 
 class DBConfigStrXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'value': ('value', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1432,6 +1636,15 @@ class DBConfigStrXMLDAOBase(XMLDAO):
 
 class DBStartupXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'version': ('version', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1509,6 +1722,24 @@ class DBStartupXMLDAOBase(XMLDAO):
 
 class DBModuleXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'cache': ('cache', 'int'),
+        'name': ('name', 'str'),
+        'namespace': ('namespace', 'str'),
+        'package': ('package', 'str'),
+        'version': ('version', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'function': ('function', 'functions'),
+        'annotation': ('annotation', 'annotations'),
+        'controlParameter': ('controlParameter', 'controlParameters'),
+        'portSpec': ('portSpec', 'portSpecs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1626,6 +1857,20 @@ class DBModuleXMLDAOBase(XMLDAO):
 
 class DBPortXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'type': ('type', 'str'),
+        'moduleId': ('moduleId', 'long'),
+        'moduleName': ('moduleName', 'str'),
+        'name': ('name', 'str'),
+        'signature': ('signature', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1679,6 +1924,15 @@ class DBPortXMLDAOBase(XMLDAO):
 
 class DBOpmAgentsXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'agent': ('opm_agent', 'agents'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1728,6 +1982,19 @@ class DBOpmAgentsXMLDAOBase(XMLDAO):
 
 class DBOpmDependenciesXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'used': ('opm_used', 'dependencys'),
+        'wasGeneratedBy': ('opm_was_generated_by', 'dependencys'),
+        'wasTriggeredBy': ('opm_was_triggered_by', 'dependencys'),
+        'wasDerivedFrom': ('opm_was_derived_from', 'dependencys'),
+        'wasControlledBy': ('opm_was_controlled_by', 'dependencys'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1801,6 +2068,19 @@ class DBOpmDependenciesXMLDAOBase(XMLDAO):
 
 class DBPEFunctionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'moduleId': ('module_id', 'long'),
+        'port_name': ('port_name', 'str'),
+        'is_alias': ('is_alias', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'peParameter': ('pe_parameter', 'parameters'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1870,6 +2150,25 @@ class DBPEFunctionXMLDAOBase(XMLDAO):
 
 class DBWorkflowXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'version': ('version', 'str'),
+        'vistrail_id': ('vistrail_id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'connection': ('connection', 'connections'),
+        'annotation': ('annotation', 'annotations'),
+        'plugin_data': ('plugin_data', 'plugin_datas'),
+        'other': ('other', 'others'),
+        'module': ('module', 'modules'),
+        'abstraction': ('abstraction', 'modules'),
+        'group': ('group', 'modules'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -1991,6 +2290,18 @@ class DBWorkflowXMLDAOBase(XMLDAO):
 
 class DBMashupActionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'prevId': ('prevId', 'long'),
+        'date': ('date', 'datetime'),
+        'user': ('user', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2060,6 +2371,15 @@ class DBMashupActionXMLDAOBase(XMLDAO):
 
 class DBConfigurationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'key': ('config_key', 'config_keys'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2109,6 +2429,20 @@ class DBConfigurationXMLDAOBase(XMLDAO):
 
 class DBChangeXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'what': ('what', 'str'),
+        'oldObjId': ('oldObjId', 'long'),
+        'newObjId': ('newObjId', 'long'),
+        'parentObjId': ('parentObjId', 'long'),
+        'parentObjType': ('parentObjType', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2258,6 +2592,22 @@ class DBChangeXMLDAOBase(XMLDAO):
 
 class DBPackageXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'identifier': ('identifier', 'str'),
+        'codepath': ('codepath', 'str'),
+        'loadConfiguration': ('load_configuration', 'int'),
+        'version': ('version', 'str'),
+        'description': ('description', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'moduleDescriptor': ('module_descriptor', 'module_descriptors'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2339,6 +2689,18 @@ class DBPackageXMLDAOBase(XMLDAO):
 
 class DBLoopExecXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'tsStart': ('ts_start', 'datetime'),
+        'tsEnd': ('ts_end', 'datetime'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'loopIteration': ('loop_iteration', 'loop_iterations'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2404,6 +2766,16 @@ class DBLoopExecXMLDAOBase(XMLDAO):
 
 class DBConnectionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'port': ('port', 'ports'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2461,6 +2833,15 @@ class DBConnectionXMLDAOBase(XMLDAO):
 
 class DBConfigBoolXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'value': ('value', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2494,6 +2875,23 @@ class DBConfigBoolXMLDAOBase(XMLDAO):
 
 class DBActionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'prevId': ('prevId', 'long'),
+        'date': ('date', 'datetime'),
+        'session': ('session', 'long'),
+        'user': ('user', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'annotation': ('annotation', 'annotations'),
+        'add': ('add', 'operations'),
+        'delete': ('delete', 'operations'),
+        'change': ('change', 'operations'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2589,6 +2987,15 @@ class DBActionXMLDAOBase(XMLDAO):
 
 class DBStartupPackageXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2646,6 +3053,15 @@ class DBStartupPackageXMLDAOBase(XMLDAO):
 
 class DBConfigIntXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'value': ('value', 'int'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2679,6 +3095,15 @@ class DBConfigIntXMLDAOBase(XMLDAO):
 
 class DBOpmProcessIdEffectXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2712,6 +3137,15 @@ class DBOpmProcessIdEffectXMLDAOBase(XMLDAO):
 
 class DBRefProvPlanXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:ref': ('prov_ref', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2745,6 +3179,16 @@ class DBRefProvPlanXMLDAOBase(XMLDAO):
 
 class DBOpmAccountsXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account', 'accounts'),
+        'overlaps': ('opm_overlaps', 'opm_overlapss'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2804,6 +3248,15 @@ class DBOpmAccountsXMLDAOBase(XMLDAO):
 
 class DBRefProvAgentXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:ref': ('prov_ref', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2837,6 +3290,23 @@ class DBRefProvAgentXMLDAOBase(XMLDAO):
 
 class DBPortSpecXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'type': ('type', 'str'),
+        'optional': ('optional', 'int'),
+        'depth': ('depth', 'int'),
+        'sortKey': ('sort_key', 'int'),
+        'minConns': ('min_conns', 'int'),
+        'maxConns': ('max_conns', 'int'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'portSpecItem': ('portSpecItem', 'portSpecItems'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2922,6 +3392,15 @@ class DBPortSpecXMLDAOBase(XMLDAO):
 
 class DBEnabledPackagesXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'package': ('startup_package', 'packages'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -2971,6 +3450,16 @@ class DBEnabledPackagesXMLDAOBase(XMLDAO):
 
 class DBOpmArtifactXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3038,6 +3527,19 @@ class DBOpmArtifactXMLDAOBase(XMLDAO):
 
 class DBLogXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'version': ('version', 'str'),
+        'name': ('name', 'str'),
+        'vistrail_id': ('vistrail_id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'workflowExec': ('workflow_exec', 'workflow_execs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3107,6 +3609,23 @@ class DBLogXMLDAOBase(XMLDAO):
 
 class DBLoopIterationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'tsStart': ('ts_start', 'datetime'),
+        'tsEnd': ('ts_end', 'datetime'),
+        'iteration': ('iteration', 'int'),
+        'completed': ('completed', 'int'),
+        'error': ('error', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'moduleExec': ('module_exec', 'item_execs'),
+        'groupExec': ('group_exec', 'item_execs'),
+        'loopExec': ('loop_exec', 'item_execs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3196,6 +3715,15 @@ class DBLoopIterationXMLDAOBase(XMLDAO):
 
 class DBOpmProcessIdCauseXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3229,6 +3757,15 @@ class DBOpmProcessIdCauseXMLDAOBase(XMLDAO):
 
 class DBOpmArtifactsXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'artifact': ('opm_artifact', 'artifacts'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3278,6 +3815,19 @@ class DBOpmArtifactsXMLDAOBase(XMLDAO):
 
 class DBPEParameterXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'pos': ('pos', 'long'),
+        'interpolator': ('interpolator', 'str'),
+        'value': ('value', 'str'),
+        'dimension': ('dimension', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3327,6 +3877,31 @@ class DBPEParameterXMLDAOBase(XMLDAO):
 
 class DBWorkflowExecXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'user': ('user', 'str'),
+        'ip': ('ip', 'str'),
+        'session': ('session', 'long'),
+        'vtVersion': ('vt_version', 'str'),
+        'tsStart': ('ts_start', 'datetime'),
+        'tsEnd': ('ts_end', 'datetime'),
+        'parentId': ('parent_id', 'long'),
+        'parentType': ('parent_type', 'str'),
+        'parentVersion': ('parent_version', 'long'),
+        'completed': ('completed', 'int'),
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'annotation': ('annotation', 'annotations'),
+        'machine': ('machine', 'machines'),
+        'moduleExec': ('module_exec', 'item_execs'),
+        'groupExec': ('group_exec', 'item_execs'),
+        'loopExec': ('loop_exec', 'item_execs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3460,6 +4035,17 @@ class DBWorkflowExecXMLDAOBase(XMLDAO):
 
 class DBLocationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'x': ('x', 'float'),
+        'y': ('y', 'float'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3501,6 +4087,18 @@ class DBLocationXMLDAOBase(XMLDAO):
 
 class DBFunctionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'pos': ('pos', 'long'),
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'parameter': ('parameter', 'parameters'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3566,6 +4164,20 @@ class DBFunctionXMLDAOBase(XMLDAO):
 
 class DBActionAnnotationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'key': ('key', 'str'),
+        'value': ('value', 'str'),
+        'actionId': ('action_id', 'long'),
+        'date': ('date', 'datetime'),
+        'user': ('user', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3619,6 +4231,15 @@ class DBActionAnnotationXMLDAOBase(XMLDAO):
 
 class DBProvActivityXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3748,6 +4369,14 @@ class DBProvActivityXMLDAOBase(XMLDAO):
 
 class DBProvUsageXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3816,6 +4445,15 @@ class DBProvUsageXMLDAOBase(XMLDAO):
 
 class DBOpmArtifactIdEffectXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3849,6 +4487,14 @@ class DBOpmArtifactIdEffectXMLDAOBase(XMLDAO):
 
 class DBOpmGraphXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3938,6 +4584,15 @@ class DBOpmGraphXMLDAOBase(XMLDAO):
 
 class DBIsPartOfXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:ref': ('prov_ref', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -3971,6 +4626,16 @@ class DBIsPartOfXMLDAOBase(XMLDAO):
 
 class DBOpmWasDerivedFromXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        'time': ('opm_time', 'opm_times'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4060,6 +4725,17 @@ class DBOpmWasDerivedFromXMLDAOBase(XMLDAO):
 
 class DBControlParameterXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'value': ('value', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4101,6 +4777,16 @@ class DBControlParameterXMLDAOBase(XMLDAO):
 
 class DBPluginDataXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'data': ('data', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4138,6 +4824,19 @@ class DBPluginDataXMLDAOBase(XMLDAO):
 
 class DBDeleteXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'what': ('what', 'str'),
+        'objectId': ('objectId', 'long'),
+        'parentObjId': ('parentObjId', 'long'),
+        'parentObjType': ('parentObjType', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4187,6 +4886,20 @@ class DBDeleteXMLDAOBase(XMLDAO):
 
 class DBVistrailVariableXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'name': ('name', 'str'),
+        'uuid': ('uuid', 'str'),
+        'package': ('package', 'str'),
+        'module': ('module', 'str'),
+        'namespace': ('namespace', 'str'),
+        'value': ('value', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4240,6 +4953,15 @@ class DBVistrailVariableXMLDAOBase(XMLDAO):
 
 class DBOpmOverlapsXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'opm_account_ids'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4289,6 +5011,16 @@ class DBOpmOverlapsXMLDAOBase(XMLDAO):
 
 class DBOpmWasTriggeredByXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        'time': ('opm_time', 'opm_times'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4378,6 +5110,22 @@ class DBOpmWasTriggeredByXMLDAOBase(XMLDAO):
 
 class DBModuleDescriptorXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'package': ('package', 'str'),
+        'namespace': ('namespace', 'str'),
+        'packageVersion': ('package_version', 'str'),
+        'version': ('version', 'str'),
+        'baseDescriptorId': ('base_descriptor_id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'portSpec': ('portSpec', 'portSpecs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4459,6 +5207,16 @@ class DBModuleDescriptorXMLDAOBase(XMLDAO):
 
 class DBTagXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4496,6 +5254,15 @@ class DBTagXMLDAOBase(XMLDAO):
 
 class DBOpmRoleXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'value': ('value', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4529,6 +5296,21 @@ class DBOpmRoleXMLDAOBase(XMLDAO):
 
 class DBProvDocumentXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'prov:entity': ('prov_entity', 'prov_entitys'),
+        'prov:activity': ('prov_activity', 'prov_activitys'),
+        'prov:agent': ('prov_agent', 'prov_agents'),
+        'vt:connection': ('vt_connection', 'vt_connections'),
+        'prov:used': ('prov_usage', 'prov_usages'),
+        'prov:wasGeneratedBy': ('prov_generation', 'prov_generations'),
+        'prov:wasAssociatedWith': ('prov_association', 'prov_associations'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4638,6 +5420,15 @@ class DBProvDocumentXMLDAOBase(XMLDAO):
 
 class DBOpmProcessesXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'process': ('opm_process', 'processs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4687,6 +5478,15 @@ class DBOpmProcessesXMLDAOBase(XMLDAO):
 
 class DBOpmAccountIdXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4720,6 +5520,23 @@ class DBOpmAccountIdXMLDAOBase(XMLDAO):
 
 class DBPortSpecItemXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'pos': ('pos', 'long'),
+        'module': ('module', 'str'),
+        'package': ('package', 'str'),
+        'namespace': ('namespace', 'str'),
+        'label': ('label', 'str'),
+        'default': ('default', 'str'),
+        'values': ('values', 'str'),
+        'entryType': ('entry_type', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4785,6 +5602,31 @@ class DBPortSpecItemXMLDAOBase(XMLDAO):
 
 class DBMashupComponentXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'vtid': ('vtid', 'long'),
+        'vttype': ('vttype', 'str'),
+        'vtparent_type': ('vtparent_type', 'str'),
+        'vtparent_id': ('vtparent_id', 'long'),
+        'vtpos': ('vtpos', 'long'),
+        'vtmid': ('vtmid', 'long'),
+        'pos': ('pos', 'long'),
+        'type': ('type', 'str'),
+        'val': ('val', 'str'),
+        'minVal': ('minVal', 'str'),
+        'maxVal': ('maxVal', 'str'),
+        'stepSize': ('stepSize', 'str'),
+        'valueList': ('strvaluelist', 'str'),
+        'widget': ('widget', 'str'),
+        'seq': ('seq', 'int'),
+        'parent': ('parent', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4882,6 +5724,21 @@ class DBMashupComponentXMLDAOBase(XMLDAO):
 
 class DBMashupXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'version': ('version', 'long'),
+        'type': ('type', 'str'),
+        'vtid': ('vtid', 'long'),
+        'has_seq': ('has_seq', 'int'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'alias': ('mashup_alias', 'aliases'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -4977,6 +5834,20 @@ class DBMashupXMLDAOBase(XMLDAO):
 
 class DBMachineXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'name': ('name', 'str'),
+        'os': ('os', 'str'),
+        'architecture': ('architecture', 'str'),
+        'processor': ('processor', 'str'),
+        'ram': ('ram', 'int'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5030,6 +5901,15 @@ class DBMachineXMLDAOBase(XMLDAO):
 
 class DBConfigFloatXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'value': ('value', 'float'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5063,6 +5943,16 @@ class DBConfigFloatXMLDAOBase(XMLDAO):
 
 class DBOtherXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'key': ('key', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5123,6 +6013,15 @@ class DBOtherXMLDAOBase(XMLDAO):
 
 class DBRefProvActivityXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:ref': ('prov_ref', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5156,6 +6055,24 @@ class DBRefProvActivityXMLDAOBase(XMLDAO):
 
 class DBAbstractionXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'cache': ('cache', 'int'),
+        'name': ('name', 'str'),
+        'namespace': ('namespace', 'str'),
+        'package': ('package', 'str'),
+        'version': ('version', 'str'),
+        'internalVersion': ('internal_version', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'function': ('function', 'functions'),
+        'annotation': ('annotation', 'annotations'),
+        'controlParameter': ('controlParameter', 'controlParameters'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5267,6 +6184,15 @@ class DBAbstractionXMLDAOBase(XMLDAO):
 
 class DBProvAgentXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5377,6 +6303,20 @@ class DBProvAgentXMLDAOBase(XMLDAO):
 
 class DBMashuptrailXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('name', 'str'),
+        'version': ('version', 'str'),
+        'vtVersion': ('vtVersion', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'action': ('mashup_action', 'actions'),
+        'annotation': ('annotation', 'annotations'),
+        'actionAnnotation': ('mashup_actionAnnotation', 'actionAnnotations'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5462,6 +6402,18 @@ class DBMashuptrailXMLDAOBase(XMLDAO):
 
 class DBRegistryXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'version': ('version', 'str'),
+        'rootDescriptorId': ('root_descriptor_id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'package': ('package', 'packages'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5527,6 +6479,16 @@ class DBRegistryXMLDAOBase(XMLDAO):
 
 class DBOpmAgentXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5593,6 +6555,15 @@ class DBOpmAgentXMLDAOBase(XMLDAO):
 
 class DBProvEntityXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'prov:id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5749,6 +6720,17 @@ class DBProvEntityXMLDAOBase(XMLDAO):
 
 class DBAnnotationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'key': ('key', 'str'),
+        'value': ('value', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5790,6 +6772,17 @@ class DBAnnotationXMLDAOBase(XMLDAO):
 
 class DBOpmTimeXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'noLaterThan': ('no_later_than', 'datetime'),
+        'noEarlierThan': ('no_earlier_than', 'datetime'),
+        'clockId': ('clock_id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5831,6 +6824,22 @@ class DBOpmTimeXMLDAOBase(XMLDAO):
 
 class DBParameterExplorationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'actionId': ('action_id', 'long'),
+        'name': ('name', 'str'),
+        'date': ('date', 'datetime'),
+        'user': ('user', 'str'),
+        'dims': ('dims', 'str'),
+        'layout': ('layout', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'peFunction': ('pe_function', 'functions'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5912,6 +6921,20 @@ class DBParameterExplorationXMLDAOBase(XMLDAO):
 
 class DBMashupActionAnnotationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'key': ('key', 'str'),
+        'value': ('value', 'str'),
+        'action_id': ('action_id', 'long'),
+        'date': ('date', 'datetime'),
+        'user': ('user', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -5965,6 +6988,16 @@ class DBMashupActionAnnotationXMLDAOBase(XMLDAO):
 
 class DBOpmProcessXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'str'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'account': ('opm_account_id', 'accounts'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -6032,6 +7065,15 @@ class DBOpmProcessXMLDAOBase(XMLDAO):
 
 class DBDisabledPackagesXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'package': ('startup_package', 'packages'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -6081,6 +7123,25 @@ class DBDisabledPackagesXMLDAOBase(XMLDAO):
 
 class DBModuleExecXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        'id': ('id', 'long'),
+        'tsStart': ('ts_start', 'datetime'),
+        'tsEnd': ('ts_end', 'datetime'),
+        'cached': ('cached', 'int'),
+        'moduleId': ('module_id', 'long'),
+        'moduleName': ('module_name', 'str'),
+        'completed': ('completed', 'int'),
+        'error': ('error', 'str'),
+        'machine_id': ('machine_id', 'long'),
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        'annotation': ('annotation', 'annotations'),
+        'loopExec': ('loop_exec', 'loop_execs'),
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -6180,6 +7241,14 @@ class DBModuleExecXMLDAOBase(XMLDAO):
 
 class DBProvAssociationXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
@@ -6258,6 +7327,14 @@ class DBProvAssociationXMLDAOBase(XMLDAO):
 
 class DBOpmProcessValueXMLDAOBase(XMLDAO):
 
+    # attribute -> (constructor argument, type) read by fromXML
+    xml_attributes = {
+        }
+    # child tag -> (dao, constructor argument) of the referenced children
+    # fromXML collects into lists
+    xml_children = {
+        }
+
     def __init__(self, daoList):
         self.daoList = daoList
 
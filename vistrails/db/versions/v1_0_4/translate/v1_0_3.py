@@ -60,11 +60,14 @@ import tempfile
 from ast import literal_eval
 import unittest
 
+copy_translations = ['translateVistrail', 'translateWorkflow',
+                     'translateRegistry']
+
 id_scope = None
 
 def translateVistrail(_vistrail):
-    """ Translate old annotation based vistrail variables to new
-        DBVistrailVariable class """
+    """ Copies the vistrail into the 1.0.4 schema; the workflows of groups
+        are copied as well """
     global id_scope
 
     def update_workflow(old_obj, trans_dict):
@@ -36,7 +36,6 @@
 """ This is the application for vistrails when running as a server. """
 from __future__ import division
 
-import Queue
 import base64
 import hashlib
 import inspect
@@ -60,11 +59,14 @@ from SimpleXMLRPCServer import SimpleXMLRPCServer
 from datetime import date, datetime
 
 from vistrails.core.application import VistrailsApplicationInterface
+from vistrails.core.configuration import get_vistrails_configuration
 import vistrails.gui.theme
 import vistrails.core.application
 from vistrails.gui import qt
 from vistrails.core.db.locator import DBLocator, ZIPFileLocator, FileLocator
 from vistrails.core.db import io
+from vistrails.core.db.vistrail_cache import get_vistrail_cache
+from vistrails.core.dispatcher import InstanceDispatcher
 import vistrails.core.db.action
 
 from vistrails.core.vistrail.vistrail import Vistrail
@@ -124,25 +126,31 @@ class RequestHandler(object):
     def __init__(self, logger, instances):
         self.server_logger = logger
         self.instances = instances
-        self.proxies_queue = None
+        self.dispatcher = None
         self.instantiate_proxies()
 
     #proxies
     def instantiate_proxies(self):
         """instantiate_proxies() -> None
         If this server started other instances of VisTrails, this will create
-        the client proxies to connect to them.
+        the dispatcher that forwards requests to them.
         """
         if len(self.instances) > 0:
-            self.proxies_queue = Queue.Queue()
+            timeout = getattr(get_vistrails_configuration(),
+                              'rpcDispatchTimeout', 0)
+            self.dispatcher = InstanceDispatcher(self.instances,
+                                                 timeout=timeout or None)
             for uri in self.instances:
-                try:
-                    proxy = xmlrpclib.ServerProxy(uri)
-                    self.proxies_queue.put(proxy)
-                    self.server_logger.info("Instantiated client for %s" % uri)
-                except Exception, e:
-                    self.server_logger.error("Error when instantiating proxy %s" % uri)
-                    self.server_logger.error(str(e))
+                self.server_logger.info("Instantiated client for %s" % uri)
+
+    def get_dispatch_stats(self):
+        """get_dispatch_stats() -> (list of dict, return_status)
+           Returns the queue depth, request counts and latency of each
+           instance this server forwards requests to.
+        """
+        if self.dispatcher is None:
+            return ([], 1)
+        return (self.dispatcher.stats(), 1)
     #utils
     def memory_usage(self):
         """memory_usage() -> dict
@@ -182,6 +190,13 @@ class RequestHandler(object):
     def try_ping(self):
         return 1
 
+    def get_cache_stats(self):
+        """get_cache_stats() -> (dict, return_status)
+           Returns the hit, miss and eviction counters of the cache of
+           vistrails and pipelines loaded from the database.
+        """
+        return (get_vistrail_cache().stats(), 1)
+
     #crowdlabs
     def get_wf_modules(self, host, port, db_name, vt_id, version):
         """get_wf_modules(host:str, port:int, db_name:str, vt_id:int,
@@ -202,8 +217,7 @@ class RequestHandler(object):
                                 obj_type=None,
                                 connection_id=None)
 
-            v = locator.load().vistrail
-            p = v.getPipeline(long(version))
+            p = get_vistrail_cache().get_pipeline(locator, version)
 
             if p:
                 result = []
@@ -331,25 +345,16 @@ class RequestHandler(object):
         self.server_logger.info("Request: get_server_packages()")
 
         messages = []
-        if self.proxies_queue is not None:
-            # collect all proxies:
-            proxies = []
-            while len(proxies) < len(self.instances):
-                self.server_logger.info("Proxies: %s Instances: %s" % (len(proxies), len(self.instances)))
-                if self.proxies_queue.empty():
-                    for p in  proxies:
-                        self.proxies_queue.put(p)
-                    return [[[],
-                        "Not all vistrail instances are free, please try again."], 1]
-                proxies.append(self.proxies_queue.get())
-            for proxy in proxies:
+        if self.dispatcher is not None:
+            # every instance has to apply the change
+            if codepath and status is not None:
+                args = (codepath, status)
+            else:
+                args = ()
+            responses = self.dispatcher.broadcast('get_server_packages', args)
+            for response, err in responses:
                 result, s = 'Please contact the server admin', 0
-                try:
-                    if codepath and status is not None:
-                        result, s = proxy.get_server_packages(codepath, status)
-                    else:
-                        result, s = proxy.get_server_packages()
-                except xmlrpclib.ProtocolError, err:
+                if isinstance(err, xmlrpclib.ProtocolError):
                     err_msg = ("A protocol error occurred\n"
                            "URL: %s\n"
                            "HTTP/HTTPS headers: %s\n"
@@ -357,8 +362,10 @@ class RequestHandler(object):
                            "Error message: %s\n") % (err.url, err.headers,
                                                  err.errcode, err.errmsg)
                     self.server_logger.error(err_msg)
-                finally:
-                    self.proxies_queue.put(proxy)
+                elif err is not None:
+                    self.server_logger.error(str(err))
+                else:
+                    result, s = response
                 if s == 0:
                     messages.append('An error occurred: %s' % result)
                 else:
@@ -542,16 +549,12 @@ class RequestHandler(object):
         config['db'] = db_name
         config['user'] = db_write_user
         config['passwd'] = db_write_pass
-        conn = None
         try:
-            conn = vistrails.db.services.io.open_db_connection(config)
-            vistrails.db.services.io.delete_entity_from_db(conn,'vistrail', vt_id)
-            vistrails.db.services.io.close_db_connection(conn)
+            with vistrails.db.services.io.pooled_db_connection(config) as conn:
+                vistrails.db.services.io.delete_entity_from_db(conn,'vistrail', vt_id)
             return (1, 1)
         except Exception, e:
             self.server_logger.error(str(e))
-            if conn is not None:
-                vistrails.db.services.io.close_db_connection(conn)
             return (str(e), 0)
 
     def get_runnable_workflows(self, host, port, db_name, vt_id):
@@ -564,7 +567,7 @@ class RequestHandler(object):
                                 obj_id=int(vt_id),
                                 obj_type=None,
                                 connection_id=None)
-            (vistrail, _, _, _)  = io.load_vistrail(locator)
+            vistrail = get_vistrail_cache().get_vistrail(locator)
 
             # get server packages
             local_packages = [x.identifier for x in \
@@ -576,7 +579,8 @@ class RequestHandler(object):
 
             # find runnable workflows
             for version_id, version_tag in vistrail.get_tagMap().iteritems():
-                pipeline = vistrail.getPipeline(version_id)
+                pipeline = get_vistrail_cache().get_pipeline(locator,
+                                                             version_id)
                 workflow_packages = set()
                 on_repo = True
                 has_python_source = False
@@ -724,16 +728,15 @@ class RequestHandler(object):
             path_to_images = \
                os.path.join(media_dir, 'medleys/images', subdir)
             if (not self.path_exists_and_not_empty(path_to_images) and
-                self.proxies_queue is not None):
+                self.dispatcher is not None):
                 #this server can send requests to other instances
-                proxy = self.proxies_queue.get()
                 try:
-                    self.server_logger.info("Sending request to %s" % proxy)
+                    self.server_logger.info("Forwarding executeMedley")
                     if extra_info is not None:
-                        result = proxy.executeMedley(xml_medley, extra_info)
+                        args = (xml_medley, extra_info)
                     else:
-                        result = proxy.executeMedley(xml_medley)
-                    self.proxies_queue.put(proxy)
+                        args = (xml_medley,)
+                    result = self.dispatcher.call('executeMedley', args)
                     self.server_logger.info("returning %s"% result)
                     return result
                 except Exception, e:
@@ -913,7 +916,8 @@ class RequestHandler(object):
 
         self.server_logger.info("path_exists_and_not_empty? %s" % self.path_exists_and_not_empty(path_to_figures))
         self.server_logger.info("build_always? %s" % build_always)
-        self.server_logger.info(str(self.proxies_queue))
+        if self.dispatcher is not None:
+            self.server_logger.info(str(self.dispatcher.stats()))
 
         if not is_local:
             # use same hashing as on crowdlabs webserver
@@ -922,16 +926,15 @@ class RequestHandler(object):
             path_to_figures = os.path.join(media_dir, "photos", "wf_execution", dest_version)
 
         if ((not self.path_exists_and_not_empty(path_to_figures) or 
-             build_always) and self.proxies_queue is not None):
+             build_always) and self.dispatcher is not None):
             self.server_logger.info("will forward request")
             #this server can send requests to other instances
-            proxy = self.proxies_queue.get()
             try:
-                self.server_logger.info("Sending request to %s" % proxy)
-                result = proxy.run_from_db(host, port, db_name, vt_id,
-                                           path_to_figures, version, pdf, vt_tag,
-                                           build_always, parameters, is_local)
-                self.proxies_queue.put(proxy)
+                result = self.dispatcher.call(
+                        'run_from_db',
+                        (host, port, db_name, vt_id, path_to_figures, version,
+                         pdf, vt_tag, build_always, parameters, is_local),
+                        key=(host, db_name, vt_id, version))
                 self.server_logger.info("returning %s" % result)
                 return result
             except xmlrpclib.ProtocolError, err:
@@ -1054,8 +1057,7 @@ class RequestHandler(object):
                                 obj_type=None,
                                 connection_id=None)
 
-            v = locator.load().vistrail
-            p = v.getPipeline(long(version))
+            p = get_vistrail_cache().get_pipeline(locator, version)
 
             if p:
                 result = []
@@ -1097,7 +1099,7 @@ class RequestHandler(object):
                                 obj_type=None,
                                 connection_id=None)
 
-            (v, _ , _, _)  = io.load_vistrail(locator)
+            v = get_vistrail_cache().get_vistrail(locator)
             if v.has_tag_str(vt_tag):
                 version = v.get_tag_str(vt_tag).action_id
             self.server_logger.info("Answer: %s" % version)
@@ -1131,8 +1133,7 @@ class RequestHandler(object):
                                 obj_type=None,
                                 connection_id=None)
 
-            (v, _ , _, _)  = io.load_vistrail(locator)
-            result = io.serialize(v)
+            result = get_vistrail_cache().get_vistrail_xml(locator)
             return (result, 1)
         except xmlrpclib.ProtocolError, err:
             err_msg = ("A protocol error occurred\n"
@@ -1161,8 +1162,7 @@ class RequestHandler(object):
                                 obj_type=None,
                                 connection_id=None)
 
-            (v, _ , _, _)  = io.load_vistrail(locator)
-            p = v.getPipeline(long(version))
+            p = get_vistrail_cache().get_pipeline(locator, version)
             if p:
                 result = io.serialize(p)
                 self.server_logger.info("success")
@@ -1201,12 +1201,13 @@ class RequestHandler(object):
             filename = os.path.join(filepath,base_fname)
             if ((not os.path.exists(filepath) or
                 os.path.exists(filepath) and not os.path.exists(filename))
-                and self.proxies_queue is not None):
+                and self.dispatcher is not None):
                 #this server can send requests to other instances
-                proxy = self.proxies_queue.get()
                 try:
-                    result = proxy.get_wf_graph_pdf(host,port,db_name, vt_id, version, is_local)
-                    self.proxies_queue.put(proxy)
+                    result = self.dispatcher.call(
+                            'get_wf_graph_pdf',
+                            (host, port, db_name, vt_id, version, is_local),
+                            key=(host, db_name, vt_id, version))
                     self.server_logger.info("get_wf_graph_pdf returning %s"% result)
                     return result
                 except xmlrpclib.ProtocolError, err:
@@ -1285,13 +1286,13 @@ class RequestHandler(object):
             filename = os.path.join(filepath,base_fname)
             if ((not os.path.exists(filepath) or
                 os.path.exists(filepath) and not os.path.exists(filename))
-                and self.proxies_queue is not None):
+                and self.dispatcher is not None):
                 #this server can send requests to other instances
-                proxy = self.proxies_queue.get()
                 try:
-                    self.server_logger.info("Sending request to %s" % proxy)
-                    result = proxy.get_wf_graph_png(host, port, db_name, vt_id, version, is_local)
-                    self.proxies_queue.put(proxy)
+                    result = self.dispatcher.call(
+                            'get_wf_graph_png',
+                            (host, port, db_name, vt_id, version, is_local),
+                            key=(host, db_name, vt_id, version))
                     self.server_logger.info("returning %s" % result)
                     return result
                 except xmlrpclib.ProtocolError, err:
@@ -1385,13 +1386,13 @@ class RequestHandler(object):
             if ((not os.path.exists(filepath) or
                 (os.path.exists(filepath) and not os.path.exists(filename)) or
                  self._is_image_stale(filename, host, port, db_name, vt_id)) and 
-                self.proxies_queue is not None):
+                self.dispatcher is not None):
                 #this server can send requests to other instances
-                proxy = self.proxies_queue.get()
                 try:
-                    self.server_logger.info("Sending request to %s" % proxy)
-                    result = proxy.get_vt_graph_png(host, port, db_name, vt_id, is_local)
-                    self.proxies_queue.put(proxy)
+                    result = self.dispatcher.call(
+                            'get_vt_graph_png',
+                            (host, port, db_name, vt_id, is_local),
+                            key=(host, db_name, vt_id))
                     self.server_logger.info("returning %s" % result)
                     return result
                 except xmlrpclib.ProtocolError, err:
@@ -1474,13 +1475,13 @@ class RequestHandler(object):
             if ((not os.path.exists(filepath) or
                 (os.path.exists(filepath) and not os.path.exists(filename)) or
                  self._is_image_stale(filename, host, port, db_name, vt_id)) and 
-                self.proxies_queue is not None):
+                self.dispatcher is not None):
                 #this server can send requests to other instances
-                proxy = self.proxies_queue.get()
                 try:
-                    self.server_logger.info("Sending request to %s" % proxy)
-                    result = proxy.get_vt_graph_pdf(host, port, db_name, vt_id, is_local)
-                    self.proxies_queue.put(proxy)
+                    result = self.dispatcher.call(
+                            'get_vt_graph_pdf',
+                            (host, port, db_name, vt_id, is_local),
+                            key=(host, db_name, vt_id))
                     self.server_logger.info("returning %s" % result)
                     return result
                 except xmlrpclib.ProtocolError, err:
@@ -1613,8 +1614,7 @@ class RequestHandler(object):
                                 obj_type=None,
                                 connection_id=None)
 
-            (v, _ , _, _)  = io.load_vistrail(locator)
-            p = v.getPipeline(long(version))
+            p = get_vistrail_cache().get_pipeline(locator, version)
             if p:
                 vistrail = Vistrail()
                 action_list = []
@@ -1718,7 +1718,7 @@ class RequestHandler(object):
                                 connection_id=None)
 
             result = []
-            v = locator.load().vistrail
+            v = get_vistrail_cache().get_vistrail(locator)
             for elem, tag in v.get_tagMap().iteritems():
                 action_map = v.actionMap[long(elem)]
                 thumbnail_fname = ""
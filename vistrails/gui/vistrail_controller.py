@@ -49,13 +49,14 @@ from vistrails.core.data_structures.graph import Graph
 from vistrails.core import debug
 import vistrails.core.db.action
 from vistrails.core.interpreter.default import get_default_interpreter
-from vistrails.core.vistrail.job import Workflow as JobWorkflow
+from vistrails.core.vistrail.job import JobMixin, Workflow as JobWorkflow
 from vistrails.core.layout.version_tree_layout import VistrailsTreeLayoutLW
 from vistrails.core.log.opm_graph import OpmGraph
 from vistrails.core.log.prov_document import ProvDocument
 from vistrails.core.modules.abstraction import identifier as abstraction_pkg
 from vistrails.core.modules.module_registry import get_module_registry
-from vistrails.core.param_explore import ActionBasedParameterExploration
+from vistrails.core.param_explore import ActionBasedParameterExploration, \
+    exploration_size, execute_exploration, _pipelinePosition
 from vistrails.core.query.version import TrueSearch
 from vistrails.core.query.visual import VisualQuery
 from vistrails.core.utils import DummyView, VistrailsInternalError, InvalidPipeline
@@ -1255,29 +1256,37 @@ class VistrailController(QtCore.QObject, BaseController):
         if self.current_pipeline and actions:
             pe_log_id = uuid.uuid1()
             explorer = ActionBasedParameterExploration()
-            (pipelines, performedActions) = explorer.explore(
+            cells = explorer.iter_explore(
                 self.current_pipeline, actions, pre_actions)
+            cellCount = exploration_size(actions)
             
             dim = [max(1, len(a)) for a in actions]
             if use_spreadsheet:
-                from vistrails.gui.paramexplore.virtual_cell import positionPipelines, assembleThumbnails
+                from vistrails.gui.paramexplore.virtual_cell import positionPipeline, assembleThumbnails
                 from vistrails.gui.paramexplore.pe_view import QParamExploreView
-                modifiedPipelines, pipelinePositions = positionPipelines(
-                    'PE#%d %s' % (QParamExploreView.explorationId, self.name),
-                    dim[2], dim[1], dim[0], pipelines, pe.layout, self)
+                sheetPrefix = 'PE#%d %s' % (QParamExploreView.explorationId,
+                                            self.name)
                 QParamExploreView.explorationId += 1
-            else:
-                from vistrails.core.param_explore import _pipelinePositions
-                modifiedPipelines = pipelines
-                pipelinePositions = _pipelinePositions(
-                    dim[2], dim[1], dim[0], pipelines)
-
-            mCount = []
-            for p in modifiedPipelines:
-                if len(mCount)==0:
-                    mCount.append(0)
-                else:
-                    mCount.append(len(p.modules)+mCount[len(mCount)-1])
+                def positioned(cells):
+                    for pi, (p, performedActions) in enumerate(cells):
+                        p, _ = positionPipeline(sheetPrefix, dim[2], dim[1],
+                                                dim[0], pi, p, pe.layout)
+                        yield (p, performedActions)
+                cells = positioned(cells)
+            pipelinePositions = lambda pi: _pipelinePosition(pi, dim[2],
+                                                             dim[1], dim[0])
+
+            # Cells are only sent to worker processes when they don't need
+            # anything from this one; in particular, modules submitting jobs
+            # need the job monitor
+            workers = getattr(get_vistrails_configuration(),
+                              'explorationWorkers', 0)
+            if (use_spreadsheet or 'pathDumpCells' in extra_info or
+                    self.get_vistrail_variables() or
+                    any(issubclass(module.module_descriptor.module, JobMixin)
+                        for module in self.current_pipeline.modules.itervalues()
+                        if module.module_descriptor.module is not None)):
+                workers = 0
 
             from vistrails.gui.job_monitor import QJobView
             jobView = QJobView.instance()
@@ -1287,11 +1296,14 @@ class VistrailController(QtCore.QObject, BaseController):
                 return
             jobView.updating_now = True
 
+            # The pipelines are generated as they are executed, so progress
+            # is estimated from the size of the explored pipeline
+            cellProgress = max(1, len(self.current_pipeline.modules))
+            totalProgress = cellCount * cellProgress
             try:
                 # Now execute the pipelines
 
                 if showProgress:
-                    totalProgress = sum([len(p.modules) for p in modifiedPipelines])
                     self.progress = PEProgressDialog(self.vistrail_view, totalProgress)
                     self.progress.show()
 
@@ -1299,30 +1311,27 @@ class VistrailController(QtCore.QObject, BaseController):
 
                 images = {}
                 errors = []
-                for pi in xrange(len(modifiedPipelines)):
+
+                def execute(pi, pipeline, performedActions):
                     if showProgress:
-                        self.progress.setValue(mCount[pi])
-                        QtCore.QCoreApplication.processEvents()
-                        if self.progress.wasCanceled():
-                            break
                         def moduleExecuted(objId):
                             if not self.progress.wasCanceled():
                                 self.progress.setValue(self.progress.value()+1)
                                 QtCore.QCoreApplication.processEvents()
                     if use_spreadsheet:
                         name = os.path.splitext(self.name)[0] + \
-                                             ("_%s_%s_%s" % pipelinePositions[pi])
+                                             ("_%s_%s_%s" % pipelinePositions(pi))
                         extra_info['nameDumpCells'] = name
                         if 'pathDumpCells' in extra_info:
-                            images[pipelinePositions[pi]] = \
+                            images[pipelinePositions(pi)] = \
                                        os.path.join(extra_info['pathDumpCells'], name)
-                    pe_cell_id = (pe_log_id,) + pipelinePositions[pi]
+                    pe_cell_id = (pe_log_id,) + pipelinePositions(pi)
                     kwargs = {'locator': self.locator,
                               'job_monitor': self.jobMonitor,
                               'current_version': self.current_version,
                               'reason': 'Parameter Exploration %s %s_%s_%s' % pe_cell_id,
                               'logger': self.get_logger(),
-                              'actions': performedActions[pi],
+                              'actions': performedActions,
                               'extra_info': extra_info
                               }
                     if view:
@@ -1337,7 +1346,7 @@ class VistrailController(QtCore.QObject, BaseController):
 
                     # Create job
                     # check if a job exist for this workflow
-                    job_id = 'Parameter Exploration %s %s %s_%s_%s' % ((self.current_version, pe.id) + pipelinePositions[pi])
+                    job_id = 'Parameter Exploration %s %s %s_%s_%s' % ((self.current_version, pe.id) + pipelinePositions(pi))
 
                     current_workflow = None
                     for wf in self.jobMonitor.workflows.itervalues():
@@ -1349,16 +1358,38 @@ class VistrailController(QtCore.QObject, BaseController):
                         current_workflow = JobWorkflow(job_id)
                         self.jobMonitor.startWorkflow(current_workflow)
                     try:
-                        result = interpreter.execute(modifiedPipelines[pi], **kwargs)
+                        return interpreter.execute(pipeline, **kwargs)
                     finally:
                         self.jobMonitor.finishWorkflow()
 
+                if showProgress:
+                    QtCore.QCoreApplication.processEvents()
+                execute_kwargs = {'current_version': self.current_version}
+                if self.locator is not None:
+                    execute_kwargs['locator'] = self.locator.to_url()
+                def cell_kwargs(pi):
+                    pe_cell_id = (pe_log_id,) + pipelinePositions(pi)
+                    return {'reason': 'Parameter Exploration %s %s_%s_%s' %
+                                      pe_cell_id}
+                results = execute_exploration(
+                    cells, execute, workers, group_size=dim[0],
+                    execute_kwargs=execute_kwargs, cell_kwargs=cell_kwargs,
+                    log=self.log if self.logging_on() else None)
+                for pi, result in results:
                     for error in result.errors.itervalues():
                         if use_spreadsheet:
-                            pp = pipelinePositions[pi]
+                            pp = pipelinePositions(pi)
                             errors.append(((pp[1], pp[0], pp[2]), error))
                         else:
                             errors.append(((0,0,0), error))
+                    if showProgress:
+                        self.progress.setValue(max(self.progress.value(),
+                                                   (pi + 1) * cellProgress))
+                        QtCore.QCoreApplication.processEvents()
+                        if self.progress.wasCanceled():
+                            # stops the cells still running on workers
+                            results.close()
+                            break
 
             finally:
                 jobView.updating_now = False
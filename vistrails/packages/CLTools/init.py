@@ -65,6 +65,10 @@ class CLTools(Module):
     def compute(self):
         raise IncompleteImplementation # pragma: no cover
 
+    def is_thread_safe(self):
+        # the work happens in a subprocess
+        return True
+
 
 SUFFIX = '.clt'
 DEFAULTFILESUFFIX = '.cld'
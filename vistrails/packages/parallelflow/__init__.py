@@ -36,6 +36,10 @@
 
 from __future__ import division
 
+from vistrails.core.configuration import ConfigurationObject
+
 identifier="edu.poly.vistrails.parallel_flow"
 name="Parallel Flow"
 version="0.1.1"
+configuration = ConfigurationObject(backend='auto',
+                                    local_processes=0)
@@ -40,7 +40,11 @@ from vistrails.core.modules.vistrails_module import Module
 from vistrails.core.modules.module_registry import get_module_registry
 from vistrails.core.modules.basic_modules import List, String
 
-from engine_manager import EngineManager
+try:
+    from engine_manager import EngineManager
+except ImportError:
+    EngineManager = None
+from local_pool import terminate_pool
 from map import Map
 
 
@@ -56,10 +60,14 @@ def initialize(*args,**keywords):
 
 
 def finalize():
-    EngineManager.cleanup()
+    terminate_pool()
+    if EngineManager is not None:
+        EngineManager.cleanup()
 
 
 def menu_items():
+    if EngineManager is None:
+        return ()
     return (
             ("Start new engine processes",
              lambda: EngineManager.start_engines()),
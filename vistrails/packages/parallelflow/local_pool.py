@@ -0,0 +1,214 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Runs Map elements on a pool of local worker processes.
+
+The pool is started the first time it is needed and kept until the package is
+unloaded or the module registry changes, so that the workers keep their
+packages loaded and their CachedInterpreter warm between Map executions. The
+pipeline containing the mapped module is written once per Map execution; each
+task only carries the values for one element, and the workers keep the parsed
+pipeline around while the tasks that use it arrive.
+"""
+
+from __future__ import division
+
+import multiprocessing
+import os
+import tempfile
+
+from vistrails.core.db.io import serialize
+from vistrails.core.db.locator import XMLFileLocator
+from vistrails.core.interpreter.default import get_default_interpreter
+from vistrails.core.interpreter.parallel_loop import ProcessPool
+from vistrails.core.log.controller import LogController
+from vistrails.core.log.log import Log
+from vistrails.core.modules.vistrails_module import Module, ModuleError
+from vistrails.core.vistrail.module_function import ModuleFunction
+from vistrails.core.vistrail.module_param import ModuleParam
+from vistrails.core.vistrail.pipeline import Pipeline
+from vistrails.db.domain import IdScope
+
+try:
+    import hashlib
+    sha1_hash = hashlib.sha1
+except ImportError:
+    import sha
+    sha1_hash = sha.new
+
+
+_pool = ProcessPool()
+
+
+def default_processes():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError: # pragma: no cover
+        return 1
+
+
+def get_pool(processes=None):
+    """Returns the pool of worker processes, starting it if necessary.
+
+    The pool is restarted if a different number of processes is requested,
+    or if packages were loaded or unloaded since it was started.
+    """
+    if not processes:
+        processes = default_processes()
+    return _pool.get(processes)
+
+
+def terminate_pool():
+    """Stops the worker processes, if they were started.
+    """
+    _pool.terminate()
+
+
+###############################################################################
+# Worker side
+#
+
+# The pipeline being mapped, as (key, Pipeline)
+_pipeline = (None, None)
+
+
+def load_pipeline(key, filename):
+    global _pipeline
+
+    if _pipeline[0] != key:
+        _pipeline = (key, XMLFileLocator(filename).load(Pipeline))
+    return _pipeline[1]
+
+
+def execute_element(task):
+    """Executes the mapped module for a single element.
+
+    Returns a dictionary in the same format as map.execute_wf(), with the
+    index of the element added to it.
+    """
+    key, filename, module_id, ports, values, output_port, index = task
+
+    pipeline = load_pipeline(key, filename).do_copy()
+    module = pipeline.modules[module_id]
+
+    # adding function and parameter to module in pipeline
+    if module.functions:
+        high_id = max(function.db_id for function in module.functions)
+    else:
+        high_id = 0
+    id_scope = IdScope(beginId=long(high_id+1))
+    for (port_name, port_type), value in zip(ports, values):
+        mod_function = ModuleFunction(
+                id=id_scope.getNewId(ModuleFunction.vtType),
+                pos=0,
+                name=port_name)
+        mod_function.add_parameter(ModuleParam(id=0L,
+                                               pos=0,
+                                               type=port_type,
+                                               val=value))
+        module.add_function(mod_function)
+    pipeline.invalidate_signatures(module_id)
+
+    log = Log()
+    execution = get_default_interpreter().execute(
+            pipeline,
+            logger=LogController(log),
+            reason='Parallel Flow Map Execution')
+
+    # Build a list of errors
+    errors = []
+    for mod_id, error in execution.errors.iteritems():
+        msg = '%s: %s' % (pipeline.modules[mod_id].name, error)
+        errors.append(msg)
+
+    # Get the execution log
+    try:
+        workflow_exec = log.workflow_execs[0]
+        module_log = workflow_exec.item_execs[0]
+    except IndexError:
+        errors.append("Module log not found")
+        return dict(errors=errors, index=index)
+    machine = workflow_exec.machines[module_log.machine_id]
+
+    # Get the output value
+    output = None
+    if not execution.errors:
+        try:
+            output = execution.objects[module_id].get_output(output_port)
+        except ModuleError:
+            errors.append("Output port not found: %s" % output_port)
+            return dict(errors=errors, index=index)
+        if isinstance(output, Module):
+            raise TypeError("Output value is a Module instance")
+
+    return dict(errors=errors,
+                output=output,
+                xml_log=serialize(module_log),
+                machine_log=serialize(machine),
+                index=index)
+
+
+###############################################################################
+# Client side
+#
+
+def map_elements(wf, module_id, ports, elements, output_port,
+                 processes=None):
+    """Executes a serialized single-module pipeline for each element.
+
+    wf is the serialized pipeline, module_id the id of the module to execute
+    in it, and ports a list of (port_name, type) giving the functions to add
+    to that module. elements is a list of parameter values (as strings) for
+    these ports.
+
+    Yields the result dictionaries in the order of the elements, as they
+    become available.
+    """
+    key = sha1_hash(wf).hexdigest()
+    fd, filename = tempfile.mkstemp(prefix='vt_map_', suffix='.xml')
+    try:
+        f = os.fdopen(fd, 'wb')
+        try:
+            f.write(wf)
+        finally:
+            f.close()
+
+        tasks = ((key, filename, module_id, ports, values, output_port, i)
+                 for i, values in enumerate(elements))
+        for result in get_pool(processes).imap(execute_element, tasks):
+            yield result
+    finally:
+        os.unlink(filename)
@@ -67,9 +67,19 @@ import re
 import sys
 import tempfile
 
-from IPython.parallel.error import CompositeError
+try:
+    from IPython.parallel.error import CompositeError
+except ImportError:
+    ipython_available = False
+
+    class CompositeError(Exception):
+        pass
+else:
+    ipython_available = True
 
+from . import configuration
 from .api import get_client
+from .local_pool import map_elements, terminate_pool
 
 try:
     import hashlib
@@ -182,7 +192,8 @@ def strip_ansi_codes(s):
 # Map Operator
 #
 class Map(Module):
-    """The Map Module executes a map operator in parallel on IPython engines.
+    """The Map Module executes a map operator in parallel on IPython engines,
+    or on a pool of local processes if no IPython cluster is available.
 
     The FunctionPort should be connected to the 'self' output of the module you
     want to execute.
@@ -246,7 +257,6 @@ class Map(Module):
             element_is_iter = True
             inputList = rawInputList
 
-        workflows = []
         module = None
         vtType = None
 
@@ -261,81 +271,234 @@ class Map(Module):
             module_id = connector.obj.moduleInfo['moduleId']
             vtType = original_pipeline.modules[module_id].vtType
 
-            # serialize the module for each value in the list
+            # checking type and setting input in the module
+            self.typeChecking(connector.obj, nameInput, inputList)
             for i, element in enumerate(inputList):
                 if element_is_iter:
                     self.element = element
                 else:
                     self.element = element[0]
-
-                # checking type and setting input in the module
-                self.typeChecking(connector.obj, nameInput, inputList)
                 self.setInputValues(connector.obj, nameInput, element, i)
 
-                pipeline_db_module = original_pipeline.modules[module_id].do_copy()
-
-                # transforming a subworkflow in a group
-                # TODO: should we also transform inner subworkflows?
-                if pipeline_db_module.is_abstraction():
-                    group = Group(id=pipeline_db_module.id,
-                                  cache=pipeline_db_module.cache,
-                                  location=pipeline_db_module.location,
-                                  functions=pipeline_db_module.functions,
-                                  annotations=pipeline_db_module.annotations)
-
-                    source_port_specs = pipeline_db_module.sourcePorts()
-                    dest_port_specs = pipeline_db_module.destinationPorts()
-                    for source_port_spec in source_port_specs:
-                        group.add_port_spec(source_port_spec)
-                    for dest_port_spec in dest_port_specs:
-                        group.add_port_spec(dest_port_spec)
-
-                    group.pipeline = pipeline_db_module.pipeline
-                    pipeline_db_module = group
-
-                # getting highest id between functions to guarantee unique ids
-                # TODO: can get current IdScope here?
-                if pipeline_db_module.functions:
-                    high_id = max(function.db_id
-                                  for function in pipeline_db_module.functions)
-                else:
-                    high_id = 0
-
-                # adding function and parameter to module in pipeline
-                # TODO: 'pos' should not be always 0 here
-                id_scope = IdScope(beginId=long(high_id+1))
-                for elementValue, inputPort in izip(element, nameInput):
-
-                    p_spec = pipeline_db_module.get_port_spec(inputPort, 'input')
-                    descrs = p_spec.descriptors()
-                    if len(descrs) != 1:
-                        raise ModuleError(
-                                self,
-                                "Tuple input ports are not supported")
-                    if not issubclass(descrs[0].module, Constant):
-                        raise ModuleError(
-                                self,
-                                "Module inputs should be Constant types")
-                    type = p_spec.sigstring[1:-1]
-
-                    mod_function = ModuleFunction(id=id_scope.getNewId(ModuleFunction.vtType),
-                                                  pos=0,
-                                                  name=inputPort)
-                    mod_param = ModuleParam(id=0L,
-                                            pos=0,
-                                            type=type,
-                                            val=elementValue)
-
-                    mod_function.add_parameter(mod_param)
-                    pipeline_db_module.add_function(mod_function)
-
-                # serializing module
-                wf = self.serialize_module(pipeline_db_module)
-                workflows.append(wf)
+            pipeline_db_module = self.prepare_module(
+                    original_pipeline.modules[module_id])
+            ports = self.get_port_types(pipeline_db_module, nameInput)
 
             # getting first connector, ignoring the rest
             break
 
+        # setting computing color
+        module.logging.set_computing(module)
+
+        if self.use_ipython():
+            map_result = self.execute_ipython(pipeline_db_module, ports,
+                                              inputList, nameOutput)
+        else:
+            map_result = self.execute_local(pipeline_db_module, ports,
+                                            inputList, nameOutput)
+
+        # verifying errors
+        errors = []
+        for engine in range(len(map_result)):
+            if map_result[engine]['errors']:
+                msg = "ModuleError in engine %d: '%s'" % (
+                        engine,
+                        ', '.join(map_result[engine]['errors']))
+                errors.append(msg)
+
+        if errors:
+            raise ModuleError(self, '\n'.join(errors))
+
+        # setting success color
+        module.logging.signalSuccess(module)
+
+        reg = vistrails.core.modules.module_registry.get_module_registry()
+        self.result = []
+        for map_execution in map_result:
+            output = map_execution['output']
+            self.result.append(output)
+
+        # including execution logs
+        if not hasattr(self.logging.log, 'log'):
+            # execution logging is disabled
+            return
+        for engine in range(len(map_result)):
+            log = map_result[engine]['xml_log']
+            exec_ = None
+            if (vtType == 'abstraction') or (vtType == 'group'):
+                exec_ = unserialize(log, GroupExec)
+            elif (vtType == 'module'):
+                exec_ = unserialize(log, ModuleExec)
+            else:
+                # something is wrong...
+                continue
+
+            # assigning new ids to existing annotations
+            exec_annotations = exec_.annotations
+            for i in range(len(exec_annotations)):
+                exec_annotations[i].id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
+
+            parallel_annotation = Annotation(key='parallel_execution', value=True)
+            parallel_annotation.id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
+            annotations = [parallel_annotation] + exec_annotations
+            exec_.annotations = annotations
+
+            # before adding the execution log, we need to get the machine information
+            machine = unserialize(map_result[engine]['machine_log'], Machine)
+            machine_id = self.logging.add_machine(machine)
+
+            # recursively add machine information to execution items
+            def add_machine_recursive(exec_):
+                for item in exec_.item_execs:
+                    if hasattr(item, 'machine_id'):
+                        item.machine_id = machine_id
+                        if item.vtType in ('abstraction', 'group'):
+                            add_machine_recursive(item)
+
+            exec_.machine_id = machine_id
+            if (vtType == 'abstraction') or (vtType == 'group'):
+                add_machine_recursive(exec_)
+
+            self.logging.add_exec(exec_)
+
+
+    def prepare_module(self, module):
+        """
+        Copies the module to be executed in parallel, transforming a
+        subworkflow into a group.
+        """
+        pipeline_db_module = module.do_copy()
+
+        # transforming a subworkflow in a group
+        # TODO: should we also transform inner subworkflows?
+        if pipeline_db_module.is_abstraction():
+            group = Group(id=pipeline_db_module.id,
+                          cache=pipeline_db_module.cache,
+                          location=pipeline_db_module.location,
+                          functions=pipeline_db_module.functions,
+                          annotations=pipeline_db_module.annotations)
+
+            source_port_specs = pipeline_db_module.sourcePorts()
+            dest_port_specs = pipeline_db_module.destinationPorts()
+            for source_port_spec in source_port_specs:
+                group.add_port_spec(source_port_spec)
+            for dest_port_spec in dest_port_specs:
+                group.add_port_spec(dest_port_spec)
+
+            group.pipeline = pipeline_db_module.pipeline
+            pipeline_db_module = group
+
+        return pipeline_db_module
+
+    def get_port_types(self, pipeline_db_module, inputPorts):
+        """
+        Returns a list of (port name, parameter type) for the input ports
+        that receive the elements of the list.
+        """
+        ports = []
+        for inputPort in inputPorts:
+            p_spec = pipeline_db_module.get_port_spec(inputPort, 'input')
+            descrs = p_spec.descriptors()
+            if len(descrs) != 1:
+                raise ModuleError(
+                        self,
+                        "Tuple input ports are not supported")
+            if not issubclass(descrs[0].module, Constant):
+                raise ModuleError(
+                        self,
+                        "Module inputs should be Constant types")
+            ports.append((inputPort, p_spec.sigstring[1:-1]))
+        return ports
+
+    def use_ipython(self):
+        """
+        Chooses between the IPython engines and the local process pool,
+        according to the 'backend' configuration setting.
+
+        With 'auto', the IPython engines are used if a cluster with engines
+        is already running, without prompting the user.
+        """
+        backend = configuration.backend
+        if backend == 'local':
+            return False
+        elif backend == 'ipython':
+            if not ipython_available:
+                raise ModuleError(self, "IPython is not available")
+            return True
+        elif backend != 'auto':
+            raise ModuleError(self, "Unknown parallel backend %r" % backend)
+
+        if not ipython_available:
+            return False
+        try:
+            return get_client(ask=False) is not None
+        except Exception:
+            return False
+
+    def execute_local(self, pipeline_db_module, ports, inputList,
+                      nameOutput):
+        """
+        Executes the module for each element on the local process pool.
+
+        The module is serialized only once, and the elements are sent to the
+        workers as parameter values.
+        """
+        wf = self.serialize_module(pipeline_db_module)
+        # parameters are sent as strings, as they would be in the XML
+        elements = [[str(value) for value in element]
+                    for element in inputList]
+
+        map_result = []
+        try:
+            for result in map_elements(wf, pipeline_db_module.id, ports,
+                                       elements, nameOutput,
+                                       configuration.local_processes):
+                map_result.append(result)
+                self.logging.update_progress(
+                        self, len(map_result) / len(elements))
+        except Exception, e:
+            raise ModuleError(self, "Error from local worker processes:\n"
+                              "%s" % debug.format_exception(e))
+        return map_result
+
+    def execute_ipython(self, pipeline_db_module, ports, inputList,
+                        nameOutput):
+        """
+        Executes the module for each element on IPython engines.
+        """
+        workflows = []
+
+        # serialize the module for each value in the list
+        for element in inputList:
+            element_module = pipeline_db_module.do_copy()
+
+            # getting highest id between functions to guarantee unique ids
+            # TODO: can get current IdScope here?
+            if element_module.functions:
+                high_id = max(function.db_id
+                              for function in element_module.functions)
+            else:
+                high_id = 0
+
+            # adding function and parameter to module in pipeline
+            # TODO: 'pos' should not be always 0 here
+            id_scope = IdScope(beginId=long(high_id+1))
+            for elementValue, (inputPort, type) in izip(element, ports):
+                mod_function = ModuleFunction(id=id_scope.getNewId(ModuleFunction.vtType),
+                                              pos=0,
+                                              name=inputPort)
+                mod_param = ModuleParam(id=0L,
+                                        pos=0,
+                                        type=type,
+                                        val=elementValue)
+
+                mod_function.add_parameter(mod_param)
+                element_module.add_function(mod_function)
+
+            # serializing module
+            wf = self.serialize_module(element_module)
+            workflows.append(wf)
+
         # IPython stuff
         try:
             rc = get_client()
@@ -394,9 +557,6 @@ class Map(Module):
 
             init_view['init'] = True
 
-        # setting computing color
-        module.logging.set_computing(module)
-
         # executing function in engines
         # each map returns a dictionary
         try:
@@ -407,67 +567,7 @@ class Map(Module):
             raise ModuleError(self, "Error from IPython engines:\n"
                               "%s" % self.list_exceptions(e))
 
-        # verifying errors
-        errors = []
-        for engine in range(len(map_result)):
-            if map_result[engine]['errors']:
-                msg = "ModuleError in engine %d: '%s'" % (
-                        engine,
-                        ', '.join(map_result[engine]['errors']))
-                errors.append(msg)
-
-        if errors:
-            raise ModuleError(self, '\n'.join(errors))
-
-        # setting success color
-        module.logging.signalSuccess(module)
-
-        reg = vistrails.core.modules.module_registry.get_module_registry()
-        self.result = []
-        for map_execution in map_result:
-            output = map_execution['output']
-            self.result.append(output)
-
-        # including execution logs
-        for engine in range(len(map_result)):
-            log = map_result[engine]['xml_log']
-            exec_ = None
-            if (vtType == 'abstraction') or (vtType == 'group'):
-                exec_ = unserialize(log, GroupExec)
-            elif (vtType == 'module'):
-                exec_ = unserialize(log, ModuleExec)
-            else:
-                # something is wrong...
-                continue
-
-            # assigning new ids to existing annotations
-            exec_annotations = exec_.annotations
-            for i in range(len(exec_annotations)):
-                exec_annotations[i].id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
-
-            parallel_annotation = Annotation(key='parallel_execution', value=True)
-            parallel_annotation.id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
-            annotations = [parallel_annotation] + exec_annotations
-            exec_.annotations = annotations
-
-            # before adding the execution log, we need to get the machine information
-            machine = unserialize(map_result[engine]['machine_log'], Machine)
-            machine_id = self.logging.add_machine(machine)
-
-            # recursively add machine information to execution items
-            def add_machine_recursive(exec_):
-                for item in exec_.item_execs:
-                    if hasattr(item, 'machine_id'):
-                        item.machine_id = machine_id
-                        if item.vtType in ('abstraction', 'group'):
-                            add_machine_recursive(item)
-
-            exec_.machine_id = machine_id
-            if (vtType == 'abstraction') or (vtType == 'group'):
-                add_machine_recursive(exec_)
-
-            self.logging.add_exec(exec_)
-
+        return map_result
 
     def serialize_module(self, module):
         """
@@ -545,3 +645,40 @@ def get_module(value, signature):
         debug.warning("Could not identify the type of the list element.")
         debug.warning("Type checking is not going to be done inside Map module.")
         return None
+
+###############################################################################
+
+import unittest
+from vistrails.tests.utils import execute, intercept_result
+from . import identifier
+
+
+class TestLocalMap(unittest.TestCase):
+    def setUp(self):
+        self.backend = configuration.backend
+        configuration.backend = 'local'
+        terminate_pool()
+
+    def tearDown(self):
+        configuration.backend = self.backend
+        terminate_pool()
+
+    def test_map(self):
+        """Test mapping PythonCalc over a list on local processes.
+        """
+        with intercept_result(Map, 'Result') as results:
+            self.assertFalse(execute([
+                    ('PythonCalc', 'org.vistrails.vistrails.pythoncalc', [
+                        ('value2', [('Float', '3.0')]),
+                        ('op', [('String', '*')]),
+                    ]),
+                    ('Map', identifier, [
+                        ('InputPort', [('List', "['value1']")]),
+                        ('OutputPort', [('String', 'value')]),
+                        ('InputList', [('List', '[1.0, 2.0, 1.0, 5.0]')]),
+                    ]),
+                ],
+                [
+                    (0, 'self', 1, 'FunctionPort'),
+                ]))
+        self.assertEqual(results, [[3.0, 6.0, 3.0, 15.0]])
@@ -43,6 +43,7 @@ py_import('dulwich', {
         'linux-ubuntu': 'python-dulwich',
         'linux-fedora': 'python-dulwich'})
 from vistrails.core import debug
+from vistrails.core.cache.file_digest import get_file_digest_cache
 
 from dulwich.errors import NotCommitError, NotGitRepository
 from dulwich.repo import Repo
@@ -154,7 +155,7 @@ class GitRepo(object):
         return tree[name][1]
 
     @staticmethod
-    def compute_blob_hash(fname, chunk_size=1<<16):
+    def read_blob_hash(fname, chunk_size=1<<16):
         obj_len = os.path.getsize(fname)
         head = object_header(Blob.type_num, obj_len)
         with open(fname, "rb") as f:
@@ -164,20 +165,41 @@ class GitRepo(object):
             return iter_sha1(my_iter)
 
     @staticmethod
-    def compute_tree_hash(dirname):
+    def _blob_hash(fname, digest_cache, chunk_size=1<<16):
+        # the digest cache only reads files that changed since last time
+        return digest_cache.file_digest(
+                fname, 'git-blob',
+                lambda f: GitRepo.read_blob_hash(f, chunk_size))
+
+    @staticmethod
+    def compute_blob_hash(fname, chunk_size=1<<16):
+        digest_cache = get_file_digest_cache()
+        bhash = GitRepo._blob_hash(fname, digest_cache, chunk_size)
+        digest_cache.save()
+        return bhash
+
+    @staticmethod
+    def _tree_hash(dirname, digest_cache):
         tree = Tree()
         for entry in sorted(os.listdir(dirname)):
             fname = os.path.join(dirname, entry)
             if os.path.isdir(fname):
-                thash = GitRepo.compute_tree_hash(fname)
+                thash = GitRepo._tree_hash(fname, digest_cache)
                 mode = stat.S_IFDIR # os.stat(fname)[stat.ST_MODE]
                 tree.add(entry, mode, thash)
             elif os.path.isfile(fname):
-                bhash = GitRepo.compute_blob_hash(fname)
+                bhash = GitRepo._blob_hash(fname, digest_cache)
                 mode = os.stat(fname)[stat.ST_MODE]
                 tree.add(entry, mode, bhash)
         return tree.id
 
+    @staticmethod
+    def compute_tree_hash(dirname):
+        digest_cache = get_file_digest_cache()
+        thash = GitRepo._tree_hash(dirname, digest_cache)
+        digest_cache.save()
+        return thash
+
     @staticmethod
     def compute_hash(path):
         if os.path.isdir(path):
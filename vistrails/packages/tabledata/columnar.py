@@ -0,0 +1,595 @@
+###############################################################################
+##
+## Copyright (C) 2014-2016, New York University.
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah.
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice,
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright
+##    notice, this list of conditions and the following disclaimer in the
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the New York University nor the names of its
+##    contributors may be used to endorse or promote products derived from
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS;
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+from __future__ import division
+
+import itertools
+import os
+import shutil
+import tempfile
+
+from .common import get_numpy, TableObject
+
+
+class SpillDirectory(object):
+    """Temporary directory holding memory-mapped columns.
+
+    Tables sharing arrays that live in this directory keep a reference to it;
+    the files are removed once the last of them goes away.
+    """
+    def __init__(self):
+        self.path = tempfile.mkdtemp(prefix='vt_columns_')
+
+    def __del__(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class ColumnarTable(TableObject):
+    """A table whose columns are stored as NumPy arrays.
+
+    Columns hold the data 'as-is' (byte strings for data read from text
+    files, objects otherwise). Numeric views are converted once, in a single
+    vectorized pass, the first time they are requested. Operations can use
+    get_array() to work on the arrays directly instead of on lists.
+    """
+    def __init__(self, arrays, nb_rows, names, storage=None, numeric=None):
+        self.columns = len(arrays)
+        self.rows = nb_rows
+        self.names = names
+
+        self._arrays = arrays
+        self._storage = storage
+        self._numeric = dict(numeric or {})
+        self._invalid = {}
+        self.column_cache = {}
+
+    def get_array(self, index, numeric=False):
+        """Gets a column as a NumPy array.
+
+        If numeric=True, the values are converted to float64; a ValueError is
+        raised if some of them are not numbers.
+        """
+        if index in self._invalid:
+            raise ValueError(self._invalid[index])
+        if not numeric:
+            return self._arrays[index]
+        try:
+            return self._numeric[index]
+        except KeyError:
+            numpy = get_numpy()
+            result = self._arrays[index].astype(numpy.float64)
+            self._numeric[index] = result
+            return result
+
+    def get_column(self, index, numeric=False):
+        if (index, numeric) in self.column_cache:
+            return self.column_cache[(index, numeric)]
+
+        if numeric:
+            numpy = get_numpy()
+            result = self.get_array(index, True).astype(numpy.float32)
+        else:
+            result = self.get_array(index).tolist()
+        self.column_cache[(index, numeric)] = result
+        return result
+
+    def iter_batches(self, batch_size=None):
+        if batch_size is None:
+            batch_size = self.batch_size
+        for start in xrange(0, self.rows, batch_size):
+            yield self.slice(start, min(start + batch_size, self.rows))
+
+    def slice(self, start, stop):
+        """Builds a new table from a range of rows, without copying them.
+        """
+        table = ColumnarTable(
+                [array[start:stop] for array in self._arrays],
+                stop - start,
+                self.names,
+                storage=self._storage,
+                numeric=dict((i, array[start:stop])
+                             for i, array in self._numeric.iteritems()))
+        table._invalid = self._invalid
+        return table
+
+    def take(self, rows):
+        """Builds a new table from the given row indexes.
+        """
+        numpy = get_numpy()
+        rows = numpy.asarray(rows, dtype=numpy.intp)
+        table = ColumnarTable(
+                [array.take(rows) for array in self._arrays],
+                len(rows),
+                self.names,
+                numeric=dict((i, array.take(rows))
+                             for i, array in self._numeric.iteritems()))
+        table._invalid = self._invalid
+        return table
+
+    @classmethod
+    def from_tables(cls, tables, names):
+        """Puts the columns of tables with the same number of rows together.
+        """
+        arrays = []
+        numeric = {}
+        for table in tables:
+            for i, array in table._numeric.iteritems():
+                numeric[len(arrays) + i] = array
+            arrays.extend(table._arrays)
+        result = cls(arrays, tables[0].rows, names,
+                     storage=[t._storage for t in tables
+                              if t._storage is not None] or None,
+                     numeric=numeric)
+        offset = 0
+        for table in tables:
+            for i, msg in table._invalid.iteritems():
+                result._invalid[offset + i] = msg
+            offset += table.columns
+        return result
+
+    def project(self, indexes, names):
+        """Builds a new table from some of the columns, without copying them.
+        """
+        table = ColumnarTable(
+                [self._arrays[i] for i in indexes],
+                self.rows,
+                names,
+                storage=self._storage,
+                numeric=dict((n, self._numeric[i])
+                             for n, i in enumerate(indexes)
+                             if i in self._numeric))
+        table._invalid = dict((n, self._invalid[i])
+                              for n, i in enumerate(indexes)
+                              if i in self._invalid)
+        return table
+
+
+def to_array(column):
+    """Converts a column, as returned by get_column(), to a NumPy array.
+    """
+    numpy = get_numpy()
+    if isinstance(column, numpy.ndarray):
+        return column
+    array = numpy.empty(len(column), dtype=object)
+    array[:] = column
+    return array
+
+
+def as_columnar(table):
+    """Gets a ColumnarTable with the content of any TableObject.
+
+    Tables that know how to build their columnar form (such as CSVTable) are
+    asked to; others are read column by column.
+    """
+    if isinstance(table, ColumnarTable):
+        return table
+    converter = getattr(table, 'as_columnar', None)
+    if converter is not None:
+        return converter()
+    return ColumnarTable([to_array(table.get_column(i))
+                          for i in xrange(table.columns)],
+                         table.rows, table.names)
+
+
+def column_array(table, index):
+    """Gets a column as a NumPy array if that doesn't require a conversion.
+
+    Returns None if the table is not columnar and its column is a list.
+    """
+    numpy = get_numpy(False)
+    if numpy is None:
+        return None
+    if (isinstance(table, ColumnarTable) or
+            getattr(table, 'as_columnar', None) is not None):
+        return as_columnar(table).get_array(index)
+    column = table.get_column(index)
+    if isinstance(column, numpy.ndarray):
+        return column
+    return None
+
+
+def numeric_array(table, index):
+    """Gets a column as a float64 NumPy array.
+    """
+    numpy = get_numpy()
+    if (isinstance(table, ColumnarTable) or
+            getattr(table, 'as_columnar', None) is not None):
+        return as_columnar(table).get_array(index, True)
+    return numpy.asarray(table.get_column(index, True), dtype=numpy.float64)
+
+
+def normalize_keys(keys, case_sensitive=False):
+    """Strips (and upper-cases) an array of byte strings.
+
+    This works on the bytes directly; numpy.char is only used for stripping,
+    when some keys actually start or end with whitespace.
+    """
+    numpy = get_numpy()
+    width = keys.dtype.itemsize
+    if not len(keys) or not width:
+        return keys
+
+    def as_bytes(keys):
+        keys = numpy.ascontiguousarray(keys)
+        return keys.view(numpy.uint8).reshape(len(keys), width)
+
+    chars = as_bytes(keys)
+    space = numpy.zeros(256, dtype=numpy.bool_)
+    space[[ord(c) for c in ' \t\n\r\x0b\x0c']] = True
+    last = width - 1 - numpy.argmax(chars[:, ::-1] != 0, axis=1)
+    if (space[chars[:, 0]].any() or
+            space[chars[numpy.arange(len(keys)), last]].any()):
+        keys = numpy.char.strip(keys)
+        width = keys.dtype.itemsize
+        chars = as_bytes(keys)
+    if not case_sensitive:
+        lower = (chars >= ord('a')) & (chars <= ord('z'))
+        if lower.any():
+            chars = chars - lower.astype(numpy.uint8) * 32
+            keys = chars.view('S%d' % width).ravel()
+    return keys
+
+
+def sortable_keys(*arrays):
+    """Views short byte-string keys as big-endian integers.
+
+    Those sort and compare much faster than strings, in the same order.
+    """
+    numpy = get_numpy()
+    if all(a.dtype.kind == 'S' and a.dtype.itemsize <= 8 for a in arrays):
+        return [numpy.ascontiguousarray(a, dtype='S8').view('>u8')
+                for a in arrays]
+    return arrays
+
+
+def join_rows(left_keys, right_keys):
+    """Matches two arrays of keys with a factorized (sort-based) hash join.
+
+    Returns the arrays (left_rows, right_rows) of the matching row indexes,
+    in the order of the left keys. If a key appears several times on the
+    right, the last row is used.
+    """
+    numpy = get_numpy()
+    left_keys, right_keys = sortable_keys(left_keys, right_keys)
+    nb_right = len(right_keys)
+    uniques, first = numpy.unique(right_keys[::-1], return_index=True)
+    if not len(uniques) or not len(left_keys):
+        empty = numpy.array([], dtype=numpy.intp)
+        return empty, empty
+    last = nb_right - 1 - first
+    positions = numpy.searchsorted(uniques, left_keys)
+    positions[positions == len(uniques)] = 0
+    left_rows = numpy.flatnonzero(uniques[positions] == left_keys)
+    return left_rows, last[positions[left_rows]]
+
+
+class Groups(object):
+    """Factorizes an array of keys into groups.
+
+    Groups are numbered in the order in which their keys first appear;
+    `first_rows` is the first row of each group and `group_ids` the group of
+    each row.
+    """
+    def __init__(self, keys):
+        numpy = get_numpy()
+        keys, = sortable_keys(keys)
+        uniques, first, inverse = numpy.unique(keys,
+                                               return_index=True,
+                                               return_inverse=True)
+        order = numpy.argsort(first, kind='mergesort')
+        rank = numpy.empty(len(order), dtype=numpy.intp)
+        rank[order] = numpy.arange(len(order))
+        self.nb_groups = len(order)
+        self.first_rows = first[order]
+        self.group_ids = rank[inverse]
+        self.counts = numpy.bincount(self.group_ids, minlength=self.nb_groups)
+
+    def reduce(self, op, values):
+        """Computes 'count', 'sum', 'average', 'min' or 'max' per group.
+        """
+        numpy = get_numpy()
+        if op == 'count':
+            return self.counts
+        elif op == 'sum':
+            return numpy.bincount(self.group_ids, weights=values,
+                                  minlength=self.nb_groups)
+        elif op == 'average':
+            return numpy.bincount(self.group_ids, weights=values,
+                                  minlength=self.nb_groups) / self.counts
+        elif op in ('min', 'max'):
+            if not self.nb_groups:
+                return numpy.array([], dtype=values.dtype)
+            ufunc = numpy.minimum if op == 'min' else numpy.maximum
+            by_group = numpy.argsort(self.group_ids, kind='mergesort')
+            starts = numpy.concatenate([[0], numpy.cumsum(self.counts)[:-1]])
+            return ufunc.reduceat(values[by_group], starts)
+        else:
+            raise ValueError('Unknown operation: "%s"' % op)
+
+
+
+class ColumnBuilder(object):
+    """Accumulates rows of byte strings into typed columns, chunk by chunk.
+
+    Each chunk of `chunk_rows` rows is turned into one fixed-width array per
+    column. Once the chunks held in memory get over `spill_threshold` bytes,
+    they are written to disk and the final columns are memory-mapped.
+
+    A fixed-width array uses the length of its longest value for every row,
+    so a chunk whose longest value is over `object_ratio` times its median
+    length (and over `object_ratio` * 8 bytes) is kept as an array of
+    objects instead. These are never spilled, and a column with such a chunk
+    is built in memory.
+    """
+    chunk_rows = 65536
+    spill_threshold = 256 * 1024 * 1024
+    object_ratio = 8
+
+    def __init__(self, nb_columns, first_line=1):
+        self.nb_columns = nb_columns
+        self.first_line = first_line
+        self.rows = 0
+        self._chunks = [[] for i in xrange(nb_columns)]
+        self._memory = 0
+        self._storage = None
+        self._invalid = {}
+
+    def add_rows(self, rows):
+        """Reads all the rows from an iterable, one chunk at a time.
+        """
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_rows))
+            if not chunk:
+                break
+            self.add_chunk(chunk)
+
+    def add_chunk(self, chunk):
+        numpy = get_numpy()
+        nb_columns = self.nb_columns
+        if min(len(row) for row in chunk) >= nb_columns:
+            columns = zip(*chunk)[:nb_columns]
+        else:
+            columns = [[] for i in xrange(nb_columns)]
+            for rownb, row in enumerate(chunk,
+                                        self.first_line + self.rows):
+                for i in xrange(nb_columns):
+                    if i < len(row):
+                        columns[i].append(row[i])
+                    else:
+                        columns[i].append('')
+                        if i not in self._invalid:
+                            self._invalid[i] = (
+                                    "Invalid CSV file: only %d fields on "
+                                    "line %d (column %d requested)" % (
+                                        len(row), rownb, i))
+        for i, values in enumerate(columns):
+            lengths = numpy.fromiter(itertools.imap(len, values),
+                                     dtype=numpy.intp, count=len(values))
+            if lengths.max() > self.object_ratio * max(numpy.median(lengths),
+                                                       8):
+                array = to_array(values)
+                self._memory += array.nbytes + lengths.sum()
+            else:
+                array = numpy.array(values, dtype=numpy.bytes_)
+                self._memory += array.nbytes
+            self._chunks[i].append(array)
+        self.rows += len(chunk)
+
+        if self._memory > self.spill_threshold:
+            self._spill()
+
+    def _spill(self):
+        numpy = get_numpy()
+        if self._storage is None:
+            self._storage = SpillDirectory()
+        for i, chunks in enumerate(self._chunks):
+            for n, array in enumerate(chunks):
+                if isinstance(array, basestring) or array.dtype == object:
+                    continue
+                filename = os.path.join(self._storage.path,
+                                        'chunk_%d_%d.npy' % (i, n))
+                numpy.save(filename, array)
+                chunks[n] = filename
+        self._memory = 0
+
+    def build(self, names):
+        """Concatenates the chunks and returns the ColumnarTable.
+        """
+        numpy = get_numpy()
+        arrays = []
+        if self._storage is None:
+            for chunks in self._chunks:
+                if chunks:
+                    arrays.append(numpy.concatenate(chunks))
+                else:
+                    arrays.append(numpy.array([], dtype=numpy.bytes_))
+        else:
+            self._spill()
+            from numpy.lib.format import open_memmap
+            for i, chunks in enumerate(self._chunks):
+                chunks = [numpy.load(chunk, mmap_mode='r')
+                          if isinstance(chunk, basestring) else chunk
+                          for chunk in chunks]
+                if any(chunk.dtype == object for chunk in chunks):
+                    arrays.append(numpy.concatenate(chunks))
+                    del chunks
+                    for filename in self._chunks[i]:
+                        if isinstance(filename, basestring):
+                            os.remove(filename)
+                    continue
+                itemsize = max([c.dtype.itemsize for c in chunks] or [1])
+                filename = os.path.join(self._storage.path, 'column_%d.npy' % i)
+                column = open_memmap(filename, mode='w+',
+                                     dtype='S%d' % itemsize,
+                                     shape=(self.rows,))
+                pos = 0
+                for chunk in chunks:
+                    column[pos:pos + len(chunk)] = chunk
+                    pos += len(chunk)
+                column.flush()
+                del column, chunks
+                for filename in self._chunks[i]:
+                    os.remove(filename)
+                arrays.append(numpy.load(
+                        os.path.join(self._storage.path, 'column_%d.npy' % i),
+                        mmap_mode='r'))
+        table = ColumnarTable(arrays, self.rows, names, storage=self._storage)
+        table._invalid = self._invalid
+        return table
+
+
+###############################################################################
+
+import unittest
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        if get_numpy(False) is None: # pragma: no cover
+            self.skipTest("numpy is not available")
+
+    def build(self, rows, nb_columns, **kwargs):
+        builder = ColumnBuilder(nb_columns)
+        for k, v in kwargs.iteritems():
+            setattr(builder, k, v)
+        builder.add_rows(rows)
+        return builder.build(['col %d' % i for i in xrange(nb_columns)])
+
+    def test_chunks(self):
+        """Builds columns from several chunks of varying width."""
+        rows = [[str(i), 'x' * (i % 7)] for i in xrange(50)]
+        table = self.build(rows, 2, chunk_rows=8)
+        self.assertEqual(table.rows, 50)
+        self.assertEqual(table.get_column(0), [str(i) for i in xrange(50)])
+        self.assertEqual(table.get_column(1), ['x' * (i % 7)
+                                               for i in xrange(50)])
+        self.assertEqual(list(table.get_column(0, True)), range(50))
+
+    def test_spill(self):
+        """Builds memory-mapped columns once over the threshold."""
+        import numpy
+
+        rows = [[str(i), 'abc'[i % 3]] for i in xrange(100)]
+        table = self.build(rows, 2, chunk_rows=16, spill_threshold=64)
+        path = table._storage.path
+        self.assertIsInstance(table.get_array(0), numpy.memmap)
+        self.assertEqual(sorted(os.listdir(path)),
+                         ['column_0.npy', 'column_1.npy'])
+        self.assertEqual(table.get_column(0), [str(i) for i in xrange(100)])
+        self.assertEqual(table.get_column(1)[:4], ['a', 'b', 'c', 'a'])
+        projected = table.project([1], ['letters'])
+        del table
+        self.assertTrue(os.path.isdir(path))
+        self.assertEqual(projected.get_column(0)[-1], 'a')
+        del projected
+        self.assertFalse(os.path.exists(path))
+
+    def test_long_values(self):
+        """Keeps chunks with a few long values as objects."""
+        rows = [[str(i), 'x' * (1000 if i == 5 else i % 3)]
+                for i in xrange(40)]
+        for kwargs in ({}, {'spill_threshold': 64}):
+            table = self.build(rows, 2, chunk_rows=16, **kwargs)
+            self.assertEqual(table.get_array(0).dtype.kind, 'S')
+            self.assertEqual(table.get_array(1).dtype, object)
+            self.assertEqual(table.get_column(0),
+                             [str(i) for i in xrange(40)])
+            self.assertEqual(table.get_column(1), [r[1] for r in rows])
+
+    def test_short_rows(self):
+        """Reports rows missing a field only when that column is used."""
+        table = self.build([['1', 'a'], ['2'], ['3', 'c']], 2)
+        self.assertEqual(table.get_column(0), ['1', '2', '3'])
+        with self.assertRaises(ValueError) as cm:
+            table.get_column(1)
+        self.assertIn("only 1 fields on line 2", cm.exception.message)
+
+    def test_take_project(self):
+        """Selects rows and columns, keeping computed numeric views."""
+        table = ColumnarTable([to_array(['1', '2', '3']),
+                               to_array(['a', 'b', 'c'])],
+                              3, ['n', 'l'])
+        table.get_array(0, True)
+        taken = table.take([2, 0])
+        self.assertIn(0, taken._numeric)
+        self.assertEqual(taken.get_column(1), ['c', 'a'])
+        self.assertEqual(list(taken.get_column(0, True)), [3, 1])
+        projected = table.project([1, 0, 0], ['l', 'n', 'n2'])
+        self.assertEqual(projected.names, ['l', 'n', 'n2'])
+        self.assertEqual(projected.get_column(2), ['1', '2', '3'])
+        self.assertIs(projected.get_array(1, True), table.get_array(0, True))
+
+    def test_join_rows(self):
+        """Matches keys, using the last duplicate on the right."""
+        import numpy
+
+        left, right = join_rows(numpy.array(['b', 'x', 'a', 'b']),
+                                numpy.array(['a', 'b', 'c', 'b', 'a']))
+        self.assertEqual(list(left), [0, 2, 3])
+        self.assertEqual(list(right), [3, 4, 3])
+        left, right = join_rows(numpy.array([1.0, 2.0]),
+                                numpy.array([], dtype=numpy.float64))
+        self.assertEqual(len(left), 0)
+
+    def test_normalize_keys(self):
+        """Strips and upper-cases keys like str.strip().upper()."""
+        import numpy
+
+        keys = ['abc', ' Ab', 'x\t', '', 'A1b2', 'a\x00b']
+        array = numpy.array(keys, dtype=numpy.bytes_)
+        self.assertEqual(normalize_keys(array).tolist(),
+                         [k.strip().upper() for k in keys])
+        self.assertEqual(normalize_keys(array, True).tolist(),
+                         [k.strip() for k in keys])
+        keys = ['abc', 'Ab']
+        self.assertEqual(
+                normalize_keys(numpy.array(keys, dtype=numpy.bytes_)).tolist(),
+                ['ABC', 'AB'])
+
+    def test_groups(self):
+        """Reduces values per group, in order of first appearance."""
+        import numpy
+
+        groups = Groups(numpy.array(['b', 'a', 'b', 'c', 'a', 'b']))
+        values = numpy.array([1.0, 2.0, 3.0, 4.0, 5.0, -6.0])
+        self.assertEqual(list(groups.first_rows), [0, 1, 3])
+        self.assertEqual(list(groups.reduce('count', values)), [3, 2, 1])
+        self.assertEqual(list(groups.reduce('sum', values)), [-2, 7, 4])
+        self.assertEqual(list(groups.reduce('min', values)), [-6, 2, 4])
+        self.assertEqual(list(groups.reduce('max', values)), [3, 5, 4])
+        self.assertEqual(list(groups.reduce('average', values)),
+                         [-2 / 3, 3.5, 4])
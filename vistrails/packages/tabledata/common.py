@@ -84,6 +84,7 @@ class TableObject(object):
     rows = None # the number of rows in the table
     names = None # the names of the columns
     name = None # a name for the table (useful for joins, etc.)
+    batch_size = 65536 # the default number of rows in iter_batches()
 
     def __init__(self, columns, nb_rows, names):
         self.columns = len(columns)
@@ -107,6 +108,28 @@ class TableObject(object):
         else:
             return self._columns[i]
 
+    def iter_batches(self, batch_size=None):
+        """Iterates on the rows of the table, as a sequence of smaller tables.
+
+        Each batch has the same columns as this table, and at most
+        `batch_size` rows. Tables that can produce their rows incrementally
+        (for instance, while reading a file) override this so that a whole
+        pipeline can run without loading the full table in memory.
+
+        This default implementation reads every column in full with
+        get_column() before yielding the first batch, so it does not bound
+        memory: the batches are slices of columns that are all held in
+        memory. Subclasses that compute their columns should override it.
+        """
+        if batch_size is None:
+            batch_size = self.batch_size
+        columns = [self.get_column(i) for i in xrange(self.columns)]
+        nb_rows = self.rows
+        for start in xrange(0, nb_rows, batch_size):
+            stop = min(start + batch_size, nb_rows)
+            yield TableObject([column[start:stop] for column in columns],
+                              stop - start, self.names)
+
     def get_column_by_name(self, name, numeric=False):
         """Gets a column from its name.
 
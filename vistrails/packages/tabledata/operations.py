@@ -35,10 +35,13 @@
 
 from __future__ import division
 
+import operator
 import re
 
 from vistrails.core.modules.vistrails_module import ModuleError
 
+from .columnar import ColumnarTable, Groups, as_columnar, column_array, \
+    join_rows, normalize_keys, numeric_array
 from .common import get_numpy, TableObject, Table, \
     choose_column, choose_columns
 
@@ -55,6 +58,9 @@ def utf8(obj):
 
 
 class JoinedTables(TableObject):
+    # Use a vectorized join when the key columns are NumPy arrays
+    use_numpy = True
+
     def __init__(self, left_t, right_t, left_key_col, right_key_col,
                  case_sensitive=False, always_prefix=False):
         self.left_t = left_t
@@ -65,9 +71,15 @@ class JoinedTables(TableObject):
         self.always_prefix = always_prefix
 
         self.build_column_names()
+        self.row_map = None
+        self.matched_rows = None
         self.compute_row_map()
         self.column_cache = {}
-        self.rows = len(self.row_map)
+        self._columnar = None
+        if self.matched_rows is not None:
+            self.rows = len(self.matched_rows[0])
+        else:
+            self.rows = len(self.row_map)
 
     def build_column_names(self):
         left_name = self.left_t.name
@@ -97,10 +109,26 @@ class JoinedTables(TableObject):
                       get_col_names(self.right_t, self.left_t, right_name))
         self.columns = len(self.names)
 
+    def as_columnar(self):
+        if self._columnar is None:
+            if self.matched_rows is not None:
+                left_rows, right_rows = self.matched_rows
+            else:
+                left_rows = sorted(self.row_map)
+                right_rows = [self.row_map[i] for i in left_rows]
+            self._columnar = ColumnarTable.from_tables(
+                    [as_columnar(self.left_t).take(left_rows),
+                     as_columnar(self.right_t).take(right_rows)],
+                    self.names)
+        return self._columnar
+
     def get_column(self, index, numeric=False):
         if (index, numeric) in self.column_cache:
             return self.column_cache[(index, numeric)]
 
+        if get_numpy(False) is not None:
+            return self.as_columnar().get_column(index, numeric)
+
         result = []
         if index < self.left_t.columns:
             column = self.left_t.get_column(index, numeric)
@@ -121,7 +149,35 @@ class JoinedTables(TableObject):
         self.column_cache[(index, numeric)] = result
         return result
 
+    def key_arrays(self):
+        """Gets the normalized key columns as NumPy arrays, or None.
+
+        Numeric keys are compared by value; other keys are compared as
+        stripped UTF-8 strings, like in the dictionary-based join.
+        """
+        numpy = get_numpy(False)
+        if numpy is None or not self.use_numpy:
+            return None
+        left = column_array(self.left_t, self.left_key_col)
+        right = column_array(self.right_t, self.right_key_col)
+        if left is None or right is None:
+            return None
+        if left.dtype.kind in 'biuf' and right.dtype.kind in 'biuf':
+            return left, right
+
+        def normalize(keys):
+            if keys.dtype.kind != 'S':
+                keys = numpy.array([utf8(val) for val in keys],
+                                   dtype=numpy.bytes_)
+            return normalize_keys(keys, self.case_sensitive)
+        return normalize(left), normalize(right)
+
     def compute_row_map(self):
+        keys = self.key_arrays()
+        if keys is not None:
+            self.matched_rows = join_rows(*keys)
+            return
+
         def build_key_dict(table, key_col):
             column = table.get_column(key_col)
             if self.case_sensitive:
@@ -204,6 +260,14 @@ class ProjectedTable(TableObject):
         mapped_idx = self.col_map[index]
         return self.table.get_column(mapped_idx, numeric)
 
+    def iter_batches(self, batch_size=None):
+        indexes = [self.col_map[i] for i in xrange(self.columns)]
+        for batch in self.table.iter_batches(batch_size):
+            if isinstance(batch, ColumnarTable):
+                yield batch.project(indexes, self.names)
+            else:
+                yield ProjectedTable(batch, indexes, self.names)
+
     @property
     def rows(self):
         return self.table.rows
@@ -251,7 +315,10 @@ class ProjectTable(Table):
                     names[name] = 1
                 column_names.append(name)
 
-        projected_table = ProjectedTable(table, indexes, column_names)
+        if isinstance(table, ColumnarTable):
+            projected_table = table.project(indexes, column_names)
+        else:
+            projected_table = ProjectedTable(table, indexes, column_names)
         self.set_output("value", projected_table)
 
 
@@ -267,7 +334,9 @@ class SelectFromTable(Table):
                       'values': "[[], ['==', '!=', '=~'], []]"}),
                     ('float_expr', 'basic:String,basic:String,basic:Float',
                      {'entry_types': "['default','enum','default']",
-                      'values': "[[], ['==', '!=', '<', '>', '<=', '>='], []]"})]
+                      'values': "[[], ['==', '!=', '<', '>', '<=', '>='], []]"}),
+                    ('streaming', 'basic:Boolean',
+                     {'optional': True, 'defaults': "['False']"})]
     _output_ports = [('value', Table)]
 
     @staticmethod
@@ -294,6 +363,29 @@ class SelectFromTable(Table):
         else:
             raise ValueError("Invalid comparison operator %r" % comparer)
 
+    _operators = {'==': operator.eq, '!=': operator.ne,
+                  '<': operator.lt, '>': operator.gt,
+                  '<=': operator.le, '>=': operator.ge}
+
+    @classmethod
+    def make_mask(cls, column, comparand, comparer):
+        """Evaluates the condition on a whole NumPy array at once.
+        """
+        numpy = get_numpy()
+        if comparer == '=~':
+            regex = re.compile(comparand)
+            return numpy.fromiter((regex.search(v) is not None
+                                   for v in column),
+                                  dtype=numpy.bool_, count=len(column))
+        try:
+            op = cls._operators[comparer]
+        except KeyError:
+            raise ValueError("Invalid comparison operator %r" % comparer)
+        if (isinstance(comparand, unicode) and
+                column.dtype.kind == numpy.dtype(numpy.bytes_).kind):
+            comparand = comparand.encode('utf-8')
+        return numpy.asarray(op(column, comparand), dtype=numpy.bool_)
+
     def compute(self):
         table = self.get_input('table')
 
@@ -317,21 +409,85 @@ class SelectFromTable(Table):
                                   "No column %d, table only has %d columns" % (
                                   idx, table.columns))
 
-        condition = self.make_condition(comparand, comparer)
-        numeric = isinstance(comparand, float)
-        column = table.get_column(idx, numeric)
-        matched_rows = [i
-                        for i, col_val in enumerate(column)
-                        if condition(col_val)]
-        columns = []
-        for col in xrange(table.columns):
-            column = table.get_column(col)
-            columns.append([column[row] for row in matched_rows])
-        selected_table = TableObject(columns, len(matched_rows), table.names)
+        if self.get_input('streaming'):
+            selected_table = SelectedTable(table, idx, comparand, comparer)
+        else:
+            selected_table = self.select(table, idx, comparand, comparer)
         self.set_output('value', selected_table)
 
+    @classmethod
+    def select(cls, table, idx, comparand, comparer):
+        """Builds the table of the rows matching the condition.
+        """
+        numeric = isinstance(comparand, float)
+        numpy = get_numpy(False)
+        if numpy is not None:
+            table = as_columnar(table)
+            mask = cls.make_mask(table.get_array(idx, numeric),
+                                 comparand, comparer)
+            return table.take(numpy.flatnonzero(mask))
+        else:
+            condition = cls.make_condition(comparand, comparer)
+            column = table.get_column(idx, numeric)
+            matched_rows = [i
+                            for i, col_val in enumerate(column)
+                            if condition(col_val)]
+            columns = []
+            for col in xrange(table.columns):
+                column = table.get_column(col)
+                columns.append([column[row] for row in matched_rows])
+            return TableObject(columns, len(matched_rows), table.names)
+
+
+class SelectedTable(TableObject):
+    """The rows of a table matching a condition, filtered batch by batch.
+
+    iter_batches() only holds one batch of the input table at a time;
+    get_column() selects from the whole table the first time it is called.
+    """
+    def __init__(self, table, idx, comparand, comparer):
+        self.table = table
+        self.idx = idx
+        self.comparand = comparand
+        self.comparer = comparer
+        self.columns = table.columns
+        self.names = table.names
+        self._rows = None
+        self._selected = None
+
+    def iter_batches(self, batch_size=None):
+        if self._selected is not None:
+            for batch in self._selected.iter_batches(batch_size):
+                yield batch
+            return
+        nb_rows = 0
+        for batch in self.table.iter_batches(batch_size):
+            batch = SelectFromTable.select(batch, self.idx,
+                                           self.comparand, self.comparer)
+            nb_rows += batch.rows
+            if batch.rows:
+                yield batch
+        self._rows = nb_rows
+
+    def get_column(self, index, numeric=False):
+        if self._selected is None:
+            self._selected = SelectFromTable.select(
+                    self.table, self.idx, self.comparand, self.comparer)
+            self._rows = self._selected.rows
+        return self._selected.get_column(index, numeric)
+
+    @property
+    def rows(self):
+        if self._rows is None:
+            for batch in self.iter_batches():
+                pass
+        return self._rows
+
 
 class AggregatedTable(TableObject):
+    # Group with NumPy when the key column is a NumPy array
+    use_numpy = True
+
     def __init__(self, table, op, col, group_col):
         self.table = table
         self.op = op
@@ -341,15 +497,25 @@ class AggregatedTable(TableObject):
         self.build_map()
 
     def build_map(self):
-        agg_map = {}
-        for i, val in enumerate(self.table.get_column(self.group_col)):
-            if val in agg_map:
-                agg_map[val].append(i)
-            else:
-                agg_map[val] = [i]
-        self.agg_rows = [(min(rows), rows) for rows in agg_map.itervalues()]
-        self.agg_rows.sort()
-        self.rows = len(self.agg_rows)
+        self.groups = None
+        self.agg_rows = None
+        keys = None
+        if self.use_numpy:
+            keys = column_array(self.table, self.group_col)
+        if keys is not None and keys.dtype.kind != 'O':
+            self.groups = Groups(keys)
+            self.rows = self.groups.nb_groups
+        else:
+            agg_map = {}
+            for i, val in enumerate(self.table.get_column(self.group_col)):
+                if val in agg_map:
+                    agg_map[val].append(i)
+                else:
+                    agg_map[val] = [i]
+            self.agg_rows = [(min(rows), rows)
+                             for rows in agg_map.itervalues()]
+            self.agg_rows.sort()
+            self.rows = len(self.agg_rows)
         self.columns = 2
         if self.table.names is not None:
             self.names = [self.table.names[self.group_col],
@@ -367,12 +533,29 @@ class AggregatedTable(TableObject):
                   'average': average,
                   'min': min,
                   'max': max}
-        if index == 0:
+        if self.groups is not None:
+            if index == 0:
+                col = self.table.get_column(self.group_col, numeric)
+                return [col[i] for i in self.groups.first_rows]
+            elif self.op == 'count':
+                return self.groups.counts.tolist()
+            else:
+                values = numeric_array(self.table, self.col)
+                return self.groups.reduce(self.op, values).tolist()
+        elif index == 0:
             col = self.table.get_column(self.group_col, numeric)
             return [col[x[0]] for x in self.agg_rows]
         else:
+            numpy = get_numpy(False)
             if self.op == 'count':
                 return [len(x[1]) for x in self.agg_rows]
+            elif self.op in op_map and numpy is not None:
+                col = as_columnar(self.table).get_array(self.col, True)
+                func = {'sum': numpy.sum,
+                        'average': numpy.mean,
+                        'min': numpy.min,
+                        'max': numpy.max}[self.op]
+                return [func(col[x[1]]) for x in self.agg_rows]
             elif self.op in op_map:
                 col = self.table.get_column(self.col, True)
                 return [op_map[self.op](col[idx] for idx in x[1])
@@ -419,6 +602,7 @@ _modules = [JoinTables, ProjectTable, SelectFromTable, AggregateColumn]
 import unittest
 from vistrails.tests.utils import execute, intercept_result
 from .identifiers import identifier
+from .columnar import to_array
 
 
 class TestJoin(unittest.TestCase):
@@ -520,6 +704,49 @@ class TestJoin(unittest.TestCase):
         self.assertEqual(table.get_column(0, False), ['1', '2', '5'])
         self.assertEqual(table.get_column(1, False), ['one', '2', 'five'])
 
+    def test_vectorized(self):
+        """Compares the NumPy join and group-by with the dict-based ones.
+        """
+        import numpy
+
+        class DictJoinedTables(JoinedTables):
+            use_numpy = False
+
+        class DictAggregatedTable(AggregatedTable):
+            use_numpy = False
+
+        keys = ['a', ' B', 'c', 'b ', 'e', 'c']
+        values = ['1', '2', '3', '4', '5', '-6']
+        right = ColumnarTable(
+                [to_array(['A', 'b', 'd', 'B']),
+                 to_array(['one', 'two', 'four', 'two again'])],
+                4, ['key', 'name'])
+        for array in (to_array, lambda l: numpy.array(l, dtype='S')):
+            left = ColumnarTable([array(keys), array(values)],
+                                 len(keys), ['key', 'value'])
+            for case_sensitive in (False, True):
+                joined = JoinedTables(left, right, 0, 0, case_sensitive)
+                self.assertIsNotNone(joined.matched_rows)
+                expected = DictJoinedTables(left, right, 0, 0,
+                                            case_sensitive)
+                self.assertIsNone(expected.matched_rows)
+                self.assertEqual(joined.rows, expected.rows)
+                for i in xrange(4):
+                    self.assertEqual(joined.get_column(i),
+                                     expected.get_column(i))
+
+        left = ColumnarTable([numpy.array(keys, dtype='S'),
+                              numpy.array(values, dtype='S')],
+                             len(keys), ['key', 'value'])
+        for op in ('count', 'sum', 'average', 'min', 'max'):
+            grouped = AggregatedTable(left, op, 1, 0)
+            self.assertIsNotNone(grouped.groups)
+            expected = DictAggregatedTable(left, op, 1, 0)
+            self.assertIsNone(expected.groups)
+            self.assertEqual(grouped.get_column(0), expected.get_column(0))
+            self.assertEqual(map(float, grouped.get_column(1)),
+                             map(float, expected.get_column(1)))
+
 
 class TestProjection(unittest.TestCase):
     def do_project(self, project_functions, error=None):
@@ -684,6 +911,22 @@ class TestSelect(unittest.TestCase):
             ])
         self.assertEqual(table.get_column(0, False), ['22', '43', '-7'])
 
+    def test_columnar(self):
+        """Selects and projects without going back to lists.
+        """
+        table = self.do_select([
+                ('str_expr', [('String', '1'),
+                              ('String', '!='),
+                              ('String', 'b')])
+            ])
+        self.assertIsInstance(table, ColumnarTable)
+        self.assertEqual(table.rows, 3)
+        projected = table.project([3, 0], ['s', 'n'])
+        self.assertIs(projected.get_array(1), table.get_array(0))
+        self.assertEqual(list(projected.get_column(1, True)), [22, -7, 500])
+        self.assertEqual(projected.get_column(0), ['abaab', 'abbababb',
+                                                   'aba abacc'])
+
 class TestAggregate(unittest.TestCase):
     def do_aggregate(self, agg_functions):
         with intercept_result(AggregateColumn, 'value') as results:
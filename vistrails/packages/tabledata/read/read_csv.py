@@ -36,8 +36,10 @@
 from __future__ import division
 
 import csv
+import itertools
 import operator
 
+from ..columnar import ColumnBuilder
 from ..common import get_numpy, TableObject, Table, InternalModuleError
 
 
@@ -68,6 +70,7 @@ class CSVTable(TableObject):
             self.skip_lines += 1
 
         self.column_cache = {}
+        self._columnar = None
 
     @staticmethod
     def read_file(filename, delimiter=None, header_present=True,
@@ -121,30 +124,77 @@ class CSVTable(TableObject):
 
         return column_count, column_names, delimiter, header_present, dialect
 
+    def _reader(self, fp):
+        for i in xrange(self.skip_lines):
+            line = fp.readline()
+            if not line:
+                raise ValueError("skip_lines greater than the number "
+                                 "of lines in the file")
+        if self.dialect is not None:
+            return csv.reader(fp, dialect=self.dialect)
+        else:
+            return csv.reader(fp, delimiter=self.delimiter)
+
+    def as_columnar(self):
+        """Parses the whole file, once, into a ColumnarTable.
+        """
+        if self._columnar is None:
+            builder = ColumnBuilder(self.columns)
+            with open(self.filename, 'rb') as fp:
+                builder.add_rows(self._reader(fp))
+            self._columnar = builder.build(self.names)
+            self._rows = self._columnar.rows
+        return self._columnar
+
+    def iter_batches(self, batch_size=None):
+        """Reads the file one batch of rows at a time.
+
+        Unless the file was already loaded, this never holds more than one
+        batch in memory.
+        """
+        if self._columnar is not None:
+            for batch in self._columnar.iter_batches(batch_size):
+                yield batch
+            return
+        if batch_size is None:
+            batch_size = self.batch_size
+        numpy = get_numpy(False)
+        nb_rows = 0
+        with open(self.filename, 'rb') as fp:
+            reader = self._reader(fp)
+            while True:
+                chunk = list(itertools.islice(reader, batch_size))
+                if not chunk:
+                    break
+                if numpy is not None:
+                    builder = ColumnBuilder(self.columns, nb_rows + 1)
+                    builder.add_chunk(chunk)
+                    yield builder.build(self.names)
+                else:
+                    columns = [[] for i in xrange(self.columns)]
+                    for rownb, row in enumerate(chunk, nb_rows + 1):
+                        if len(row) < self.columns:
+                            raise ValueError(
+                                    "Invalid CSV file: only %d fields on "
+                                    "line %d" % (len(row), rownb))
+                        for i, column in enumerate(columns):
+                            column.append(row[i])
+                    yield TableObject(columns, len(chunk), self.names)
+                nb_rows += len(chunk)
+        self._rows = nb_rows
+
     def get_column(self, index, numeric=False):
         if (index, numeric) in self.column_cache:
             return self.column_cache[(index, numeric)]
 
         numpy = get_numpy(False)
 
-        if numeric and numpy is not None:
-            result = numpy.loadtxt(
-                    self.filename,
-                    dtype=numpy.float32,
-                    delimiter=self.delimiter,
-                    skiprows=self.skip_lines,
-                    usecols=[index])
+        if numpy is not None:
+            # all the columns are read in a single pass
+            return self.as_columnar().get_column(index, numeric)
         else:
             with open(self.filename, 'rb') as fp:
-                for i in xrange(self.skip_lines):
-                    line = fp.readline()
-                    if not line:
-                        raise ValueError("skip_lines greater than the number "
-                                         "of lines in the file")
-                if self.dialect is not None:
-                    reader = csv.reader(fp, dialect=self.dialect)
-                else:
-                    reader = csv.reader(fp, delimiter=self.delimiter)
+                reader = self._reader(fp)
 
                 getter = operator.itemgetter(index)
                 try:
@@ -128,3 +128,62 @@ class ExcelWriteTestCase(unittest.TestCase, BaseWriteTestCase):
 class CSVWriteTestCase(unittest.TestCase, BaseWriteTestCase):
     WRITER_MODULE = 'write|WriteCSV'
     READER_MODULE = 'read|CSVFile'
+
+    def test_streaming(self):
+        """Filters and writes a CSV file in batches of rows.
+        """
+        from vistrails.tests.utils import execute, intercept_result
+        from ..common import TableObject
+        from ..identifiers import identifier
+        from ..operations import SelectedTable, SelectFromTable
+        from .write_csv import WriteCSV
+
+        old_batch_size = TableObject.batch_size
+        TableObject.batch_size = 2
+        try:
+            with intercept_result(SelectFromTable, 'value') as tables:
+                with intercept_result(WriteCSV, 'file') as files:
+                    self.assertFalse(execute([
+                            ('WriteFile', 'org.vistrails.vistrails.basic', [
+                                ('in_value', [('String', 'a;b;c\n'
+                                                         '1;one;x\n'
+                                                         '2;two;y\n'
+                                                         '3;three;x\n'
+                                                         '4;four;x\n'
+                                                         '5;five;y\n'
+                                                         '6;six;x\n')]),
+                            ]),
+                            ('read|CSVFile', identifier, [
+                                ('delimiter', [('String', ';')]),
+                                ('header_present', [('Boolean', 'True')]),
+                            ]),
+                            ('SelectFromTable', identifier, [
+                                ('str_expr', [('String', 'c'),
+                                              ('String', '=='),
+                                              ('String', 'x')]),
+                                ('streaming', [('Boolean', 'True')]),
+                            ]),
+                            ('ProjectTable', identifier, [
+                                ('column_names', [('List', "['b', 'a']")]),
+                            ]),
+                            (self.WRITER_MODULE, identifier, []),
+                        ], [
+                            (0, 'out_value', 1, 'file'),
+                            (1, 'value', 2, 'table'),
+                            (2, 'value', 3, 'table'),
+                            (3, 'value', 4, 'table'),
+                        ]))
+            self.assertEqual(len(tables), 1)
+            self.assertIsInstance(tables[0], SelectedTable)
+            self.assertEqual([batch.rows
+                              for batch in tables[0].iter_batches()],
+                             [1, 2, 1])
+            self.assertEqual(tables[0].rows, 4)
+            with open(files[0].name, 'rb') as fp:
+                self.assertEqual(fp.read(),
+                                 'b;a\none;1\nthree;3\nfour;4\nsix;6\n')
+            # the whole-column interface is still available
+            self.assertEqual(tables[0].get_column(1),
+                             ['one', 'three', 'four', 'six'])
+        finally:
+            TableObject.batch_size = old_batch_size
@@ -60,16 +60,17 @@ class WriteCSV(Module):
 
     @staticmethod
     def write(fname, table, delimiter=';', write_header=True):
-        cols = [table.get_column(i) for i in xrange(table.columns)]
-
         with open(fname, 'w') as fp:
             if write_header and table.names is not None:
                 fp.write(delimiter.join(table.names) + '\n')
 
+            # write the rows as they are produced, one batch at a time
             line = 0
-            for l in izip(*cols):
-                fp.write(delimiter.join(str(e) for e in l) + '\n')
-                line += 1
+            for batch in table.iter_batches():
+                cols = [batch.get_column(i) for i in xrange(batch.columns)]
+                for l in izip(*cols):
+                    fp.write(delimiter.join(str(e) for e in l) + '\n')
+                    line += 1
 
         return line
 